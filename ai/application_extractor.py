@@ -10,7 +10,7 @@ and provenance tracking.
 import json
 import os
 import re
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Any, Optional
 from pathlib import Path
 
@@ -201,6 +201,32 @@ class ApplicationExtraction:
                 records.append(record)
         return records
 
+    def to_dict(self) -> dict:
+        """JSON-serializable form (used by the extraction cache)."""
+        return {
+            "data": {
+                section: {name: asdict(result) for name, result in fields.items()}
+                for section, fields in self.data.items()
+            },
+            "raw_text": self.raw_text,
+            "page_count": self.page_count,
+            "model_used": self.model_used,
+            "extraction_metadata": self.extraction_metadata,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "ApplicationExtraction":
+        return cls(
+            data={
+                section: {name: ExtractionResult(**result) for name, result in fields.items()}
+                for section, fields in payload["data"].items()
+            },
+            raw_text=payload.get("raw_text", ""),
+            page_count=payload.get("page_count", 0),
+            model_used=payload.get("model_used", ""),
+            extraction_metadata=payload.get("extraction_metadata", {}),
+        )
+
 
 def _build_extraction_prompt(text: str, page_markers: dict[int, int]) -> str:
     """Build the extraction prompt for Claude."""
@@ -558,6 +584,7 @@ def extract_with_textract_lines(
     key_values: list[dict] = None,
     model: str = "claude-sonnet-4-20250514",
     page_count: Optional[int] = None,
+    content_sha256: Optional[str] = None,
 ) -> ApplicationExtraction:
     """
     Extract application data using Textract lines AND key-values with direct bbox linking.
@@ -568,24 +595,43 @@ def extract_with_textract_lines(
         key_values: List of {id, key, value, type, page, bbox} from KEY_VALUE_SET
         model: Claude model to use for extraction
         page_count: Number of pages (if known)
+        content_sha256: Source file hash; when given, Claude's response is cached
+            (core.extraction_cache) under the file, model and the exact prompt,
+            so its LINE_n / KV_n refs always index these textract_lines and
+            key_values; they are re-mapped to the current line_id_map on a hit
 
     Returns:
         ApplicationExtraction with question_line_id and answer_id populated for bbox lookup
     """
+    from core import extraction_cache
+
     if page_count is None:
         page_count = max(line.get("page", 1) for line in textract_lines) if textract_lines else 1
 
     # Build prompt with Textract lines AND key-values
     prompt = _build_extraction_prompt_with_textract(textract_lines, key_values)
 
-    client = _get_client()
-    response = client.messages.create(
-        model=model,
-        max_tokens=8000,
-        messages=[{"role": "user", "content": prompt}],
-    )
+    def _call_claude() -> dict:
+        client = _get_client()
+        response = client.messages.create(
+            model=model,
+            max_tokens=8000,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        _parse_extraction_response(response.content[0].text)  # don't cache an unparseable response
+        return {
+            "response_text": response.content[0].text,
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+        }
 
-    response_text = response.content[0].text
+    schema = _get_extraction_schema()
+    # The prompt numbers the lines / key-values the response refers to: key on it
+    # too, so different Textract output for the same file never reuses refs
+    claude_output, cache_hit = extraction_cache.cached(
+        content_sha256, "textract_lines", model, extraction_cache.schema_version([schema, prompt]), _call_claude,
+    )
+    response_text = claude_output["response_text"]
 
     # Parse response
     raw_data = _parse_extraction_response(response_text)
@@ -611,7 +657,6 @@ def extract_with_textract_lines(
         return None
 
     # Convert to ExtractionResult objects
-    schema = _get_extraction_schema()
     data: dict[str, dict[str, ExtractionResult]] = {}
 
     for section, fields in schema.items():
@@ -670,10 +715,11 @@ def extract_with_textract_lines(
         page_count=page_count,
         model_used=model,
         extraction_metadata={
-            "input_tokens": response.usage.input_tokens,
-            "output_tokens": response.usage.output_tokens,
+            "input_tokens": claude_output["input_tokens"],
+            "output_tokens": claude_output["output_tokens"],
             "extraction_method": "textract_lines",
             "lines_provided": len(textract_lines),
+            "cache_hit": cache_hit,
         },
     )
 
@@ -686,6 +732,9 @@ def extract_from_pdf(
     """
     Extract application data directly from a PDF file.
 
+    Results are cached by file content + schema version + model
+    (core.extraction_cache); a hit skips the Claude call entirely.
+
     Args:
         file_path: Path to PDF file
         model: Claude model to use
@@ -694,6 +743,26 @@ def extract_from_pdf(
     Returns:
         ApplicationExtraction with all extracted fields
     """
+    from core import extraction_cache
+
+    try:
+        sha = extraction_cache.file_sha256(file_path) if extraction_cache.enabled() else None
+    except OSError:
+        sha = None
+
+    payload, cache_hit = extraction_cache.cached(
+        sha,
+        "claude_vision" if use_vision else "claude_text",
+        model,
+        extraction_cache.schema_version(_get_extraction_schema()) if sha else extraction_cache.NO_SCHEMA,
+        lambda: _extract_from_pdf_uncached(file_path, model, use_vision).to_dict(),
+    )
+    extraction = ApplicationExtraction.from_dict(payload)
+    extraction.extraction_metadata["cache_hit"] = cache_hit
+    return extraction
+
+
+def _extract_from_pdf_uncached(file_path: str, model: str, use_vision: bool) -> ApplicationExtraction:
     if use_vision:
         return extract_from_pdf_vision(file_path, model=model)
 
@@ -7,6 +7,8 @@ Detects contradictions, implausible answers, and credibility issues.
 import os
 import json
 import re
+import threading
+import time
 from typing import Any
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -18,8 +20,12 @@ from pathlib import Path
 
 load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 
+from core.compiled_rules import CompiledRule, RuleSet, options_matcher
 from core.db import get_conn
 
+# How often (seconds) the compiled catalog re-checks conflict_rules for edits
+RULES_CHECK_SECONDS = float(os.getenv("CONFLICT_RULES_CHECK_SECONDS", "30"))
+
 
 @dataclass
 class DetectedConflict:
@@ -50,147 +56,210 @@ def get_known_rules() -> list[dict]:
         return []
 
 
-def check_known_rules(app_data: dict, rules: list[dict]) -> list[DetectedConflict]:
-    """Check app data against known rules from the catalog."""
-    detected = []
+def get_known_rules_version() -> str | None:
+    """Content digest of the active conflict_rules (None if the catalog can't be read)."""
+    try:
+        with get_conn() as conn:
+            row = conn.execute(text("""
+                SELECT count(*) || ':' || md5(coalesce(string_agg(
+                    concat_ws(chr(31), rule_name, category, severity, title, description,
+                              detection_pattern::text),
+                    chr(30) ORDER BY rule_name), ''))
+                FROM conflict_rules
+                WHERE is_active = true
+            """)).fetchone()
+            return row[0] if row else None
+    except Exception as e:
+        print(f"Error reading conflict rules version: {e}")
+        return None
+
+
+_compiled_lock = threading.Lock()
+_compiled_rules: RuleSet | None = None
+_compiled_checked_at = 0.0
 
+
+def get_compiled_rules() -> RuleSet:
+    """
+    The active catalog, compiled. Recompiled only when the catalog content
+    changes (checked at most every CONFLICT_RULES_CHECK_SECONDS).
+    """
+    global _compiled_rules, _compiled_checked_at
+
+    with _compiled_lock:
+        now = time.monotonic()
+        if _compiled_rules is not None and now - _compiled_checked_at < RULES_CHECK_SECONDS:
+            return _compiled_rules
+        version = get_known_rules_version()
+        if version is None:
+            # Catalog unreadable: keep what we have rather than dropping to no rules
+            return _compiled_rules or compile_known_rules(get_known_rules())
+        if _compiled_rules is None or _compiled_rules.version != version:
+            _compiled_rules = compile_known_rules(get_known_rules(), version=version)
+        _compiled_checked_at = now
+        return _compiled_rules
+
+
+def compile_known_rules(rules: list[dict], version: str | None = None) -> RuleSet:
+    """Compile catalog rules (see check_known_rules for the pattern shapes)."""
+    compiled = []
     for rule in rules:
         pattern = rule.get("detection_pattern")
         if not pattern:
             continue
-
         try:
-            # Handle different pattern types
             if "field_a" in pattern and "field_b" in pattern:
-                # Simple field comparison
-                conflict = _check_field_comparison(app_data, rule, pattern)
-                if conflict:
-                    detected.append(conflict)
+                compiled_rule = _compile_field_comparison(rule, pattern)
             elif "context_field" in pattern and "check_field" in pattern:
-                # Context-based check (e.g., B2C + no PII)
-                conflict = _check_context_rule(app_data, rule, pattern)
-                if conflict:
-                    detected.append(conflict)
+                compiled_rule = _compile_context_rule(rule, pattern)
+            else:
+                continue
+            hash(compiled_rule.trigger_field)  # dispatch key; a list here would fail every lookup
+            compiled.append(compiled_rule)
         except Exception as e:
             print(f"Error checking rule {rule['rule_name']}: {e}")
-            continue
+    return RuleSet(compiled, version=version)
 
-    return detected
 
+def check_known_rules(app_data: dict, rules: list[dict] | RuleSet) -> list[DetectedConflict]:
+    """Check app data against known rules from the catalog (raw rows or compiled)."""
+    ruleset = rules if isinstance(rules, RuleSet) else compile_known_rules(rules)
+    return [hit.payload for hit in ruleset.evaluate(app_data)]
 
-def _check_field_comparison(app_data: dict, rule: dict, pattern: dict) -> DetectedConflict | None:
-    """Check a simple field comparison rule."""
-    field_a = pattern.get("field_a")
-    field_b = pattern.get("field_b")
-    value_a_triggers = pattern.get("value_a", [])
-    condition = pattern.get("condition", "")
-    value_b_triggers = pattern.get("value_b", [])
 
-    actual_a = app_data.get(field_a)
-    actual_b = app_data.get(field_b)
+def check_known_rules_many(
+    app_datas: list[dict],
+    rules: list[dict] | RuleSet | None = None,
+) -> list[list[DetectedConflict]]:
+    """
+    Check many applications against the catalog in one pass - for rule-impact
+    backtests. Defaults to the active catalog.
+    """
+    if rules is None:
+        ruleset = get_compiled_rules()
+    else:
+        ruleset = rules if isinstance(rules, RuleSet) else compile_known_rules(rules)
+    return [[hit.payload for hit in hits] for hits in ruleset.evaluate_many(app_datas)]
 
-    # Normalize values for comparison
-    actual_a_normalized = _normalize_value(actual_a)
 
-    # Check if field_a matches trigger values
-    a_matches = False
-    for trigger in value_a_triggers:
-        if _normalize_value(trigger) == actual_a_normalized:
-            a_matches = True
-            break
+def _guarded(rule: dict, check):
+    """Per-rule error isolation, as in the interpreted loop."""
+    def guarded(app_data: dict):
+        try:
+            return check(app_data)
+        except Exception as e:
+            print(f"Error checking rule {rule['rule_name']}: {e}")
+            return None
+    return guarded
 
-    if not a_matches:
-        return None
 
-    # Now check field_b based on condition
-    conflict_found = False
-
-    if condition == "should_be_empty":
-        # Field B should be empty/None/blank but isn't
-        if actual_b and str(actual_b).strip() and str(actual_b).lower() not in ["none", "n/a", ""]:
-            conflict_found = True
-    elif condition == "should_be_zero_or_empty":
-        # Field B should be 0 or empty
-        if actual_b and actual_b != 0 and str(actual_b).strip() not in ["0", "none", "n/a", ""]:
-            conflict_found = True
-    elif value_b_triggers:
-        # Field B should NOT be in these values, but is
-        actual_b_normalized = _normalize_value(actual_b)
-        for trigger in value_b_triggers:
-            if _normalize_value(trigger) == actual_b_normalized:
+def _known_conflict(rule: dict, field_values: dict) -> DetectedConflict:
+    return DetectedConflict(
+        rule_name=rule["rule_name"],
+        category=rule["category"],
+        severity=rule["severity"],
+        title=rule["title"],
+        description=rule["description"],
+        field_values=field_values,
+        is_known_rule=True,
+    )
+
+
+def _compile_field_comparison(rule: dict, pattern: dict) -> CompiledRule:
+    """Compile a simple field comparison rule."""
+    field_a = pattern.get("field_a")
+    field_b = pattern.get("field_b")
+    condition = pattern.get("condition", "")
+    a_matches = options_matcher(pattern.get("value_a", []), _normalize_value)
+    b_matches = options_matcher(pattern.get("value_b", []), _normalize_value)
+    has_value_b = bool(pattern.get("value_b", []))
+
+    def check(app_data: dict) -> DetectedConflict | None:
+        actual_a = app_data.get(field_a)
+        if not a_matches(_normalize_value(actual_a)):
+            return None
+        actual_b = app_data.get(field_b)
+
+        # Now check field_b based on condition
+        conflict_found = False
+        if condition == "should_be_empty":
+            # Field B should be empty/None/blank but isn't
+            if actual_b and str(actual_b).strip() and str(actual_b).lower() not in ["none", "n/a", ""]:
                 conflict_found = True
-                break
+        elif condition == "should_be_zero_or_empty":
+            # Field B should be 0 or empty
+            if actual_b and actual_b != 0 and str(actual_b).strip() not in ["0", "none", "n/a", ""]:
+                conflict_found = True
+        elif has_value_b:
+            # Field B should NOT be in these values, but is
+            conflict_found = b_matches(_normalize_value(actual_b))
 
-    if conflict_found:
-        return DetectedConflict(
-            rule_name=rule["rule_name"],
-            category=rule["category"],
-            severity=rule["severity"],
-            title=rule["title"],
-            description=rule["description"],
-            field_values={field_a: actual_a, field_b: actual_b},
-            is_known_rule=True,
-        )
+        if conflict_found:
+            return _known_conflict(rule, {field_a: actual_a, field_b: actual_b})
+        return None
 
-    return None
+    return CompiledRule(
+        name=rule["rule_name"],
+        trigger_field=field_a,
+        check=_guarded(rule, check),
+        fires_when_absent=a_matches(_normalize_value(None)),
+        rule=rule,
+    )
 
 
-def _check_context_rule(app_data: dict, rule: dict, pattern: dict) -> DetectedConflict | None:
-    """Check a context-based rule (e.g., B2C business + no PII)."""
+def _compile_context_rule(rule: dict, pattern: dict) -> CompiledRule:
+    """Compile a context-based rule (e.g., B2C business + no PII)."""
     context_field = pattern.get("context_field")
-    context_values = pattern.get("context_value", [])
     context_condition = pattern.get("context_condition")
-    context_threshold = pattern.get("context_value")
     check_field = pattern.get("check_field")
-    check_values = pattern.get("check_value", [])
-
-    actual_context = app_data.get(context_field)
-    actual_check = app_data.get(check_field)
-
-    # Check if context matches
-    context_matches = False
+    check_matches = options_matcher(pattern.get("check_value", []), _normalize_value)
 
     if context_condition in [">", "<", ">=", "<="]:
         # Numeric comparison
+        context_threshold = pattern.get("context_value")
         try:
-            actual_num = float(actual_context) if actual_context else 0
             threshold = float(context_threshold) if context_threshold else 0
-            if context_condition == ">" and actual_num > threshold:
-                context_matches = True
-            elif context_condition == "<" and actual_num < threshold:
-                context_matches = True
-            elif context_condition == ">=" and actual_num >= threshold:
-                context_matches = True
-            elif context_condition == "<=" and actual_num <= threshold:
-                context_matches = True
         except (ValueError, TypeError):
-            pass
+            threshold = None  # unparseable threshold never matches
+        compare = {
+            ">": lambda a, b: a > b,
+            "<": lambda a, b: a < b,
+            ">=": lambda a, b: a >= b,
+            "<=": lambda a, b: a <= b,
+        }[context_condition]
+
+        def context_matches(actual_context: Any) -> bool:
+            if threshold is None:
+                return False
+            try:
+                actual_num = float(actual_context) if actual_context else 0
+            except (ValueError, TypeError):
+                return False
+            return compare(actual_num, threshold)
     else:
         # Value matching
-        actual_context_normalized = _normalize_value(actual_context)
-        for ctx_val in context_values:
-            if _normalize_value(ctx_val) == actual_context_normalized:
-                context_matches = True
-                break
-
-    if not context_matches:
+        value_matches = options_matcher(pattern.get("context_value", []), _normalize_value)
+
+        def context_matches(actual_context: Any) -> bool:
+            return value_matches(_normalize_value(actual_context))
+
+    def check(app_data: dict) -> DetectedConflict | None:
+        actual_context = app_data.get(context_field)
+        if not context_matches(actual_context):
+            return None
+        # Check if the check field matches problem values
+        actual_check = app_data.get(check_field)
+        if check_matches(_normalize_value(actual_check)):
+            return _known_conflict(rule, {context_field: actual_context, check_field: actual_check})
         return None
 
-    # Check if the check field matches problem values
-    actual_check_normalized = _normalize_value(actual_check)
-    for check_val in check_values:
-        if _normalize_value(check_val) == actual_check_normalized:
-            return DetectedConflict(
-                rule_name=rule["rule_name"],
-                category=rule["category"],
-                severity=rule["severity"],
-                title=rule["title"],
-                description=rule["description"],
-                field_values={context_field: actual_context, check_field: actual_check},
-                is_known_rule=True,
-            )
-
-    return None
+    return CompiledRule(
+        name=rule["rule_name"],
+        trigger_field=context_field,
+        check=_guarded(rule, check),
+        fires_when_absent=context_matches(None),
+        rule=rule,
+    )
 
 
 def _normalize_value(value: Any) -> str:
@@ -425,8 +494,7 @@ def analyze_application(
     all_conflicts = []
 
     # 1. Check known rules
-    known_rules = get_known_rules()
-    known_conflicts = check_known_rules(app_data, known_rules)
+    known_conflicts = check_known_rules(app_data, get_compiled_rules())
     all_conflicts.extend(known_conflicts)
 
     # 2. LLM analysis for new patterns
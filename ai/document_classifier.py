@@ -11,18 +11,35 @@ Classifies PDFs into categories:
 
 Uses first-page analysis via OpenAI vision for accurate classification.
 Cyber/tech insurance primarily uses carrier-specific applications, not ACORD forms.
+
+Batches are classified concurrently (bounded worker pool, retries with backoff
+on rate limits / transient API errors) and results are cached by content hash,
+so a re-sent attachment with the same bytes never goes back to the model.
+
+Environment:
+  CLASSIFIER_MAX_WORKERS  concurrent vision calls      (default: 6)
+  CLASSIFIER_MAX_RETRIES  retries per document         (default: 4)
+  CLASSIFIER_CACHE_PATH   sqlite file, "" disables     (default: <repo>/.cache/classifications.sqlite)
 """
 
 import base64
+import hashlib
 import io
+import json
 import os
-from dataclasses import dataclass
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Optional
 
 from openai import OpenAI
 
+from core.sqlite_cache import SqliteCache
+
 
 class DocumentType(str, Enum):
     """Document type categories."""
@@ -44,12 +61,58 @@ class ClassificationResult:
     detected_form_number: Optional[str] = None  # For ACORD forms
 
 
+MAX_WORKERS = int(os.getenv("CLASSIFIER_MAX_WORKERS", "6"))
+MAX_RETRIES = int(os.getenv("CLASSIFIER_MAX_RETRIES", "4"))
+_DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / ".cache" / "classifications.sqlite"
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+
 def _get_client() -> OpenAI:
-    """Get OpenAI client with API key from environment."""
-    key = os.getenv("OPENAI_API_KEY")
-    if not key:
-        raise ValueError("OPENAI_API_KEY environment variable not set")
-    return OpenAI(api_key=key)
+    """Get the shared OpenAI client (API key from environment). Thread-safe."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                key = os.getenv("OPENAI_API_KEY")
+                if not key:
+                    raise ValueError("OPENAI_API_KEY environment variable not set")
+                # _with_retries does the (jittered) backoff; don't stack the SDK's on top
+                _client = OpenAI(api_key=key, max_retries=0)
+    return _client
+
+
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying, or None if the error isn't retryable."""
+    import openai
+
+    if isinstance(exc, openai.RateLimitError):
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+    elif not isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError)):
+        return None
+    # Exponential backoff with jitter so concurrent workers don't retry in lockstep
+    return min(30.0, 2 ** attempt) * (0.5 + random.random())
+
+
+def _with_retries(fn, max_retries: int = MAX_RETRIES):
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt >= max_retries:
+                raise
+            attempt += 1
+            print(f"[classifier] {type(e).__name__}, retry {attempt}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
 
 
 def _pdf_first_page_to_image(pdf_path: str) -> bytes:
@@ -123,7 +186,7 @@ def classify_document(pdf_path: str, model: str = "gpt-4o") -> ClassificationRes
 
     client = _get_client()
 
-    response = client.chat.completions.create(
+    response = _with_retries(lambda: client.chat.completions.create(
         model=model,
         max_tokens=500,
         messages=[
@@ -142,11 +205,10 @@ def classify_document(pdf_path: str, model: str = "gpt-4o") -> ClassificationRes
             }
         ],
         response_format={"type": "json_object"}
-    )
+    ))
 
     result = response.choices[0].message.content
 
-    import json
     data = json.loads(result)
 
     # Map to enum
@@ -165,29 +227,120 @@ def classify_document(pdf_path: str, model: str = "gpt-4o") -> ClassificationRes
     )
 
 
-def classify_documents(pdf_paths: list[str], model: str = "gpt-4o") -> dict[str, ClassificationResult]:
+# ─────────────────────────────────────────────────────────────
+# Content-hash cache
+# ─────────────────────────────────────────────────────────────
+
+def content_hash(pdf_path: str, model: str) -> str:
+    """Cache key: file bytes + model + prompt (a prompt change invalidates old results)."""
+    h = hashlib.sha256()
+    h.update(f"{model}\0{CLASSIFICATION_PROMPT}\0".encode("utf-8"))
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _encode_result(result: ClassificationResult) -> str:
+    return json.dumps({**asdict(result), "document_type": result.document_type.value})
+
+
+def _decode_result(stored: str) -> ClassificationResult:
+    data = json.loads(stored)
+    data["document_type"] = DocumentType(data["document_type"])
+    return ClassificationResult(**data)
+
+
+class ClassificationCache(SqliteCache):
+    """In-memory dict in front of an optional sqlite file."""
+
+    def __init__(self, path: Optional[Path] = None):
+        super().__init__(path, "classifications", "result",
+                         encode=_encode_result, decode=_decode_result, memory_items=None)
+
+
+_cache: Optional[ClassificationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_classification_cache() -> ClassificationCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                cache_path = os.getenv("CLASSIFIER_CACHE_PATH", str(_DEFAULT_CACHE_PATH))
+                _cache = ClassificationCache(Path(cache_path) if cache_path else None)
+    return _cache
+
+
+def classify_documents(
+    pdf_paths: list[str],
+    model: str = "gpt-4o",
+    max_workers: Optional[int] = None,
+) -> dict[str, ClassificationResult]:
     """
-    Classify multiple PDF documents.
+    Classify multiple PDF documents concurrently.
+
+    Attachments already seen (same bytes, same model) come from the cache;
+    identical attachments within the batch are classified once. Failures
+    are returned as OTHER with confidence 0 and are not cached.
 
     Args:
         pdf_paths: List of paths to PDF files
         model: OpenAI model to use
+        max_workers: Concurrent vision calls (default: CLASSIFIER_MAX_WORKERS)
 
     Returns:
-        Dict mapping file path to ClassificationResult
+        Dict mapping file path to ClassificationResult, in input order
     """
-    results = {}
-    for path in pdf_paths:
+    cache = get_classification_cache()
+    results: dict[str, Optional[ClassificationResult]] = {path: None for path in pdf_paths}
+    keys: dict[str, Optional[str]] = {}
+    to_classify: dict[str, str] = {}  # content key -> representative path
+    hits = 0
+
+    for path in results:
+        try:
+            key = content_hash(path, model)
+        except OSError:
+            key = None  # let classify_document raise the real error
+        keys[path] = key
+        cached = cache.get(key) if key else None
+        if cached is not None:
+            results[path] = cached
+            hits += 1
+        elif key is None:
+            to_classify[f"path:{path}"] = path
+        else:
+            to_classify.setdefault(key, path)
+
+    def _classify(path: str) -> tuple[ClassificationResult, bool]:
         try:
-            results[path] = classify_document(path, model)
+            return classify_document(path, model), True
         except Exception as e:
             # Log error but continue with other documents
             print(f"[classifier] Failed to classify {path}: {e}")
-            results[path] = ClassificationResult(
+            return ClassificationResult(
                 document_type=DocumentType.OTHER,
                 confidence=0.0,
                 reason=f"Classification failed: {e}"
-            )
+            ), False
+
+    fresh: dict[str, ClassificationResult] = {}
+    if to_classify:
+        workers = max(1, min(max_workers or MAX_WORKERS, len(to_classify)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="classify") as pool:
+            for key, (result, ok) in zip(to_classify, pool.map(_classify, to_classify.values())):
+                fresh[key] = result
+                if ok and not key.startswith("path:"):
+                    cache.put(key, result)
+
+    for path in results:
+        if results[path] is None:
+            results[path] = fresh[keys[path] or f"path:{path}"]
+
+    if results:
+        print(f"[classifier] Classified {len(fresh)} document(s), {hits} from cache")
     return results
 
 
@@ -255,10 +408,14 @@ def quick_classify_by_filename(filename: str) -> Optional[DocumentType]:
     return None  # Uncertain, use vision
 
 
-def smart_classify_documents(pdf_paths: list[str], model: str = "gpt-4o") -> dict[str, ClassificationResult]:
+def smart_classify_documents(
+    pdf_paths: list[str],
+    model: str = "gpt-4o",
+    max_workers: Optional[int] = None,
+) -> dict[str, ClassificationResult]:
     """
     Classify documents using filename heuristics first, then vision for uncertain ones.
-    More efficient than classifying everything with vision.
+    More efficient than classifying everything with vision. Results keep input order.
     """
     results = {}
     need_vision = []
@@ -278,10 +435,10 @@ def smart_classify_documents(pdf_paths: list[str], model: str = "gpt-4o") -> dic
 
     # Use vision for uncertain documents
     if need_vision:
-        vision_results = classify_documents(need_vision, model)
+        vision_results = classify_documents(need_vision, model, max_workers=max_workers)
         results.update(vision_results)
 
-    return results
+    return {path: results[path] for path in pdf_paths}
 
 
 # ─────────────────────────────────────────────────────────────
@@ -0,0 +1,213 @@
+"""
+Embedding Service
+
+One place to turn text into embeddings. Inputs are de-duplicated, looked up in
+a content-addressed cache (sha256 of backend + model + text), and only the
+misses are sent to the backend - many inputs per API call. Re-processing the
+same submission or re-ingesting the same guideline chunk never pays twice.
+
+Backends:
+  - "openai": OpenAI embeddings API (default)
+  - "stub":   offline, deterministic hash-seeded unit vectors (tests, air-gapped dev)
+
+Environment:
+  EMBEDDING_BACKEND     openai | stub            (default: openai)
+  EMBEDDING_CACHE_PATH  sqlite file, "" disables (default: <repo>/.cache/embeddings.sqlite)
+  EMBEDDING_BATCH_SIZE  inputs per API call      (default: 256)
+
+Usage:
+    from ai.embedding_service import get_embedding_service
+    svc = get_embedding_service()
+    ops_vec, ctrl_vec = svc.embed_many([business_summary, controls_summary])
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import random
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional, Protocol
+
+from core.sqlite_cache import SqliteCache
+
+EMBED_MODEL = "text-embedding-3-small"
+EMBED_DIM = 1536
+
+_DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / ".cache" / "embeddings.sqlite"
+
+
+# ─────────────────────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────────────────────
+
+class EmbeddingBackend(Protocol):
+    name: str
+
+    def embed_batch(self, texts: list[str], model: str) -> list[list[float]]: ...
+
+
+class OpenAIBackend:
+    """OpenAI embeddings API; one request per batch."""
+
+    name = "openai"
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._client
+
+    def embed_batch(self, texts: list[str], model: str) -> list[list[float]]:
+        rsp = self.client.embeddings.create(model=model, input=texts, encoding_format="float")
+        # API returns items with an index; don't rely on response order
+        data = sorted(rsp.data, key=lambda d: d.index)
+        return [d.embedding for d in data]
+
+
+class StubBackend:
+    """Deterministic offline embeddings: same text + model -> same unit vector."""
+
+    name = "stub"
+
+    def __init__(self, dim: int = EMBED_DIM):
+        self.dim = dim
+
+    def embed_batch(self, texts: list[str], model: str) -> list[list[float]]:
+        out = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()[:8], "big")
+            rng = random.Random(seed)
+            vec = [rng.gauss(0.0, 1.0) for _ in range(self.dim)]
+            norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+            out.append([v / norm for v in vec])
+        return out
+
+
+# ─────────────────────────────────────────────────────────────
+# Content-addressed cache
+# ─────────────────────────────────────────────────────────────
+
+def content_key(text: str, model: str, backend: str = "openai") -> str:
+    # Vectors from different backends must never share an entry (stub vectors
+    # are not embeddings). OpenAI keys keep the original model-only namespace
+    # so existing cache files stay valid.
+    namespace = model if backend == "openai" else f"{backend}:{model}"
+    return hashlib.sha256(f"{namespace}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _pack(vec: list[float]) -> bytes:
+    return array("f", vec).tobytes()
+
+
+def _unpack(blob: bytes) -> list[float]:
+    vec = array("f")
+    vec.frombytes(blob)
+    return vec.tolist()
+
+
+class EmbeddingCache(SqliteCache):
+    """
+    In-memory LRU in front of an optional sqlite file, both holding float32
+    blobs (~6 KB per 1536-d vector, vs ~50 KB as a list of floats).
+    """
+
+    def __init__(self, path: Optional[Path] = None, memory_items: int = 4096):
+        super().__init__(path, "embeddings", "vec", encode=_pack, decode=_unpack,
+                         memory_items=memory_items, keep_encoded=True)
+
+
+# ─────────────────────────────────────────────────────────────
+# Service
+# ─────────────────────────────────────────────────────────────
+
+class EmbeddingService:
+    """Batched, cached embeddings. Thread-safe."""
+
+    def __init__(
+        self,
+        backend: Optional[EmbeddingBackend] = None,
+        cache: Optional[EmbeddingCache] = None,
+        model: str = EMBED_MODEL,
+        batch_size: int = 256,
+    ):
+        self.backend = backend or OpenAIBackend()
+        self.cache = cache or EmbeddingCache()
+        self.model = model
+        self.batch_size = batch_size
+        self._stats_lock = threading.Lock()
+        self.stats = {"requested": 0, "cache_hits": 0, "embedded": 0, "api_calls": 0}
+
+    def embed(self, text: Optional[str]) -> Optional[list[float]]:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: list[Optional[str]]) -> list[Optional[list[float]]]:
+        """Embed texts in order. Blank/None inputs map to None."""
+        backend_name = getattr(self.backend, "name", type(self.backend).__name__)
+        keys = [content_key(t, self.model, backend_name) if (t or "").strip() else None for t in texts]
+        wanted = {k: t for k, t in zip(keys, texts) if k is not None}
+
+        vectors = self.cache.get_many(list(wanted))
+        misses = [k for k in wanted if k not in vectors]
+
+        calls = 0
+        fresh: dict[str, list[float]] = {}
+        for i in range(0, len(misses), self.batch_size):
+            chunk = misses[i:i + self.batch_size]
+            embedded = self.backend.embed_batch([wanted[k] for k in chunk], self.model)
+            calls += 1
+            fresh.update(zip(chunk, embedded))
+        if fresh:
+            self.cache.put_many(fresh)
+            vectors.update(fresh)
+
+        with self._stats_lock:
+            self.stats["requested"] += len(wanted)
+            self.stats["cache_hits"] += len(wanted) - len(misses)
+            self.stats["embedded"] += len(misses)
+            self.stats["api_calls"] += calls
+
+        return [vectors[k] if k is not None else None for k in keys]
+
+    def as_langchain(self):
+        """LangChain ``Embeddings`` adapter so vector-store loaders share the cache."""
+        from langchain_core.embeddings import Embeddings
+
+        service = self
+
+        class _ServiceEmbeddings(Embeddings):
+            def embed_documents(self, texts: list[str]) -> list[list[float]]:
+                return service.embed_many(texts)
+
+            def embed_query(self, text: str) -> list[float]:
+                return service.embed(text)
+
+        return _ServiceEmbeddings()
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide service configured from the environment."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                backend_name = os.getenv("EMBEDDING_BACKEND", "openai").lower()
+                backend = StubBackend() if backend_name == "stub" else OpenAIBackend()
+                cache_path = os.getenv("EMBEDDING_CACHE_PATH", str(_DEFAULT_CACHE_PATH))
+                _service = EmbeddingService(
+                    backend=backend,
+                    cache=EmbeddingCache(Path(cache_path) if cache_path else None),
+                    batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "256")),
+                )
+    return _service
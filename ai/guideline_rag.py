@@ -4,7 +4,6 @@ import os, json
 import re
 from typing import List
 from supabase import create_client
-from langchain_openai.embeddings import OpenAIEmbeddings
 from langchain_openai import ChatOpenAI
 from langchain_classic.chains import ConversationalRetrievalChain
 from langchain_core.prompts import PromptTemplate
@@ -15,12 +14,13 @@ from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from pathlib import Path
 from dotenv import load_dotenv
 from utils.performance_monitor import monitor
+from ai.embedding_service import get_embedding_service
 
 load_dotenv(Path(__file__).resolve().parents[0] / ".env")
 
 # 1) Custom retriever using direct Supabase RPC call (bypasses broken SupabaseVectorStore)
 _supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
-_embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+_embeddings = get_embedding_service()  # batched + content-addressed cache
 
 
 class DirectSupabaseRetriever(BaseRetriever):
@@ -33,7 +33,7 @@ class DirectSupabaseRetriever(BaseRetriever):
     ) -> List[Document]:
         """Retrieve documents using direct Supabase RPC call."""
         # Generate embedding for query
-        query_embedding = _embeddings.embed_query(query)
+        query_embedding = _embeddings.embed(query)
 
         # Call the match_guidelines function directly via RPC
         try:
@@ -12,19 +12,23 @@ from langchain_community.document_loaders import (
     TextLoader,
 )
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai.embeddings import OpenAIEmbeddings
 from langchain_community.vectorstores import SupabaseVectorStore
 from dotenv import load_dotenv
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 load_dotenv(PROJECT_ROOT / ".env")
 
+import sys
+sys.path.insert(0, str(PROJECT_ROOT))
+from ai.embedding_service import get_embedding_service
+
 # after load_dotenv()
 supabase_url = os.getenv("SUPABASE_URL")
 supabase_key = os.getenv("SUPABASE_KEY")
 supabase_client = create_client(supabase_url, supabase_key)
 
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+# Cached service: re-ingesting unchanged chunks costs no embedding calls
+embeddings = get_embedding_service().as_langchain()
 splitter = RecursiveCharacterTextSplitter(
     chunk_size=800, chunk_overlap=100
 )
@@ -8,14 +8,37 @@ Provides:
 
 The key insight: if PyMuPDF extracts very little text from a PDF,
 it's likely a scanned document that needs OCR.
+
+Large PDFs (OCR_SHARD_MIN_PAGES+ pages) use page-sharded extraction: native
+text is pulled across a long-lived process pool (once a document is big
+enough to be worth splitting), only the pages below the text-density
+threshold go to Textract (concurrently), and pages are reassembled in order
+with per-page timing and cost.
 """
 
+import atexit
+import multiprocessing
 import os
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from typing import Optional, Tuple
 from pathlib import Path
 
 
+@dataclass
+class PageResult:
+    """Text and accounting for one page."""
+    page_number: int  # 1-based
+    text: str
+    method: str  # "pymupdf", "textract_detect", "failed", "ocr_unavailable"
+    confidence: float = 1.0
+    seconds: float = 0.0
+    cost: float = 0.0
+
+
 @dataclass
 class TextExtractionResult:
     """Result of text extraction with OCR metadata."""
@@ -26,11 +49,26 @@ class TextExtractionResult:
     ocr_confidence: Optional[float] = None  # Average OCR confidence
     pages_ocrd: int = 0  # Number of pages that required OCR
     extraction_cost: float = 0.0  # Cost of extraction
+    pages: list[PageResult] = field(default_factory=list)  # Page-sharded mode only
+    elapsed: float = 0.0  # Wall-clock seconds (page-sharded mode only)
 
 
 # Threshold: if average chars per page is below this, consider it scanned
 MIN_CHARS_PER_PAGE = 100
 
+# Cost: $0.0015 per page for detect_document_text
+TEXTRACT_DETECT_COST_PER_PAGE = 0.0015
+
+# Page-sharded extraction for large documents
+SHARD_MIN_PAGES = int(os.getenv("OCR_SHARD_MIN_PAGES", "20"))
+TEXT_WORKERS = int(os.getenv("OCR_TEXT_WORKERS", str(min(4, os.cpu_count() or 1))))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "8"))
+# Native text is only sharded across processes when each worker gets at least this many pages
+TEXT_PAGES_PER_WORKER = int(os.getenv("OCR_TEXT_PAGES_PER_WORKER", "100"))
+
+_text_pool: Optional[ProcessPoolExecutor] = None
+_text_pool_lock = threading.Lock()
+
 
 def is_pdf_scanned(file_path: str, sample_pages: int = 3) -> Tuple[bool, int, int]:
     """
@@ -88,6 +126,9 @@ def extract_text_with_ocr_fallback(
         force_ocr: If True, skip PyMuPDF and go straight to OCR
         max_pages: Maximum pages to process (None = all)
 
+    Documents with OCR_SHARD_MIN_PAGES or more pages are handed to
+    extract_text_page_sharded (per-page OCR decision, parallel).
+
     Returns:
         TextExtractionResult with text and metadata
     """
@@ -97,6 +138,10 @@ def extract_text_with_ocr_fallback(
     total_pages = len(doc)
     pages_to_process = min(max_pages, total_pages) if max_pages else total_pages
 
+    if pages_to_process >= SHARD_MIN_PAGES:
+        doc.close()
+        return extract_text_page_sharded(file_path, force_ocr=force_ocr, max_pages=max_pages)
+
     if not force_ocr:
         # Try PyMuPDF first
         text_parts = []
@@ -211,8 +256,7 @@ def _extract_with_textract_ocr(
         # Calculate average confidence
         avg_confidence = (total_confidence / confidence_count / 100) if confidence_count > 0 else 0.0
 
-        # Cost: $0.0015 per page for detect_document_text
-        cost = len(images) * 0.0015
+        cost = len(images) * TEXTRACT_DETECT_COST_PER_PAGE
 
         return TextExtractionResult(
             text="\n\n".join(text_parts),
@@ -244,6 +288,233 @@ def _extract_with_textract_ocr(
         )
 
 
+# ─────────────────────────────────────────────────────────────
+# Page-sharded extraction
+# ─────────────────────────────────────────────────────────────
+
+def _native_text_range(file_path: str, start: int, stop: int) -> list[tuple[int, str, float]]:
+    """PyMuPDF text for pages [start, stop) -> [(page_number, text, seconds)].
+
+    Top-level so it can run in a worker process; each worker opens its own
+    document handle (PyMuPDF objects aren't shareable across processes/threads).
+    """
+    import fitz
+
+    out = []
+    doc = fitz.open(file_path)
+    try:
+        for i in range(start, stop):
+            t0 = time.perf_counter()
+            page_text = doc[i].get_text()
+            out.append((i + 1, page_text, time.perf_counter() - t0))
+    finally:
+        doc.close()
+    return out
+
+
+def _warm_text_worker() -> None:
+    import fitz  # noqa: F401  (pay the import once per worker, not per document)
+
+
+def _get_text_pool() -> ProcessPoolExecutor:
+    global _text_pool
+    with _text_pool_lock:
+        if _text_pool is None:
+            # spawn, not fork: callers (pipeline stages, API workers) are multi-threaded
+            _text_pool = ProcessPoolExecutor(
+                max_workers=TEXT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_text_worker,
+            )
+        return _text_pool
+
+
+def _discard_text_pool(broken: ProcessPoolExecutor) -> None:
+    global _text_pool
+    with _text_pool_lock:
+        if _text_pool is broken:
+            _text_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _shutdown_text_pool() -> None:
+    global _text_pool
+    with _text_pool_lock:
+        pool, _text_pool = _text_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(_shutdown_text_pool)
+
+
+def _native_text_pages(file_path: str, page_count: int, workers: int) -> list[tuple[int, str, float]]:
+    """
+    Native text for the first page_count pages, sharded across the long-lived
+    text pool. PyMuPDF reads a text page in milliseconds, so documents are
+    only split once each worker gets OCR_TEXT_PAGES_PER_WORKER pages; smaller
+    ones are read in-process.
+    """
+    workers = max(1, min(workers, TEXT_WORKERS, page_count // TEXT_PAGES_PER_WORKER or 1))
+    if workers == 1:
+        return _native_text_range(file_path, 0, page_count)
+
+    step = -(-page_count // workers)  # ceil
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    pool = _get_text_pool()
+    try:
+        shards = list(pool.map(_native_text_range, [file_path] * len(ranges), *zip(*ranges)))
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge page): rebuild the pool next time, read in-process now
+        _discard_text_pool(pool)
+        return _native_text_range(file_path, 0, page_count)
+    return [page for shard in shards for page in shard]
+
+
+def _ocr_page(client, file_path: str, page_number: int) -> PageResult:
+    """Textract detect_document_text for one page."""
+    from pdf2image import convert_from_path
+    import io
+
+    t0 = time.perf_counter()
+    try:
+        img = convert_from_path(file_path, dpi=200, first_page=page_number, last_page=page_number)[0]
+        img_buffer = io.BytesIO()
+        img.save(img_buffer, format='PNG')
+
+        response = client.detect_document_text(Document={'Bytes': img_buffer.getvalue()})
+
+        lines, confidences = [], []
+        for block in response.get('Blocks', []):
+            if block['BlockType'] == 'LINE':
+                lines.append(block.get('Text', ''))
+                if 'Confidence' in block:
+                    confidences.append(block['Confidence'])
+        return PageResult(
+            page_number=page_number,
+            text='\n'.join(lines),
+            method="textract_detect",
+            confidence=(sum(confidences) / len(confidences) / 100) if confidences else 0.0,
+            seconds=time.perf_counter() - t0,
+            cost=TEXTRACT_DETECT_COST_PER_PAGE,
+        )
+    except Exception as e:
+        print(f"[ocr_utils] OCR failed for page {page_number}: {e}")
+        return PageResult(
+            page_number=page_number,
+            text="[OCR FAILED]",
+            method="failed",
+            confidence=0.0,
+            seconds=time.perf_counter() - t0,
+        )
+
+
+def extract_text_page_sharded(
+    file_path: str,
+    force_ocr: bool = False,
+    max_pages: Optional[int] = None,
+    text_workers: Optional[int] = None,
+    ocr_workers: Optional[int] = None,
+) -> TextExtractionResult:
+    """
+    Extract text page by page, in parallel.
+
+    1. Native text for every page across a process pool (OCR_TEXT_WORKERS)
+    2. Pages under MIN_CHARS_PER_PAGE (all pages if force_ocr) go to
+       Textract concurrently (OCR_WORKERS); text-rich pages are never OCR'd.
+       Without Textract they stay "ocr_unavailable" with confidence 0
+    3. Pages are reassembled in order; each PageResult carries its own
+       method, confidence, time and cost
+
+    Args:
+        file_path: Path to PDF file
+        force_ocr: OCR every page regardless of native text
+        max_pages: Maximum pages to process (None = all)
+        text_workers: Processes for native text extraction
+        ocr_workers: Concurrent Textract calls
+
+    Returns:
+        TextExtractionResult with per-page results in .pages
+    """
+    import fitz
+
+    started = time.perf_counter()
+    doc = fitz.open(file_path)
+    total_pages = len(doc)
+    doc.close()
+    pages_to_process = min(max_pages, total_pages) if max_pages else total_pages
+
+    native = _native_text_pages(file_path, pages_to_process, text_workers or TEXT_WORKERS)
+    pages = {
+        num: PageResult(page_number=num, text=text, method="pymupdf", seconds=secs)
+        for num, text, secs in native
+    }
+    sparse = [num for num, page in pages.items() if force_ocr or len(page.text.strip()) < MIN_CHARS_PER_PAGE]
+
+    if sparse:
+        if not os.getenv("AWS_ACCESS_KEY_ID") and not os.getenv("AWS_DEFAULT_REGION"):
+            print(f"[ocr_utils] Warning: AWS credentials not configured, {len(sparse)} sparse page(s) not OCR'd")
+        else:
+            try:
+                import boto3
+                from dotenv import load_dotenv
+                load_dotenv()
+
+                # boto3 clients are thread-safe; one client for all page workers
+                client = boto3.client(
+                    'textract',
+                    region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
+                )
+                print(f"[ocr_utils] OCR for {len(sparse)}/{pages_to_process} low-text pages")
+                with ThreadPoolExecutor(max_workers=max(1, min(ocr_workers or OCR_WORKERS, len(sparse)))) as pool:
+                    for ocr in pool.map(lambda n: _ocr_page(client, file_path, n), sparse):
+                        ocr.seconds += pages[ocr.page_number].seconds
+                        pages[ocr.page_number] = ocr
+            except ImportError as e:
+                print(f"[ocr_utils] Missing dependency: {e}")
+
+    # Sparse pages left untouched (no credentials / boto3) keep their native
+    # text but must not count as confident native extraction
+    for num in sparse:
+        if pages[num].method == "pymupdf":
+            pages[num].method, pages[num].confidence = "ocr_unavailable", 0.0
+
+    ordered = [pages[num] for num in sorted(pages)]
+    ocrd = [p for p in ordered if p.method in ("textract_detect", "failed")]
+    ocr_ok = [p for p in ocrd if p.method == "textract_detect"]
+
+    if not sparse:
+        method, confidence = "pymupdf", 1.0
+    elif len(sparse) == len(ordered):
+        method = "textract_detect" if ocr_ok else "failed"
+        confidence = sum(p.confidence for p in ocr_ok) / len(ocr_ok) if ocr_ok else 0.0
+    else:
+        method = "mixed"  # native text + Textract for sparse pages
+        confidence = sum(p.confidence for p in ordered) / len(ordered)
+
+    return TextExtractionResult(
+        text="\n\n".join(f"--- Page {p.page_number} ---\n{p.text}" for p in ordered),
+        page_count=total_pages,
+        is_scanned=method in ("textract_detect", "failed"),  # every page needed OCR; "mixed" is not scanned
+        ocr_method=method,
+        ocr_confidence=confidence,
+        pages_ocrd=len(ocrd),
+        extraction_cost=sum(p.cost for p in ordered),
+        pages=ordered,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def timing_report(result: TextExtractionResult, top: int = 3) -> str:
+    """One-line summary of a page-sharded extraction, slowest pages first."""
+    if not result.pages:
+        return f"{result.page_count} pages via {result.ocr_method}"
+    slowest = sorted(result.pages, key=lambda p: -p.seconds)[:top]
+    parts = " ".join(f"p{p.page_number}={p.seconds:.2f}s" for p in slowest)
+    return (f"{len(result.pages)} pages, {result.pages_ocrd} OCR'd, ${result.extraction_cost:.4f}, "
+            f"wall={result.elapsed:.2f}s slowest: {parts}")
+
+
 def adjust_confidence_for_ocr(
     base_confidence: float,
     is_scanned: bool,
@@ -94,6 +94,30 @@ class TextractResult:
             ],
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "TextractResult":
+        """Inverse of to_dict (raw_text included when present)."""
+        def _field(d: dict, field_type: str) -> ExtractedField:
+            return ExtractedField(
+                field_name=d["field_name"],
+                value=d.get("value", d.get("is_selected")),  # to_dict omits checkbox value
+                confidence=d.get("confidence", 0.0),
+                page=d.get("page", 1),
+                bbox=BoundingBox(**d["bbox"]),
+                field_type=d.get("field_type", field_type),
+                is_selected=d.get("is_selected"),
+                source_text=d.get("source_text"),
+            )
+
+        return cls(
+            document_id=data.get("document_id"),
+            pages=data.get("pages", 0),
+            fields=[_field(f, "text") for f in data.get("fields", [])],
+            key_value_pairs=data.get("key_value_pairs", {}),
+            checkboxes=[_field(c, "checkbox") for c in data.get("checkboxes", [])],
+            raw_text=data.get("raw_text", ""),
+        )
+
 
 def get_textract_client():
     """Get Textract client. Uses default AWS credential chain."""
@@ -118,9 +142,31 @@ def extract_from_pdf(file_path: str, max_pages: int = 10) -> TextractResult:
         file_path: Path to the PDF file
         max_pages: Maximum number of pages to process
 
+    Results are cached by file content (core.extraction_cache), so
+    re-extracting identical bytes doesn't call Textract again.
+
     Returns:
         TextractResult with all extracted data and bounding boxes
     """
+    from core import extraction_cache
+
+    try:
+        sha = extraction_cache.file_sha256(file_path) if extraction_cache.enabled() else None
+    except OSError:
+        sha = None
+
+    def _compute() -> dict:
+        result = _analyze_pdf(file_path, max_pages)
+        return {**result.to_dict(), "raw_text": result.raw_text}
+
+    payload, _hit = extraction_cache.cached(
+        sha, f"textract_forms:p{max_pages}", "analyze_document:FORMS", extraction_cache.NO_SCHEMA, _compute,
+    )
+    return TextractResult.from_dict(payload)
+
+
+def _analyze_pdf(file_path: str, max_pages: int) -> TextractResult:
+    """Run Textract AnalyzeDocument (FORMS) page by page; no caching."""
     from pdf2image import convert_from_path
     import io
 
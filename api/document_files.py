@@ -0,0 +1,349 @@
+"""
+Document file serving: /api/documents/{id}/file and per-page PDFs.
+
+The PDF viewer requests a document again and again while underwriters page
+through large loss runs and policies. Serving it:
+
+  - document id -> file location (doc_metadata file_path / storage_key) is
+    cached in-process, so repeat hits skip the documents query. Entries
+    expire after DOCUMENT_FILE_CACHE_SECONDS and are dropped early when the
+    file has gone.
+  - Responses carry ETag (size + mtime), Last-Modified, Cache-Control and
+    Accept-Ranges. A matching If-None-Match answers 304 with no body.
+  - A single byte range (Range: bytes=a-b, honouring If-Range) answers
+    206 with just those bytes. pdf.js then loads the trailer, the xref and
+    the objects of the pages it shows, not the whole file.
+  - page_file() splits a PDF into single-page PDFs in one pass, the first
+    time any page is asked for. The pages are kept on disk under the
+    document's ETag, so page N of a 300-page document is a small file of
+    its own.
+
+Documents kept only in storage (no local file_path) are served from
+core.storage's download cache.
+
+Environment:
+  DOCUMENT_FILE_CACHE_SECONDS  id -> location cache lifetime (default: 300)
+  DOCUMENT_FILE_MAX_AGE        Cache-Control max-age for document bytes (default: 3600)
+  DOCUMENT_PAGE_CACHE_DIR      split pages (default: <system temp>/document_pages)
+  DOCUMENT_PAGE_CACHE_MB       split page cache size (default: 1024)
+"""
+
+import email.utils
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from urllib.parse import quote
+
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+LOCATION_TTL_SECONDS = float(os.getenv("DOCUMENT_FILE_CACHE_SECONDS", "300"))
+MAX_AGE = int(os.getenv("DOCUMENT_FILE_MAX_AGE", "3600"))
+PAGE_CACHE_DIR = Path(os.getenv("DOCUMENT_PAGE_CACHE_DIR") or Path(tempfile.gettempdir()) / "document_pages")
+PAGE_CACHE_BYTES = int(os.getenv("DOCUMENT_PAGE_CACHE_MB", "1024")) * 1024 * 1024
+
+_LOCATION_CACHE_MAX = 4096
+_STREAM_CHUNK = 256 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# ─────────────────────────────────────────────────────────────
+# id -> location cache
+# ─────────────────────────────────────────────────────────────
+
+_locations: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_locations_lock = threading.Lock()
+
+
+def forget(document_id: str) -> None:
+    """Drop a document's cached location (after its file moved or was deleted)."""
+    with _locations_lock:
+        _locations.pop(str(document_id), None)
+
+
+def _cached_location(document_id: str) -> Optional[dict]:
+    with _locations_lock:
+        hit = _locations.get(document_id)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] > LOCATION_TTL_SECONDS:
+            del _locations[document_id]
+            return None
+        _locations.move_to_end(document_id)
+        return hit[1]
+
+
+def _remember(document_id: str, location: dict) -> None:
+    with _locations_lock:
+        _locations[document_id] = (time.monotonic(), location)
+        _locations.move_to_end(document_id)
+        while len(_locations) > _LOCATION_CACHE_MAX:
+            _locations.popitem(last=False)
+
+
+def _local_path(location: dict) -> Optional[str]:
+    file_path = location.get("file_path")
+    if file_path and os.path.exists(file_path):
+        return file_path
+    storage_key = location.get("storage_key")
+    if storage_key:
+        from core import storage
+        if storage.is_configured():
+            try:
+                return str(storage.cached_document(storage_key))
+            except Exception as e:
+                print(f"[document_files] storage fetch failed for {storage_key}: {e}")
+    return None
+
+
+def resolve(document_id: str, load: Callable[[str], Optional[dict]]) -> tuple[str, str, str]:
+    """
+    (local path, filename, media type) of a document's file.
+
+    The media type comes from the document's filename: storage-only
+    documents resolve to a download-cache entry with no useful extension.
+
+    ``load(document_id)`` returns the documents row (filename, doc_metadata)
+    or None; it only runs on a cache miss, or when the cached location no
+    longer has a file.
+    """
+    document_id = str(document_id)
+    location = _cached_location(document_id)
+    if location is not None:
+        path = _local_path(location)
+        if path:
+            return path, location["filename"], location["media_type"]
+        forget(document_id)
+
+    row = load(document_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Document not found")
+    metadata = row["doc_metadata"] if isinstance(row["doc_metadata"], dict) else {}
+    media_type = media_type_for(row["filename"] or "")
+    if media_type == "application/octet-stream" and metadata.get("file_path"):
+        media_type = media_type_for(metadata["file_path"])
+    location = {
+        "filename": row["filename"],
+        "file_path": metadata.get("file_path"),
+        "storage_key": metadata.get("storage_key"),
+        "media_type": media_type,
+    }
+    path = _local_path(location)
+    if not path:
+        raise HTTPException(status_code=404, detail="Document file not found on disk")
+    _remember(document_id, location)
+    return path, location["filename"], location["media_type"]
+
+
+# ─────────────────────────────────────────────────────────────
+# Responses
+# ─────────────────────────────────────────────────────────────
+
+def media_type_for(file_path: str) -> str:
+    """Content type from a file name's extension."""
+    lower = file_path.lower()
+    if lower.endswith('.pdf'):
+        return "application/pdf"
+    elif lower.endswith('.png'):
+        return "image/png"
+    elif lower.endswith('.jpg') or lower.endswith('.jpeg'):
+        return "image/jpeg"
+    return "application/octet-stream"
+
+
+def _etag(st: os.stat_result) -> str:
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    (start, end) inclusive for a single satisfiable byte range; None to serve
+    the whole file (absent, malformed or multi-range). Raises 416 for an
+    unsatisfiable range.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    first, last = match.group(1), match.group(2)
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            start, end = size, size - 1
+        else:
+            start, end = max(0, size - length), size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _iter_file(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(_STREAM_CHUNK, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(request_headers, path: str, filename: str, media_type: Optional[str] = None) -> Response:
+    """
+    Serve ``path`` honouring If-None-Match, Range and If-Range.
+
+    ``request_headers`` is the incoming request's headers mapping.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Document file not found on disk")
+
+    etag = _etag(st)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": email.utils.formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": f"private, max-age={MAX_AGE}",
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = _content_disposition(filename)
+    media_type = media_type or media_type_for(path)
+    size = st.st_size
+
+    byte_range = None
+    range_header = request_headers.get("range")
+    if range_header:
+        if_range = request_headers.get("if-range")
+        if not if_range or if_range.strip() == etag:
+            byte_range = _parse_range(range_header, size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_iter_file(path, 0, size - 1), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(_iter_file(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+
+# ─────────────────────────────────────────────────────────────
+# Per-page PDFs
+# ─────────────────────────────────────────────────────────────
+
+_split_locks: dict[str, threading.Lock] = {}
+_split_locks_guard = threading.Lock()
+_page_written = 0
+
+
+def _split_lock(name: str) -> threading.Lock:
+    with _split_locks_guard:
+        return _split_locks.setdefault(name, threading.Lock())
+
+
+def page_file(path: str, page_number: int) -> Path:
+    """
+    Single-page PDF for page ``page_number`` (1-based) of the PDF at ``path``.
+
+    The first request for any page splits the whole document, so later
+    pages are already on disk. Raises 404 for a page that does not exist.
+    """
+    global _page_written
+    st = os.stat(path)
+    name = hashlib.sha256(f"{os.path.abspath(path)}\n{_etag(st)}".encode()).hexdigest()
+    doc_dir = PAGE_CACHE_DIR / name[:2] / name
+    count_file = doc_dir / "pages"
+
+    with _split_lock(name):
+        if not count_file.exists():
+            from pypdf import PdfReader, PdfWriter
+
+            PAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_dir = Path(tempfile.mkdtemp(dir=PAGE_CACHE_DIR))
+            try:
+                reader = PdfReader(path)
+                written = 0
+                for i, page in enumerate(reader.pages, start=1):
+                    writer = PdfWriter()
+                    writer.add_page(page)
+                    with open(tmp_dir / f"{i}.pdf", "wb") as f:
+                        writer.write(f)
+                    written += (tmp_dir / f"{i}.pdf").stat().st_size
+                (tmp_dir / "pages").write_text(str(len(reader.pages)))
+                doc_dir.parent.mkdir(parents=True, exist_ok=True)
+                shutil.rmtree(doc_dir, ignore_errors=True)
+                os.replace(tmp_dir, doc_dir)
+            except BaseException:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+            _page_written += written
+            if _page_written > PAGE_CACHE_BYTES // 10:
+                _page_written = 0
+                prune_pages()
+        else:
+            os.utime(count_file)
+
+    pages = int(count_file.read_text())
+    if not 1 <= page_number <= pages:
+        raise HTTPException(status_code=404, detail=f"Page {page_number} not found (document has {pages} pages)")
+    return doc_dir / f"{page_number}.pdf"
+
+
+def prune_pages(max_bytes: Optional[int] = None) -> int:
+    """Delete the least recently used split documents until the page cache fits."""
+    max_bytes = PAGE_CACHE_BYTES if max_bytes is None else max_bytes
+    docs = []
+    total = 0
+    for count_file in PAGE_CACHE_DIR.glob("*/*/pages"):
+        doc_dir = count_file.parent
+        try:
+            size = sum(p.stat().st_size for p in doc_dir.iterdir())
+            docs.append((count_file.stat().st_mtime, size, doc_dir))
+        except OSError:
+            continue
+        total += size
+
+    removed = 0
+    docs.sort()
+    for _, size, doc_dir in docs:
+        if total <= max_bytes:
+            break
+        shutil.rmtree(doc_dir, ignore_errors=True)
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,452 @@
+"""
+Hot read endpoints: shared SQL plus async (psycopg 3) handlers.
+
+The submissions list/detail, workflow queue, dashboard and stats endpoints are
+the most-hit reads in the app. Their SQL and response shaping live here so the
+sync handlers in api/main.py and the async handlers on ``router`` stay
+identical. main.py includes ``router`` ahead of its own routes when
+core.db_async is enabled; otherwise the sync handlers serve these paths.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from core import db_async
+
+router = APIRouter()
+
+
+# ─────────────────────────────────────────────────────────────
+# SQL
+# ─────────────────────────────────────────────────────────────
+
+LIST_SUBMISSIONS_SQL = """
+    SELECT
+        s.id,
+        s.applicant_name,
+        s.naics_primary_title,
+        s.annual_revenue,
+        s.submission_status as status,
+        s.created_at,
+        s.decision_tag,
+        COALESCE(bound.is_bound, false) as has_bound_quote,
+        bound.quote_name as bound_quote_name,
+        sw.current_stage as workflow_stage,
+        s.assigned_uw_name as assigned_to_name,
+        s.assigned_at,
+        s.assigned_by
+    FROM submissions s
+    LEFT JOIN (
+        SELECT DISTINCT ON (submission_id)
+            submission_id, is_bound, quote_name
+        FROM insurance_towers
+        WHERE is_bound = true
+        ORDER BY submission_id, created_at DESC
+    ) bound ON s.id = bound.submission_id
+    LEFT JOIN submission_workflow sw ON s.id = sw.submission_id
+    ORDER BY s.created_at DESC
+    LIMIT 100
+"""
+
+GET_SUBMISSION_SQL = """
+    SELECT s.id, s.applicant_name, s.business_summary, s.annual_revenue,
+           s.naics_primary_title, s.naics_primary_code,
+           s.naics_secondary_title, s.naics_secondary_code,
+           s.industry_tags,
+           s.submission_status, s.submission_outcome, s.outcome_reason,
+           s.bullet_point_summary, s.nist_controls_summary,
+           s.hazard_override, s.control_overrides, s.default_retroactive_date,
+           s.ai_recommendation, s.ai_guideline_citations,
+           s.decision_tag, s.decision_reason, s.decided_at, s.decided_by,
+           s.cyber_exposures, s.nist_controls,
+           s.website, s.broker_email, s.broker_employment_id,
+           s.effective_date, s.expiration_date,
+           s.opportunity_notes,
+           s.created_at,
+           s.account_id,
+           s.assigned_uw_name, s.assigned_at, s.assigned_by,
+           e.org_id as broker_org_id,
+           o.name as broker_company,
+           CONCAT(p.first_name, ' ', p.last_name) as broker_name,
+           e.email as broker_contact_email,
+           e.phone as broker_phone,
+           -- Prefer submission address, fall back to account address
+           COALESCE(s.address_street, a.address_street) as address_street,
+           a.address_street2,
+           COALESCE(s.address_city, a.address_city) as address_city,
+           COALESCE(s.address_state, a.address_state) as address_state,
+           COALESCE(s.address_zip, a.address_zip) as address_zip
+    FROM submissions s
+    LEFT JOIN brkr_employments e ON e.employment_id::text = s.broker_employment_id
+    LEFT JOIN brkr_organizations o ON o.org_id = e.org_id
+    LEFT JOIN brkr_people p ON p.person_id = e.person_id
+    LEFT JOIN accounts a ON a.id = s.account_id
+    WHERE s.id = %s
+"""
+
+STATS_SUMMARY_SQL = """
+    SELECT
+        submission_status,
+        submission_outcome,
+        COUNT(*) as count
+    FROM submissions
+    GROUP BY submission_status, submission_outcome
+"""
+
+UPCOMING_RENEWALS_SQL = """
+    SELECT
+        s.id,
+        s.applicant_name,
+        s.expiration_date,
+        (s.expiration_date - CURRENT_DATE) as days_until_expiry,
+        t.sold_premium
+    FROM submissions s
+    LEFT JOIN insurance_towers t ON t.submission_id = s.id AND t.is_bound = true
+    WHERE s.expiration_date IS NOT NULL
+    AND s.expiration_date >= CURRENT_DATE
+    AND s.expiration_date <= CURRENT_DATE + %s
+    AND t.is_bound = true
+    ORDER BY s.expiration_date ASC
+"""
+
+RENEWALS_NOT_RECEIVED_SQL = """
+    SELECT
+        s.id,
+        s.applicant_name,
+        s.effective_date,
+        s.outcome_reason
+    FROM submissions s
+    WHERE s.submission_status = 'renewal_not_received'
+    OR (s.submission_status = 'renewal_expected'
+        AND s.effective_date < CURRENT_DATE)
+    ORDER BY s.effective_date DESC
+    LIMIT 50
+"""
+
+RETENTION_MONTHLY_SQL = """
+    SELECT
+        DATE_TRUNC('month', s.date_received) as month,
+        COUNT(*) FILTER (WHERE s.submission_status NOT IN ('renewal_expected')) as renewals_received,
+        COUNT(*) FILTER (WHERE s.submission_outcome = 'bound') as renewals_bound,
+        COUNT(*) FILTER (WHERE s.submission_outcome = 'lost') as renewals_lost,
+        COUNT(*) FILTER (WHERE s.submission_status = 'renewal_not_received') as renewals_not_received
+    FROM submissions s
+    WHERE s.renewal_type = 'renewal'
+    AND s.date_received IS NOT NULL
+    GROUP BY DATE_TRUNC('month', s.date_received)
+    ORDER BY month DESC
+    LIMIT 12
+"""
+
+RETENTION_RATE_CHANGES_SQL = """
+    SELECT
+        s.id,
+        s.applicant_name,
+        bound_opt.sold_premium as current_premium,
+        prior_opt.sold_premium as prior_premium
+    FROM submissions s
+    JOIN insurance_towers bound_opt ON bound_opt.submission_id = s.id AND bound_opt.is_bound = TRUE
+    JOIN submissions prior ON prior.id = s.prior_submission_id
+    JOIN insurance_towers prior_opt ON prior_opt.submission_id = prior.id AND prior_opt.is_bound = TRUE
+    WHERE s.renewal_type = 'renewal'
+    AND bound_opt.sold_premium IS NOT NULL
+    AND prior_opt.sold_premium IS NOT NULL
+    ORDER BY s.date_received DESC
+    LIMIT 20
+"""
+
+SUBMISSION_STATUS_COUNTS_SQL = """
+    SELECT submission_status, COUNT(*)::int
+    FROM submissions
+    WHERE COALESCE(date_received, created_at) >= (now() - (%s || ' days')::interval)
+    GROUP BY submission_status
+"""
+
+QUEUE_NEEDS_VOTES_SQL = """
+    SELECT
+        nv.submission_id,
+        nv.applicant_name,
+        nv.submitted_at,
+        nv.current_stage,
+        nv.stage_entered_at,
+        nv.deadline,
+        nv.hours_remaining,
+        nv.votes_cast,
+        nv.votes_needed,
+        nv.required_votes,
+        s.opportunity_notes,
+        s.naics_primary_title,
+        s.annual_revenue,
+        s.broker_email,
+        s.bullet_point_summary,
+        o.name as broker_company,
+        CONCAT(p.first_name, ' ', p.last_name) as broker_person
+    FROM v_needs_votes nv
+    JOIN submissions s ON s.id = nv.submission_id
+    LEFT JOIN brkr_employments e ON (
+        e.employment_id::text = s.broker_employment_id
+        OR (s.broker_employment_id IS NULL AND e.email = s.broker_email)
+    )
+    LEFT JOIN brkr_organizations o ON o.org_id = e.org_id
+    LEFT JOIN brkr_people p ON p.person_id = e.person_id
+    ORDER BY nv.hours_remaining ASC
+"""
+
+QUEUE_READY_TO_WORK_SQL = """
+    SELECT
+        submission_id,
+        applicant_name,
+        submitted_at,
+        stage_entered_at,
+        hours_waiting
+    FROM v_ready_to_work
+    ORDER BY stage_entered_at ASC
+"""
+
+QUEUE_VOTE_TALLIES_SQL = """
+    SELECT submission_id, current_stage, vote, vote_count, voters
+    FROM v_vote_tally
+    WHERE submission_id = ANY(%s::uuid[])
+"""
+
+QUEUE_USER_VOTES_SQL = """
+    SELECT submission_id, stage, vote
+    FROM workflow_votes
+    WHERE user_name = %s
+"""
+
+QUEUE_COMMENTS_SQL = """
+    SELECT submission_id, user_name, comment, voted_at as created_at, vote
+    FROM workflow_votes
+    WHERE submission_id = ANY(%s::uuid[])
+      AND comment IS NOT NULL AND comment != ''
+    ORDER BY voted_at DESC
+"""
+
+
+def recent_submissions_query(search: str = None, status: str = None, outcome: str = None, limit: int = 50):
+    """Build the filtered recent-submissions query. Returns (sql, params)."""
+    where_clauses = ["TRUE"]
+    params = [limit]
+
+    if search:
+        where_clauses.append("LOWER(s.applicant_name) LIKE LOWER(%s)")
+        params.insert(0, f"%{search.strip()}%")
+    if status and status != "all":
+        where_clauses.append("s.submission_status = %s")
+        params.insert(-1, status)
+    if outcome and outcome != "all":
+        where_clauses.append("s.submission_outcome = %s")
+        params.insert(-1, outcome)
+
+    query = f"""
+        SELECT
+            s.id,
+            COALESCE(s.date_received, s.created_at)::date AS date_received,
+            s.applicant_name,
+            a.name AS account_name,
+            s.submission_status,
+            s.submission_outcome,
+            s.annual_revenue,
+            s.naics_primary_title
+        FROM submissions s
+        LEFT JOIN accounts a ON a.id = s.account_id
+        WHERE {" AND ".join(where_clauses)}
+        ORDER BY COALESCE(s.date_received, s.created_at) DESC
+        LIMIT %s
+    """
+    return query, params
+
+
+# ─────────────────────────────────────────────────────────────
+# Response shaping (shared by sync and async handlers)
+# ─────────────────────────────────────────────────────────────
+
+def build_stats_summary(rows: list[dict]) -> dict:
+    """Roll status/outcome counts up into the stats summary payload."""
+    # Build summary structure
+    summary = {}
+    for row in rows:
+        status = row["submission_status"] or "unknown"
+        outcome = row["submission_outcome"] or "pending"
+        count = row["count"]
+
+        if status not in summary:
+            summary[status] = {}
+        summary[status][outcome] = count
+
+    # Calculate totals
+    received = summary.get("received", {}).get("pending", 0)
+    pending_info = summary.get("pending_info", {}).get("pending", 0)
+
+    quoted = summary.get("quoted", {})
+    bound = quoted.get("bound", 0)
+    lost = quoted.get("lost", 0)
+    waiting = quoted.get("waiting_for_response", 0)
+
+    declined = summary.get("declined", {}).get("declined", 0)
+
+    return {
+        "total": received + pending_info + bound + lost + waiting + declined,
+        "in_progress": received + pending_info,
+        "quoted": bound + lost + waiting,
+        "declined": declined,
+        "breakdown": {
+            "received": received,
+            "pending_info": pending_info,
+            "waiting": waiting,
+            "bound": bound,
+            "lost": lost
+        },
+        "raw": summary
+    }
+
+
+def build_status_counts(rows: list[dict]) -> dict:
+    return {str(row["submission_status"] or "unknown"): row["count"] for row in rows}
+
+
+def attach_vote_tallies(needs_votes: list[dict], tallies: list[dict]) -> None:
+    """Group v_vote_tally rows by submission and attach as ``vote_tally``."""
+    tally_map = {}
+    for t in tallies:
+        sid = str(t['submission_id'])
+        if sid not in tally_map:
+            tally_map[sid] = {}
+        if t['vote']:
+            tally_map[sid][t['vote']] = {
+                'count': t['vote_count'],
+                'voters': t['voters']
+            }
+
+    for nv in needs_votes:
+        nv['vote_tally'] = tally_map.get(str(nv['submission_id']), {})
+
+
+def attach_user_votes(needs_votes: list[dict], votes: list[dict]) -> None:
+    """Mark which queue items the requesting user has already voted on."""
+    user_votes = {(str(v['submission_id']), v['stage']): v['vote'] for v in votes}
+
+    for nv in needs_votes:
+        key = (str(nv['submission_id']), nv['current_stage'])
+        nv['my_vote'] = user_votes.get(key)
+
+
+def attach_comments(needs_votes: list[dict], all_comments: list[dict]) -> None:
+    """Group vote comments by submission and attach as ``comments``."""
+    comment_map = {}
+    for c in all_comments:
+        sid = str(c['submission_id'])
+        if sid not in comment_map:
+            comment_map[sid] = []
+        comment_map[sid].append({
+            'user_name': c['user_name'],
+            'comment': c['comment'],
+            'created_at': c['created_at'].isoformat() if c['created_at'] else None,
+            'vote': c['vote']
+        })
+
+    for nv in needs_votes:
+        nv['comments'] = comment_map.get(str(nv['submission_id']), [])
+
+
+def build_workflow_queue(needs_votes: list[dict], ready_to_work: list[dict]) -> dict:
+    return {
+        "needs_votes": needs_votes,
+        "ready_to_work": ready_to_work,
+        "summary": {
+            "needs_votes_count": len(needs_votes),
+            "ready_to_work_count": len(ready_to_work)
+        }
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Async handlers
+# ─────────────────────────────────────────────────────────────
+
+@router.get("/api/submissions")
+async def list_submissions():
+    """List all submissions with bound status and workflow stage."""
+    return await db_async.fetch_all(LIST_SUBMISSIONS_SQL)
+
+
+@router.get("/api/submissions/{submission_id}")
+async def get_submission(submission_id: str):
+    """Get a single submission with full details."""
+    row = await db_async.fetch_one(GET_SUBMISSION_SQL, (submission_id,))
+    if not row:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return row
+
+
+@router.get("/api/stats/summary")
+async def get_stats_summary():
+    """Get submission status summary counts."""
+    return build_stats_summary(await db_async.fetch_all(STATS_SUMMARY_SQL))
+
+
+@router.get("/api/stats/upcoming-renewals")
+async def get_upcoming_renewals(days: int = 90):
+    """Get policies with upcoming renewals."""
+    return await db_async.fetch_all(UPCOMING_RENEWALS_SQL, (days,))
+
+
+@router.get("/api/stats/renewals-not-received")
+async def get_renewals_not_received():
+    """Get renewals that were expected but not received."""
+    return await db_async.fetch_all(RENEWALS_NOT_RECEIVED_SQL)
+
+
+@router.get("/api/stats/retention-metrics")
+async def get_retention_metrics():
+    """Get renewal retention metrics by month."""
+    async with db_async.get_async_conn() as conn:
+        cur = await conn.execute(RETENTION_MONTHLY_SQL)
+        monthly = await cur.fetchall()
+        cur = await conn.execute(RETENTION_RATE_CHANGES_SQL)
+        rate_changes = await cur.fetchall()
+    return {
+        "monthly": monthly,
+        "rate_changes": rate_changes
+    }
+
+
+@router.get("/api/dashboard/submission-status-counts")
+async def get_submission_status_counts(days: int = 30):
+    """Get submission status counts for the last N days."""
+    return build_status_counts(await db_async.fetch_all(SUBMISSION_STATUS_COUNTS_SQL, (days,)))
+
+
+@router.get("/api/dashboard/recent-submissions")
+async def get_recent_submissions(search: str = None, status: str = None, outcome: str = None, limit: int = 50):
+    """Get recent submissions with optional filters."""
+    query, params = recent_submissions_query(search, status, outcome, limit)
+    return await db_async.fetch_all(query, params)
+
+
+@router.get("/api/workflow/queue")
+async def get_workflow_queue(user_name: Optional[str] = None):
+    """Get the voting queue - items needing votes and ready to work."""
+    async with db_async.get_async_conn() as conn:
+        cur = await conn.execute(QUEUE_NEEDS_VOTES_SQL)
+        needs_votes = await cur.fetchall()
+
+        cur = await conn.execute(QUEUE_READY_TO_WORK_SQL)
+        ready_to_work = await cur.fetchall()
+
+        if needs_votes:
+            submission_ids = [str(n['submission_id']) for n in needs_votes]
+            cur = await conn.execute(QUEUE_VOTE_TALLIES_SQL, (submission_ids,))
+            attach_vote_tallies(needs_votes, await cur.fetchall())
+
+        if user_name:
+            cur = await conn.execute(QUEUE_USER_VOTES_SQL, (user_name,))
+            attach_user_votes(needs_votes, await cur.fetchall())
+
+        if needs_votes:
+            cur = await conn.execute(QUEUE_COMMENTS_SQL, (submission_ids,))
+            attach_comments(needs_votes, await cur.fetchall())
+
+    return build_workflow_queue(needs_votes, ready_to_work)
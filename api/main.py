@@ -2,7 +2,7 @@
 FastAPI backend for the React frontend.
 Exposes the existing database and business logic via REST API.
 """
-from fastapi import FastAPI, HTTPException, File, UploadFile
+from fastapi import FastAPI, HTTPException, File, UploadFile, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
@@ -18,6 +18,9 @@ import openai
 # Load environment variables from .env file
 load_dotenv()
 
+from core import db, db_async
+from api import hot_reads
+
 app = FastAPI(title="Underwriting Assistant API")
 
 # CORS for local development
@@ -29,6 +32,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Async (psycopg 3) handlers for the hot read endpoints. Registered before the
+# sync handlers below so they take precedence; without psycopg 3 (or with
+# ASYNC_DB=0) the sync handlers serve the same paths.
+if db_async.is_enabled():
+    app.include_router(hot_reads.router)
+
 
 # ─────────────────────────────────────────────────────────────
 # Startup Health Checks
@@ -50,7 +59,7 @@ def check_required_config():
         print("  - Set SUPABASE_URL and SUPABASE_SERVICE_ROLE in .env")
         print("  - See docs/guides/supabase-storage-setup.md for setup instructions")
     else:
-        print("\n[OK] Supabase Storage configured")
+        print(f"\n[OK] Document storage configured ({storage.backend_name()})")
         # Check bucket exists (read-only, no auto-create)
         bucket_name = os.getenv('STORAGE_BUCKET', 'documents')
         try:
@@ -75,12 +84,53 @@ def check_required_config():
     print("\n" + "=" * 60 + "\n")
 
 
+@app.on_event("startup")
+async def open_async_pool():
+    if db_async.is_enabled():
+        await db_async.open_pool()
+
+
+@app.on_event("shutdown")
+async def close_async_pool():
+    await db_async.close_pool()
+
+
+@app.on_event("startup")
+def start_pdf_render_pool():
+    """Spawn and warm the WeasyPrint workers before the first document request."""
+    from core import pdf_render
+    try:
+        pdf_render.start()
+    except Exception as e:
+        print(f"[WARNING] PDF render pool failed to start: {e}")
+
+
+@app.on_event("startup")
+def preload_document_templates():
+    """Compile the document templates before the first document request."""
+    from core import template_registry
+    template_registry.preload()
+
+
+@app.on_event("shutdown")
+def stop_pdf_render_pool():
+    from core import pdf_render
+    pdf_render.shutdown()
+
+
 def get_conn():
-    """Get database connection using existing DATABASE_URL."""
-    return psycopg2.connect(
-        os.environ.get("DATABASE_URL"),
-        cursor_factory=RealDictCursor
-    )
+    """Check a connection out of the shared pool (RealDictCursor by default).
+
+    Use as ``with get_conn() as conn:`` - commits on success, rolls back
+    on exception and returns the connection to the pool on exit.
+    """
+    return db.get_raw_conn(cursor_factory=RealDictCursor)
+
+
+def get_db():
+    """FastAPI dependency: one pooled connection for the whole request."""
+    with get_conn() as conn:
+        yield conn
 
 
 # ─────────────────────────────────────────────────────────────
@@ -180,33 +230,7 @@ def list_submissions():
     """List all submissions with bound status and workflow stage."""
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                SELECT
-                    s.id,
-                    s.applicant_name,
-                    s.naics_primary_title,
-                    s.annual_revenue,
-                    s.submission_status as status,
-                    s.created_at,
-                    s.decision_tag,
-                    COALESCE(bound.is_bound, false) as has_bound_quote,
-                    bound.quote_name as bound_quote_name,
-                    sw.current_stage as workflow_stage,
-                    s.assigned_uw_name as assigned_to_name,
-                    s.assigned_at,
-                    s.assigned_by
-                FROM submissions s
-                LEFT JOIN (
-                    SELECT DISTINCT ON (submission_id)
-                        submission_id, is_bound, quote_name
-                    FROM insurance_towers
-                    WHERE is_bound = true
-                    ORDER BY submission_id, created_at DESC
-                ) bound ON s.id = bound.submission_id
-                LEFT JOIN submission_workflow sw ON s.id = sw.submission_id
-                ORDER BY s.created_at DESC
-                LIMIT 100
-            """)
+            cur.execute(hot_reads.LIST_SUBMISSIONS_SQL)
             return cur.fetchall()
 
 
@@ -215,41 +239,7 @@ def get_submission(submission_id: str):
     """Get a single submission with full details."""
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                SELECT s.id, s.applicant_name, s.business_summary, s.annual_revenue,
-                       s.naics_primary_title, s.naics_primary_code,
-                       s.naics_secondary_title, s.naics_secondary_code,
-                       s.industry_tags,
-                       s.submission_status, s.submission_outcome, s.outcome_reason,
-                       s.bullet_point_summary, s.nist_controls_summary,
-                       s.hazard_override, s.control_overrides, s.default_retroactive_date,
-                       s.ai_recommendation, s.ai_guideline_citations,
-                       s.decision_tag, s.decision_reason, s.decided_at, s.decided_by,
-                       s.cyber_exposures, s.nist_controls,
-                       s.website, s.broker_email, s.broker_employment_id,
-                       s.effective_date, s.expiration_date,
-                       s.opportunity_notes,
-                       s.created_at,
-                       s.account_id,
-                       s.assigned_uw_name, s.assigned_at, s.assigned_by,
-                       e.org_id as broker_org_id,
-                       o.name as broker_company,
-                       CONCAT(p.first_name, ' ', p.last_name) as broker_name,
-                       e.email as broker_contact_email,
-                       e.phone as broker_phone,
-                       -- Prefer submission address, fall back to account address
-                       COALESCE(s.address_street, a.address_street) as address_street,
-                       a.address_street2,
-                       COALESCE(s.address_city, a.address_city) as address_city,
-                       COALESCE(s.address_state, a.address_state) as address_state,
-                       COALESCE(s.address_zip, a.address_zip) as address_zip
-                FROM submissions s
-                LEFT JOIN brkr_employments e ON e.employment_id::text = s.broker_employment_id
-                LEFT JOIN brkr_organizations o ON o.org_id = e.org_id
-                LEFT JOIN brkr_people p ON p.person_id = e.person_id
-                LEFT JOIN accounts a ON a.id = s.account_id
-                WHERE s.id = %s
-            """, (submission_id,))
+            cur.execute(hot_reads.GET_SUBMISSION_SQL, (submission_id,))
             row = cur.fetchone()
             if not row:
                 raise HTTPException(status_code=404, detail="Submission not found")
@@ -678,9 +668,7 @@ def get_submission_documents(submission_id: str):
             }
 
 
-@app.get("/api/documents/{document_id}/file")
-def serve_document_file(document_id: str):
-    """Serve a local document file by ID."""
+def _load_document_file_row(document_id: str):
     with get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute("""
@@ -688,27 +676,35 @@ def serve_document_file(document_id: str):
                 FROM documents
                 WHERE id = %s
             """, (document_id,))
-            row = cur.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Document not found")
+            return cur.fetchone()
 
-            metadata = row["doc_metadata"] if isinstance(row["doc_metadata"], dict) else {}
-            file_path = metadata.get("file_path")
 
-            if not file_path or not os.path.exists(file_path):
-                raise HTTPException(status_code=404, detail="Document file not found on disk")
-
-            # Determine content type
-            if file_path.lower().endswith('.pdf'):
-                media_type = "application/pdf"
-            elif file_path.lower().endswith('.png'):
-                media_type = "image/png"
-            elif file_path.lower().endswith('.jpg') or file_path.lower().endswith('.jpeg'):
-                media_type = "image/jpeg"
-            else:
-                media_type = "application/octet-stream"
+@app.get("/api/documents/{document_id}/file")
+def serve_document_file(document_id: str, request: Request):
+    """
+    Serve a document file by ID.
+
+    Supports conditional (If-None-Match) and single byte-range requests so
+    the PDF viewer can revalidate and fetch only the parts it renders.
+    """
+    from api import document_files
+
+    file_path, filename, media_type = document_files.resolve(document_id, _load_document_file_row)
+    return document_files.file_response(request.headers, file_path, filename, media_type=media_type)
 
-            return FileResponse(file_path, media_type=media_type, filename=row["filename"])
+
+@app.get("/api/documents/{document_id}/pages/{page_number}")
+def serve_document_page(document_id: str, page_number: int, request: Request):
+    """Serve a single page (1-based) of a PDF document as its own PDF."""
+    from api import document_files
+
+    file_path, filename, media_type = document_files.resolve(document_id, _load_document_file_row)
+    if media_type != "application/pdf":
+        raise HTTPException(status_code=400, detail="Document is not a PDF")
+    page_path = document_files.page_file(file_path, page_number)
+    stem = os.path.splitext(filename)[0]
+    return document_files.file_response(request.headers, str(page_path), f"{stem}_p{page_number}.pdf",
+                                        media_type="application/pdf")
 
 
 @app.get("/api/documents/{document_id}/bbox")
@@ -2273,6 +2269,13 @@ def get_extraction_stats(days: int = 30):
             }
 
 
+@app.get("/api/extraction/cache-stats")
+def get_extraction_cache_stats():
+    """Extraction result cache: hit/miss counters (this process) and stored entries."""
+    from core import extraction_cache
+    return extraction_cache.cache_stats()
+
+
 # ─────────────────────────────────────────────────────────────
 # Policy Form Catalog Endpoints
 # ─────────────────────────────────────────────────────────────
@@ -4340,11 +4343,8 @@ def get_standard_coverage_tags():
 # ─────────────────────────────────────────────────────────────
 
 def get_conn_raw():
-    """Get database connection without RealDictCursor (for modules expecting tuples)."""
-    from pgvector.psycopg2 import register_vector
-    conn = psycopg2.connect(os.environ.get("DATABASE_URL"))
-    register_vector(conn)
-    return conn
+    """Pooled connection with tuple cursors and pgvector adapters (for modules expecting tuples)."""
+    return db.get_raw_conn(vector=True)
 
 
 @app.get("/api/submissions/{submission_id}/comparables")
@@ -4360,19 +4360,20 @@ def get_comparables_endpoint(
     """Get comparable submissions for benchmarking with vector similarity."""
     from core.benchmarking import get_comparables as get_comparables_core
 
-    comparables = get_comparables_core(
-        submission_id,
-        get_conn_raw,
-        similarity_mode="operations",
-        revenue_tolerance=revenue_tolerance if revenue_tolerance > 0 else 0,
-        same_industry=False,
-        stage_filter=None,
-        date_window_months=months,
-        layer_filter=layer,
-        attachment_min=attachment_min,
-        attachment_max=attachment_max,
-        limit=limit,
-    )
+    with get_conn_raw() as conn:
+        comparables = get_comparables_core(
+            submission_id,
+            conn,
+            similarity_mode="operations",
+            revenue_tolerance=revenue_tolerance if revenue_tolerance > 0 else 0,
+            same_industry=False,
+            stage_filter=None,
+            date_window_months=months,
+            layer_filter=layer,
+            attachment_min=attachment_min,
+            attachment_max=attachment_max,
+            limit=limit,
+        )
 
     # Transform field names to match frontend expectations
     result = []
@@ -4691,9 +4692,8 @@ def issue_endorsement_endpoint(endorsement_id: str):
 
 
 @app.post("/api/endorsements/{endorsement_id}/void")
-def void_endorsement_endpoint(endorsement_id: str):
+def void_endorsement_endpoint(endorsement_id: str, conn=Depends(get_db)):
     """Void an issued endorsement."""
-    conn = get_conn()
     try:
         cur = conn.cursor()
         # Get current status
@@ -4723,9 +4723,8 @@ def void_endorsement_endpoint(endorsement_id: str):
 
 
 @app.delete("/api/endorsements/{endorsement_id}")
-def delete_endorsement_endpoint(endorsement_id: str):
+def delete_endorsement_endpoint(endorsement_id: str, conn=Depends(get_db)):
     """Delete a draft endorsement."""
-    conn = get_conn()
     try:
         cur = conn.cursor()
         # Get current status
@@ -4752,9 +4751,8 @@ def delete_endorsement_endpoint(endorsement_id: str):
 
 
 @app.post("/api/endorsements/{endorsement_id}/reinstate")
-def reinstate_endorsement_endpoint(endorsement_id: str):
+def reinstate_endorsement_endpoint(endorsement_id: str, conn=Depends(get_db)):
     """Reinstate a voided endorsement back to issued status."""
-    conn = get_conn()
     try:
         cur = conn.cursor()
         # Get current status
@@ -4865,7 +4863,7 @@ def calculate_premium_grid(submission_id: str):
     """Calculate premium for multiple limits at once (for the rating grid)."""
     import sys
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from rating_engine.premium_calculator import calculate_premium
+    from rating_engine.premium_calculator import calculate_premium_batch
 
     with get_conn() as conn:
         with conn.cursor() as cur:
@@ -4905,31 +4903,42 @@ def calculate_premium_grid(submission_id: str):
             retentions = [25_000, 50_000, 100_000]
             default_retention = 25_000
 
+            # All cells in one vectorized pass
+            result = calculate_premium_batch(
+                revenue=float(revenue),
+                limit=limits,
+                retention=default_retention,
+                industry=industry,
+                hazard_override=hazard_override,
+                control_adjustment=control_adj,
+            )
+
             grid = []
-            for limit in limits:
-                result = calculate_premium(
-                    revenue=float(revenue),
-                    limit=limit,
-                    retention=default_retention,
-                    industry=industry,
-                    hazard_override=hazard_override,
-                    control_adjustment=control_adj,
-                )
+            for i, limit in enumerate(limits):
+                technical = int(result["technical_premium"][i])
+                risk_adjusted = int(result["risk_adjusted_premium"][i])
                 grid.append({
                     "limit": limit,
                     "retention": default_retention,
-                    "technical_premium": result.get("technical_premium", 0),
-                    "risk_adjusted_premium": result.get("risk_adjusted_premium", 0),
-                    "rate_per_mil": result.get("risk_adjusted_premium", 0) / (limit / 1_000_000) if result.get("risk_adjusted_premium") else 0
+                    "technical_premium": technical,
+                    "risk_adjusted_premium": risk_adjusted,
+                    "rate_per_mil": risk_adjusted / (limit / 1_000_000) if risk_adjusted else 0
                 })
 
             return {
                 "grid": grid,
-                "hazard_class": grid[0].get("breakdown", {}).get("hazard_class") if grid else None,
-                "industry_slug": grid[0].get("breakdown", {}).get("industry_slug") if grid else None
+                "hazard_class": int(result["hazard_class"][0]) if grid else None,
+                "industry_slug": result["industry_slug"][0] if grid else None
             }
 
 
+@app.get("/api/rating/cache-stats")
+def get_rating_cache_stats():
+    """Premium / industry-slug memoization: hit rates and size (this process)."""
+    from rating_engine.premium_calculator import premium_cache_stats
+    return premium_cache_stats()
+
+
 # ─────────────────────────────────────────────────────────────
 # Statistics Endpoints
 # ─────────────────────────────────────────────────────────────
@@ -4939,52 +4948,8 @@ def get_stats_summary():
     """Get submission status summary counts."""
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                SELECT
-                    submission_status,
-                    submission_outcome,
-                    COUNT(*) as count
-                FROM submissions
-                GROUP BY submission_status, submission_outcome
-            """)
-            rows = cur.fetchall()
-
-            # Build summary structure
-            summary = {}
-            for row in rows:
-                status = row["submission_status"] or "unknown"
-                outcome = row["submission_outcome"] or "pending"
-                count = row["count"]
-
-                if status not in summary:
-                    summary[status] = {}
-                summary[status][outcome] = count
-
-            # Calculate totals
-            received = summary.get("received", {}).get("pending", 0)
-            pending_info = summary.get("pending_info", {}).get("pending", 0)
-
-            quoted = summary.get("quoted", {})
-            bound = quoted.get("bound", 0)
-            lost = quoted.get("lost", 0)
-            waiting = quoted.get("waiting_for_response", 0)
-
-            declined = summary.get("declined", {}).get("declined", 0)
-
-            return {
-                "total": received + pending_info + bound + lost + waiting + declined,
-                "in_progress": received + pending_info,
-                "quoted": bound + lost + waiting,
-                "declined": declined,
-                "breakdown": {
-                    "received": received,
-                    "pending_info": pending_info,
-                    "waiting": waiting,
-                    "bound": bound,
-                    "lost": lost
-                },
-                "raw": summary
-            }
+            cur.execute(hot_reads.STATS_SUMMARY_SQL)
+            return hot_reads.build_stats_summary(cur.fetchall())
 
 
 @app.get("/api/stats/upcoming-renewals")
@@ -4992,21 +4957,7 @@ def get_upcoming_renewals(days: int = 90):
     """Get policies with upcoming renewals."""
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                SELECT
-                    s.id,
-                    s.applicant_name,
-                    s.expiration_date,
-                    (s.expiration_date - CURRENT_DATE) as days_until_expiry,
-                    t.sold_premium
-                FROM submissions s
-                LEFT JOIN insurance_towers t ON t.submission_id = s.id AND t.is_bound = true
-                WHERE s.expiration_date IS NOT NULL
-                AND s.expiration_date >= CURRENT_DATE
-                AND s.expiration_date <= CURRENT_DATE + %s
-                AND t.is_bound = true
-                ORDER BY s.expiration_date ASC
-            """, (days,))
+            cur.execute(hot_reads.UPCOMING_RENEWALS_SQL, (days,))
             return cur.fetchall()
 
 
@@ -5201,19 +5152,7 @@ def get_renewals_not_received():
     """Get renewals that were expected but not received."""
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                SELECT
-                    s.id,
-                    s.applicant_name,
-                    s.effective_date,
-                    s.outcome_reason
-                FROM submissions s
-                WHERE s.submission_status = 'renewal_not_received'
-                OR (s.submission_status = 'renewal_expected'
-                    AND s.effective_date < CURRENT_DATE)
-                ORDER BY s.effective_date DESC
-                LIMIT 50
-            """)
+            cur.execute(hot_reads.RENEWALS_NOT_RECEIVED_SQL)
             return cur.fetchall()
 
 
@@ -5223,39 +5162,11 @@ def get_retention_metrics():
     with get_conn() as conn:
         with conn.cursor() as cur:
             # Monthly breakdown
-            cur.execute("""
-                SELECT
-                    DATE_TRUNC('month', s.date_received) as month,
-                    COUNT(*) FILTER (WHERE s.submission_status NOT IN ('renewal_expected')) as renewals_received,
-                    COUNT(*) FILTER (WHERE s.submission_outcome = 'bound') as renewals_bound,
-                    COUNT(*) FILTER (WHERE s.submission_outcome = 'lost') as renewals_lost,
-                    COUNT(*) FILTER (WHERE s.submission_status = 'renewal_not_received') as renewals_not_received
-                FROM submissions s
-                WHERE s.renewal_type = 'renewal'
-                AND s.date_received IS NOT NULL
-                GROUP BY DATE_TRUNC('month', s.date_received)
-                ORDER BY month DESC
-                LIMIT 12
-            """)
+            cur.execute(hot_reads.RETENTION_MONTHLY_SQL)
             monthly = cur.fetchall()
 
             # Rate change analysis
-            cur.execute("""
-                SELECT
-                    s.id,
-                    s.applicant_name,
-                    bound_opt.sold_premium as current_premium,
-                    prior_opt.sold_premium as prior_premium
-                FROM submissions s
-                JOIN insurance_towers bound_opt ON bound_opt.submission_id = s.id AND bound_opt.is_bound = TRUE
-                JOIN submissions prior ON prior.id = s.prior_submission_id
-                JOIN insurance_towers prior_opt ON prior_opt.submission_id = prior.id AND prior_opt.is_bound = TRUE
-                WHERE s.renewal_type = 'renewal'
-                AND bound_opt.sold_premium IS NOT NULL
-                AND prior_opt.sold_premium IS NOT NULL
-                ORDER BY s.date_received DESC
-                LIMIT 20
-            """)
+            cur.execute(hot_reads.RETENTION_RATE_CHANGES_SQL)
             rate_changes = cur.fetchall()
 
             return {
@@ -7649,14 +7560,8 @@ def get_submission_status_counts(days: int = 30):
     """Get submission status counts for the last N days."""
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                SELECT submission_status, COUNT(*)::int
-                FROM submissions
-                WHERE COALESCE(date_received, created_at) >= (now() - (%s || ' days')::interval)
-                GROUP BY submission_status
-            """, (days,))
-            rows = cur.fetchall()
-            return {str(row["submission_status"] or "unknown"): row["count"] for row in rows}
+            cur.execute(hot_reads.SUBMISSION_STATUS_COUNTS_SQL, (days,))
+            return hot_reads.build_status_counts(cur.fetchall())
 
 
 @app.get("/api/dashboard/recent-submissions")
@@ -7664,35 +7569,7 @@ def get_recent_submissions(search: str = None, status: str = None, outcome: str
     """Get recent submissions with optional filters."""
     with get_conn() as conn:
         with conn.cursor() as cur:
-            where_clauses = ["TRUE"]
-            params = [limit]
-
-            if search:
-                where_clauses.append("LOWER(s.applicant_name) LIKE LOWER(%s)")
-                params.insert(0, f"%{search.strip()}%")
-            if status and status != "all":
-                where_clauses.append("s.submission_status = %s")
-                params.insert(-1, status)
-            if outcome and outcome != "all":
-                where_clauses.append("s.submission_outcome = %s")
-                params.insert(-1, outcome)
-
-            query = f"""
-                SELECT
-                    s.id,
-                    COALESCE(s.date_received, s.created_at)::date AS date_received,
-                    s.applicant_name,
-                    a.name AS account_name,
-                    s.submission_status,
-                    s.submission_outcome,
-                    s.annual_revenue,
-                    s.naics_primary_title
-                FROM submissions s
-                LEFT JOIN accounts a ON a.id = s.account_id
-                WHERE {" AND ".join(where_clauses)}
-                ORDER BY COALESCE(s.date_received, s.created_at) DESC
-                LIMIT %s
-            """
+            query, params = hot_reads.recent_submissions_query(search, status, outcome, limit)
             cur.execute(query, params)
             return cur.fetchall()
 
@@ -8912,6 +8789,7 @@ class PackageGenerateRequest(BaseModel):
     selected_documents: list = []  # List of document library IDs
     include_specimen: bool = False  # Include policy specimen form
     include_endorsements: bool = True  # Include endorsement package (default true)
+    background: bool = False  # Queue the job and return a job id to poll
 
 
 @app.post("/api/quotes/{quote_id}/generate-package")
@@ -8922,6 +8800,8 @@ def generate_quote_package(quote_id: str, request: PackageGenerateRequest):
     package_type: "quote_only" or "full_package"
     selected_documents: List of document library entry IDs to include
     include_specimen: Include policy specimen form (rendered from template)
+    background: return {"job_id", "status"} immediately and generate in the
+        background; poll GET /api/render-jobs/{job_id} for the result
     """
     try:
         import sys
@@ -8947,26 +8827,35 @@ def generate_quote_package(quote_id: str, request: PackageGenerateRequest):
 
         if request.package_type == "full_package" or request.include_specimen or request.include_endorsements:
             # Generate full package with library documents and/or specimen
-            result = generate_package(
-                submission_id=str(submission_id),
-                quote_option_id=quote_id,
-                doc_type=doc_type,
-                package_type="full_package",
-                selected_documents=request.selected_documents,
-                created_by="api",
-                include_specimen=request.include_specimen,
-                include_endorsements=request.include_endorsements
-            )
+            generator = generate_package
+            params = {
+                "submission_id": str(submission_id),
+                "quote_option_id": quote_id,
+                "doc_type": doc_type,
+                "package_type": "full_package",
+                "selected_documents": request.selected_documents,
+                "created_by": "api",
+                "include_specimen": request.include_specimen,
+                "include_endorsements": request.include_endorsements,
+            }
         else:
             # Generate quote only
-            result = generate_document(
-                submission_id=str(submission_id),
-                quote_option_id=quote_id,
-                doc_type=doc_type,
-                created_by="api"
+            generator = generate_document
+            params = {
+                "submission_id": str(submission_id),
+                "quote_option_id": quote_id,
+                "doc_type": doc_type,
+                "created_by": "api",
+            }
+
+        if request.background:
+            from core import render_jobs
+            job_id = render_jobs.submit_job(
+                "quote_package", generator, params, quote_option_id=quote_id, created_by="api"
             )
+            return {"job_id": job_id, "status": "pending"}
 
-        return result
+        return generator(**params)
 
     except HTTPException:
         raise
@@ -8975,6 +8864,23 @@ def generate_quote_package(quote_id: str, request: PackageGenerateRequest):
         raise HTTPException(status_code=500, detail=f"Package generation failed: {str(e)}")
 
 
+@app.get("/api/render-jobs/{job_id}")
+def get_render_job(job_id: str):
+    """Status of a background document generation job (result once completed)."""
+    import uuid
+    from core import render_jobs
+
+    try:
+        uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Render job not found")
+
+    job = render_jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Render job not found")
+    return job
+
+
 # ─────────────────────────────────────────────────────────────
 # Extraction Schema Management
 # ─────────────────────────────────────────────────────────────
@@ -9866,125 +9772,30 @@ def get_workflow_queue(user_name: Optional[str] = None):
     with get_conn() as conn:
         with conn.cursor() as cur:
             # Get items needing votes
-            cur.execute("""
-                SELECT
-                    nv.submission_id,
-                    nv.applicant_name,
-                    nv.submitted_at,
-                    nv.current_stage,
-                    nv.stage_entered_at,
-                    nv.deadline,
-                    nv.hours_remaining,
-                    nv.votes_cast,
-                    nv.votes_needed,
-                    nv.required_votes,
-                    s.opportunity_notes,
-                    s.naics_primary_title,
-                    s.annual_revenue,
-                    s.broker_email,
-                    s.bullet_point_summary,
-                    o.name as broker_company,
-                    CONCAT(p.first_name, ' ', p.last_name) as broker_person
-                FROM v_needs_votes nv
-                JOIN submissions s ON s.id = nv.submission_id
-                LEFT JOIN brkr_employments e ON (
-                    e.employment_id::text = s.broker_employment_id
-                    OR (s.broker_employment_id IS NULL AND e.email = s.broker_email)
-                )
-                LEFT JOIN brkr_organizations o ON o.org_id = e.org_id
-                LEFT JOIN brkr_people p ON p.person_id = e.person_id
-                ORDER BY nv.hours_remaining ASC
-            """)
+            cur.execute(hot_reads.QUEUE_NEEDS_VOTES_SQL)
             needs_votes = cur.fetchall()
 
             # Get items ready to work (unclaimed)
-            cur.execute("""
-                SELECT
-                    submission_id,
-                    applicant_name,
-                    submitted_at,
-                    stage_entered_at,
-                    hours_waiting
-                FROM v_ready_to_work
-                ORDER BY stage_entered_at ASC
-            """)
+            cur.execute(hot_reads.QUEUE_READY_TO_WORK_SQL)
             ready_to_work = cur.fetchall()
 
             # Get current vote tallies for items needing votes
             if needs_votes:
                 submission_ids = [str(n['submission_id']) for n in needs_votes]
-                cur.execute("""
-                    SELECT submission_id, current_stage, vote, vote_count, voters
-                    FROM v_vote_tally
-                    WHERE submission_id = ANY(%s::uuid[])
-                """, (submission_ids,))
-                tallies = cur.fetchall()
-
-                # Group tallies by submission
-                tally_map = {}
-                for t in tallies:
-                    sid = str(t['submission_id'])
-                    if sid not in tally_map:
-                        tally_map[sid] = {}
-                    if t['vote']:
-                        tally_map[sid][t['vote']] = {
-                            'count': t['vote_count'],
-                            'voters': t['voters']
-                        }
-
-                # Add tallies to needs_votes
-                for nv in needs_votes:
-                    nv['vote_tally'] = tally_map.get(str(nv['submission_id']), {})
+                cur.execute(hot_reads.QUEUE_VOTE_TALLIES_SQL, (submission_ids,))
+                hot_reads.attach_vote_tallies(needs_votes, cur.fetchall())
 
             # If user specified, mark which ones they've voted on
             if user_name:
-                cur.execute("""
-                    SELECT submission_id, stage, vote
-                    FROM workflow_votes
-                    WHERE user_name = %s
-                """, (user_name,))
-                user_votes = {(str(v['submission_id']), v['stage']): v['vote'] for v in cur.fetchall()}
-
-                for nv in needs_votes:
-                    key = (str(nv['submission_id']), nv['current_stage'])
-                    nv['my_vote'] = user_votes.get(key)
+                cur.execute(hot_reads.QUEUE_USER_VOTES_SQL, (user_name,))
+                hot_reads.attach_user_votes(needs_votes, cur.fetchall())
 
             # Get comments for all needs_votes items
             if needs_votes:
-                submission_ids = [str(n['submission_id']) for n in needs_votes]
-                cur.execute("""
-                    SELECT submission_id, user_name, comment, voted_at as created_at, vote
-                    FROM workflow_votes
-                    WHERE submission_id = ANY(%s::uuid[])
-                      AND comment IS NOT NULL AND comment != ''
-                    ORDER BY voted_at DESC
-                """, (submission_ids,))
-                all_comments = cur.fetchall()
-
-                # Group comments by submission
-                comment_map = {}
-                for c in all_comments:
-                    sid = str(c['submission_id'])
-                    if sid not in comment_map:
-                        comment_map[sid] = []
-                    comment_map[sid].append({
-                        'user_name': c['user_name'],
-                        'comment': c['comment'],
-                        'created_at': c['created_at'].isoformat() if c['created_at'] else None,
-                        'vote': c['vote']
-                    })
+                cur.execute(hot_reads.QUEUE_COMMENTS_SQL, (submission_ids,))
+                hot_reads.attach_comments(needs_votes, cur.fetchall())
 
-                for nv in needs_votes:
-                    nv['comments'] = comment_map.get(str(nv['submission_id']), [])
-
-            return {
-                "needs_votes": needs_votes,
-                "ready_to_work": ready_to_work,
-                "summary": {
-                    "needs_votes_count": len(needs_votes),
-                    "ready_to_work_count": len(ready_to_work)
-                }
-            }
+            return hot_reads.build_workflow_queue(needs_votes, ready_to_work)
 
 
 @app.post("/api/workflow/{submission_id}/comment")
@@ -15157,3 +14968,9 @@ def dismiss_agent_notification(
 def health_check():
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+@app.get("/api/health/db-pool")
+def db_pool_health():
+    """Shared connection pool metrics (in-use, overflow, checkout wait)."""
+    return {"sync": db.pool_stats(), "async": db_async.pool_stats()}
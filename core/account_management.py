@@ -8,13 +8,9 @@ to persistent account entities across policy years.
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import text
-import os
-import importlib.util
 
 # Import database connection
-spec = importlib.util.spec_from_file_location("db", os.path.join(os.path.dirname(__file__), "db.py"))
-db = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(db)
+from core import db
 get_conn = db.get_conn
 
 
@@ -194,11 +190,34 @@ def update_account(
         }
 
 
+# `%` (similarity >= pg_trgm.similarity_threshold) is what the GIN
+# gin_trgm_ops index on accounts.normalized_name can serve; similarity() in
+# the WHERE cannot. The threshold is set per transaction, and the strict
+# `> :threshold` recheck keeps the original cut-off on just the index hits.
+# Index: db_setup/create_accounts_trgm_index.sql
+_SET_TRGM_THRESHOLD_SQL = "SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"
+
+_MATCH_COLUMNS = "id, name, website, industry, naics_code, naics_title"
+
+
+def _match_row(row) -> dict:
+    return {
+        "id": str(row[0]),
+        "name": row[1],
+        "website": row[2],
+        "industry": row[3],
+        "naics_code": row[4],
+        "naics_title": row[5],
+        "score": float(row[6])
+    }
+
+
 def find_matching_accounts(applicant_name: str, threshold: float = 0.3, limit: int = 5) -> list[dict]:
     """
     Find accounts matching applicant name using trigram similarity.
 
-    Uses PostgreSQL pg_trgm extension for fuzzy matching.
+    Uses PostgreSQL pg_trgm extension for fuzzy matching (index-backed
+    ``%`` operator; see find_matching_accounts_batch for many names).
 
     Args:
         applicant_name: Name to search for
@@ -214,27 +233,63 @@ def find_matching_accounts(applicant_name: str, threshold: float = 0.3, limit: i
     normalized = normalize_name(applicant_name)
 
     with get_conn() as conn:
-        result = conn.execute(text("""
-            SELECT id, name, website, industry, naics_code, naics_title,
+        conn.execute(text(_SET_TRGM_THRESHOLD_SQL), {"threshold": str(threshold)})
+        result = conn.execute(text(f"""
+            SELECT {_MATCH_COLUMNS},
                    similarity(normalized_name, :name) as score
             FROM accounts
-            WHERE similarity(normalized_name, :name) > :threshold
+            WHERE normalized_name % :name
+              AND similarity(normalized_name, :name) > :threshold
             ORDER BY score DESC
             LIMIT :limit
         """), {"name": normalized, "threshold": threshold, "limit": limit})
 
-        return [
-            {
-                "id": str(row[0]),
-                "name": row[1],
-                "website": row[2],
-                "industry": row[3],
-                "naics_code": row[4],
-                "naics_title": row[5],
-                "score": float(row[6])
-            }
-            for row in result.fetchall()
-        ]
+        return [_match_row(row) for row in result.fetchall()]
+
+
+def find_matching_accounts_batch(
+    applicant_names: list[str],
+    threshold: float = 0.3,
+    limit: int = 5,
+) -> list[list[dict]]:
+    """
+    find_matching_accounts for many names in one round-trip (ingestion backfills).
+
+    Args:
+        applicant_names: Names to search for
+        threshold: Minimum similarity score (0-1), default 0.3
+        limit: Maximum number of results per name
+
+    Returns:
+        One list of matches per input name, in input order (empty for blank names)
+    """
+    normalized = [normalize_name(name) if name else "" for name in applicant_names]
+    unique = sorted({name for name in normalized if name})
+    if not unique:
+        return [[] for _ in applicant_names]
+
+    matches: dict[str, list[dict]] = {name: [] for name in unique}
+    with get_conn() as conn:
+        conn.execute(text(_SET_TRGM_THRESHOLD_SQL), {"threshold": str(threshold)})
+        result = conn.execute(text(f"""
+            SELECT q.name, m.*
+            FROM unnest(CAST(:names AS text[])) AS q(name)
+            CROSS JOIN LATERAL (
+                SELECT {_MATCH_COLUMNS},
+                       similarity(normalized_name, q.name) as score
+                FROM accounts
+                WHERE normalized_name % q.name
+                  AND similarity(normalized_name, q.name) > :threshold
+                ORDER BY score DESC
+                LIMIT :limit
+            ) m
+            ORDER BY q.name, m.score DESC
+        """), {"names": unique, "threshold": threshold, "limit": limit})
+
+        for row in result.fetchall():
+            matches[row[0]].append(_match_row(row[1:]))
+
+    return [list(matches[name]) if name else [] for name in normalized]
 
 
 def search_accounts(query: str, limit: int = 10) -> list[dict]:
@@ -0,0 +1,121 @@
+"""
+Flattened Application Data View
+
+Credibility scoring (core.credibility_score) and application contradiction
+detection (core.conflict_detection) both look answers up in the nested
+application JSON by bare or dot-notation field name. FlatAppData walks the
+JSON once and keeps everything those checks need:
+
+  fields      dot-notation and bare keys, in document order - the view the
+              credibility dimensions iterate and look up
+  lookup      the contradiction-detection view: "data" wrapper unwrapped,
+              bare, dotted and lower-cased bare keys for case-insensitive
+              lookup
+  normalized  normalize_answer() of every value in ``fields``, computed once
+              per leaf rather than per rule and per dimension
+
+Keys are interned. The view is a snapshot - build it once per submission,
+after the application data is final, and pass it to every check:
+
+    view = FlatAppData.of(app_data)
+    detect_conflicts(..., app_data=view)
+    calculate_credibility_score(view, submission_data)
+
+Every check still accepts the raw dict and builds the view itself.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+_MISSING = object()
+
+
+def normalize_answer(value: Any) -> Any:
+    """Normalize an answer for comparison: trimmed lower-case strings, yes/no as bools."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        v = value.strip().lower()
+        if v in ("yes", "true"):
+            return True
+        if v in ("no", "false"):
+            return False
+        return v
+    return value
+
+
+class FlatAppData:
+    """One-pass flattened, pre-normalised view of an application's answers."""
+
+    __slots__ = ("raw", "fields", "lookup", "normalized", "_question_count")
+
+    def __init__(self, app_data: dict | None):
+        self.raw: dict = app_data or {}
+        self.fields: dict[str, Any] = {}
+        self.lookup: dict[str, Any] = {}
+        self.normalized: dict[str, Any] = {}
+        self._question_count: int | None = None
+
+        wrapped = self.raw.get("data")
+        self._walk(self.raw, "", "", in_lookup=not isinstance(wrapped, dict), lookup_root="data")
+
+    @classmethod
+    def of(cls, app_data: "dict | FlatAppData | None") -> "FlatAppData":
+        """Return ``app_data`` if it is already a view, else build one."""
+        if isinstance(app_data, FlatAppData):
+            return app_data
+        return cls(app_data)
+
+    def _walk(self, obj: dict, prefix: str, lookup_prefix: str, in_lookup: bool, lookup_root: str | None):
+        fields, lookup, normalized = self.fields, self.lookup, self.normalized
+        for key, value in obj.items():
+            key = sys.intern(key) if type(key) is str else key
+            full_key = sys.intern(f"{prefix}.{key}") if prefix else key
+            # With a "data" wrapper only its contents are visible to lookup,
+            # keyed relative to the wrapper
+            child_in_lookup = in_lookup or (lookup_root is not None and key == lookup_root)
+            if isinstance(value, dict):
+                if in_lookup:
+                    child_lookup_prefix = f"{lookup_prefix}.{key}" if lookup_prefix else key
+                else:
+                    child_lookup_prefix = ""
+                self._walk(value, full_key, child_lookup_prefix, child_in_lookup, None)
+                continue
+
+            norm = normalize_answer(value)
+            fields[full_key] = value
+            fields[key] = value
+            normalized[full_key] = norm
+            normalized[key] = norm
+            if in_lookup:
+                lookup_key = sys.intern(f"{lookup_prefix}.{key}") if lookup_prefix else key
+                lookup[key] = value
+                lookup[lookup_key] = value
+                lookup[key.lower()] = value
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    def get(self, field_name: str, default: Any = None) -> Any:
+        """Value by exact bare or dot-notation key (credibility view)."""
+        return self.fields.get(field_name, default)
+
+    def get_normalized(self, field_name: str) -> Any:
+        """normalize_answer() of the value at ``field_name`` (None if absent)."""
+        return self.normalized.get(field_name)
+
+    def get_ci(self, field_name: str) -> Any:
+        """Value by exact, then lower-cased key (contradiction view)."""
+        value = self.lookup.get(field_name, _MISSING)
+        if value is not _MISSING:
+            return value
+        return self.lookup.get(field_name.lower())
+
+    @property
+    def question_count(self) -> int:
+        """Number of non-null entries in ``fields`` (drives app complexity)."""
+        if self._question_count is None:
+            self._question_count = sum(1 for v in self.fields.values() if v is not None)
+        return self._question_count
@@ -7,9 +7,205 @@ for underwriting decision support.
 
 from typing import Optional
 import json
+import math
+import os
 from datetime import date, timedelta
 from pgvector import Vector
 
+# Vector column per similarity mode; combined_embedding is the stored
+# ops_embedding + controls_embedding (db_setup/create_comparables_vector_indexes.sql)
+VECTOR_COLUMNS = {
+    "operations": "ops_embedding",
+    "controls": "controls_embedding",
+    "combined": "combined_embedding",
+}
+
+# Strategy selection (see _nearest_submissions)
+PREFILTER_MAX_ROWS = int(os.getenv("COMPARABLES_PREFILTER_MAX_ROWS", "5000"))
+POSTFILTER_MIN_SELECTIVITY = float(os.getenv("COMPARABLES_POSTFILTER_MIN_SELECTIVITY", "0.02"))
+POSTFILTER_MAX_CANDIDATES = int(os.getenv("COMPARABLES_POSTFILTER_MAX_CANDIDATES", "4000"))
+HNSW_MAX_EF_SEARCH = 1000  # pgvector's upper bound for hnsw.ef_search
+
+
+def _comparable_filters(
+    submission_id: str,
+    current_revenue,
+    current_naics,
+    revenue_tolerance: float,
+    same_industry: bool,
+    stage_filter: Optional[str],
+    date_window_months: Optional[int],
+) -> tuple[str, list]:
+    """WHERE clause (over ``submissions s``) and params for the comparable filters."""
+    where_clauses = ["s.id <> %s"]
+    params: list = [submission_id]
+
+    # Revenue filter
+    if current_revenue and revenue_tolerance > 0:
+        rev = float(current_revenue)
+        min_rev = rev * (1 - revenue_tolerance)
+        max_rev = rev * (1 + revenue_tolerance)
+        where_clauses.append("s.annual_revenue BETWEEN %s AND %s")
+        params.extend([min_rev, max_rev])
+
+    # Industry filter
+    if same_industry and current_naics:
+        where_clauses.append("s.naics_primary_code = %s")
+        params.append(current_naics)
+
+    # Stage filter (collapsed status/outcome)
+    if stage_filter == "bound":
+        where_clauses.append("s.submission_outcome = 'bound'")
+    elif stage_filter == "lost":
+        where_clauses.append("s.submission_outcome = 'lost'")
+    elif stage_filter == "declined":
+        where_clauses.append("s.submission_status = 'declined'")
+    elif stage_filter == "quoted":
+        where_clauses.append("s.submission_status = 'quoted'")
+    elif stage_filter == "quoted_plus":
+        where_clauses.append(
+            "(s.submission_status = 'quoted' OR s.submission_outcome IN ('bound', 'lost'))"
+        )
+    elif stage_filter == "received":
+        where_clauses.append(
+            "s.submission_status IN ('received', 'pending', 'waiting_for_response', 'open', "
+            "'renewal_expected', 'renewal_not_received')"
+        )
+
+    # Date window filter (effective date if present, else received)
+    if date_window_months:
+        cutoff = date.today() - timedelta(days=30 * date_window_months)
+        where_clauses.append("COALESCE(s.effective_date, s.date_received) >= %s")
+        params.append(cutoff)
+
+    return " AND ".join(where_clauses), params
+
+
+# ─────────────────────────────────────────────────────────────
+# Nearest-neighbour search
+# ─────────────────────────────────────────────────────────────
+
+def _estimate_rows(cur, sql: str, params: list) -> float:
+    """Planner row estimate for a query (EXPLAIN, nothing is executed)."""
+    cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+    plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return float(plan[0]["Plan"]["Plan Rows"])
+
+
+def _choose_strategy(cur, vec_col: str, where_sql: str, params: list, limit: int) -> tuple[str, int]:
+    """
+    Pick pre- or post-filtering from the planner's estimate of the filtered set.
+
+    pre_filter:  few rows pass the filters -> exact distance over just those
+                 (exact recall; the HNSW index would have to walk far to find them)
+    post_filter: the filters keep a decent share of the table -> ANN index scan
+                 for limit / selectivity candidates, then apply the filters
+
+    Returns (strategy, candidates to fetch for post_filter).
+    """
+    matching = _estimate_rows(
+        cur, f"SELECT 1 FROM submissions s WHERE {where_sql} AND s.{vec_col} IS NOT NULL", params
+    )
+    if matching <= PREFILTER_MAX_ROWS:
+        return "pre_filter", 0
+    total = _estimate_rows(cur, f"SELECT 1 FROM submissions s WHERE s.{vec_col} IS NOT NULL", [])
+    selectivity = matching / total if total else 1.0
+    if selectivity < POSTFILTER_MIN_SELECTIVITY:
+        return "pre_filter", 0
+    candidates = math.ceil(limit / min(selectivity, 1.0) * 2)  # 2x headroom for estimate error
+    return "post_filter", min(max(candidates, limit, 40), POSTFILTER_MAX_CANDIDATES)
+
+
+def _pre_filter_search(cur, vec_col: str, query_vec, where_sql: str, params: list, limit: int) -> list[tuple]:
+    """Exact k-NN over the filtered rows. MATERIALIZED keeps the planner off the ANN index."""
+    cur.execute(f"""
+        WITH candidates AS MATERIALIZED (
+            SELECT s.id, s.{vec_col} AS vec
+            FROM submissions s
+            WHERE {where_sql} AND s.{vec_col} IS NOT NULL
+        )
+        SELECT id, vec <=> %s AS distance
+        FROM candidates
+        ORDER BY distance
+        LIMIT %s
+    """, [*params, Vector(query_vec), limit])
+    return cur.fetchall()
+
+
+def _post_filter_search(cur, vec_col: str, query_vec, where_sql: str, params: list, limit: int,
+                        candidates: int) -> Optional[list[tuple]]:
+    """
+    ANN (HNSW) top-``candidates``, then the scalar filters. Widens the candidate
+    set while too few survive; None once it hits POSTFILTER_MAX_CANDIDATES
+    (caller falls back to pre-filtering).
+    """
+    query_vector = Vector(query_vec)
+    while True:
+        cur.execute(f"SET LOCAL hnsw.ef_search = {min(max(candidates, 40), HNSW_MAX_EF_SEARCH)}")
+        cur.execute(f"""
+            SELECT s.id, nn.distance
+            FROM (
+                SELECT id, {vec_col} <=> %s AS distance
+                FROM submissions
+                WHERE {vec_col} IS NOT NULL
+                ORDER BY {vec_col} <=> %s
+                LIMIT %s
+            ) nn
+            JOIN submissions s ON s.id = nn.id
+            WHERE {where_sql}
+            ORDER BY nn.distance
+            LIMIT %s
+        """, [query_vector, query_vector, candidates, *params, limit])
+        rows = cur.fetchall()
+        if len(rows) >= limit:
+            return rows
+        if candidates >= POSTFILTER_MAX_CANDIDATES:
+            return None
+        candidates = min(candidates * 4, POSTFILTER_MAX_CANDIDATES)
+
+
+_combined_column_exists: Optional[bool] = None
+
+
+def _has_combined_column(cur) -> bool:
+    """Whether submissions.combined_embedding exists (checked once per process)."""
+    global _combined_column_exists
+    if _combined_column_exists is None:
+        cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'submissions' AND column_name = 'combined_embedding'
+        """)
+        _combined_column_exists = cur.fetchone() is not None
+    return _combined_column_exists
+
+
+def _summed_vector_search(cur, query_vec, where_sql: str, params: list, limit: int) -> list[tuple]:
+    """Exact k-NN on ops_embedding + controls_embedding, for databases without combined_embedding."""
+    cur.execute(f"""
+        SELECT s.id, (s.ops_embedding + s.controls_embedding) <=> %s AS distance
+        FROM submissions s
+        WHERE {where_sql} AND s.ops_embedding IS NOT NULL AND s.controls_embedding IS NOT NULL
+        ORDER BY distance
+        LIMIT %s
+    """, [Vector(query_vec), *params, limit])
+    return cur.fetchall()
+
+
+def _nearest_submissions(cur, vec_col: str, query_vec, where_sql: str, params: list, limit: int,
+                         strategy: str = "auto") -> tuple[list[tuple], str]:
+    """(id, distance) of the ``limit`` nearest filtered submissions, and the strategy used."""
+    candidates = POSTFILTER_MAX_CANDIDATES
+    if strategy == "auto":
+        strategy, candidates = _choose_strategy(cur, vec_col, where_sql, params, limit)
+    if strategy == "post_filter":
+        rows = _post_filter_search(cur, vec_col, query_vec, where_sql, params, limit, candidates)
+        if rows is not None:
+            return rows, strategy
+        strategy = "pre_filter"
+    return _pre_filter_search(cur, vec_col, query_vec, where_sql, params, limit), strategy
+
 
 def get_comparables(
     submission_id: str,
@@ -24,10 +220,15 @@ def get_comparables(
     attachment_min: float | None = None,
     attachment_max: float | None = None,
     limit: int = 15,
+    strategy: str = "auto",  # auto, pre_filter, post_filter
 ) -> list[dict]:
     """
     Get comparable submissions with pricing and outcome data.
 
+    The vector ranking runs first (_nearest_submissions: exact over the
+    filtered rows, or HNSW index scan then filter, by filter selectivity);
+    towers, layers and losses are then joined for those submissions only.
+
     Args:
         submission_id: Current submission UUID
         get_conn: Database connection function
@@ -36,16 +237,20 @@ def get_comparables(
         same_industry: Require same NAICS code
         stage_filter: Filter by collapsed stage
         limit: Max results
+        strategy: Force pre_filter / post_filter (default: chosen per query)
 
     Returns:
         List of comparable dicts with pricing/outcome/performance
     """
     conn = get_conn() if callable(get_conn) else get_conn
 
-    # Get current submission's embedding and profile
+    # Get current submission's embedding and profile. combined_embedding is
+    # only read for combined searches, and only once its migration has run.
     with conn.cursor() as cur:
-        cur.execute("""
-            SELECT ops_embedding, controls_embedding,
+        use_combined_column = similarity_mode == "combined" and _has_combined_column(cur)
+        combined_select = "combined_embedding" if use_combined_column else "NULL"
+        cur.execute(f"""
+            SELECT ops_embedding, controls_embedding, {combined_select},
                    annual_revenue, naics_primary_code
             FROM submissions WHERE id = %s
         """, (submission_id,))
@@ -54,70 +259,56 @@ def get_comparables(
     if not row:
         return []
 
-    ops_vec, ctrl_vec, current_revenue, current_naics = row
+    ops_vec, ctrl_vec, combined_vec, current_revenue, current_naics = row
+    summed = False
 
     # Determine query vector based on mode
     if similarity_mode == "operations" and ops_vec is not None:
         query_vec = ops_vec
-        vec_col = "ops_embedding"
+        vec_col = VECTOR_COLUMNS["operations"]
     elif similarity_mode == "controls" and ctrl_vec is not None:
         query_vec = ctrl_vec
-        vec_col = "controls_embedding"
-    elif similarity_mode == "combined" and ops_vec is not None and ctrl_vec is not None:
+        vec_col = VECTOR_COLUMNS["controls"]
+    elif similarity_mode == "combined" and combined_vec is not None:
+        query_vec = combined_vec
+        vec_col = VECTOR_COLUMNS["combined"]
+    elif similarity_mode == "combined" and not use_combined_column \
+            and ops_vec is not None and ctrl_vec is not None:
+        # combined_embedding not migrated yet: sum on the fly (no index)
         query_vec = [a + b for a, b in zip(ops_vec, ctrl_vec)]
-        vec_col = "(ops_embedding + controls_embedding)"
+        vec_col = VECTOR_COLUMNS["combined"]
+        summed = True
     else:
         # Fallback to operations
-        if ops_vec is not None:
-            query_vec = ops_vec
-            vec_col = "ops_embedding"
-        else:
-            query_vec = None
-            vec_col = "ops_embedding"
-
-    # Build WHERE clauses
-    where_clauses = ["s.id <> %s"]
-    params = [submission_id]
-
-    # Revenue filter
-    if current_revenue and revenue_tolerance > 0:
-        rev = float(current_revenue)
-        min_rev = rev * (1 - revenue_tolerance)
-        max_rev = rev * (1 + revenue_tolerance)
-        where_clauses.append("s.annual_revenue BETWEEN %s AND %s")
-        params.extend([min_rev, max_rev])
-
-    # Industry filter
-    if same_industry and current_naics:
-        where_clauses.append("s.naics_primary_code = %s")
-        params.append(current_naics)
-
-    # Stage filter (collapsed status/outcome)
-    if stage_filter == "bound":
-        where_clauses.append("s.submission_outcome = 'bound'")
-    elif stage_filter == "lost":
-        where_clauses.append("s.submission_outcome = 'lost'")
-    elif stage_filter == "declined":
-        where_clauses.append("s.submission_status = 'declined'")
-    elif stage_filter == "quoted":
-        where_clauses.append("s.submission_status = 'quoted'")
-    elif stage_filter == "quoted_plus":
-        where_clauses.append(
-            "(s.submission_status = 'quoted' OR s.submission_outcome IN ('bound', 'lost'))"
-        )
-    elif stage_filter == "received":
-        where_clauses.append(
-            "s.submission_status IN ('received', 'pending', 'waiting_for_response', 'open', "
-            "'renewal_expected', 'renewal_not_received')"
-        )
+        query_vec = ops_vec
+        vec_col = VECTOR_COLUMNS["operations"]
 
-    # Date window filter (effective date if present, else received)
-    if date_window_months:
-        cutoff = date.today() - timedelta(days=30 * date_window_months)
-        where_clauses.append("COALESCE(s.effective_date, s.date_received) >= %s")
-        params.append(cutoff)
+    where_sql, params = _comparable_filters(
+        submission_id, current_revenue, current_naics,
+        revenue_tolerance, same_industry, stage_filter, date_window_months,
+    )
 
-    where_sql = " AND ".join(where_clauses)
+    # Rank first, then join towers / losses for the winners only
+    with conn.cursor() as cur:
+        if summed:
+            nearest = _summed_vector_search(cur, query_vec, where_sql, params, limit)
+        elif query_vec is not None:
+            nearest, _ = _nearest_submissions(cur, vec_col, query_vec, where_sql, params, limit, strategy)
+        else:
+            cur.execute(f"""
+                SELECT s.id, NULL::float AS distance
+                FROM submissions s
+                WHERE {where_sql}
+                ORDER BY
+                    CASE WHEN s.annual_revenue IS NULL THEN 1 ELSE 0 END,
+                    ABS(s.annual_revenue - %s) ASC NULLS LAST,
+                    COALESCE(s.effective_date, s.date_received) DESC
+                LIMIT %s
+            """, [*params, current_revenue, limit])
+            nearest = cur.fetchall()
+
+    if not nearest:
+        return []
 
     controls_similarity_select = "NULL::float as controls_similarity"
     if ctrl_vec is not None:
@@ -126,27 +317,6 @@ def get_comparables(
             "ELSE 1 - (m.controls_embedding <=> %s) END as controls_similarity"
         )
 
-    distance_select = "NULL::float as distance"
-    embedding_filter = ""
-    order_sql = ""
-    order_params: list = []
-    if query_vec is not None:
-        distance_select = f"{vec_col} <=> %s AS distance"
-        embedding_filter = f"AND {vec_col} IS NOT NULL"
-        order_sql = "ORDER BY distance LIMIT %s"
-        order_params = [limit]
-    else:
-        distance_select = "NULL::float as distance"
-        embedding_filter = ""
-        order_sql = """
-            ORDER BY
-                CASE WHEN s.annual_revenue IS NULL THEN 1 ELSE 0 END,
-                ABS(s.annual_revenue - %s) ASC NULLS LAST,
-                COALESCE(s.effective_date, s.date_received) DESC
-            LIMIT %s
-        """
-        order_params = [current_revenue, limit]
-
     layer_params: list = []
     layer_filters = []
     if layer_filter == "primary":
@@ -166,7 +336,10 @@ def get_comparables(
     # Main query - insurance_towers stores tower_json as JSONB array
     # Extract first layer's limit from tower_json, position from position column
     query = f"""
-        WITH matched_subs AS (
+        WITH nearest AS (
+            SELECT * FROM unnest(%s::uuid[], %s::float8[]) AS n(id, distance)
+        ),
+        matched_subs AS (
             SELECT
                 s.id,
                 s.applicant_name,
@@ -184,11 +357,9 @@ def get_comparables(
                 s.business_summary,
                 s.nist_controls,
                 s.controls_embedding,
-                {distance_select}
-            FROM submissions s
-            WHERE {where_sql}
-            {embedding_filter}
-            {order_sql}
+                n.distance
+            FROM nearest n
+            JOIN submissions s ON s.id = n.id
         ),
         best_tower AS (
             SELECT DISTINCT ON (t.submission_id)
@@ -280,11 +451,10 @@ def get_comparables(
         ORDER BY similarity_score DESC
     """
 
-    params_full: list = []
-    if query_vec is not None:
-        params_full.append(Vector(query_vec))
-    params_full.extend(params)
-    params_full.extend(order_params)
+    params_full: list = [
+        [str(sub_id) for sub_id, _ in nearest],
+        [distance for _, distance in nearest],
+    ]
     params_full.extend(layer_params)
     if ctrl_vec is not None:
         params_full.append(Vector(ctrl_vec))
@@ -9,13 +9,9 @@ from typing import Optional
 from dataclasses import dataclass, field
 from sqlalchemy import text
 
-import os
-import importlib.util
 
 # Import database connection
-spec = importlib.util.spec_from_file_location("db", os.path.join(os.path.dirname(__file__), "db.py"))
-db = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(db)
+from core import db
 get_conn = db.get_conn
 
 
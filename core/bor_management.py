@@ -13,14 +13,10 @@ Key concepts:
 from datetime import datetime, date
 from typing import Optional
 from sqlalchemy import text
-import os
 import json
-import importlib.util
 
 # Import database connection
-spec = importlib.util.spec_from_file_location("db", os.path.join(os.path.dirname(__file__), "db.py"))
-db = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(db)
+from core import db
 get_conn = db.get_conn
 
 
@@ -0,0 +1,137 @@
+"""
+Compiled Rule Sets
+
+Rule catalogs (credibility CONSISTENCY_RULES, the conflict_rules table) are
+lists of dicts that used to be interpreted rule by rule for every
+application: look up the trigger field, normalize every trigger value,
+branch on the condition string. A RuleSet holds the same rules compiled
+once into closures:
+
+  - trigger values are normalized once into a frozen set
+  - each rule is indexed under its trigger field, so evaluating an
+    application only runs the rules whose trigger field is present (rules
+    that can fire on a missing field are always run)
+  - hits come back in catalog order, exactly as the interpreted loop
+    produced them
+
+The compilers live next to the rules' semantics (core.credibility_score,
+ai.conflict_analyzer); this module is the shared container plus the batch
+entry points used for rule-impact backtests:
+
+    ruleset = compile_consistency_rules(CONSISTENCY_RULES)
+    hits = ruleset.evaluate(view, present=view.fields)
+    counts = ruleset.impact(views, present=lambda v: v.fields)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Hashable, Iterable, Sequence
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """One catalog rule compiled to a predicate.
+
+    ``check(data)`` returns None when the rule does not fire, otherwise a
+    payload (whatever the compiler chose - trigger/conflict values, etc.).
+    """
+    name: str
+    trigger_field: Hashable
+    check: Callable[[Any], Any]
+    fires_when_absent: bool = False
+    rule: dict | None = None
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    """A fired rule and its payload."""
+    rule: CompiledRule
+    payload: Any
+
+
+def options_matcher(options: Iterable[Any], normalize: Callable[[Any], Any]) -> Callable[[Any], bool]:
+    """
+    Compile a list of trigger values into ``matches(normalized_value)``.
+
+    Equivalent to ``any(normalize(o) == normalized_value for o in options)``,
+    using a set lookup when the normalized value is hashable.
+    """
+    normalized = tuple(normalize(o) for o in options)
+    try:
+        lookup = frozenset(normalized)
+    except TypeError:
+        lookup = None
+
+    def matches(value: Any) -> bool:
+        if lookup is not None:
+            try:
+                return value in lookup
+            except TypeError:
+                pass
+        return value in normalized
+
+    return matches
+
+
+class RuleSet:
+    """Compiled rules with a trigger-field dispatch index."""
+
+    def __init__(self, rules: Sequence[CompiledRule], version: str | None = None):
+        self.rules: tuple[CompiledRule, ...] = tuple(rules)
+        self.version = version
+        by_field: dict[Hashable, list[int]] = {}
+        always: list[int] = []
+        for i, rule in enumerate(self.rules):
+            if rule.fires_when_absent:
+                always.append(i)
+            else:
+                by_field.setdefault(rule.trigger_field, []).append(i)
+        self.by_field: dict[Hashable, tuple[int, ...]] = {f: tuple(ix) for f, ix in by_field.items()}
+        self.always: tuple[int, ...] = tuple(always)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def candidates(self, present: Collection) -> list[CompiledRule]:
+        """Rules that can fire given the set of present field names, in catalog order."""
+        picked = list(self.always)
+        for field_name, indexes in self.by_field.items():
+            if field_name in present:
+                picked.extend(indexes)
+        picked.sort()
+        return [self.rules[i] for i in picked]
+
+    def evaluate(self, data: Any, present: Collection | None = None) -> list[RuleHit]:
+        """
+        Run the rules against one record.
+
+        ``present`` is the collection of field names the record has (defaults
+        to ``data`` itself, i.e. a dict's keys).
+        """
+        hits = []
+        for rule in self.candidates(data if present is None else present):
+            payload = rule.check(data)
+            if payload is not None:
+                hits.append(RuleHit(rule, payload))
+        return hits
+
+    def evaluate_many(
+        self,
+        records: Iterable[Any],
+        present: Callable[[Any], Collection] | None = None,
+    ) -> list[list[RuleHit]]:
+        """evaluate() for each record; ``present(record)`` gives its field names."""
+        return [self.evaluate(r, present(r) if present else None) for r in records]
+
+    def impact(
+        self,
+        records: Iterable[Any],
+        present: Callable[[Any], Collection] | None = None,
+    ) -> dict[str, int]:
+        """How many records each rule fires on (every rule listed, catalog order)."""
+        counts = {rule.name: 0 for rule in self.rules}
+        for record in records:
+            for hit in self.evaluate(record, present(record) if present else None):
+                counts[hit.rule.name] += 1
+        return counts
@@ -9,6 +9,7 @@ See docs/conflict_review_implementation_plan.md for full documentation.
 
 from __future__ import annotations
 
+import math
 import re
 from collections import defaultdict
 from dataclasses import dataclass, field
@@ -16,6 +17,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Any
 
+from core.app_data_view import FlatAppData
 from core.conflict_config import (
     APPLICATION_CONTRADICTION_RULES,
     CONFIDENCE_THRESHOLD,
@@ -53,7 +55,7 @@ def detect_conflicts(
     field_values: list[dict],
     check_duplicates: bool = False,
     existing_submissions: list[dict] | None = None,
-    app_data: dict | None = None,
+    app_data: dict | FlatAppData | None = None,
     broker_info: dict | None = None,
     include_sign_offs: bool = True,
 ) -> list[ConflictResult]:
@@ -74,7 +76,8 @@ def detect_conflicts(
         check_duplicates: Whether to check for duplicate submissions
         existing_submissions: For duplicate check, list of other submissions
             with keys: id, applicant_name, broker_email, date_received
-        app_data: Raw application JSON for contradiction detection
+        app_data: Raw application JSON (or a FlatAppData view of it) for
+            contradiction detection
         broker_info: Broker assignment info with 'confidence' and 'source' keys
         include_sign_offs: Whether to include core verification sign-off items
 
@@ -309,7 +312,7 @@ def detect_outliers(field_values: list[dict]) -> list[ConflictResult]:
 
 def detect_duplicate_submission(
     current_values: dict[str, Any],
-    existing_submissions: list[dict],
+    existing_submissions: list[dict] | SubmissionNameIndex,
     name_similarity_threshold: float = 0.85,
 ) -> list[ConflictResult]:
     """
@@ -320,7 +323,8 @@ def detect_duplicate_submission(
 
     Args:
         current_values: Dict of field_name -> value for current submission
-        existing_submissions: List of existing submissions to check against
+        existing_submissions: List of existing submissions to check against,
+            or a SubmissionNameIndex over them (build once, check many)
         name_similarity_threshold: Minimum similarity score to flag as duplicate
 
     Returns:
@@ -332,32 +336,27 @@ def detect_duplicate_submission(
     if not current_name:
         return conflicts
 
-    current_name_normalized = _normalize_company_name(current_name)
+    index = existing_submissions
+    if not isinstance(index, SubmissionNameIndex):
+        index = SubmissionNameIndex(existing_submissions)
 
-    for existing in existing_submissions:
+    for pos, similarity in index.matches(current_name, name_similarity_threshold):
+        existing = index.submissions[pos]
         existing_name = existing.get("applicant_name", "")
-        if not existing_name:
-            continue
-
-        existing_name_normalized = _normalize_company_name(existing_name)
-
-        similarity = _string_similarity(current_name_normalized, existing_name_normalized)
-
-        if similarity >= name_similarity_threshold:
-            conflicts.append(ConflictResult(
-                conflict_type="DUPLICATE_SUBMISSION",
-                field_name=None,
-                priority="high",
-                message=f"Potential duplicate of existing submission '{existing_name}'",
-                details={
-                    "existing_submission_id": existing.get("id"),
-                    "existing_applicant_name": existing_name,
-                    "similarity_score": similarity,
-                    "existing_date_received": existing.get("date_received"),
-                    "existing_broker_email": existing.get("broker_email"),
-                },
-                conflicting_values=[],
-            ))
+        conflicts.append(ConflictResult(
+            conflict_type="DUPLICATE_SUBMISSION",
+            field_name=None,
+            priority="high",
+            message=f"Potential duplicate of existing submission '{existing_name}'",
+            details={
+                "existing_submission_id": existing.get("id"),
+                "existing_applicant_name": existing_name,
+                "similarity_score": similarity,
+                "existing_date_received": existing.get("date_received"),
+                "existing_broker_email": existing.get("broker_email"),
+            },
+            conflicting_values=[],
+        ))
 
     return conflicts
 
@@ -446,7 +445,7 @@ def detect_document_conflicts(submission_id: str) -> list[ConflictResult]:
     return conflicts
 
 
-def detect_application_contradictions(app_data: dict) -> list[ConflictResult]:
+def detect_application_contradictions(app_data: dict | FlatAppData) -> list[ConflictResult]:
     """
     Detect contradictory answers within the application form.
 
@@ -455,7 +454,7 @@ def detect_application_contradictions(app_data: dict) -> list[ConflictResult]:
     - hasMFA=No but mfaType specified
 
     Args:
-        app_data: Raw application JSON data
+        app_data: Raw application JSON data, or a prebuilt FlatAppData
 
     Returns:
         List of contradiction conflicts
@@ -465,27 +464,27 @@ def detect_application_contradictions(app_data: dict) -> list[ConflictResult]:
     if not app_data:
         return conflicts
 
-    # Flatten nested app data for easier field lookup
-    flat_data = _flatten_app_data(app_data)
+    # Flattened view (case-insensitive lookup, "data" wrapper unwrapped)
+    get_field = FlatAppData.of(app_data).get_ci
 
     for rule in APPLICATION_CONTRADICTION_RULES:
         field_a = rule["field_a"]
         field_b = rule["field_b"]
 
         # Get field values (case-insensitive lookup with alternate field names)
-        value_a = _get_field_case_insensitive(flat_data, field_a)
+        value_a = get_field(field_a)
         # Try alternate field names if primary not found
         if value_a is None and "field_a_alt" in rule:
             for alt_field in rule["field_a_alt"]:
-                value_a = _get_field_case_insensitive(flat_data, alt_field)
+                value_a = get_field(alt_field)
                 if value_a is not None:
                     break
 
-        value_b = _get_field_case_insensitive(flat_data, field_b)
+        value_b = get_field(field_b)
         # Try alternate field names if primary not found
         if value_b is None and "field_b_alt" in rule:
             for alt_field in rule["field_b_alt"]:
-                value_b = _get_field_case_insensitive(flat_data, alt_field)
+                value_b = get_field(alt_field)
                 if value_b is not None:
                     break
 
@@ -608,46 +607,6 @@ def detect_sign_off_required(
     return conflicts
 
 
-def _flatten_app_data(app_data: dict) -> dict:
-    """
-    Flatten nested application data structure for easier field lookup.
-
-    Handles the common pattern where app data has a "data" wrapper
-    with nested sections.
-    """
-    flat = {}
-
-    def _flatten(obj: dict, prefix: str = ""):
-        for key, value in obj.items():
-            full_key = f"{prefix}.{key}" if prefix else key
-            if isinstance(value, dict):
-                _flatten(value, full_key)
-            else:
-                # Store both with and without prefix for flexible lookup
-                flat[key] = value
-                flat[full_key] = value
-                flat[key.lower()] = value
-
-    # Handle "data" wrapper if present
-    if "data" in app_data and isinstance(app_data["data"], dict):
-        _flatten(app_data["data"])
-    else:
-        _flatten(app_data)
-
-    return flat
-
-
-def _get_field_case_insensitive(flat_data: dict, field_name: str) -> Any:
-    """Get a field value with case-insensitive lookup."""
-    # Try exact match first
-    if field_name in flat_data:
-        return flat_data[field_name]
-    # Try lowercase
-    if field_name.lower() in flat_data:
-        return flat_data[field_name.lower()]
-    return None
-
-
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -851,14 +810,16 @@ def _string_similarity(s1: str, s2: str) -> float:
     if s1 == s2:
         return 1.0
 
-    # Generate trigrams
-    def trigrams(s: str) -> set[str]:
-        s = f"  {s}  "  # Pad for edge trigrams
-        return {s[i:i+3] for i in range(len(s) - 2)}
+    return _trigram_jaccard(_trigrams(s1), _trigrams(s2))
+
 
-    t1 = trigrams(s1)
-    t2 = trigrams(s2)
+def _trigrams(s: str) -> frozenset[str]:
+    """Character trigrams of s, padded so edges get their own trigrams."""
+    s = f"  {s}  "  # Pad for edge trigrams
+    return frozenset(s[i:i+3] for i in range(len(s) - 2))
 
+
+def _trigram_jaccard(t1: frozenset[str], t2: frozenset[str]) -> float:
     intersection = len(t1 & t2)
     union = len(t1 | t2)
 
@@ -868,6 +829,101 @@ def _string_similarity(s1: str, s2: str) -> float:
     return intersection / union
 
 
+# =============================================================================
+# NAME INDEX
+# =============================================================================
+
+class SubmissionNameIndex:
+    """
+    Reusable index of existing submissions for detect_duplicate_submission.
+
+    Normalized names and trigram sets are computed once per submission, and
+    an inverted trigram -> submission posting list (bucketed by trigram-set
+    size) finds candidates. A query only reads the postings of its rarest
+    trigrams (prefix filtering: a name with Jaccard >= t shares at least
+    ceil(t * |Q|) of the query's |Q| trigrams, so it must share one of the
+    |Q| - ceil(t|Q|) + 1 rarest), and only the size buckets in
+    [t|Q|, |Q|/t]. Candidates are verified with the exact _string_similarity
+    arithmetic, so matches and scores are identical to the pairwise loop.
+
+        index = SubmissionNameIndex(existing_submissions)
+        detect_duplicate_submission(current_values, index)
+    """
+
+    def __init__(self, submissions: list[dict] | None = None):
+        self.submissions: list[dict] = []
+        self._names: list[str] = []                   # normalized, "" if unindexed
+        self._trigrams: list[frozenset[str]] = []
+        self._postings: dict[str, dict[int, list[int]]] = defaultdict(dict)  # gram -> size -> positions
+        self._df: dict[str, int] = defaultdict(int)
+        for submission in submissions or ():
+            self.add(submission)
+
+    def __len__(self) -> int:
+        return len(self.submissions)
+
+    def add(self, submission: dict) -> None:
+        """Append a submission (dict with id, applicant_name, broker_email, date_received)."""
+        pos = len(self.submissions)
+        name = _normalize_company_name(submission.get("applicant_name", "") or "")
+        grams = _trigrams(name) if name else frozenset()
+        self.submissions.append(submission)
+        self._names.append(name)
+        self._trigrams.append(grams)
+        size = len(grams)
+        for gram in grams:
+            self._postings[gram].setdefault(size, []).append(pos)
+            self._df[gram] += 1
+
+    def matches(self, name: str, threshold: float) -> list[tuple[int, float]]:
+        """(position, similarity) of submissions with similarity >= threshold, in insertion order."""
+        normalized = _normalize_company_name(name)
+        if threshold <= 0:
+            # Every named submission qualifies (even at similarity 0): no pruning possible
+            return [
+                (pos, _string_similarity(normalized, other))
+                for pos, submission in enumerate(self.submissions)
+                if submission.get("applicant_name", "")
+                for other in (self._names[pos],)
+            ]
+        if not normalized:
+            return []
+
+        query = _trigrams(normalized)
+        size = len(query)
+        min_overlap = math.ceil(threshold * size - 1e-9)
+        prefix = size - min_overlap + 1
+        if prefix <= 0:
+            return []
+
+        # |B| outside [t|Q|, |Q|/t] can't reach Jaccard t
+        sizes = range(math.ceil(threshold * size - 1e-9), math.floor(size / threshold + 1e-9) + 1)
+
+        df = self._df
+        rarest = sorted(query, key=lambda g: df.get(g, 0))[:prefix]
+        candidates: set[int] = set()
+        for gram in rarest:
+            buckets = self._postings.get(gram)
+            if not buckets:
+                continue
+            for bucket_size in sizes:
+                bucket = buckets.get(bucket_size)
+                if bucket:
+                    candidates.update(bucket)
+
+        found = []
+        trigram_sets = self._trigrams
+        for pos in candidates:
+            other = trigram_sets[pos]
+            shared = len(query & other)
+            # same integers as _trigram_jaccard's len(t1 & t2) / len(t1 | t2), without building the union
+            similarity = 1.0 if self._names[pos] == normalized else shared / (size + len(other) - shared)
+            if similarity >= threshold:
+                found.append((pos, similarity))
+        found.sort()
+        return found
+
+
 # =============================================================================
 # CONVERSION HELPERS
 # =============================================================================
@@ -47,6 +47,7 @@ from core.conflict_config import (
     is_eager_field,
     is_field_tracked,
 )
+from core.app_data_view import FlatAppData
 from core.conflict_detection import (
     ConflictResult,
     conflicts_to_dicts,
@@ -69,11 +70,7 @@ except ImportError:
     HAS_CONFLICT_ANALYZER = False
 
 # Database connection
-import os
-import importlib.util
-spec = importlib.util.spec_from_file_location("db", os.path.join(os.path.dirname(__file__), "db.py"))
-db = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(db)
+from core import db
 get_conn = db.get_conn
 
 
@@ -289,7 +286,7 @@ class ConflictService:
     def _run_and_cache(
         self,
         submission_id: str,
-        app_data: dict | None = None,
+        app_data: dict | FlatAppData | None = None,
         broker_info: dict | None = None,
     ) -> list[dict]:
         """
@@ -325,7 +322,9 @@ class ConflictService:
         Call this from the pipeline when you have access to app_data
         and broker_info.
         """
-        conflicts = self._run_and_cache(submission_id, app_data, broker_info)
+        # Flatten the application once for contradiction and credibility checks
+        app_view = FlatAppData(app_data) if app_data else None
+        conflicts = self._run_and_cache(submission_id, app_view, broker_info)
 
         # Run dynamic LLM-based conflict detection
         if app_data and HAS_CONFLICT_ANALYZER:
@@ -354,7 +353,7 @@ class ConflictService:
         if app_data:
             self.calculate_and_store_credibility(
                 submission_id=submission_id,
-                app_data=app_data,
+                app_data=app_view,
                 submission_data=submission_data,
             )
 
@@ -399,7 +398,7 @@ class ConflictService:
     def calculate_and_store_credibility(
         self,
         submission_id: str,
-        app_data: dict,
+        app_data: dict | FlatAppData,
         submission_data: dict | None = None,
     ) -> CredibilityScore:
         """
@@ -407,7 +406,7 @@ class ConflictService:
 
         Args:
             submission_id: UUID of the submission
-            app_data: The application form data
+            app_data: The application form data (raw or as a FlatAppData)
             submission_data: Additional metadata (NAICS, revenue, etc.)
 
         Returns:
@@ -946,6 +945,28 @@ def get_submission_context(submission_id: str) -> dict:
         }
 
 
+# k nearest by ops_embedding first (ORDER BY <=> LIMIT is what the HNSW index
+# serves), then the similarity threshold on just those rows. Putting the
+# threshold in the scan's WHERE forces a distance computation per row.
+# Index: db_setup/create_duplicate_detection_index.sql
+DUPLICATE_KNN_SQL = """
+    SELECT id, applicant_name, broker_email, date_received, similarity
+    FROM (
+        SELECT
+            id, applicant_name, broker_email, date_received,
+            1 - (ops_embedding <=> CAST(:embedding AS vector)) as similarity
+        FROM submissions
+        WHERE ops_embedding IS NOT NULL
+        ORDER BY ops_embedding <=> CAST(:embedding AS vector)
+        LIMIT :candidates
+    ) nearest
+    WHERE id != :submission_id
+      AND similarity >= :threshold
+    ORDER BY similarity DESC
+    LIMIT :limit
+"""
+
+
 def check_duplicate_submission(
     submission_id: str,
     similarity_threshold: float = 0.95,
@@ -954,7 +975,9 @@ def check_duplicate_submission(
     """
     Check for potential duplicate submissions using vector similarity.
 
-    Uses the ops_embedding column for semantic similarity search.
+    Uses the ops_embedding column for semantic similarity search: an
+    index-backed k-NN query for the nearest ``limit`` submissions (plus
+    one, the submission itself), then the similarity threshold.
 
     Args:
         submission_id: UUID of the submission to check
@@ -977,24 +1000,13 @@ def check_duplicate_submission(
             return []
 
         embedding = row[0]
-        current_name = row[1]
-        current_date = row[2]
 
-        # Find similar submissions (excluding self)
-        result = conn.execute(text("""
-            SELECT
-                id, applicant_name, broker_email, date_received,
-                1 - (ops_embedding <=> :embedding) as similarity
-            FROM submissions
-            WHERE id != :submission_id
-              AND ops_embedding IS NOT NULL
-              AND 1 - (ops_embedding <=> :embedding) >= :threshold
-            ORDER BY ops_embedding <=> :embedding
-            LIMIT :limit
-        """), {
+        # Nearest neighbours (self included, hence limit + 1), then threshold
+        result = conn.execute(text(DUPLICATE_KNN_SQL), {
             "submission_id": submission_id,
             "embedding": embedding,
             "threshold": similarity_threshold,
+            "candidates": limit + 1,
             "limit": limit,
         })
 
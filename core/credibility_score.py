@@ -13,8 +13,11 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
+from core.app_data_view import FlatAppData, normalize_answer as _normalize_value
+from core.compiled_rules import CompiledRule, RuleSet, options_matcher
 from core.credibility_config import (
     DIMENSION_WEIGHTS,
     SEVERITY_WEIGHTS,
@@ -115,32 +118,9 @@ class CredibilityScore:
 # HELPER FUNCTIONS
 # =============================================================================
 
-def _flatten_app_data(app_data: dict, prefix: str = "") -> dict[str, Any]:
-    """Flatten nested app data into dot-notation keys."""
-    result = {}
-    for key, value in app_data.items():
-        full_key = f"{prefix}.{key}" if prefix else key
-        if isinstance(value, dict):
-            result.update(_flatten_app_data(value, full_key))
-        else:
-            result[full_key] = value
-            # Also store without prefix for easier matching
-            result[key] = value
-    return result
-
-
-def _normalize_value(value: Any) -> Any:
-    """Normalize a value for comparison."""
-    if value is None:
-        return None
-    if isinstance(value, str):
-        v = value.strip().lower()
-        if v in ("yes", "true"):
-            return True
-        if v in ("no", "false"):
-            return False
-        return v
-    return value
+# Compiled once: completeness checks every answer against these
+_NONSENSE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in NONSENSE_PATTERNS]
+_VENDOR_RE = re.compile("|".join(re.escape(vendor) for vendor in sorted(KNOWN_VENDORS)))
 
 
 def _is_empty(value: Any) -> bool:
@@ -168,18 +148,14 @@ def _is_nonsense(value: Any) -> bool:
     if _contains_vendor(value):
         return False
 
-    for pattern in NONSENSE_PATTERNS:
-        if re.match(pattern, v, re.IGNORECASE):
-            return True
-    return False
+    return any(pattern.match(v) for pattern in _NONSENSE_RES)
 
 
 def _contains_vendor(value: Any) -> bool:
     """Check if a value contains a known vendor name."""
     if not isinstance(value, str):
         return False
-    v = value.lower()
-    return any(vendor in v for vendor in KNOWN_VENDORS)
+    return _VENDOR_RE.search(value.lower()) is not None
 
 
 def _extract_number(value: Any) -> float | None:
@@ -200,14 +176,70 @@ def _extract_number(value: Any) -> float | None:
 # CONSISTENCY SCORE
 # =============================================================================
 
+def _compile_consistency_rule(rule: dict) -> CompiledRule:
+    """
+    Compile one CONSISTENCY_RULES entry.
+
+    The check takes a FlatAppData and returns (field_a, value_a, field_b,
+    value_b) when field_a matches a trigger value and field_b violates the
+    condition.
+    """
+    field_a = rule["field_a"]
+    field_b = rule["field_b"]
+    condition = rule["condition"]
+    triggered = options_matcher(rule.get("value_a", []), _normalize_value)
+
+    if condition == "should_be_empty":
+        def violated(view: FlatAppData, value_b: Any) -> bool:
+            return not _is_empty(value_b)
+    elif condition == "should_not_be_empty":
+        def violated(view: FlatAppData, value_b: Any) -> bool:
+            return _is_empty(value_b)
+    elif condition == "should_be_empty_or_zero":
+        def violated(view: FlatAppData, value_b: Any) -> bool:
+            return not _is_empty(value_b) and _extract_number(value_b) != 0
+    elif condition == "should_not_be":
+        conflicting = options_matcher(rule.get("conflict_values", []), _normalize_value)
+
+        def violated(view: FlatAppData, value_b: Any) -> bool:
+            return conflicting(view.get_normalized(field_b))
+    else:
+        def violated(view: FlatAppData, value_b: Any) -> bool:
+            return False
+
+    def check(view: FlatAppData):
+        value_a = view.fields.get(field_a)
+        if value_a is None or not triggered(view.normalized[field_a]):
+            return None
+        value_b = view.fields.get(field_b)
+        if not violated(view, value_b):
+            return None
+        return field_a, value_a, field_b, value_b
+
+    return CompiledRule(name=rule["name"], trigger_field=field_a, check=check, rule=rule)
+
+
+def compile_consistency_rules(rules: list[dict]) -> RuleSet:
+    """Compile consistency rules into a RuleSet evaluated against FlatAppData."""
+    return RuleSet([_compile_consistency_rule(rule) for rule in rules])
+
+
+@lru_cache(maxsize=1)
+def consistency_ruleset() -> RuleSet:
+    """CONSISTENCY_RULES, compiled once per process."""
+    return compile_consistency_rules(CONSISTENCY_RULES)
+
+
 def calculate_consistency_score(
-    app_data: dict,
+    app_data: dict | FlatAppData,
     testable_pairs: int | None = None,
 ) -> DimensionScore:
     """
     Calculate consistency score based on contradictions found.
 
     Consistency = 1 - (weighted_contradictions / testable_pairs)
+
+    ``app_data`` may be the raw application dict or a prebuilt FlatAppData.
     """
     if not app_data:
         return DimensionScore(
@@ -218,79 +250,37 @@ def calculate_consistency_score(
             details={"testable_pairs": 0, "contradictions": 0},
         )
 
-    flat_data = _flatten_app_data(app_data)
+    view = FlatAppData.of(app_data)
+    flat_data = view.fields
     issues: list[CredibilityIssue] = []
     weighted_contradictions = 0.0
 
-    for rule in CONSISTENCY_RULES:
-        field_a = rule["field_a"]
-        field_b = rule["field_b"]
+    for hit in consistency_ruleset().evaluate(view, present=flat_data):
+        rule = hit.rule.rule
+        field_a, value_a, field_b, value_b = hit.payload
+        severity = rule.get("severity", "medium")
+        weight = SEVERITY_WEIGHTS.get(severity, 1.0)
+        weighted_contradictions += weight
 
-        # Get values
-        value_a = flat_data.get(field_a)
-        value_b = flat_data.get(field_b)
-
-        # Skip if field_a not present
-        if value_a is None:
-            continue
-
-        # Check if field_a matches trigger values
-        trigger_values = rule.get("value_a", [])
-        normalized_a = _normalize_value(value_a)
-
-        matches_trigger = False
-        for trigger in trigger_values:
-            if _normalize_value(trigger) == normalized_a:
-                matches_trigger = True
-                break
-
-        if not matches_trigger:
-            continue
-
-        # Now check the condition on field_b
-        condition = rule["condition"]
-        is_contradiction = False
-
-        if condition == "should_be_empty":
-            is_contradiction = not _is_empty(value_b)
-        elif condition == "should_not_be_empty":
-            is_contradiction = _is_empty(value_b)
-        elif condition == "should_be_empty_or_zero":
-            num = _extract_number(value_b)
-            is_contradiction = not _is_empty(value_b) and num != 0
-        elif condition == "should_not_be":
-            conflict_values = rule.get("conflict_values", [])
-            normalized_b = _normalize_value(value_b)
-            for cv in conflict_values:
-                if _normalize_value(cv) == normalized_b:
-                    is_contradiction = True
-                    break
-
-        if is_contradiction:
-            severity = rule.get("severity", "medium")
-            weight = SEVERITY_WEIGHTS.get(severity, 1.0)
-            weighted_contradictions += weight
-
-            issues.append(CredibilityIssue(
-                dimension="consistency",
-                rule_name=rule["name"],
-                severity=severity,
-                message=rule["message"],
-                field_name=field_b,
-                field_value=value_b,
-                details={
-                    "trigger_field": field_a,
-                    "trigger_value": value_a,
-                    "conflict_field": field_b,
-                    "conflict_value": value_b,
-                },
-            ))
+        issues.append(CredibilityIssue(
+            dimension="consistency",
+            rule_name=rule["name"],
+            severity=severity,
+            message=rule["message"],
+            field_name=field_b,
+            field_value=value_b,
+            details={
+                "trigger_field": field_a,
+                "trigger_value": value_a,
+                "conflict_field": field_b,
+                "conflict_value": value_b,
+            },
+        ))
 
     # Determine testable pairs based on app complexity
     if testable_pairs is None:
         # Estimate based on fields present
-        question_count = len([k for k, v in flat_data.items() if v is not None])
-        complexity = get_app_complexity(question_count)
+        complexity = get_app_complexity(view.question_count)
         testable_pairs = complexity["testable_pairs"]
 
     # Calculate score
@@ -393,13 +383,15 @@ def _matches_context(rule_context: dict, business_context: BusinessContext) -> b
 
 
 def calculate_plausibility_score(
-    app_data: dict,
+    app_data: dict | FlatAppData,
     submission_data: dict | None = None,
 ) -> DimensionScore:
     """
     Calculate plausibility score based on business context.
 
     Plausibility = 1 - (weighted_implausibilities / context_checkable_questions)
+
+    ``app_data`` may be the raw application dict or a prebuilt FlatAppData.
     """
     if not app_data:
         return DimensionScore(
@@ -411,9 +403,10 @@ def calculate_plausibility_score(
         )
 
     # Build business context
-    context_data = {**(submission_data or {}), **app_data}
+    view = FlatAppData.of(app_data)
+    context_data = {**(submission_data or {}), **view.raw}
     context = BusinessContext.from_submission(context_data)
-    flat_data = _flatten_app_data(app_data)
+    flat_data = view.fields
 
     issues: list[CredibilityIssue] = []
     weighted_implausibilities = 0.0
@@ -434,7 +427,7 @@ def calculate_plausibility_score(
 
         # Check if value is implausible
         implausible_values = rule.get("implausible_values", [])
-        normalized = _normalize_value(value)
+        normalized = view.normalized[field_name]
 
         is_implausible = any(
             _normalize_value(iv) == normalized
@@ -496,7 +489,7 @@ def calculate_plausibility_score(
 # =============================================================================
 
 def calculate_completeness_score(
-    app_data: dict,
+    app_data: dict | FlatAppData,
     required_fields: list[str] | None = None,
 ) -> DimensionScore:
     """
@@ -507,6 +500,8 @@ def calculate_completeness_score(
     - Specific details provided (vendors, percentages)
     - Quality of free-form text
     - Red flags (all-yes, nonsense text)
+
+    ``app_data`` may be the raw application dict or a prebuilt FlatAppData.
     """
     if not app_data:
         return DimensionScore(
@@ -517,7 +512,9 @@ def calculate_completeness_score(
             details={},
         )
 
-    flat_data = _flatten_app_data(app_data)
+    view = FlatAppData.of(app_data)
+    flat_data = view.fields
+    normalized_data = view.normalized
     issues: list[CredibilityIssue] = []
 
     points_earned = 0
@@ -574,7 +571,7 @@ def calculate_completeness_score(
             points_earned += COMPLETENESS_POINTS["percentage_provided"]
 
         # Track yes/no for pattern detection
-        normalized = _normalize_value(value)
+        normalized = normalized_data[field_name]
         if normalized is True:
             yes_count += 1
             security_questions += 1
@@ -657,7 +654,7 @@ def calculate_completeness_score(
 # =============================================================================
 
 def calculate_credibility_score(
-    app_data: dict,
+    app_data: dict | FlatAppData,
     submission_data: dict | None = None,
     required_fields: list[str] | None = None,
     question_count: int | None = None,
@@ -666,7 +663,8 @@ def calculate_credibility_score(
     Calculate the complete credibility score for an application.
 
     Args:
-        app_data: The application form data (security questions, etc.)
+        app_data: The application form data (security questions, etc.), raw
+            or as a FlatAppData shared with other checks
         submission_data: Additional submission metadata (NAICS, revenue, etc.)
         required_fields: List of required field names
         question_count: Override for question count (for complexity calculation)
@@ -674,26 +672,28 @@ def calculate_credibility_score(
     Returns:
         CredibilityScore with all dimensions and issues
     """
+    # Flatten once and share the view across dimensions
+    view = FlatAppData.of(app_data)
+
     # Determine app complexity
     if question_count is None:
-        flat = _flatten_app_data(app_data) if app_data else {}
-        question_count = len([k for k, v in flat.items() if v is not None])
+        question_count = view.question_count
 
     complexity = get_app_complexity(question_count)
 
     # Calculate each dimension
     consistency = calculate_consistency_score(
-        app_data,
+        view,
         testable_pairs=complexity["testable_pairs"],
     )
 
     plausibility = calculate_plausibility_score(
-        app_data,
+        view,
         submission_data=submission_data,
     )
 
     completeness = calculate_completeness_score(
-        app_data,
+        view,
         required_fields=required_fields,
     )
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 from dotenv import load_dotenv
 load_dotenv()  # this will read .env into os.environ
 
@@ -11,24 +13,196 @@ from sqlalchemy.engine import Engine
 
 DATABASE_URL = os.environ["DATABASE_URL"]
 
+# One process-wide pool. core.* helpers (SQLAlchemy) and api/main.py
+# (raw psycopg2 cursors) both check connections out of this engine's pool.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
 engine: Engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,   # checks connections before use
-    pool_size=5,          # max open connections
-    max_overflow=5,       # extra if burst needed
+    pool_size=POOL_SIZE,  # max open connections
+    max_overflow=MAX_OVERFLOW,  # extra if burst needed
+    pool_timeout=POOL_TIMEOUT,  # seconds to wait for a free connection
     pool_recycle=1800,    # recycle every 30 mins
 )
 
+
+# ─────────────────────────────────────────────────────────────
+# Pool metrics
+# ─────────────────────────────────────────────────────────────
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "checkouts": 0,
+    "wait_ms_total": 0.0,
+    "wait_ms_max": 0.0,
+    "checkout_errors": 0,
+}
+
+
+def _record_wait(started: float, failed: bool = False) -> None:
+    wait_ms = (time.perf_counter() - started) * 1000
+    with _metrics_lock:
+        if failed:
+            _metrics["checkout_errors"] += 1
+            return
+        _metrics["checkouts"] += 1
+        _metrics["wait_ms_total"] += wait_ms
+        _metrics["wait_ms_max"] = max(_metrics["wait_ms_max"], wait_ms)
+
+
+def pool_stats() -> dict:
+    """Snapshot of the shared pool: size, in-use, overflow and checkout wait times."""
+    pool = engine.pool
+    with _metrics_lock:
+        checkouts = _metrics["checkouts"]
+        stats = {
+            "pool_size": POOL_SIZE,
+            "max_overflow": MAX_OVERFLOW,
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts": checkouts,
+            "checkout_errors": _metrics["checkout_errors"],
+            "wait_ms_avg": round(_metrics["wait_ms_total"] / checkouts, 3) if checkouts else 0.0,
+            "wait_ms_max": round(_metrics["wait_ms_max"], 3),
+        }
+    return stats
+
+
+# ─────────────────────────────────────────────────────────────
+# Connection checkout
+# ─────────────────────────────────────────────────────────────
+
 @contextmanager
 def get_conn():
     """Get a database connection with proper transaction support.
 
-    Uses engine.begin() which auto-commits on successful exit
+    Same as engine.begin(): auto-commits on successful exit
     and rolls back on exception. Explicit conn.commit() calls
     in code are no longer needed but won't cause errors.
     """
-    with engine.begin() as conn:
-        yield conn
+    started = time.perf_counter()
+    try:
+        conn = engine.connect()
+    except Exception:
+        _record_wait(started, failed=True)
+        raise
+    _record_wait(started)
+    with conn:
+        with conn.begin():
+            yield conn
+
+
+class PooledConnection:
+    """psycopg2 connection checked out of the shared pool.
+
+    Behaves like the underlying DBAPI connection, except that cursor()
+    defaults to the requested cursor_factory and, when asked, registers
+    the pgvector adapter on each cursor (not the connection, so pooled
+    connections handed to SQLAlchemy later are unaffected).
+    """
+
+    def __init__(self, dbapi_conn, cursor_factory=None, vector: bool = False):
+        self._conn = dbapi_conn
+        self._cursor_factory = cursor_factory
+        self._vector = vector
+
+    def cursor(self, *args, **kwargs):
+        if self._cursor_factory is not None and not args:
+            kwargs.setdefault("cursor_factory", self._cursor_factory)
+        cur = self._conn.cursor(*args, **kwargs)
+        if self._vector:
+            from pgvector.psycopg2 import register_vector
+            register_vector(cur)
+        return cur
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@contextmanager
+def get_raw_conn(cursor_factory=None, vector: bool = False):
+    """Check a raw psycopg2 connection out of the shared pool.
+
+    Commits on successful exit, rolls back on exception, and always
+    returns the connection to the pool (same semantics as
+    ``with psycopg2.connect(...) as conn`` minus the reconnect).
+    """
+    started = time.perf_counter()
+    try:
+        fairy = engine.raw_connection()
+    except Exception:
+        _record_wait(started, failed=True)
+        raise
+    _record_wait(started)
+    try:
+        yield PooledConnection(fairy, cursor_factory=cursor_factory, vector=vector)
+        fairy.commit()
+    except BaseException:
+        fairy.rollback()
+        raise
+    finally:
+        fairy.close()  # returns the connection to the pool
+
+
+# ─────────────────────────────────────────────────────────────
+# Bulk writes
+# ─────────────────────────────────────────────────────────────
+
+def _waves_by_key(rows: list, key) -> list[list[int]]:
+    """Split row indexes so no wave repeats a key (n-th occurrence -> wave n)."""
+    waves: list[list[int]] = []
+    seen: dict = {}
+    for i, row in enumerate(rows):
+        k = key(row)
+        n = seen.get(k, 0)
+        seen[k] = n + 1
+        if n == len(waves):
+            waves.append([])
+        waves[n].append(i)
+    return waves
+
+
+def insert_many(conn, sql: str, rows, template: str | None = None,
+                page_size: int = 1000, returning: bool = False, conflict_key=None) -> list:
+    """Multi-row INSERT (psycopg2 execute_values) on a SQLAlchemy or raw connection.
+
+    ``sql`` contains a single ``VALUES %s`` placeholder and rows are tuples;
+    ``template`` overrides the per-row VALUES template, e.g. to add NOW().
+    Rows go out ``page_size`` per statement, inside the caller's transaction.
+
+    With ``returning=True`` the RETURNING rows come back in input order (one
+    INSERT ... VALUES returns rows in VALUES order). ``conflict_key(row)``
+    keeps repeated keys out of the same statement, so ON CONFLICT DO UPDATE
+    sees them one after another exactly like a per-row loop would.
+    """
+    from psycopg2.extras import execute_values
+
+    rows = list(rows)
+    if not rows:
+        return []
+    waves = [list(range(len(rows)))] if conflict_key is None else _waves_by_key(rows, conflict_key)
+    dbapi_conn = conn.connection if hasattr(conn, "exec_driver_sql") else conn
+    out: list = [None] * len(rows) if returning else []
+    cur = dbapi_conn.cursor()
+    try:
+        for wave in waves:
+            fetched = execute_values(
+                cur, sql, [rows[i] for i in wave],
+                template=template, page_size=page_size, fetch=returning,
+            )
+            if returning:
+                if len(fetched) != len(wave):
+                    raise RuntimeError(f"insert_many: expected {len(wave)} RETURNING rows, got {len(fetched)}")
+                for i, row in zip(wave, fetched):
+                    out[i] = row
+    finally:
+        cur.close()
+    return out
+
 
 def fetch_df(sql: str, params: dict | None = None, limit: int | None = None):
     import pandas as pd
@@ -0,0 +1,92 @@
+"""
+Async Database Access
+
+psycopg 3 async pool for read-heavy API endpoints. psycopg 3 uses the same
+%s placeholder style as psycopg2, so SQL is shared verbatim between the sync
+(core.db / api.main.get_conn) and async paths.
+
+Disabled (and the API falls back to the sync handlers) when psycopg 3 is not
+installed or ASYNC_DB=0.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+try:
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # optional dependency
+    dict_row = None
+    AsyncConnectionPool = None
+
+
+ASYNC_POOL_MIN = int(os.getenv("ASYNC_DB_POOL_MIN", "2"))
+ASYNC_POOL_MAX = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+
+_pool: Optional["AsyncConnectionPool"] = None
+
+
+def is_enabled() -> bool:
+    """True when the async path is installed, configured and not switched off."""
+    return (
+        AsyncConnectionPool is not None
+        and bool(os.getenv("DATABASE_URL"))
+        and os.getenv("ASYNC_DB", "1") != "0"
+    )
+
+
+async def open_pool() -> None:
+    """Open the process-wide async pool (idempotent)."""
+    global _pool
+    if _pool is not None:
+        return
+    if not is_enabled():
+        raise RuntimeError("Async DB disabled: install psycopg[binary] and psycopg-pool, or unset ASYNC_DB=0")
+    pool = AsyncConnectionPool(
+        os.environ["DATABASE_URL"],
+        min_size=ASYNC_POOL_MIN,
+        max_size=ASYNC_POOL_MAX,
+        kwargs={"row_factory": dict_row},
+        check=AsyncConnectionPool.check_connection,  # health check on checkout
+        open=False,
+    )
+    await pool.open()
+    _pool = pool
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def get_async_conn():
+    """Check an async connection (dict rows) out of the pool."""
+    if _pool is None:
+        await open_pool()
+    async with _pool.connection() as conn:
+        yield conn
+
+
+async def fetch_all(sql: str, params: Any = None) -> list[dict]:
+    async with get_async_conn() as conn:
+        cur = await conn.execute(sql, params)
+        return await cur.fetchall()
+
+
+async def fetch_one(sql: str, params: Any = None) -> Optional[dict]:
+    async with get_async_conn() as conn:
+        cur = await conn.execute(sql, params)
+        return await cur.fetchone()
+
+
+def pool_stats() -> dict:
+    """Async pool metrics (empty when the pool is not open)."""
+    if _pool is None:
+        return {}
+    return _pool.get_stats()
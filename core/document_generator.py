@@ -10,12 +10,8 @@ import os
 import uuid
 import json
 from datetime import datetime, date, timedelta
-from pathlib import Path
-from tempfile import NamedTemporaryFile
 from typing import Optional
 
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
 from sqlalchemy import text
 
 # Coverage configuration
@@ -24,58 +20,38 @@ from rating_engine.coverage_config import (
     get_coverage_label,
     get_default_policy_form,
 )
+from rating_engine.tower import cmai_layer_index, layer_attachment, tower_amount
 
 # Database connection
-import importlib.util
-spec = importlib.util.spec_from_file_location("db", os.path.join(os.path.dirname(__file__), "db.py"))
-db = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(db)
+from core import db
 get_conn = db.get_conn
 
+# HTML -> PDF on the warm render workers
+from core.pdf_render import render_pdf
+
 # Supabase client
 from supabase import create_client
 SB = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
 
-# Template environment
-TEMPLATE_DIR = Path(__file__).parent.parent / "rating_engine" / "templates"
-TEMPLATE_ENV = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
-
-# Register custom filters
-def format_currency(value):
-    """Format currency with K/M suffixes."""
-    if value is None:
-        return "—"
-    if isinstance(value, str):
-        return value
-    if value >= 1_000_000 and value % 1_000_000 == 0:
-        return f"${value // 1_000_000}M"
-    elif value >= 1_000 and value % 1_000 == 0:
-        return f"${value // 1_000}K"
-    return f"${value:,}"
-
-def format_date(dt):
-    """Format date for display."""
-    if dt is None:
-        return "—"
-    if isinstance(dt, str):
-        return dt
-    if hasattr(dt, 'strftime'):
-        return dt.strftime("%B %d, %Y")
-    return str(dt)
-
-def format_limit(value):
-    """Format limit with K/M suffixes (no $ sign)."""
-    if value is None:
-        return "—"
-    if value >= 1_000_000 and value % 1_000_000 == 0:
-        return f"{value // 1_000_000}M"
-    elif value >= 1_000 and value % 1_000 == 0:
-        return f"{value // 1_000}K"
-    return f"{value:,}"
-
-TEMPLATE_ENV.filters['format_currency'] = format_currency
-TEMPLATE_ENV.filters['format_date'] = format_date
-TEMPLATE_ENV.filters['format_limit'] = format_limit
+# Shared template environment (filters, bytecode cache) and compiled DB templates
+from core.template_registry import (
+    TEMPLATE_DIR,
+    TEMPLATE_ENV,
+    PlaceholderTemplate,
+    db_template,
+    format_currency,
+    format_date,
+    format_limit,
+)
+
+# Placeholders understood by endorsement component templates
+COMPONENT_PLACEHOLDERS = (
+    "{{form_number}}",
+    "{{edition_date}}",
+    "{{policy_type}}",
+    "{{effective_date}}",
+    "{{policy_number}}",
+)
 
 
 def get_endorsement_component_templates(position: str = "primary") -> dict:
@@ -86,54 +62,62 @@ def get_endorsement_component_templates(position: str = "primary") -> dict:
         position: 'primary' or 'excess' - determines which templates to use
 
     Returns:
-        dict with 'header', 'lead_in', 'closing' keys containing HTML content
+        dict with 'header', 'lead_in', 'closing' keys containing compiled
+        templates (PlaceholderTemplate; str() gives the HTML, empty if none)
     """
-    components = {"header": "", "lead_in": "", "closing": ""}
+    components = {
+        component_type: PlaceholderTemplate("", COMPONENT_PLACEHOLDERS)
+        for component_type in ["header", "lead_in", "closing"]
+    }
 
     with get_conn() as conn:
-        # Fetch default templates for each component type
+        # Default template for each component type
         # Prefer position-specific templates, fall back to 'either'
-        for component_type in ["header", "lead_in", "closing"]:
-            result = conn.execute(text("""
-                SELECT content_html
-                FROM endorsement_component_templates
-                WHERE component_type = :component_type
-                  AND is_default = TRUE
-                  AND (position = :position OR position = 'either')
-                ORDER BY
-                    CASE WHEN position = :position THEN 0 ELSE 1 END
-                LIMIT 1
-            """), {"component_type": component_type, "position": position})
-            row = result.fetchone()
-            if row and row[0]:
-                components[component_type] = row[0]
+        result = conn.execute(text("""
+            SELECT DISTINCT ON (component_type)
+                   component_type, id, updated_at, content_html
+            FROM endorsement_component_templates
+            WHERE component_type IN ('header', 'lead_in', 'closing')
+              AND is_default = TRUE
+              AND (position = :position OR position = 'either')
+            ORDER BY
+                component_type,
+                CASE WHEN position = :position THEN 0 ELSE 1 END
+        """), {"position": position})
+        for component_type, template_id, updated_at, content_html in result.fetchall():
+            if content_html:
+                components[component_type] = db_template(
+                    template_id, updated_at, content_html, COMPONENT_PLACEHOLDERS
+                )
 
     return components
 
 
-def render_endorsement_component(template_html: str, context: dict) -> str:
+def render_endorsement_component(template: str | PlaceholderTemplate, context: dict) -> str:
     """
     Render an endorsement component template with variable substitution.
 
-    Replaces {{placeholder}} with values from context.
+    Replaces {{placeholder}} with values from context. Accepts a compiled
+    template (get_endorsement_component_templates) or raw HTML.
     """
-    if not template_html:
+    if not template:
         return ""
+    if isinstance(template, str):
+        template = PlaceholderTemplate(template, COMPONENT_PLACEHOLDERS)
 
-    result = template_html
     # Map context keys to template placeholders
     placeholder_map = {
-        "form_number": context.get("document_code", ""),
-        "edition_date": context.get("edition_date", ""),
-        "policy_type": context.get("document_type", "Cyber Quote").replace(" Quote", ""),
-        "effective_date": context.get("effective_date", ""),
-        "policy_number": context.get("document_number", ""),
+        "{{form_number}}": context.get("document_code", ""),
+        "{{edition_date}}": context.get("edition_date", ""),
+        "{{policy_type}}": context.get("document_type", "Cyber Quote").replace(" Quote", ""),
+        "{{effective_date}}": context.get("effective_date", ""),
+        "{{policy_number}}": context.get("document_number", ""),
     }
 
-    for key, value in placeholder_map.items():
-        result = result.replace("{{" + key + "}}", str(value) if value else "")
-
-    return result
+    return template.render({
+        token: str(placeholder_map[token]) if placeholder_map[token] else ""
+        for token in template.tokens
+    })
 
 
 def format_quote_display_name(limit: int, retention_or_attachment: int, position: str = "primary") -> str:
@@ -299,12 +283,7 @@ def preview_document(
     html_content = template.render(**context)
 
     # Generate PDF in memory
-    from io import BytesIO
-    pdf_buffer = BytesIO()
-    HTML(string=html_content).write_pdf(pdf_buffer)
-    pdf_buffer.seek(0)
-
-    return pdf_buffer.read()
+    return render_pdf(html_content)
 
 
 def get_document_context(submission_id: str, quote_option_id: str) -> dict:
@@ -404,30 +383,16 @@ def get_document_context(submission_id: str, quote_option_id: str) -> dict:
 
             if tower_json:
                 if position == "excess":
-                    # For excess, find the CMAI layer
-                    cmai_idx = None
-                    for i, layer in enumerate(tower_json):
-                        carrier = layer.get("carrier", "")
-                        if "CMAI" in carrier.upper():
-                            cmai_idx = i
-                            # Handle various numeric formats (int, float, string)
-                            limit_raw = layer.get("limit", 0)
-                            attachment_raw = layer.get("attachment", 0)
-                            premium_raw = layer.get("premium", 0)
-
-                            aggregate_limit = int(float(limit_raw)) if limit_raw else 0
-                            our_attachment = int(float(attachment_raw)) if attachment_raw else 0
-                            # Get premium from layer if not set at quote level
-                            if not our_premium:
-                                our_premium = int(float(premium_raw)) if premium_raw else 0
-                            break
-
-                    # If attachment is 0, calculate it from tower structure (sum of layers below CMAI)
-                    if our_attachment == 0 and cmai_idx is not None and cmai_idx > 0:
-                        our_attachment = sum(
-                            int(float(layer.get("limit", 0) or 0))
-                            for layer in tower_json[:cmai_idx]
-                        )
+                    # For excess, find the CMAI layer; with no attachment of its
+                    # own it sits on the layers below it
+                    cmai_idx = cmai_layer_index(tower_json)
+                    if cmai_idx is not None:
+                        cmai_layer = tower_json[cmai_idx]
+                        aggregate_limit = tower_amount(cmai_layer.get("limit"))
+                        our_attachment = layer_attachment(tower_json, cmai_idx)
+                        # Get premium from layer if not set at quote level
+                        if not our_premium:
+                            our_premium = tower_amount(cmai_layer.get("premium"))
 
                     # Fallback if no CMAI layer found
                     if aggregate_limit == 0 and tower_json:
@@ -771,31 +736,23 @@ def render_and_upload(template_name: str, context: dict, doc_type: str) -> str:
     html_content = template.render(**context)
 
     # Generate PDF
-    with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        HTML(string=html_content).write_pdf(tmp.name)
-        pdf_path = Path(tmp.name)
+    pdf_bytes = render_pdf(html_content)
 
-    try:
-        # Upload to Supabase
-        bucket = "quotes"
-        key = f"{doc_type}/{uuid.uuid4()}.pdf"
-
-        with pdf_path.open("rb") as f:
-            SB.storage.from_(bucket).upload(
-                key,
-                f,
-                {"content-type": "application/pdf"}
-            )
+    # Upload to Supabase
+    bucket = "quotes"
+    key = f"{doc_type}/{uuid.uuid4()}.pdf"
 
-        # Get public URL
-        base_url = os.getenv("SUPABASE_URL")
-        pdf_url = f"{base_url}/storage/v1/object/public/{bucket}/{key}"
+    SB.storage.from_(bucket).upload(
+        key,
+        pdf_bytes,
+        {"content-type": "application/pdf"}
+    )
 
-        return pdf_url
+    # Get public URL
+    base_url = os.getenv("SUPABASE_URL")
+    pdf_url = f"{base_url}/storage/v1/object/public/{bucket}/{key}"
 
-    finally:
-        # Clean up temp file
-        pdf_path.unlink(missing_ok=True)
+    return pdf_url
 
 
 def get_documents(submission_id: str) -> list[dict]:
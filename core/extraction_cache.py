@@ -0,0 +1,176 @@
+"""
+Extraction Result Cache
+
+Content-addressed cache for the paid extraction calls (Textract analyze,
+Claude extraction). An entry is keyed by the document's SHA-256 plus the
+strategy, extraction schema version and model, so re-extracting identical
+bytes - /extract, /extract-textract, extract-integrated, reprocessing -
+skips the API call. The cache stores the call's output only; callers still
+run their normal save path (textract rows, provenance) on a hit.
+
+Entries live in Postgres (extraction_cache, see
+db_setup/create_extraction_cache.sql). The cache fails open: any DB error
+is logged and treated as a miss.
+
+Environment:
+  EXTRACTION_CACHE  0 disables the cache (default: enabled)
+
+Usage:
+    from core import extraction_cache
+    sha = extraction_cache.file_sha256(file_path)
+    schema = extraction_cache.schema_version(extraction_schema)
+    payload, hit = extraction_cache.cached(sha, "claude_vision", model, schema, compute)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+# Bump when a cached payload's shape changes so old entries stop matching
+CACHE_FORMAT = 1
+NO_SCHEMA = "-"
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def enabled() -> bool:
+    return os.getenv("EXTRACTION_CACHE", "1") != "0" and bool(os.getenv("DATABASE_URL"))
+
+
+def file_sha256(file_path: str) -> str:
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def schema_version(schema: Any) -> str:
+    """Stable short hash of an extraction schema (plus the cache format)."""
+    digest = hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"v{CACHE_FORMAT}-{digest[:16]}"
+
+
+def _count(strategy: str, what: str) -> None:
+    with _stats_lock:
+        bucket = _stats.setdefault(strategy, {"hits": 0, "misses": 0, "writes": 0, "errors": 0})
+        bucket[what] += 1
+
+
+def get(content_sha256: str, strategy: str, schema: str, model: str) -> Optional[dict]:
+    """Cached payload, or None on a miss (or any DB error)."""
+    from core.db import get_conn
+
+    try:
+        with get_conn() as conn:
+            row = conn.execute(
+                text("""
+                    UPDATE extraction_cache
+                    SET hit_count = hit_count + 1, last_hit_at = NOW()
+                    WHERE content_sha256 = :sha AND strategy = :strategy
+                      AND schema_version = :schema AND model = :model
+                    RETURNING payload
+                """),
+                {"sha": content_sha256, "strategy": strategy, "schema": schema, "model": model},
+            ).fetchone()
+    except Exception as e:
+        print(f"[extraction_cache] Lookup failed ({strategy}): {e}")
+        _count(strategy, "errors")
+        return None
+
+    _count(strategy, "hits" if row else "misses")
+    if not row:
+        return None
+    payload = row[0]
+    return json.loads(payload) if isinstance(payload, str) else payload
+
+
+def put(content_sha256: str, strategy: str, schema: str, model: str, payload: dict) -> None:
+    from core.db import get_conn
+
+    try:
+        body = json.dumps(payload, default=str)
+        with get_conn() as conn:
+            conn.execute(
+                text("""
+                    INSERT INTO extraction_cache
+                    (content_sha256, strategy, schema_version, model, payload, payload_bytes)
+                    VALUES (:sha, :strategy, :schema, :model, CAST(:payload AS jsonb), :bytes)
+                    ON CONFLICT (content_sha256, strategy, schema_version, model)
+                    DO UPDATE SET payload = EXCLUDED.payload,
+                                  payload_bytes = EXCLUDED.payload_bytes,
+                                  created_at = NOW()
+                """),
+                {"sha": content_sha256, "strategy": strategy, "schema": schema,
+                 "model": model, "payload": body, "bytes": len(body)},
+            )
+        _count(strategy, "writes")
+    except Exception as e:
+        print(f"[extraction_cache] Store failed ({strategy}): {e}")
+        _count(strategy, "errors")
+
+
+def cached(
+    content_sha256: Optional[str],
+    strategy: str,
+    model: str,
+    schema: str,
+    compute: Callable[[], dict],
+) -> tuple[dict, bool]:
+    """
+    Return (payload, cache_hit). On a miss runs compute() and stores its result.
+
+    Pass content_sha256=None (or disable EXTRACTION_CACHE) to bypass the cache.
+    """
+    if not content_sha256 or not enabled():
+        return compute(), False
+
+    payload = get(content_sha256, strategy, schema, model)
+    if payload is not None:
+        print(f"[extraction_cache] Hit: {strategy} {content_sha256[:12]}")
+        return payload, True
+
+    payload = compute()
+    put(content_sha256, strategy, schema, model, payload)
+    return payload, False
+
+
+def cache_stats() -> Dict[str, Any]:
+    """In-process hit/miss counters by strategy plus table totals."""
+    with _stats_lock:
+        by_strategy = {k: dict(v) for k, v in _stats.items()}
+    hits = sum(s["hits"] for s in by_strategy.values())
+    lookups = hits + sum(s["misses"] for s in by_strategy.values())
+
+    stored: Dict[str, Any] = {}
+    if enabled():
+        from core.db import get_conn
+        try:
+            with get_conn() as conn:
+                row = conn.execute(text("""
+                    SELECT COUNT(*) AS entries,
+                           COALESCE(SUM(hit_count), 0) AS total_hits,
+                           COALESCE(SUM(payload_bytes), 0) AS total_bytes
+                    FROM extraction_cache
+                """)).mappings().fetchone()
+                stored = dict(row) if row else {}
+        except Exception as e:
+            stored = {"error": str(e)}
+
+    return {
+        "enabled": enabled(),
+        "process": {
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "by_strategy": by_strategy,
+        },
+        "stored": stored,
+    }
@@ -370,6 +370,24 @@ def extract_document(
         raise
 
 
+_TEXTRACT_INSERT_SQL = """
+    INSERT INTO textract_extractions
+    (document_id, page_number, field_key, field_value, field_type,
+     bbox_left, bbox_top, bbox_width, bbox_height, confidence)
+    VALUES %s
+    RETURNING id
+"""
+
+
+def _bbox_columns(bbox) -> tuple:
+    """(left, top, width, height) from a BoundingBox, a bbox dict, or None."""
+    if not bbox:
+        return (None, None, None, None)
+    if isinstance(bbox, dict):
+        return (bbox.get("left"), bbox.get("top"), bbox.get("width"), bbox.get("height"))
+    return (bbox.left, bbox.top, bbox.width, bbox.height)
+
+
 def _save_textract_bbox_data(document_id: str, key_value_pairs: dict) -> Dict[str, Dict]:
     """
     Save Textract key-value pairs with bbox to textract_extractions table.
@@ -377,7 +395,7 @@ def _save_textract_bbox_data(document_id: str, key_value_pairs: dict) -> Dict[st
 
     DEPRECATED: Use _save_textract_lines instead for better bbox coverage.
     """
-    from core.db import get_conn
+    from core.db import get_conn, insert_many
 
     if not key_value_pairs:
         return {}
@@ -385,6 +403,18 @@ def _save_textract_bbox_data(document_id: str, key_value_pairs: dict) -> Dict[st
     textract_map: Dict[str, Dict] = {}
 
     try:
+        rows = []
+        for field_key, data in key_value_pairs.items():
+            rows.append((
+                document_id,
+                data.get("page", 1),
+                field_key,
+                str(data.get("value", "")) if data.get("value") is not None else None,
+                data.get("type", "text"),
+                *_bbox_columns(data.get("bbox", {})),
+                data.get("confidence"),
+            ))
+
         with get_conn() as conn:
             # Clear existing extractions for this document
             conn.execute(
@@ -392,39 +422,16 @@ def _save_textract_bbox_data(document_id: str, key_value_pairs: dict) -> Dict[st
                 {"doc_id": document_id}
             )
 
-            # Insert new extractions and capture IDs
-            for field_key, data in key_value_pairs.items():
-                bbox = data.get("bbox", {})
-                result = conn.execute(
-                    text("""
-                        INSERT INTO textract_extractions
-                        (document_id, page_number, field_key, field_value, field_type,
-                         bbox_left, bbox_top, bbox_width, bbox_height, confidence)
-                        VALUES (:doc_id, :page, :key, :value, :type,
-                                :left, :top, :width, :height, :conf)
-                        RETURNING id
-                    """),
-                    {
-                        "doc_id": document_id,
-                        "page": data.get("page", 1),
-                        "key": field_key,
-                        "value": str(data.get("value", "")) if data.get("value") is not None else None,
-                        "type": data.get("type", "text"),
-                        "left": bbox.get("left"),
-                        "top": bbox.get("top"),
-                        "width": bbox.get("width"),
-                        "height": bbox.get("height"),
-                        "conf": data.get("confidence"),
-                    }
-                )
-                textract_id = str(result.fetchone()[0])
+            # Insert new extractions and capture IDs (in input order)
+            ids = insert_many(conn, _TEXTRACT_INSERT_SQL, rows, returning=True)
 
-                # Build mapping for Claude to reference
+            # Build mapping for Claude to reference
+            for (field_key, data), (textract_id,) in zip(key_value_pairs.items(), ids):
                 textract_map[field_key] = {
-                    "id": textract_id,
+                    "id": str(textract_id),
                     "value": data.get("value"),
                     "page": data.get("page", 1),
-                    "bbox": bbox,
+                    "bbox": data.get("bbox", {}),
                 }
             conn.commit()
             print(f"[orchestrator] Saved {len(key_value_pairs)} bbox entries for document {document_id}")
@@ -438,13 +445,16 @@ def _save_textract_lines(document_id: str, textract_result) -> Tuple[List[Dict],
     """
     Save Textract LINE blocks, KEY_VALUE_SET data, and raw checkboxes to textract_extractions table.
 
+    All rows go out as multi-row INSERTs (a few statements per document rather
+    than one round-trip per block); ids come back in input order.
+
     Returns:
         Tuple of (lines_for_claude, line_id_map, key_values_for_claude)
         - lines_for_claude: List of {id, text, page, bbox} for Claude prompt
         - line_id_map: Map of line/kv index -> database UUID for linking
         - key_values_for_claude: List of {id, key, value, type, page, bbox} for answers
     """
-    from core.db import get_conn
+    from core.db import get_conn, insert_many
 
     lines_for_claude = []
     key_values_for_claude = []
@@ -453,6 +463,63 @@ def _save_textract_lines(document_id: str, textract_result) -> Tuple[List[Dict],
     if not textract_result or not textract_result.fields:
         return lines_for_claude, line_id_map, key_values_for_claude
 
+    rows = []
+    # line_id_map key for each row that needs its id back (None = raw checkbox)
+    row_keys: List[Optional[str]] = []
+
+    # ALL raw checkboxes (SELECTION_ELEMENT) for position-based matching
+    # These are checkboxes Textract found but didn't link to KEY_VALUE pairs
+    for idx, cb in enumerate(textract_result.checkboxes or []):
+        rows.append((
+            document_id, cb.page,
+            f"CB_{idx}",  # Raw checkbox, not KV-linked
+            str(cb.is_selected), "raw_checkbox",
+            *_bbox_columns(cb.bbox), cb.confidence,
+        ))
+        row_keys.append(None)
+
+    # LINE blocks
+    for idx, field in enumerate(textract_result.fields):
+        if field.field_type != "text":
+            continue
+
+        bbox = field.bbox
+        rows.append((
+            document_id, field.page, f"LINE_{idx}", field.value, "line",
+            *_bbox_columns(bbox), field.confidence,
+        ))
+        row_keys.append(f"LINE_{idx}")
+        lines_for_claude.append({
+            "id": str(idx),
+            "text": field.value,
+            "page": field.page,
+            "bbox": bbox.to_dict() if bbox else None,
+        })
+
+    # KEY_VALUE_SET data (form fields and checkboxes with answers)
+    for kv_idx, (key_text, kv_data) in enumerate(textract_result.key_value_pairs.items()):
+        kv_id = f"KV_{kv_idx}"
+        bbox_data = kv_data.get("bbox", {})
+
+        rows.append((
+            document_id,
+            kv_data.get("page", 1),
+            key_text,  # The form field label/question
+            str(kv_data.get("value", "")),  # The answer
+            kv_data.get("type", "text"),  # "checkbox" or "text"
+            *_bbox_columns(bbox_data),
+            kv_data.get("confidence", 0),
+        ))
+        row_keys.append(kv_id)
+        key_values_for_claude.append({
+            "id": kv_id,
+            "key": key_text,
+            "value": kv_data.get("value"),
+            "type": kv_data.get("type", "text"),
+            "page": kv_data.get("page", 1),
+            "bbox": bbox_data,
+        })
+
     try:
         with get_conn() as conn:
             # Clear existing extractions for this document
@@ -461,110 +528,10 @@ def _save_textract_lines(document_id: str, textract_result) -> Tuple[List[Dict],
                 {"doc_id": document_id}
             )
 
-            # Save ALL raw checkboxes (SELECTION_ELEMENT) for position-based matching
-            # These are checkboxes Textract found but didn't link to KEY_VALUE pairs
-            for idx, cb in enumerate(textract_result.checkboxes or []):
-                bbox = cb.bbox
-                conn.execute(
-                    text("""
-                        INSERT INTO textract_extractions
-                        (document_id, page_number, field_key, field_value, field_type,
-                         bbox_left, bbox_top, bbox_width, bbox_height, confidence)
-                        VALUES (:doc_id, :page, :key, :value, :type,
-                                :left, :top, :width, :height, :conf)
-                    """),
-                    {
-                        "doc_id": document_id,
-                        "page": cb.page,
-                        "key": f"CB_{idx}",  # Raw checkbox, not KV-linked
-                        "value": str(cb.is_selected),
-                        "type": "raw_checkbox",
-                        "left": bbox.left if bbox else None,
-                        "top": bbox.top if bbox else None,
-                        "width": bbox.width if bbox else None,
-                        "height": bbox.height if bbox else None,
-                        "conf": cb.confidence,
-                    }
-                )
-
-            # Insert LINE blocks
-            for idx, field in enumerate(textract_result.fields):
-                if field.field_type != "text":
-                    continue
-
-                bbox = field.bbox
-                result = conn.execute(
-                    text("""
-                        INSERT INTO textract_extractions
-                        (document_id, page_number, field_key, field_value, field_type,
-                         bbox_left, bbox_top, bbox_width, bbox_height, confidence)
-                        VALUES (:doc_id, :page, :key, :value, :type,
-                                :left, :top, :width, :height, :conf)
-                        RETURNING id
-                    """),
-                    {
-                        "doc_id": document_id,
-                        "page": field.page,
-                        "key": f"LINE_{idx}",
-                        "value": field.value,
-                        "type": "line",
-                        "left": bbox.left if bbox else None,
-                        "top": bbox.top if bbox else None,
-                        "width": bbox.width if bbox else None,
-                        "height": bbox.height if bbox else None,
-                        "conf": field.confidence,
-                    }
-                )
-                db_id = str(result.fetchone()[0])
-
-                lines_for_claude.append({
-                    "id": str(idx),
-                    "text": field.value,
-                    "page": field.page,
-                    "bbox": bbox.to_dict() if bbox else None,
-                })
-                line_id_map[f"LINE_{idx}"] = db_id
-
-            # Insert KEY_VALUE_SET data (form fields and checkboxes with answers)
-            kv_idx = 0
-            for key_text, kv_data in textract_result.key_value_pairs.items():
-                kv_id = f"KV_{kv_idx}"
-                bbox_data = kv_data.get("bbox", {})
-
-                result = conn.execute(
-                    text("""
-                        INSERT INTO textract_extractions
-                        (document_id, page_number, field_key, field_value, field_type,
-                         bbox_left, bbox_top, bbox_width, bbox_height, confidence)
-                        VALUES (:doc_id, :page, :key, :value, :type,
-                                :left, :top, :width, :height, :conf)
-                        RETURNING id
-                    """),
-                    {
-                        "doc_id": document_id,
-                        "page": kv_data.get("page", 1),
-                        "key": key_text,  # The form field label/question
-                        "value": str(kv_data.get("value", "")),  # The answer
-                        "type": kv_data.get("type", "text"),  # "checkbox" or "text"
-                        "left": bbox_data.get("left"),
-                        "top": bbox_data.get("top"),
-                        "width": bbox_data.get("width"),
-                        "height": bbox_data.get("height"),
-                        "conf": kv_data.get("confidence", 0),
-                    }
-                )
-                db_id = str(result.fetchone()[0])
-
-                key_values_for_claude.append({
-                    "id": kv_id,
-                    "key": key_text,
-                    "value": kv_data.get("value"),
-                    "type": kv_data.get("type", "text"),
-                    "page": kv_data.get("page", 1),
-                    "bbox": bbox_data,
-                })
-                line_id_map[kv_id] = db_id
-                kv_idx += 1
+            ids = insert_many(conn, _TEXTRACT_INSERT_SQL, rows, returning=True)
+            for key, (db_id,) in zip(row_keys, ids):
+                if key is not None:
+                    line_id_map[key] = str(db_id)
 
             conn.commit()
             print(f"[orchestrator] Saved {len(lines_for_claude)} LINE blocks + {len(key_values_for_claude)} KEY_VALUE pairs for document {document_id}")
@@ -573,6 +540,9 @@ def _save_textract_lines(document_id: str, textract_result) -> Tuple[List[Dict],
         print(f"[orchestrator] Failed to save textract data: {e}")
         import traceback
         traceback.print_exc()
+        # As before: extraction still gets the lines and key-values, just without
+        # database links (the transaction rolled back, so no ids are valid)
+        line_id_map = {}
 
     return lines_for_claude, line_id_map, key_values_for_claude
 
@@ -1278,6 +1248,18 @@ def _log_extraction_diagnostic(
     return str(diag_path)
 
 
+def _content_sha256(file_path: str) -> Optional[str]:
+    """File hash for the extraction cache (None if the cache is off or the file is unreadable)."""
+    from core import extraction_cache
+
+    if not extraction_cache.enabled():
+        return None
+    try:
+        return extraction_cache.file_sha256(file_path)
+    except OSError:
+        return None
+
+
 def extract_application_integrated(
     document_id: str,
     file_path: str,
@@ -1344,7 +1326,9 @@ def extract_application_integrated(
             key_values=key_values_for_claude,
             line_id_map=line_id_map,
             page_count=textract_result.pages,
+            content_sha256=_content_sha256(file_path),
         )
+        result["cache_hit"] = extraction.extraction_metadata.get("cache_hit", False)
 
         # Step 4: Save provenance with direct textract_extraction_id
         provenance_records = extraction.to_provenance_records(submission_id)
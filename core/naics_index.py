@@ -0,0 +1,137 @@
+"""
+NAICS Nearest-Neighbour Index
+
+Holds the NAICS 2022 code embeddings as one contiguous, pre-normalised float32
+matrix so top-k cosine search is a single matrix-vector product plus
+argpartition, instead of rebuilding NumPy arrays row by row. The index is
+read-only after construction and safe to share across threads.
+
+Storage: the source of truth is the parquet table (code, title, emb). A compact
+copy - ``<stem>.npy`` (normalised float32 matrix) plus ``<stem>.codes.json``
+(codes/titles sidecar) - loads memory-mapped in milliseconds and is rebuilt
+automatically when the parquet is newer.
+
+Build the compact copy by hand:
+    python -m core.naics_index ai/naics_2022_w_embeddings.parquet
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+
+def _normalise_rows(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+class NaicsIndex:
+    """Cosine top-k over NAICS code embeddings."""
+
+    def __init__(self, codes: Sequence[str], titles: Sequence[str], matrix: np.ndarray, normalised: bool = False):
+        if len(codes) != len(titles) or len(codes) != matrix.shape[0]:
+            raise ValueError("codes, titles and matrix rows must line up")
+        self.codes = list(codes)
+        self.titles = list(titles)
+        mat = np.asarray(matrix, dtype=np.float32)
+        self.matrix = mat if normalised else np.ascontiguousarray(_normalise_rows(mat), dtype=np.float32)
+
+    @classmethod
+    def from_parquet(cls, path: str | Path) -> "NaicsIndex":
+        """Build from the parquet table (columns: code, title, emb list[float])."""
+        import pandas as pd
+
+        df = pd.read_parquet(path, columns=["code", "title", "emb"])
+        matrix = np.vstack(df["emb"].to_numpy()).astype(np.float32)
+        return cls(df["code"].tolist(), df["title"].tolist(), matrix)
+
+    @classmethod
+    def load_npy(cls, npy_path: str | Path, mmap: bool = True) -> "NaicsIndex":
+        """Load the compact copy written by save_npy (memory-mapped by default)."""
+        npy_path = Path(npy_path)
+        meta = json.loads(_sidecar_path(npy_path).read_text())
+        matrix = np.load(npy_path, mmap_mode="r" if mmap else None)
+        return cls(meta["codes"], meta["titles"], matrix, normalised=True)
+
+    def save_npy(self, npy_path: str | Path) -> None:
+        """Write the normalised matrix + codes/titles sidecar (atomic renames)."""
+        npy_path = Path(npy_path)
+        tmp_npy = npy_path.with_suffix(".npy.tmp")
+        with open(tmp_npy, "wb") as f:
+            np.save(f, self.matrix)
+        tmp_meta = npy_path.with_suffix(".json.tmp")
+        tmp_meta.write_text(json.dumps({"codes": self.codes, "titles": self.titles}))
+        os.replace(tmp_npy, npy_path)
+        os.replace(tmp_meta, _sidecar_path(npy_path))
+
+    @classmethod
+    def load(cls, parquet_path: str | Path) -> "NaicsIndex":
+        """Load from the compact copy if fresh, else build from parquet and refresh the copy."""
+        parquet_path = Path(parquet_path)
+        npy_path = compact_path(parquet_path)
+        sidecar = _sidecar_path(npy_path)
+        if npy_path.exists() and sidecar.exists():
+            if not parquet_path.exists() or npy_path.stat().st_mtime >= parquet_path.stat().st_mtime:
+                return cls.load_npy(npy_path)
+        if not parquet_path.exists():
+            raise FileNotFoundError(f"{parquet_path.name} missing. Build it once, then rerun.")
+        index = cls.from_parquet(parquet_path)
+        try:
+            index.save_npy(npy_path)
+        except OSError as e:  # read-only deploys still work, just slower
+            print(f"[naics_index] Could not write {npy_path.name}: {e}")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _rank(self, sims: np.ndarray, k: int) -> np.ndarray:
+        k = min(k, sims.shape[0])
+        idx = np.argpartition(-sims, k - 1)[:k]
+        # Highest similarity first; ties keep table order (matches DataFrame.nlargest)
+        return idx[np.lexsort((idx, -sims[idx]))]
+
+    def top_k(self, vec: Sequence[float], k: int = 8) -> list[dict]:
+        """Top-k candidates for one query vector: [{code, title, sim}, ...]."""
+        return self.top_k_many([vec], k)[0]
+
+    def top_k_many(self, vecs: Sequence[Sequence[float]], k: int = 8) -> list[list[dict]]:
+        """Top-k candidates for many query vectors in one matrix product."""
+        if not len(vecs):
+            return []
+        queries = _normalise_rows(np.asarray(vecs, dtype=np.float32).reshape(len(vecs), -1))
+        sims = queries @ self.matrix.T  # (n_queries, n_codes)
+        results = []
+        for row in sims:
+            results.append([
+                {"code": self.codes[i], "title": self.titles[i], "sim": float(row[i])}
+                for i in self._rank(row, k)
+            ])
+        return results
+
+
+def compact_path(parquet_path: str | Path) -> Path:
+    """Path of the compact .npy copy for a parquet table."""
+    parquet_path = Path(parquet_path)
+    return parquet_path.with_name(parquet_path.stem + ".npy")
+
+
+def _sidecar_path(npy_path: Path) -> Path:
+    return npy_path.with_name(npy_path.stem + ".codes.json")
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    src = Path(sys.argv[1] if len(sys.argv) > 1 else "ai/naics_2022_w_embeddings.parquet")
+    NaicsIndex.from_parquet(src).save_npy(compact_path(src))
+    t0 = time.perf_counter()
+    idx = NaicsIndex.load_npy(compact_path(src))
+    print(f"Wrote {compact_path(src)} ({len(idx)} codes); reload took {(time.perf_counter() - t0) * 1000:.1f} ms")
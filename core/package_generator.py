@@ -4,6 +4,12 @@ Package Generator Module
 Generates combined document packages (quote + endorsements + other materials)
 as a single PDF. Stores manifests for regeneration.
 
+Each section (quote, specimen, each endorsement/library document) is rendered
+to its own PDF fragment, cached by a hash of its HTML (core.pdf_fragments),
+and the fragments are merged into the package. Regenerating a package after
+editing one endorsement re-renders only that endorsement (and the quote
+letter, whose footer carries the generation time).
+
 Supports endorsement fill-ins using {{variable}} syntax:
 - {{insured_name}} - Insured/applicant name
 - {{effective_date}} - Policy effective date
@@ -18,17 +24,15 @@ import re
 import uuid
 import json
 from datetime import datetime
-from pathlib import Path
-from tempfile import NamedTemporaryFile
 from typing import Optional
 
 from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
 from sqlalchemy import text
 
 # Import document library
 from core.document_library import get_library_entry, get_library_entries
 from core.document_generator import get_endorsement_component_templates, render_endorsement_component
+from core.template_registry import db_template
 
 # Import document generator for context and rendering
 from core.document_generator import (
@@ -41,21 +45,70 @@ from core.document_generator import (
 )
 
 # Database connection
-import importlib.util
-spec = importlib.util.spec_from_file_location("db", os.path.join(os.path.dirname(__file__), "db.py"))
-db = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(db)
+from core import db
 get_conn = db.get_conn
 
+# HTML -> PDF on the warm render workers; packages from cached per-section fragments
+from core.pdf_render import render_pdf
+from core.pdf_fragments import HIDE_PAGE_MARGIN_BOXES, add_styles, document_shell, render_merged
+
 # Supabase client
 from supabase import create_client
 SB = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
 
 
+# Standard fill-in variable to context field mappings
+STANDARD_FILL_IN_MAPPINGS = {
+    "{{insured_name}}": "insured_name",
+    "{{effective_date}}": "effective_date",
+    "{{expiration_date}}": "expiration_date",
+    "{{policy_number}}": "quote_number",
+    "{{aggregate_limit}}": "aggregate_limit",
+    "{{retention}}": "retention",
+    # Extension endorsement variables
+    "{{original_expiration_date}}": "original_expiration_formatted",
+    "{{new_expiration_date}}": "new_expiration_formatted",
+    "{{premium_change}}": "premium_change",
+    "{{pro_rata_calculation}}": "pro_rata_calculation",
+    # Also support bracket-style placeholders
+    "[Original Date]": "original_expiration_formatted",
+    "[New Date]": "new_expiration_formatted",
+    "[Premium Amount]": "premium_change",
+    # Coverage change endorsement variables
+    "[Coverage Description]": "coverage_description",
+    "[Limit Amount]": "limit_amount",
+    "[Retention Amount]": "retention_amount",
+    "[Date]": "endorsement_effective_date_formatted",
+    "[Amount]": "premium_change",
+    "{{coverage_changes_table}}": "coverage_changes_table",
+    "{{coverage_changes_summary}}": "coverage_changes_summary",
+    # Address change endorsement variables
+    "[Previous Address]": "old_address_display",
+    "[New Address]": "new_address_display",
+    "{{old_address}}": "old_address_display",
+    "{{new_address}}": "new_address_display",
+    # Name change endorsement variables
+    "[Previous Name]": "old_name",
+    "[New Name]": "new_name",
+    "{{old_name}}": "old_name",
+    "{{new_name}}": "new_name",
+    # BOR change endorsement variables
+    "[Previous Broker]": "previous_broker_name",
+    "[New Broker]": "new_broker_name",
+    "{{previous_broker_name}}": "previous_broker_name",
+    "{{new_broker_name}}": "new_broker_name",
+}
+
+# Schedules filled in even without a mapping entry
+_SCHEDULE_FILL_INS = ("{{sublimits_schedule}}", "{{additional_insureds_schedule}}")
+
+
 def process_endorsement_fill_ins(
     content: str,
     context: dict,
-    fill_in_mappings: dict = None
+    fill_in_mappings: dict = None,
+    template_id: str = None,
+    updated_at=None
 ) -> str:
     """
     Process fill-in variables in endorsement content.
@@ -77,6 +130,8 @@ def process_endorsement_fill_ins(
         context: Document context dict with quote/policy data
         fill_in_mappings: Optional dict mapping variables to context fields
                          (from document_library.fill_in_mappings)
+        template_id: document_library id the content came from; with
+                     updated_at, the compiled content is reused across renders
 
     Returns:
         Content with variables replaced
@@ -84,56 +139,16 @@ def process_endorsement_fill_ins(
     if not content:
         return content
 
-    # Standard variable to context field mappings
-    standard_mappings = {
-        "{{insured_name}}": "insured_name",
-        "{{effective_date}}": "effective_date",
-        "{{expiration_date}}": "expiration_date",
-        "{{policy_number}}": "quote_number",
-        "{{aggregate_limit}}": "aggregate_limit",
-        "{{retention}}": "retention",
-        # Extension endorsement variables
-        "{{original_expiration_date}}": "original_expiration_formatted",
-        "{{new_expiration_date}}": "new_expiration_formatted",
-        "{{premium_change}}": "premium_change",
-        "{{pro_rata_calculation}}": "pro_rata_calculation",
-        # Also support bracket-style placeholders
-        "[Original Date]": "original_expiration_formatted",
-        "[New Date]": "new_expiration_formatted",
-        "[Premium Amount]": "premium_change",
-        # Coverage change endorsement variables
-        "[Coverage Description]": "coverage_description",
-        "[Limit Amount]": "limit_amount",
-        "[Retention Amount]": "retention_amount",
-        "[Date]": "endorsement_effective_date_formatted",
-        "[Amount]": "premium_change",
-        "{{coverage_changes_table}}": "coverage_changes_table",
-        "{{coverage_changes_summary}}": "coverage_changes_summary",
-        # Address change endorsement variables
-        "[Previous Address]": "old_address_display",
-        "[New Address]": "new_address_display",
-        "{{old_address}}": "old_address_display",
-        "{{new_address}}": "new_address_display",
-        # Name change endorsement variables
-        "[Previous Name]": "old_name",
-        "[New Name]": "new_name",
-        "{{old_name}}": "old_name",
-        "{{new_name}}": "new_name",
-        # BOR change endorsement variables
-        "[Previous Broker]": "previous_broker_name",
-        "[New Broker]": "new_broker_name",
-        "{{previous_broker_name}}": "previous_broker_name",
-        "{{new_broker_name}}": "new_broker_name",
-    }
-
     # Merge with database-provided mappings (DB mappings take precedence)
+    mappings = STANDARD_FILL_IN_MAPPINGS
     if fill_in_mappings:
-        standard_mappings.update(fill_in_mappings)
+        mappings = {**STANDARD_FILL_IN_MAPPINGS, **fill_in_mappings}
+
+    template = db_template(template_id, updated_at, content, (*mappings, *_SCHEDULE_FILL_INS))
 
-    # Process each mapping
-    for variable, context_field in standard_mappings.items():
-        if variable not in content:
-            continue
+    values = {}
+    for variable in template.tokens:
+        context_field = mappings.get(variable)
 
         # Special rendering for certain variables
         if variable == "{{sublimits_schedule}}" or context_field == "sublimits":
@@ -144,25 +159,12 @@ def process_endorsement_fill_ins(
              context_field in ("aggregate_limit", "retention", "limit"):
             raw_value = context.get(context_field, 0)
             value = format_limit(raw_value) if raw_value else ""
-        elif variable in ("{{effective_date}}", "{{expiration_date}}") or \
-             context_field in ("effective_date", "expiration_date"):
-            value = str(context.get(context_field, ""))
         else:
             value = str(context.get(context_field, ""))
 
-        content = content.replace(variable, value)
-
-    # Handle sublimits_schedule if not already processed via mappings
-    if "{{sublimits_schedule}}" in content:
-        sublimits_html = _render_sublimits_schedule(context)
-        content = content.replace("{{sublimits_schedule}}", sublimits_html)
+        values[variable] = value
 
-    # Handle additional_insureds_schedule if not already processed via mappings
-    if "{{additional_insureds_schedule}}" in content:
-        ai_html = _render_additional_insureds_schedule(context)
-        content = content.replace("{{additional_insureds_schedule}}", ai_html)
-
-    return content
+    return template.render(values)
 
 
 def _render_sublimits_schedule(context: dict) -> str:
@@ -275,7 +277,8 @@ def generate_package(
     selected_documents: list[str] = None,
     created_by: str = "user",
     include_specimen: bool = False,
-    include_endorsements: bool = True
+    include_endorsements: bool = True,
+    document_number: str = None
 ) -> dict:
     """
     Generate a document package.
@@ -289,6 +292,8 @@ def generate_package(
         created_by: User generating the package
         include_specimen: Include the policy specimen form
         include_endorsements: Include endorsement documents linked to quote
+        document_number: Reuse an existing document number (regeneration);
+            a new one is generated when omitted
 
     Returns:
         dict with id, pdf_url, document_number, manifest
@@ -303,7 +308,7 @@ def generate_package(
     context = get_document_context(submission_id, quote_option_id)
 
     # Generate document number
-    document_number = _generate_document_number(doc_config["prefix"])
+    document_number = document_number or _generate_document_number(doc_config["prefix"])
     context["document_number"] = document_number
     context["document_id"] = str(uuid.uuid4())[:8].upper()
     context["generated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M")
@@ -347,6 +352,8 @@ def generate_package(
 
     if package_type == "full_package" and selected_documents:
         for doc_id in selected_documents:
+            if any(d["id"] == doc_id for d in endorsement_docs):
+                continue  # already included as a quote endorsement
             entry = get_library_entry(doc_id)
             if entry and entry.get("status") == "active":
                 library_docs.append(entry)
@@ -365,25 +372,37 @@ def generate_package(
     all_docs = endorsement_docs + library_docs
     all_docs.sort(key=lambda x: x.get("default_sort_order", 100))
 
-    # Sort manifest by doc order
-    doc_order = {d["id"]: i for i, d in enumerate(all_docs)}
-    manifest.sort(key=lambda x: doc_order.get(x["library_id"], 999))
-
-    # Render combined HTML
-    if all_docs or include_specimen:
-        html_content = render_package_html(
-            doc_config["template"],
-            context,
-            all_docs,
-            include_specimen=include_specimen
-        )
-    else:
-        # Just render the quote
-        template = TEMPLATE_ENV.get_template(doc_config["template"])
-        html_content = template.render(**context)
+    # Render each section to its own PDF fragment (unchanged sections come
+    # from the fragment cache) and merge them into the package
+    sections = render_package_sections(
+        doc_config["template"],
+        context,
+        all_docs,
+        include_specimen=include_specimen
+    )
+    pdf_bytes = _render_package_pdf(sections)
 
-    # Generate PDF and upload
-    pdf_url = _render_and_upload_package(html_content, doc_type)
+    # Manifest: quote/specimen sections, then library docs in package order,
+    # each with its fragment key and whether it was reused
+    by_library_id = {item["library_id"]: item for item in manifest}
+    manifest = []
+    for section in sections:
+        if section["section"] == "library":
+            item = by_library_id[section["doc"]["id"]]
+        else:
+            item = {
+                "library_id": None,
+                "code": None,
+                "title": doc_config["label"] if section["section"] == "quote" else "Policy Specimen",
+                "version": None,
+                "document_type": section["section"],
+            }
+        item["section"] = section["section"]
+        item["fragment"] = section["fragment"]
+        item["reused"] = section["reused"]
+        manifest.append(item)
+
+    pdf_url = _upload_package_pdf(pdf_bytes, doc_type)
 
     # Save document record
     doc_id = _save_document(
@@ -397,8 +416,7 @@ def generate_package(
     )
 
     # Save manifest
-    if manifest:
-        _save_manifest(doc_id, package_type, manifest)
+    _save_manifest(doc_id, package_type, manifest)
 
     return {
         "id": doc_id,
@@ -478,6 +496,47 @@ def render_package_html(
     return combined
 
 
+def render_package_sections(
+    quote_template: str,
+    context: dict,
+    library_documents: list[dict],
+    include_specimen: bool = False
+) -> list[dict]:
+    """
+    Render a package as standalone HTML documents, one per section.
+
+    Every section shares the quote's <head> (its styles plus library document
+    styles), so it lays out as it would inside the combined document. Page
+    margin boxes are hidden; render_merged draws them over the merged
+    package.
+
+    Returns:
+        Ordered list of {"section": "quote" | "policy_specimen" | "library",
+        "html": ..., "doc": library doc (library sections only)}
+    """
+    template = TEMPLATE_ENV.get_template(quote_template)
+    quote_html = template.render(**context)
+    quote_html = add_styles(quote_html, _get_library_document_styles())
+    quote_html = add_styles(quote_html, HIDE_PAGE_MARGIN_BOXES)
+    open_tag, close = document_shell(quote_html)
+
+    sections = [{"section": "quote", "html": quote_html}]
+
+    if include_specimen:
+        specimen_html = _render_policy_specimen(context)
+        if specimen_html:
+            sections.append({"section": "policy_specimen", "html": open_tag + specimen_html + close})
+
+    for doc in library_documents:
+        sections.append({
+            "section": "library",
+            "doc": doc,
+            "html": open_tag + _render_library_document_html(doc, context) + close,
+        })
+
+    return sections
+
+
 def _render_policy_specimen(context: dict) -> str:
     """
     Render the policy specimen form based on the quote's policy_form.
@@ -523,7 +582,10 @@ def _render_library_document_html(doc: dict, context: dict) -> str:
 
     # Process fill-in variables for endorsements
     if doc_type == "endorsement" and content:
-        content = process_endorsement_fill_ins(content, context, fill_in_mappings)
+        content = process_endorsement_fill_ins(
+            content, context, fill_in_mappings,
+            template_id=doc.get("id"), updated_at=doc.get("updated_at")
+        )
 
     if doc_type == "endorsement":
         # Use mid-term endorsement format for all endorsements
@@ -842,30 +904,36 @@ def _get_library_document_styles() -> str:
     '''
 
 
-def _render_and_upload_package(html_content: str, doc_type: str) -> str:
-    """Render HTML to PDF and upload to Supabase."""
-    with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        HTML(string=html_content).write_pdf(tmp.name)
-        pdf_path = Path(tmp.name)
+def _render_package_pdf(sections: list[dict]) -> bytes:
+    """
+    Render package sections (render_package_sections) to one PDF from cached
+    per-section fragments. Sets "fragment" and "reused" on each section.
+    """
+    pdf_bytes, fragments = render_merged([s["html"] for s in sections])
+    for section, fragment in zip(sections, fragments):
+        section["fragment"] = fragment.key
+        section["reused"] = fragment.reused
 
-    try:
-        bucket = "quotes"
-        key = f"{doc_type}/{uuid.uuid4()}.pdf"
-
-        with pdf_path.open("rb") as f:
-            SB.storage.from_(bucket).upload(
-                key,
-                f,
-                {"content-type": "application/pdf"}
-            )
+    reused = sum(1 for f in fragments if f.reused)
+    print(f"[package_generator] {len(fragments)} fragments ({reused} reused)")
+    return pdf_bytes
 
-        base_url = os.getenv("SUPABASE_URL")
-        pdf_url = f"{base_url}/storage/v1/object/public/{bucket}/{key}"
 
-        return pdf_url
+def _upload_package_pdf(pdf_bytes: bytes, doc_type: str) -> str:
+    """Upload a package PDF to Supabase."""
+    bucket = "quotes"
+    key = f"{doc_type}/{uuid.uuid4()}.pdf"
+
+    SB.storage.from_(bucket).upload(
+        key,
+        pdf_bytes,
+        {"content-type": "application/pdf"}
+    )
+
+    base_url = os.getenv("SUPABASE_URL")
+    pdf_url = f"{base_url}/storage/v1/object/public/{bucket}/{key}"
 
-    finally:
-        pdf_path.unlink(missing_ok=True)
+    return pdf_url
 
 
 def _generate_document_number(prefix: str) -> str:
@@ -978,6 +1046,10 @@ def regenerate_package(policy_document_id: str, created_by: str = "user") -> dic
     """
     Regenerate a package from its stored manifest.
 
+    Keeps the original document number, so sections that have not changed
+    since (same context, same library content) are reused from the PDF
+    fragment cache and only edited sections are rendered again.
+
     Args:
         policy_document_id: ID of the original document
         created_by: User regenerating the package
@@ -988,7 +1060,7 @@ def regenerate_package(policy_document_id: str, created_by: str = "user") -> dic
     # Get original document info
     with get_conn() as conn:
         result = conn.execute(text("""
-            SELECT submission_id, quote_option_id, document_type
+            SELECT submission_id, quote_option_id, document_type, document_number
             FROM policy_documents
             WHERE id = :doc_id
         """), {"doc_id": policy_document_id})
@@ -1000,6 +1072,7 @@ def regenerate_package(policy_document_id: str, created_by: str = "user") -> dic
         submission_id = str(row[0])
         quote_option_id = str(row[1])
         doc_type = row[2]
+        document_number = row[3]
 
     # Get manifest
     manifest = get_manifest(policy_document_id)
@@ -1010,11 +1083,14 @@ def regenerate_package(policy_document_id: str, created_by: str = "user") -> dic
             quote_option_id=quote_option_id,
             doc_type=doc_type,
             package_type="quote_only",
-            created_by=created_by
+            created_by=created_by,
+            document_number=document_number
         )
 
-    # Extract document IDs from manifest
-    selected_documents = [item["library_id"] for item in manifest.get("manifest", [])]
+    # Extract document IDs (and the specimen section) from manifest
+    items = manifest.get("manifest", [])
+    selected_documents = [item["library_id"] for item in items if item.get("library_id")]
+    include_specimen = any(item.get("section") == "policy_specimen" for item in items)
 
     return generate_package(
         submission_id=submission_id,
@@ -1022,7 +1098,9 @@ def regenerate_package(policy_document_id: str, created_by: str = "user") -> dic
         doc_type=doc_type,
         package_type=manifest.get("package_type", "full_package"),
         selected_documents=selected_documents,
-        created_by=created_by
+        created_by=created_by,
+        include_specimen=include_specimen,
+        document_number=document_number
     )
 
 
@@ -1075,7 +1153,10 @@ def generate_midterm_endorsement_document(
         fill_in_mappings = template.get("fill_in_mappings")
 
         if content_html:
-            content_html = process_endorsement_fill_ins(content_html, context, fill_in_mappings)
+            content_html = process_endorsement_fill_ins(
+                content_html, context, fill_in_mappings,
+                template_id=template.get("id"), updated_at=template.get("updated_at")
+            )
 
         # Render the document HTML
         html_content = _render_midterm_endorsement_html(
@@ -1704,26 +1785,19 @@ def _render_midterm_endorsement_html(
 
 def _render_and_upload_endorsement(html_content: str, endorsement: dict) -> str:
     """Render HTML to PDF and upload to Supabase."""
-    with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        HTML(string=html_content).write_pdf(tmp.name)
-        pdf_path = Path(tmp.name)
+    pdf_bytes = render_pdf(html_content)
 
-    try:
-        bucket = "quotes"  # or create a dedicated 'endorsements' bucket
-        endorsement_number = endorsement.get("endorsement_number", "0")
-        key = f"endorsements/{endorsement['submission_id']}/endorsement_{endorsement_number}_{uuid.uuid4()}.pdf"
-
-        with pdf_path.open("rb") as f:
-            SB.storage.from_(bucket).upload(
-                key,
-                f,
-                {"content-type": "application/pdf"}
-            )
+    bucket = "quotes"  # or create a dedicated 'endorsements' bucket
+    endorsement_number = endorsement.get("endorsement_number", "0")
+    key = f"endorsements/{endorsement['submission_id']}/endorsement_{endorsement_number}_{uuid.uuid4()}.pdf"
 
-        base_url = os.getenv("SUPABASE_URL")
-        pdf_url = f"{base_url}/storage/v1/object/public/{bucket}/{key}"
+    SB.storage.from_(bucket).upload(
+        key,
+        pdf_bytes,
+        {"content-type": "application/pdf"}
+    )
 
-        return pdf_url
+    base_url = os.getenv("SUPABASE_URL")
+    pdf_url = f"{base_url}/storage/v1/object/public/{bucket}/{key}"
 
-    finally:
-        pdf_path.unlink(missing_ok=True)
+    return pdf_url
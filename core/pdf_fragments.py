@@ -0,0 +1,266 @@
+"""
+PDF Fragment Cache
+
+Quote packages are assembled from independently rendered PDF fragments: the
+quote letter, the policy specimen and one per endorsement/library document.
+A fragment is keyed by the SHA-256 of the exact HTML it is rendered from.
+Everything that can change a section (context values, fill-ins, library
+content and version, styles) ends up in that HTML. An unchanged section
+therefore maps to the same key and its PDF is reused instead of rendered
+again. Only the sections that changed go to core.pdf_render, and those
+render concurrently.
+
+Fragments live on local disk as <dir>/<key[:2]>/<key>.pdf. Writes go through
+a temp file and os.replace, so API processes on the same host can share the
+directory. Reads refresh the file's mtime; when the directory grows past its
+budget the least recently used fragments are deleted.
+
+A package's sections share one <head>, but page counters ("Page 3 of 12")
+must span the whole package. Sections are therefore rendered with the page
+margin boxes hidden (HIDE_PAGE_MARGIN_BOXES). render_merged then renders
+the margin boxes once, as blank pages under the unhidden <head>, and stamps
+them over the merged pages.
+
+Environment:
+  PDF_FRAGMENT_CACHE_DIR  cache directory (default: <system temp>/pdf_fragments)
+  PDF_FRAGMENT_CACHE_MB   size budget in MB (default: 512)
+
+Usage:
+    from core.pdf_fragments import render_merged
+    package_pdf, fragments = render_merged([quote_html, endorsement_html])
+    [f.reused for f in fragments]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.pdf_render import render_many, render_pdf
+
+CACHE_DIR = Path(os.getenv("PDF_FRAGMENT_CACHE_DIR") or Path(tempfile.gettempdir()) / "pdf_fragments")
+CACHE_BYTES = int(os.getenv("PDF_FRAGMENT_CACHE_MB", "512")) * 1024 * 1024
+
+# Bump when the renderer/merge changes in a way that invalidates cached PDFs
+FRAGMENT_FORMAT = "1"
+
+_PAGE_MARGIN_BOXES = (
+    "top-left-corner", "top-left", "top-center", "top-right", "top-right-corner",
+    "right-top", "right-middle", "right-bottom",
+    "bottom-right-corner", "bottom-right", "bottom-center", "bottom-left", "bottom-left-corner",
+    "left-bottom", "left-middle", "left-top",
+)
+HIDE_PAGE_MARGIN_BOXES = "@page { " + " ".join(f"@{box} {{ content: none; }}" for box in _PAGE_MARGIN_BOXES) + " }"
+
+_written = 0
+_written_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Fragment:
+    """A rendered section: its cache key, PDF bytes and whether it came from the cache."""
+    key: str
+    pdf: bytes
+    reused: bool
+
+
+def fragment_key(html: str) -> str:
+    """Cache key for a fragment rendered from ``html``."""
+    digest = hashlib.sha256(f"pdf-fragment:{FRAGMENT_FORMAT}\n".encode())
+    digest.update(html.encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ─────────────────────────────────────────────────────────────
+# Section documents
+# ─────────────────────────────────────────────────────────────
+
+def add_styles(html: str, styles: str) -> str:
+    """Insert CSS before the first </style>, or as a <style> block before </head>."""
+    if '</style>' in html:
+        return html.replace('</style>', styles + '\n</style>', 1)
+    if '</head>' in html:
+        return html.replace('</head>', '<style>' + styles + '</style>\n</head>', 1)
+    return html
+
+
+def document_shell(html: str) -> tuple[str, str]:
+    """Split a document into (everything through <body ...>, </body> onwards)."""
+    body = re.search(r"<body\b[^>]*>", html, re.IGNORECASE)
+    close = html.rfind("</body>")
+    if not body or close == -1:
+        return "<html><body>", "</body></html>"
+    return html[:body.end()], html[close:]
+
+
+# ─────────────────────────────────────────────────────────────
+# Disk cache
+# ─────────────────────────────────────────────────────────────
+
+def _path(key: str) -> Path:
+    return CACHE_DIR / key[:2] / f"{key}.pdf"
+
+
+def get_cached(key: str) -> bytes | None:
+    """Cached fragment PDF, or None."""
+    path = _path(key)
+    try:
+        pdf = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return pdf
+
+
+def put_cached(key: str, pdf: bytes) -> None:
+    """Store a fragment PDF (failures are logged, never raised)."""
+    global _written
+    path = _path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[pdf_fragments] could not cache fragment {key[:12]}: {e}")
+        return
+
+    # Scan the directory only after roughly a tenth of the budget has been written
+    with _written_lock:
+        _written += len(pdf)
+        if _written < CACHE_BYTES // 10:
+            return
+        _written = 0
+    prune()
+
+
+def prune(max_bytes: int | None = None) -> int:
+    """Delete least recently used fragments until the cache fits; returns files removed."""
+    max_bytes = CACHE_BYTES if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    for path in CACHE_DIR.glob("*/*.pdf"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    removed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+# ─────────────────────────────────────────────────────────────
+# Render / merge
+# ─────────────────────────────────────────────────────────────
+
+def render_fragments(htmls: list[str]) -> list[Fragment]:
+    """
+    PDF fragments for ``htmls`` (in order), rendering only cache misses.
+
+    Misses render concurrently on the render pool; identical HTML within one
+    call renders once.
+    """
+    keys = [fragment_key(html) for html in htmls]
+
+    found: dict[str, bytes] = {}
+    missing: dict[str, str] = {}
+    for key, html in zip(keys, htmls):
+        if key in found or key in missing:
+            continue
+        pdf = get_cached(key)
+        if pdf is None:
+            missing[key] = html
+        else:
+            found[key] = pdf
+
+    rendered: dict[str, bytes] = {}
+    if missing:
+        for key, pdf in zip(missing, render_many(missing.values())):
+            rendered[key] = pdf
+            put_cached(key, pdf)
+
+    return [
+        Fragment(key, found[key], True) if key in found else Fragment(key, rendered[key], False)
+        for key in keys
+    ]
+
+
+def page_count(pdf: bytes) -> int:
+    """Number of pages in a PDF."""
+    from pypdf import PdfReader
+
+    return len(PdfReader(io.BytesIO(pdf)).pages)
+
+
+def merge_pdfs(pdfs: list[bytes], overlay: bytes | None = None) -> bytes:
+    """
+    Concatenate PDFs into one document.
+
+    ``overlay`` (optional) must have one page per output page; each of its
+    pages is stamped over the matching merged page (used for page furniture
+    such as "Page 3 of 12" that spans the whole package).
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for pdf in pdfs:
+        writer.append(PdfReader(io.BytesIO(pdf)))
+
+    if overlay is not None:
+        stamps = PdfReader(io.BytesIO(overlay)).pages
+        if len(stamps) != len(writer.pages):
+            raise ValueError(f"Overlay has {len(stamps)} pages, package has {len(writer.pages)}")
+        for page, stamp in zip(writer.pages, stamps):
+            page.merge_page(stamp)
+
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def render_merged(htmls: list[str]) -> tuple[bytes, list[Fragment]]:
+    """
+    One PDF from section documents that share the first one's <head>.
+
+    Sections are rendered (or reused) as fragments and concatenated; the
+    page margin boxes, hidden in the sections via HIDE_PAGE_MARGIN_BOXES,
+    are rendered once for the total page count and stamped over every page.
+    """
+    fragments = render_fragments(htmls)
+
+    open_tag, close = document_shell(htmls[0])
+    page_open = open_tag.replace(HIDE_PAGE_MARGIN_BOXES, "", 1)
+    pages = sum(page_count(f.pdf) for f in fragments)
+    blank_pages = '<div></div>' + '<div style="break-before: page"></div>' * (pages - 1)
+    furniture = render_fragments([page_open + blank_pages + close])[0]
+
+    if page_count(furniture.pdf) != pages:
+        # Should not happen; fall back to rendering one combined document
+        print(f"[pdf_fragments] page furniture has {page_count(furniture.pdf)} pages, package has {pages}")
+        bodies = [html[len(open_tag):html.rfind("</body>")] for html in htmls]
+        combined = page_open + '\n<div class="page-break"></div>\n'.join(bodies) + close
+        return render_pdf(combined), [Fragment(f.key, f.pdf, False) for f in fragments]
+
+    return merge_pdfs([f.pdf for f in fragments], overlay=furniture.pdf), fragments
@@ -0,0 +1,140 @@
+"""
+PDF Render Service
+
+HTML -> PDF conversion off the request thread. WeasyPrint runs in a pool of
+long-lived worker processes (spawned, like ai.ocr_utils and
+rating_engine.rerate). Each worker imports WeasyPrint once and keeps one
+FontConfiguration and resource cache for its lifetime. It warms up by
+rendering a blank page, so the first real document does not pay for
+Pango/fontconfig start-up. PDFs come back as bytes; nothing touches disk.
+
+Environment:
+  PDF_RENDER_WORKERS  worker processes (default: min(4, CPU count));
+                      0 renders in the calling thread (still warm, per thread)
+
+Usage:
+    from core.pdf_render import render_pdf
+    pdf_bytes = render_pdf(html_content)
+
+Call start() at service startup to spawn and warm the workers up front;
+otherwise the pool starts on the first render.
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable
+
+RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Images/stylesheets fetched by URL (logos, etc.); cleared when it grows past this
+_RESOURCE_CACHE_MAX = 256
+
+_local = threading.local()
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+# ─────────────────────────────────────────────────────────────
+# Worker side
+# ─────────────────────────────────────────────────────────────
+
+def _warm() -> tuple:
+    """This process/thread's (FontConfiguration, resource cache), created on first use."""
+    state = getattr(_local, "state", None)
+    if state is None:
+        from weasyprint import HTML
+        from weasyprint.text.fonts import FontConfiguration
+
+        state = (FontConfiguration(), {})
+        HTML(string="<p></p>").write_pdf(font_config=state[0], cache=state[1])
+        _local.state = state
+    return state
+
+
+def _render(html: str, base_url: str | None = None) -> bytes:
+    from weasyprint import HTML
+
+    font_config, cache = _warm()
+    if len(cache) > _RESOURCE_CACHE_MAX:
+        cache.clear()
+    return HTML(string=html, base_url=base_url).write_pdf(font_config=font_config, cache=cache)
+
+
+def _ready() -> None:
+    _warm()
+
+
+# ─────────────────────────────────────────────────────────────
+# Pool
+# ─────────────────────────────────────────────────────────────
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the API and pipeline are multi-threaded
+            _pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm,
+            )
+        return _pool
+
+
+def _discard_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def start() -> None:
+    """Spawn the render workers and wait until each has warmed up."""
+    if RENDER_WORKERS <= 0:
+        return
+    pool = _get_pool()
+    for future in [pool.submit(_ready) for _ in range(RENDER_WORKERS)]:
+        future.result()
+    print(f"[pdf_render] render pool ready ({RENDER_WORKERS} workers)")
+
+
+def shutdown() -> None:
+    """Stop the render workers (idempotent)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown)
+
+
+def render_pdf(html: str, base_url: str | None = None) -> bytes:
+    """Render an HTML document to PDF bytes on a warm worker."""
+    if RENDER_WORKERS <= 0:
+        return _render(html, base_url)
+    pool = _get_pool()
+    try:
+        return pool.submit(_render, html, base_url).result()
+    except BrokenProcessPool:
+        # A worker died (OOM, crash in a native lib); retry once on a fresh pool
+        _discard_pool(pool)
+        return _get_pool().submit(_render, html, base_url).result()
+
+
+def render_many(htmls: Iterable[str], base_url: str | None = None) -> list[bytes]:
+    """Render several documents concurrently; results in input order."""
+    if RENDER_WORKERS <= 0:
+        return [_render(html, base_url) for html in htmls]
+    pool = _get_pool()
+    futures = [pool.submit(_render, html, base_url) for html in htmls]
+    return [f.result() for f in futures]
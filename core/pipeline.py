@@ -18,7 +18,7 @@ import psycopg2
 from psycopg2.extras import Json
 from pgvector.psycopg2 import register_vector
 from pgvector import Vector
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
 # Attachment contract (must match ingest_local.py usage)
 from dataclasses import dataclass
@@ -34,12 +34,17 @@ class Attachment:
     content_type: Optional[str] = None
 
 
+from ai.embedding_service import get_embedding_service
+
 # ─────────────────── ENV / CLIENTS ───────────────────
 load_dotenv(dotenv_path=Path('.') / '.env')
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL) if DATABASE_URL else None
+if DATABASE_URL:
+    from core.db import engine, insert_many  # shared process-wide pool
+else:
+    engine = None
 
 # ---------- FILENAME DETECTION HELPER ----------
 _FILE_EXT_RE = re.compile(r"\.(pdf|json|docx?|xlsx?|pptx?|csv|png|jpe?g|txt)$", re.I)
@@ -468,7 +473,11 @@ def summarize_controls_with_flags_and_bullets(app_data: dict[str, Any]) -> str:
     """Legacy function - now returns combined content for backward compatibility"""
     nist_summary = summarize_nist_controls(app_data)
     bullet_summary = summarize_bullet_points(app_data)
-    
+    return combine_controls_summary(nist_summary, bullet_summary)
+
+
+def combine_controls_summary(nist_summary: str, bullet_summary: str) -> str:
+    """Legacy combined layout built from already-generated NIST and bullet summaries."""
     return f"""---
 
 🔐 NIST CYBERSECURITY FRAMEWORK SUMMARY
@@ -495,31 +504,38 @@ Email:\n{email_text}
     return rsp.choices[0].message.content.strip()
 
 # ───────────── NAICS (vector + LLM) ─────────────
-import numpy as np
-import pandas as pd
+import threading
+
+NAICS_FILE = Path("ai/naics_2022_w_embeddings.parquet")  # expects columns: code,title,emb(list[float])
+
+# Loaded on first use (not at import): prefers the memory-mapped .npy copy next to the parquet.
+_naics_index = None
+_naics_lock = threading.Lock()
 
-NAICS_FILE = Path("ai/naics_2022_w_embeddings.parquet")
-if not NAICS_FILE.exists():
-    raise FileNotFoundError("naics_2022_w_embeddings.parquet missing. Build it once, then rerun.")
 
-_naics_df = pd.read_parquet(NAICS_FILE)  # expects columns: code,title,emb(list[float])
-_EMBED_MODEL = "text-embedding-3-small"
+def _get_naics_index():
+    global _naics_index
+    if _naics_index is None:
+        with _naics_lock:
+            if _naics_index is None:
+                from core.naics_index import NaicsIndex
+                _naics_index = NaicsIndex.load(NAICS_FILE)
+    return _naics_index
 
 
 def _embed(txt: str) -> list[float]:
-    return openai_client.embeddings.create(input=[txt[:512]], model=_EMBED_MODEL).data[0].embedding
+    return get_embedding_service().embed(txt[:512])
 
 
-def _cosine(a, b):
-    a, b = np.array(a), np.array(b)
-    denom = (np.linalg.norm(a) * np.linalg.norm(b)) or 1.0
-    return float(np.dot(a, b) / denom)
+def _top_k(desc: str, k: int = 8) -> list[dict]:
+    """NAICS candidates [{code, title, sim}] for a description, most similar first."""
+    return _get_naics_index().top_k(_embed(desc), k)
 
 
-def _top_k(desc: str, k: int = 8):
-    vec = _embed(desc)
-    _naics_df["sim"] = _naics_df["emb"].apply(lambda v: _cosine(vec, v))
-    return _naics_df.nlargest(k, "sim")["code title sim".split()]
+def _top_k_many(descs: list[str], k: int = 8) -> list[list[dict]]:
+    """Batch _top_k: one embedding call and one matrix product for all descriptions."""
+    vecs = get_embedding_service().embed_many([d[:512] for d in descs])
+    return _get_naics_index().top_k_many(vecs, k)
 
 _SYSTEM_NAICS = (
     "You are a NAICS classifier. Return ONLY valid JSON with keys: primary{code,title,confidence}, secondary{code,title,confidence or null}.\n"
@@ -546,7 +562,21 @@ def _generate_industry_tags(description: str) -> list[str]:
 
 
 def classify_naics(description: str) -> dict:
-    cands = _top_k(description).to_dict("records")
+    return _classify_naics_from_candidates(description, _top_k(description))
+
+
+def classify_naics_batch(descriptions: list[str], max_workers: int = 8) -> list[dict]:
+    """Classify many descriptions: shared vector search, concurrent LLM picks, input order kept."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not descriptions:
+        return []
+    all_cands = _top_k_many(descriptions)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_classify_naics_from_candidates, descriptions, all_cands))
+
+
+def _classify_naics_from_candidates(description: str, cands: list[dict]) -> dict:
     rsp = openai_client.chat.completions.create(
         model="gpt-5.1",
         messages=[
@@ -592,13 +622,12 @@ def _vector_from_flags(flags: dict) -> list[int]:
 
 
 def _embed_text(txt: str) -> list[float] | None:
-    if not (txt or "").strip():
-        return None
-    return openai_client.embeddings.create(
-        model="text-embedding-3-small",
-        input=txt,
-        encoding_format="float",
-    ).data[0].embedding
+    return get_embedding_service().embed(txt)
+
+
+def _embed_texts(texts: list[str]) -> list[list[float] | None]:
+    """Embed several texts in one batched, cached call (blank texts -> None)."""
+    return get_embedding_service().embed_many(texts)
 
 
 def parse_controls_from_summary(bullet_summary: str, nist_summary: str = "") -> list[str]:
@@ -654,6 +683,9 @@ from core.conflict_service import save_field_value, ConflictService
 # Native application extraction
 from ai.application_extractor import extract_from_pdf, ApplicationExtraction
 
+# Concurrent stage execution
+from core.stage_runner import StageRunner
+
 # Document classification
 from ai.document_classifier import (
     smart_classify_documents,
@@ -1259,39 +1291,43 @@ def _save_extraction_provenance(
         return
 
     records = extraction.to_provenance_records(submission_id)
+    rows = [
+        (
+            submission_id,
+            rec["field_name"],
+            Json(rec["extracted_value"]),
+            rec["confidence"],
+            rec.get("source_page"),
+            rec.get("source_text"),
+            rec["is_present"],
+            extraction.model_used,
+            document_id,
+        )
+        for rec in records
+    ]
 
     with engine.begin() as conn:
-        for rec in records:
-            conn.execute(
-                text("""
-                    INSERT INTO extraction_provenance
-                    (submission_id, field_name, extracted_value, confidence,
-                     source_page, source_text, is_present, model_used, source_document_id)
-                    VALUES (:submission_id, :field_name, :extracted_value, :confidence,
-                            :source_page, :source_text, :is_present, :model_used, :doc_id)
-                    ON CONFLICT (submission_id, field_name)
-                    DO UPDATE SET
-                        extracted_value = EXCLUDED.extracted_value,
-                        confidence = EXCLUDED.confidence,
-                        source_page = EXCLUDED.source_page,
-                        source_text = EXCLUDED.source_text,
-                        is_present = EXCLUDED.is_present,
-                        model_used = EXCLUDED.model_used,
-                        source_document_id = EXCLUDED.source_document_id,
-                        created_at = NOW()
-                """),
-                {
-                    "submission_id": submission_id,
-                    "field_name": rec["field_name"],
-                    "extracted_value": Json(rec["extracted_value"]),
-                    "confidence": rec["confidence"],
-                    "source_page": rec.get("source_page"),
-                    "source_text": rec.get("source_text"),
-                    "is_present": rec["is_present"],
-                    "model_used": extraction.model_used,
-                    "doc_id": document_id,
-                },
-            )
+        insert_many(
+            conn,
+            """
+            INSERT INTO extraction_provenance
+            (submission_id, field_name, extracted_value, confidence,
+             source_page, source_text, is_present, model_used, source_document_id)
+            VALUES %s
+            ON CONFLICT (submission_id, field_name)
+            DO UPDATE SET
+                extracted_value = EXCLUDED.extracted_value,
+                confidence = EXCLUDED.confidence,
+                source_page = EXCLUDED.source_page,
+                source_text = EXCLUDED.source_text,
+                is_present = EXCLUDED.is_present,
+                model_used = EXCLUDED.model_used,
+                source_document_id = EXCLUDED.source_document_id,
+                created_at = NOW()
+            """,
+            rows,
+            conflict_key=lambda row: row[1],
+        )
 
 
 def _save_extraction_run(
@@ -1374,79 +1410,83 @@ def _save_extracted_values(
         print("[pipeline] submission_extracted_values table not found, skipping")
         return 0
 
-    saved_count = 0
-    with engine.begin() as conn:
-        for section_name, fields in extraction.data.items():
-            for field_name, result in fields.items():
-                # Determine status based on extraction result
-                if not result.is_present:
-                    status = "not_asked"
-                elif result.value is None:
-                    status = "pending"  # Question asked but no answer
-                elif result.value is True or (result.value and result.value not in [False, [], ""]):
-                    status = "present"
-                else:
-                    status = "not_present"
-
-                # Convert value to JSON-compatible format
-                import json
-                value_json = json.dumps(result.value) if result.value is not None else None
+    import json
+
+    rows = []
+    for section_name, fields in extraction.data.items():
+        for field_name, result in fields.items():
+            # Determine status based on extraction result
+            if not result.is_present:
+                status = "not_asked"
+            elif result.value is None:
+                status = "pending"  # Question asked but no answer
+            elif result.value is True or (result.value and result.value not in [False, [], ""]):
+                status = "present"
+            else:
+                status = "not_present"
+
+            rows.append((
+                submission_id,
+                field_name,  # Just the field name, not section.field
+                json.dumps(result.value) if result.value is not None else None,
+                status,
+                source_type,
+                document_id,
+                result.source_text[:500] if result.source_text else None,
+                result.confidence,
+                "pipeline",
+            ))
 
-                try:
-                    conn.execute(
-                        text("""
-                            INSERT INTO submission_extracted_values
-                                (submission_id, field_key, value, status, source_type,
-                                 source_document_id, source_text, confidence, updated_at, updated_by)
-                            VALUES
-                                (:submission_id, :field_key, :value, :status, :source_type,
-                                 :source_document_id, :source_text, :confidence, NOW(), :updated_by)
-                            ON CONFLICT (submission_id, field_key)
-                            DO UPDATE SET
-                                value = CASE
-                                    -- Only update if new value is more definitive
-                                    WHEN EXCLUDED.status = 'present' THEN EXCLUDED.value
-                                    WHEN submission_extracted_values.status = 'present' THEN submission_extracted_values.value
-                                    ELSE COALESCE(EXCLUDED.value, submission_extracted_values.value)
-                                END,
-                                status = CASE
-                                    -- Present > pending > not_asked > not_present (priority order)
-                                    WHEN EXCLUDED.status = 'present' THEN 'present'
-                                    WHEN submission_extracted_values.status = 'present' THEN 'present'
-                                    WHEN EXCLUDED.status = 'pending' THEN 'pending'
-                                    WHEN submission_extracted_values.status = 'pending' THEN 'pending'
-                                    ELSE EXCLUDED.status
-                                END,
-                                source_type = CASE
-                                    WHEN EXCLUDED.status = 'present' THEN EXCLUDED.source_type
-                                    ELSE submission_extracted_values.source_type
-                                END,
-                                source_text = CASE
-                                    WHEN EXCLUDED.status = 'present' THEN EXCLUDED.source_text
-                                    ELSE submission_extracted_values.source_text
-                                END,
-                                confidence = CASE
-                                    WHEN EXCLUDED.confidence > submission_extracted_values.confidence
-                                    THEN EXCLUDED.confidence
-                                    ELSE submission_extracted_values.confidence
-                                END,
-                                updated_at = NOW()
-                        """),
-                        {
-                            "submission_id": submission_id,
-                            "field_key": field_name,  # Just the field name, not section.field
-                            "value": value_json,
-                            "status": status,
-                            "source_type": source_type,
-                            "source_document_id": document_id,
-                            "source_text": result.source_text[:500] if result.source_text else None,
-                            "confidence": result.confidence,
-                            "updated_by": "pipeline",
-                        },
-                    )
-                    saved_count += 1
-                except Exception as e:
-                    print(f"[pipeline] Failed to save {field_name}: {e}")
+    saved_count = 0
+    try:
+        with engine.begin() as conn:
+            # The same field name can appear in more than one section; those
+            # rows go in later statements so the merge below applies in order.
+            insert_many(
+                conn,
+                """
+                INSERT INTO submission_extracted_values
+                    (submission_id, field_key, value, status, source_type,
+                     source_document_id, source_text, confidence, updated_at, updated_by)
+                VALUES %s
+                ON CONFLICT (submission_id, field_key)
+                DO UPDATE SET
+                    value = CASE
+                        -- Only update if new value is more definitive
+                        WHEN EXCLUDED.status = 'present' THEN EXCLUDED.value
+                        WHEN submission_extracted_values.status = 'present' THEN submission_extracted_values.value
+                        ELSE COALESCE(EXCLUDED.value, submission_extracted_values.value)
+                    END,
+                    status = CASE
+                        -- Present > pending > not_asked > not_present (priority order)
+                        WHEN EXCLUDED.status = 'present' THEN 'present'
+                        WHEN submission_extracted_values.status = 'present' THEN 'present'
+                        WHEN EXCLUDED.status = 'pending' THEN 'pending'
+                        WHEN submission_extracted_values.status = 'pending' THEN 'pending'
+                        ELSE EXCLUDED.status
+                    END,
+                    source_type = CASE
+                        WHEN EXCLUDED.status = 'present' THEN EXCLUDED.source_type
+                        ELSE submission_extracted_values.source_type
+                    END,
+                    source_text = CASE
+                        WHEN EXCLUDED.status = 'present' THEN EXCLUDED.source_text
+                        ELSE submission_extracted_values.source_text
+                    END,
+                    confidence = CASE
+                        WHEN EXCLUDED.confidence > submission_extracted_values.confidence
+                        THEN EXCLUDED.confidence
+                        ELSE submission_extracted_values.confidence
+                    END,
+                    updated_at = NOW()
+                """,
+                rows,
+                template="(%s, %s, %s, %s, %s, %s, %s, %s, NOW(), %s)",
+                conflict_key=lambda row: row[1],
+            )
+        saved_count = len(rows)
+    except Exception as e:
+        print(f"[pipeline] Failed to save extracted values: {e}")
 
     print(f"[pipeline] Saved {saved_count} extracted values to submission_extracted_values")
     return saved_count
@@ -1599,13 +1639,15 @@ def _extract_text_from_pdf(pdf_path: str, use_ocr_fallback: bool = True) -> str:
         Extracted text
     """
     try:
-        from ai.ocr_utils import extract_text_with_ocr_fallback
+        from ai.ocr_utils import extract_text_with_ocr_fallback, timing_report
 
         result = extract_text_with_ocr_fallback(pdf_path)
 
         if result.is_scanned:
             print(f"[pipeline] Scanned PDF detected, used {result.ocr_method} "
                   f"(confidence: {result.ocr_confidence:.0%}, cost: ${result.extraction_cost:.4f})")
+        if result.pages:
+            print(f"[pipeline] {Path(pdf_path).name}: {timing_report(result)}")
 
         return result.text
 
@@ -1638,7 +1680,9 @@ def _extract_text_from_pdf_with_metadata(pdf_path: str) -> dict:
             "is_scanned": bool,
             "ocr_method": str or None,
             "ocr_confidence": float or None,
-            "extraction_cost": float
+            "extraction_cost": float,
+            "pages_ocrd": int,
+            "page_timings": {page_number: seconds}  # large PDFs (page-sharded) only
         }
     """
     try:
@@ -1653,6 +1697,8 @@ def _extract_text_from_pdf_with_metadata(pdf_path: str) -> dict:
             "ocr_method": result.ocr_method,
             "ocr_confidence": result.ocr_confidence,
             "extraction_cost": result.extraction_cost,
+            "pages_ocrd": result.pages_ocrd,
+            "page_timings": {p.page_number: round(p.seconds, 3) for p in result.pages},
         }
 
     except Exception as e:
@@ -1664,6 +1710,8 @@ def _extract_text_from_pdf_with_metadata(pdf_path: str) -> dict:
             "ocr_method": "failed",
             "ocr_confidence": None,
             "extraction_cost": 0.0,
+            "pages_ocrd": 0,
+            "page_timings": {},
         }
 
 
@@ -2029,35 +2077,63 @@ def process_submission(subject: str, email_body: str, sender_email: str, attachm
             print(f"[pipeline] No revenue in app, checking {len(financial_docs)} financial document(s)...")
             revenue = _extract_revenue_from_financials(financial_docs)
 
-    # External public info
-    tavily_text = get_public_description(name, website)
+    # ───────────── Analysis stages (run concurrently where independent) ─────────────
+    email_text = email_body or subject or ""
+    app_json = app_data or {}
 
+    runner = StageRunner()
+    # External public info
+    runner.add("public_info", lambda r: get_public_description(name, website))
     # Summaries
-    email_summary = summarize_submission_email(email_body or subject or "")
-    business_summary = summarize_business_operations(name, website, tavily_text)
-    cyber_exposures = summarize_cyber_exposures(business_summary)
-    nist_controls = summarize_nist_controls(app_data or {})
-    bullet_points = summarize_bullet_points(app_data or {})
-    controls_summary = summarize_controls_with_flags_and_bullets(app_data or {})  # Legacy combined
-
+    runner.add("email_summary", lambda r: summarize_submission_email(email_text))
+    runner.add("business_summary",
+               lambda r: summarize_business_operations(name, website, r["public_info"]),
+               deps=["public_info"])
+    runner.add("cyber_exposures",
+               lambda r: summarize_cyber_exposures(r["business_summary"]),
+               deps=["business_summary"])
+    runner.add("nist_controls", lambda r: summarize_nist_controls(app_json))
+    runner.add("bullet_points", lambda r: summarize_bullet_points(app_json))
+    # Legacy combined summary reuses the two summaries above instead of regenerating them
+    runner.add("controls_summary",
+               lambda r: combine_controls_summary(r["nist_controls"], r["bullet_points"]),
+               deps=["nist_controls", "bullet_points"])
     # Guideline decision
-    ai_result = get_ai_decision(business_summary, cyber_exposures, controls_summary)
+    runner.add("ai_decision",
+               lambda r: get_ai_decision(r["business_summary"], r["cyber_exposures"], r["controls_summary"]),
+               deps=["business_summary", "cyber_exposures", "controls_summary"])
+    # NAICS + tags
+    runner.add("naics", lambda r: classify_naics(r["business_summary"]), deps=["business_summary"])
+    # Vectors (ops, controls, exposures) in one batched embedding call
+    runner.add("vectors",
+               lambda r: _embed_texts([r["business_summary"], r["controls_summary"], r["cyber_exposures"]]),
+               deps=["business_summary", "controls_summary", "cyber_exposures"])
+    # Resolve broker assignment from email chain and contacts
+    runner.add("broker_info", lambda r: resolve_broker_assignment(email_text, sender_email))
+
+    stage_results = runner.run()
+    print(f"[pipeline] Stage timings: {runner.timing_report()}")
+
+    email_summary = stage_results["email_summary"]
+    business_summary = stage_results["business_summary"]
+    cyber_exposures = stage_results["cyber_exposures"]
+    nist_controls = stage_results["nist_controls"]
+    bullet_points = stage_results["bullet_points"]
+    controls_summary = stage_results["controls_summary"]
+
+    ai_result = stage_results["ai_decision"]
     ai_text = ai_result["answer"]
     ai_cites = ai_result["citations"]
 
-    # NAICS + tags
-    naics_result = classify_naics(business_summary)
+    naics_result = stage_results["naics"]
     industry_tags = naics_result.get("tags", [])
 
     # Flags + vectors
     nist_flags = _parse_nist_flags(controls_summary)
     nist_vector = _vector_from_flags(nist_flags)
-    ops_vec = _embed_text(business_summary)
-    controls_vec = _embed_text(controls_summary)
-    exposures_vec = _embed_text(cyber_exposures)
+    ops_vec, controls_vec, exposures_vec = stage_results["vectors"]
 
-    # Resolve broker assignment from email chain and contacts
-    broker_info = resolve_broker_assignment(email_body or subject or "", sender_email)
+    broker_info = stage_results["broker_info"]
     broker_email = broker_info.get("email") or sender_email
     broker_company_id = broker_info.get("broker_company_id")
     broker_org_id = broker_info.get("broker_org_id")
@@ -0,0 +1,122 @@
+"""
+Document Render Jobs
+
+Generating a full quote package takes seconds (context queries, rendering,
+upload). submit_job() records a document_render_jobs row
+(db_setup/create_document_render_jobs.sql), runs the work on a small thread
+pool in this process and returns the job id immediately; get_job() reads the
+row back, so the poll can land on any API process. The threads mostly wait
+on the database, storage and core.pdf_render's worker processes, so a few
+of them keep the render pool busy.
+
+Jobs still pending or processing when their process exits stay in that
+state; pollers should treat a job that has not finished after a generous
+timeout as failed.
+
+Environment:
+  RENDER_JOB_THREADS  concurrent jobs per API process (default: 4)
+
+Usage:
+    job_id = render_jobs.submit_job("quote_package", generate_package, kwargs, quote_option_id=quote_id)
+    render_jobs.get_job(job_id)  # {"status": "completed", "result": {...}, ...}
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from sqlalchemy import text
+
+from core.db import get_conn
+
+JOB_THREADS = int(os.getenv("RENDER_JOB_THREADS", "4"))
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=JOB_THREADS, thread_name_prefix="render-job")
+        return _executor
+
+
+def submit_job(
+    job_type: str,
+    fn: Callable[..., Any],
+    params: dict,
+    quote_option_id: str | None = None,
+    created_by: str | None = None,
+) -> str:
+    """Record a pending job, schedule ``fn(**params)`` and return the job id."""
+    with get_conn() as conn:
+        job_id = str(conn.execute(text("""
+            INSERT INTO document_render_jobs (job_type, quote_option_id, params, created_by)
+            VALUES (:job_type, :quote_option_id, :params, :created_by)
+            RETURNING id
+        """), {
+            "job_type": job_type,
+            "quote_option_id": quote_option_id,
+            "params": json.dumps(params, default=str),
+            "created_by": created_by,
+        }).scalar())
+
+    _get_executor().submit(_run_job, job_id, fn, params)
+    return job_id
+
+
+def _run_job(job_id: str, fn: Callable[..., Any], params: dict) -> None:
+    # Runs on the executor, which swallows exceptions: every failure,
+    # including the status updates themselves, must end in 'failed'
+    try:
+        with get_conn() as conn:
+            conn.execute(text("""
+                UPDATE document_render_jobs
+                SET status = 'processing', started_at = NOW()
+                WHERE id = :job_id
+            """), {"job_id": job_id})
+
+        result = fn(**params)
+
+        with get_conn() as conn:
+            conn.execute(text("""
+                UPDATE document_render_jobs
+                SET status = 'completed', result = :result, completed_at = NOW()
+                WHERE id = :job_id
+            """), {"job_id": job_id, "result": json.dumps(result, default=str)})
+    except Exception as e:
+        traceback.print_exc()
+        try:
+            with get_conn() as conn:
+                conn.execute(text("""
+                    UPDATE document_render_jobs
+                    SET status = 'failed', error = :error, completed_at = NOW()
+                    WHERE id = :job_id
+                """), {"job_id": job_id, "error": f"{type(e).__name__}: {e}"})
+        except Exception as mark_error:
+            print(f"[render_jobs] Could not mark job {job_id} failed: {mark_error}")
+
+
+def get_job(job_id: str) -> dict | None:
+    """Job status row as a dict (None if unknown)."""
+    with get_conn() as conn:
+        row = conn.execute(text("""
+            SELECT id, job_type, quote_option_id, status, result, error,
+                   created_by, created_at, started_at, completed_at
+            FROM document_render_jobs
+            WHERE id = :job_id
+        """), {"job_id": job_id}).mappings().fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job["id"] = str(job["id"])
+    if job["quote_option_id"] is not None:
+        job["quote_option_id"] = str(job["quote_option_id"])
+    return job
@@ -0,0 +1,103 @@
+"""
+Local key/value cache: an in-memory LRU in front of an optional sqlite file.
+
+Shared by the content-addressed AI caches (ai.embedding_service,
+ai.document_classifier). Keys are caller-built content hashes; values go
+through the caller's encode/decode (float32 blobs, JSON text) so the memory
+layer holds ready-to-use objects. One connection per file, serialized by a
+lock; WAL so several processes can share the file.
+
+Usage:
+    from core.sqlite_cache import SqliteCache
+    cache = SqliteCache(path, "classifications", "result", encode=json.dumps, decode=json.loads)
+    cache.put(key, value)
+    hit = cache.get(key)
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+_SQLITE_MAX_PARAMS = 500
+
+
+class SqliteCache:
+    """In-memory LRU in front of an optional sqlite file. Thread-safe."""
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        table: str,
+        value_column: str = "value",
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda stored: stored,
+        memory_items: Optional[int] = 4096,
+        keep_encoded: bool = False,
+    ):
+        self.path = path
+        self.table = table
+        self.value_column = value_column
+        self.memory_items = memory_items
+        # Hold encoded values in memory (compact), decoding on every read
+        self.keep_encoded = keep_encoded
+        self._encode = encode
+        self._decode = decode
+        self._mem: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, {value_column})")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        found: dict[str, Any] = {}
+        with self._lock:
+            for k in keys:
+                if k in self._mem:
+                    self._mem.move_to_end(k)
+                    found[k] = self._decode(self._mem[k]) if self.keep_encoded else self._mem[k]
+            missing = [k for k in keys if k not in found]
+            if missing and self._db is not None:
+                for i in range(0, len(missing), _SQLITE_MAX_PARAMS):
+                    chunk = missing[i:i + _SQLITE_MAX_PARAMS]
+                    rows = self._db.execute(
+                        f"SELECT key, {self.value_column} FROM {self.table} "
+                        f"WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for k, stored in rows:
+                        found[k] = self._decode(stored)
+                        self._remember(k, stored if self.keep_encoded else found[k])
+        return found
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many({key: value})
+
+    def put_many(self, items: dict[str, Any]) -> None:
+        with self._lock:
+            encoded = {k: self._encode(value) for k, value in items.items()} \
+                if self._db is not None or self.keep_encoded else {}
+            for k, value in items.items():
+                self._remember(k, encoded[k] if self.keep_encoded else value)
+            if self._db is not None and items:
+                self._db.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, {self.value_column}) VALUES (?, ?)",
+                    list(encoded.items()),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        if self.memory_items is not None:
+            while len(self._mem) > self.memory_items:
+                self._mem.popitem(last=False)
@@ -1,8 +1,20 @@
 """
-Supabase Storage Integration
+Document Storage
 
 Handles document upload/download for the underwriting platform.
-Uses S3-compatible object storage via Supabase.
+Objects live behind a StorageBackend:
+
+  supabase  Supabase Storage (S3-compatible object storage); the default
+            when SUPABASE_URL and a key are set
+  local     a directory tree (<STORAGE_LOCAL_ROOT>/<bucket>/<key>) for tests,
+            development and air-gapped installs
+
+Transfers stream in CHUNK_SIZE pieces in both directions, so a large loss
+run never sits in memory whole. Downloads go through a bounded on-disk LRU
+cache keyed by storage key + ETag. Re-running extraction on a document
+reuses the cached copy. After DOCUMENT_CACHE_REVALIDATE_SECONDS the copy is
+revalidated with a conditional request (If-None-Match); that is a 304 with
+no body unless the object changed.
 
 Bucket structure:
   documents/
@@ -10,16 +22,26 @@ Bucket structure:
       {timestamp}_{filename}    # Source documents (applications, loss runs, etc.)
     quotes/{quote_id}/
       {timestamp}_{filename}    # Generated quote/binder PDFs
+
+Environment:
+  STORAGE_BACKEND                   supabase | local (default: supabase if configured)
+  STORAGE_LOCAL_ROOT                root directory for the local backend (default: ./storage)
+  DOCUMENT_CACHE_DIR                download cache (default: <system temp>/document_cache)
+  DOCUMENT_CACHE_MB                 cache size budget, 0 disables it (default: 1024)
+  DOCUMENT_CACHE_REVALIDATE_SECONDS serve cached copies without asking storage for this long (default: 300)
 """
 
 import os
 import mimetypes
+import shutil
+import tempfile
+import threading
 import time
 import hashlib
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
-
-from supabase import create_client, Client
+from typing import BinaryIO, Optional
+from urllib.parse import quote
 
 # ─────────────────────────────────────────────────────────────
 # Configuration
@@ -29,22 +51,338 @@ _SUPA_URL = os.getenv("SUPABASE_URL")
 _SUPA_KEY = os.getenv("SUPABASE_SERVICE_ROLE") or os.getenv("SUPABASE_ANON_KEY")
 _BUCKET = os.getenv("STORAGE_BUCKET", "documents")  # Default bucket for documents
 
-if not _SUPA_URL or not _SUPA_KEY:
-    _SB: Optional[Client] = None
-else:
-    _SB = create_client(_SUPA_URL, _SUPA_KEY)
+CHUNK_SIZE = 1024 * 1024
+
+CACHE_DIR = Path(os.getenv("DOCUMENT_CACHE_DIR") or Path(tempfile.gettempdir()) / "document_cache")
+CACHE_BYTES = int(os.getenv("DOCUMENT_CACHE_MB", "1024")) * 1024 * 1024
+CACHE_REVALIDATE_SECONDS = float(os.getenv("DOCUMENT_CACHE_REVALIDATE_SECONDS", "300"))
+
+
+# ─────────────────────────────────────────────────────────────
+# Backends
+# ─────────────────────────────────────────────────────────────
+
+class StorageBackend(ABC):
+    """
+    Where stored objects live.
+
+    upload() reads ``fileobj`` and fetch() writes ``dest`` in CHUNK_SIZE
+    pieces. fetch() takes the ETag of a copy the caller already has and
+    returns (modified, etag); when not modified nothing is written.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def upload(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        ...
+
+    @abstractmethod
+    def fetch(self, key: str, dest: BinaryIO, etag: str | None = None) -> tuple[bool, str | None]:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def signed_url(self, key: str, expires_sec: int) -> str:
+        ...
+
+    @abstractmethod
+    def public_url(self, key: str) -> str:
+        ...
+
+    @abstractmethod
+    def bucket_names(self) -> list[str]:
+        ...
+
+    @abstractmethod
+    def create_bucket(self, bucket: str) -> None:
+        ...
+
+
+class SupabaseBackend(StorageBackend):
+    """Supabase Storage; object transfers go straight to the storage REST API."""
+
+    name = "supabase"
+
+    def __init__(self, url: str, key: str, bucket: str):
+        import httpx  # installed with supabase
+        from supabase import create_client
+
+        self.client = create_client(url, key)
+        self.bucket = bucket
+        self._objects = f"{url.rstrip('/')}/storage/v1/object"
+        self._http = httpx.Client(
+            headers={"Authorization": f"Bearer {key}", "apikey": key},
+            timeout=httpx.Timeout(30.0, read=300.0),
+        )
+
+    def _object_url(self, key: str) -> str:
+        return f"{self._objects}/{self.bucket}/{quote(key, safe='/')}"
+
+    def upload(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        # httpx streams file objects in chunks with a Content-Length header
+        response = self._http.post(
+            self._object_url(key),
+            content=fileobj,
+            headers={"content-type": content_type, "x-upsert": "true"},
+        )
+        response.raise_for_status()
+
+    def fetch(self, key: str, dest: BinaryIO, etag: str | None = None) -> tuple[bool, str | None]:
+        headers = {"If-None-Match": etag} if etag else {}
+        with self._http.stream("GET", self._object_url(key), headers=headers) as response:
+            if response.status_code == 304:
+                return False, etag
+            response.raise_for_status()
+            for chunk in response.iter_bytes(CHUNK_SIZE):
+                dest.write(chunk)
+            return True, response.headers.get("etag")
+
+    def delete(self, key: str) -> None:
+        self.client.storage.from_(self.bucket).remove([key])
+
+    def signed_url(self, key: str, expires_sec: int) -> str:
+        result = self.client.storage.from_(self.bucket).create_signed_url(key, expires_in=expires_sec)
+        return result.get("signedURL") if isinstance(result, dict) else result
+
+    def public_url(self, key: str) -> str:
+        return self.client.storage.from_(self.bucket).get_public_url(key)
+
+    def bucket_names(self) -> list[str]:
+        return [b.name for b in self.client.storage.list_buckets()]
+
+    def create_bucket(self, bucket: str) -> None:
+        # Private by default
+        self.client.storage.create_bucket(bucket, options={"public": False})
+
+
+class LocalBackend(StorageBackend):
+    """Objects as files under <root>/<bucket>/; the ETag is size + mtime."""
+
+    name = "local"
+
+    def __init__(self, root: str | Path, bucket: str):
+        self.root = Path(root).resolve()
+        self.bucket = bucket
+
+    def _path(self, key: str) -> Path:
+        base = self.root / self.bucket
+        path = (base / key).resolve()
+        if base.resolve() not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    @staticmethod
+    def _etag(path: Path) -> str:
+        st = path.stat()
+        return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+    def upload(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".upload")
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(fileobj, f, CHUNK_SIZE)
+        os.replace(tmp, path)
+
+    def fetch(self, key: str, dest: BinaryIO, etag: str | None = None) -> tuple[bool, str | None]:
+        path = self._path(key)
+        current = self._etag(path)  # FileNotFoundError for a missing object
+        if etag == current:
+            return False, current
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, dest, CHUNK_SIZE)
+        return True, current
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink()
+
+    def signed_url(self, key: str, expires_sec: int) -> str:
+        return self._path(key).as_uri()
+
+    def public_url(self, key: str) -> str:
+        return self._path(key).as_uri()
+
+    def bucket_names(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return [p.name for p in self.root.iterdir() if p.is_dir()]
+
+    def create_bucket(self, bucket: str) -> None:
+        (self.root / bucket).mkdir(parents=True, exist_ok=True)
+
+
+def _create_backend() -> Optional[StorageBackend]:
+    kind = os.getenv("STORAGE_BACKEND", "").lower()
+    if kind == "local":
+        return LocalBackend(os.getenv("STORAGE_LOCAL_ROOT", "storage"), _BUCKET)
+    if kind not in ("", "supabase"):
+        raise RuntimeError(f"Unknown STORAGE_BACKEND: {kind}")
+    if not _SUPA_URL or not _SUPA_KEY:
+        return None
+    return SupabaseBackend(_SUPA_URL, _SUPA_KEY, _BUCKET)
+
+
+_BACKEND: Optional[StorageBackend] = _create_backend()
+
+
+def require_backend() -> StorageBackend:
+    """Get the storage backend or raise if not configured."""
+    if _BACKEND is None:
+        raise RuntimeError("Storage not configured. Set SUPABASE_URL and SUPABASE_SERVICE_ROLE in .env "
+                           "(or STORAGE_BACKEND=local)")
+    return _BACKEND
 
 
 def require_sb():
     """Get Supabase client or raise if not configured."""
-    if _SB is None:
+    if not isinstance(_BACKEND, SupabaseBackend):
         raise RuntimeError("Supabase not configured. Set SUPABASE_URL and SUPABASE_SERVICE_ROLE in .env")
-    return _SB
+    return _BACKEND.client
 
 
 def is_configured() -> bool:
-    """Check if Supabase storage is configured."""
-    return _SB is not None
+    """Check if document storage is configured."""
+    return _BACKEND is not None
+
+
+def backend_name() -> str | None:
+    """Name of the configured backend ('supabase', 'local') or None."""
+    return _BACKEND.name if _BACKEND else None
+
+
+# ─────────────────────────────────────────────────────────────
+# Download cache
+# ─────────────────────────────────────────────────────────────
+#
+# <CACHE_DIR>/<kh[:2]>/<kh>.etag         ETag of the cached copy; its mtime is
+#                                        when the copy was last validated
+# <CACHE_DIR>/<kh[:2]>/<kh>-<eh>.bin     the object at that ETag
+#
+# kh = sha256(storage key), eh = sha256(etag)[:16]. Hits touch the .bin, so
+# mtimes order entries for LRU eviction.
+
+_cache_written = 0
+_cache_lock = threading.Lock()
+
+
+def _key_hash(storage_key: str) -> str:
+    return hashlib.sha256(storage_key.encode()).hexdigest()
+
+
+def _cache_entry(kh: str, etag: str | None) -> Path:
+    eh = hashlib.sha256((etag or "").encode()).hexdigest()[:16]
+    return CACHE_DIR / kh[:2] / f"{kh}-{eh}.bin"
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def cached_document(storage_key: str) -> Path:
+    """
+    Local path of a stored object, downloading it into the cache if needed.
+
+    The file belongs to the cache: read it, do not modify or delete it
+    (download_document() gives a private copy).
+    """
+    backend = require_backend()
+    kh = _key_hash(storage_key)
+    pointer = CACHE_DIR / kh[:2] / f"{kh}.etag"
+
+    etag = None
+    entry = None
+    try:
+        etag = pointer.read_text() or None
+        entry = _cache_entry(kh, etag)
+        if not entry.exists():
+            etag = entry = None
+        elif time.time() - pointer.stat().st_mtime < CACHE_REVALIDATE_SECONDS:
+            _touch(entry)
+            return entry
+    except OSError:
+        etag = entry = None
+
+    pointer.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=pointer.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            modified, new_etag = backend.fetch(storage_key, f, etag=etag)
+        if not modified:
+            os.unlink(tmp)
+            _touch(pointer)
+            _touch(entry)
+            return entry
+
+        new_entry = _cache_entry(kh, new_etag)
+        size = os.path.getsize(tmp)
+        os.replace(tmp, new_entry)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+    fd, tmp = tempfile.mkstemp(dir=pointer.parent, suffix=".part")
+    with os.fdopen(fd, "w") as f:
+        f.write(new_etag or "")
+    os.replace(tmp, pointer)
+    if entry is not None and entry != new_entry:
+        entry.unlink(missing_ok=True)
+
+    _account(size)
+    return new_entry
+
+
+def _account(size: int) -> None:
+    """Prune once roughly a tenth of the budget has been written since the last prune."""
+    global _cache_written
+    with _cache_lock:
+        _cache_written += size
+        if _cache_written < CACHE_BYTES // 10:
+            return
+        _cache_written = 0
+    prune_cache()
+
+
+def prune_cache(max_bytes: int | None = None) -> int:
+    """Delete least recently used cached documents until the cache fits; returns entries removed."""
+    max_bytes = CACHE_BYTES if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    for path in CACHE_DIR.glob("*/*.bin"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    removed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        kh = path.name.split("-", 1)[0]
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        (path.parent / f"{kh}.etag").unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def _evict(storage_key: str) -> None:
+    kh = _key_hash(storage_key)
+    for path in (CACHE_DIR / kh[:2]).glob(f"{kh}*"):
+        path.unlink(missing_ok=True)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -57,25 +395,31 @@ def now_key(prefix: str, filename: str) -> str:
     return f"{prefix}/{ts}-{filename}"
 
 
-def put_bytes(key: str, data: bytes, content_type: str | None = None) -> str:
-    """Upload bytes to storage. Returns the storage key."""
-    sb = require_sb()
+def put_file(key: str, fileobj: BinaryIO, content_type: str | None = None) -> str:
+    """Stream a file object to storage. Returns the storage key."""
+    backend = require_backend()
     ct = content_type or mimetypes.guess_type(key)[0] or "application/octet-stream"
-    sb.storage.from_(_BUCKET).upload(key, data, {"content-type": ct, "upsert": "true"})
+    backend.upload(key, fileobj, ct)
+    # Uploads overwrite (upsert): drop any cached copy of the old object
+    _evict(key)
     return key
 
 
+def put_bytes(key: str, data: bytes, content_type: str | None = None) -> str:
+    """Upload bytes to storage. Returns the storage key."""
+    import io
+
+    return put_file(key, io.BytesIO(data), content_type)
+
+
 def signed_url(key: str, expires_sec: int = 3600) -> str:
     """Generate a signed URL for temporary access to a file."""
-    sb = require_sb()
-    result = sb.storage.from_(_BUCKET).create_signed_url(key, expires_in=expires_sec)
-    return result.get("signedURL") if isinstance(result, dict) else result
+    return require_backend().signed_url(key, expires_sec)
 
 
 def public_url(key: str) -> str:
     """Get the public URL for a file (bucket must have public access)."""
-    sb = require_sb()
-    return sb.storage.from_(_BUCKET).get_public_url(key)
+    return require_backend().public_url(key)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -108,12 +452,10 @@ def upload_document(
     file_hash = hashlib.md5(f"{submission_id}_{fname}_{ts}".encode()).hexdigest()[:8]
     storage_key = f"submissions/{submission_id}/{ts}_{file_hash}_{fname}"
 
-    # Read and upload
-    with open(path, "rb") as f:
-        data = f.read()
-
+    # Stream the file up
     content_type = mimetypes.guess_type(fname)[0] or "application/octet-stream"
-    put_bytes(storage_key, data, content_type)
+    with open(path, "rb") as f:
+        put_file(storage_key, f, content_type)
 
     # Return key and a signed URL
     return {
@@ -170,6 +512,9 @@ def download_document(storage_key: str, dest_path: str | Path | None = None) ->
     """
     Download a document from storage to a local file.
 
+    Served from the download cache when possible; the returned file is the
+    caller's own copy and may be deleted.
+
     Args:
         storage_key: The storage key to download
         dest_path: Optional destination path. If not provided, creates a temp file.
@@ -177,13 +522,6 @@ def download_document(storage_key: str, dest_path: str | Path | None = None) ->
     Returns:
         Path to the downloaded file
     """
-    import tempfile
-
-    sb = require_sb()
-
-    # Download the file bytes
-    data = sb.storage.from_(_BUCKET).download(storage_key)
-
     # Determine destination
     if dest_path:
         path = Path(dest_path)
@@ -194,10 +532,20 @@ def download_document(storage_key: str, dest_path: str | Path | None = None) ->
         path = Path(temp.name)
         temp.close()
 
-    # Write to file
-    with open(path, "wb") as f:
-        f.write(data)
+    if CACHE_BYTES <= 0:
+        # Cache disabled: stream straight to the destination
+        with open(path, "wb") as f:
+            require_backend().fetch(storage_key, f)
+        return path
 
+    cached = cached_document(storage_key)
+    try:
+        # Hard link when possible (same filesystem, instant); the cache entry
+        # is replaced, never rewritten, so the caller's file stays intact
+        path.unlink(missing_ok=True)
+        os.link(cached, path)
+    except OSError:
+        shutil.copyfile(cached, path)
     return path
 
 
@@ -212,8 +560,8 @@ def delete_document(storage_key: str) -> bool:
         True if deleted successfully
     """
     try:
-        sb = require_sb()
-        sb.storage.from_(_BUCKET).remove([storage_key])
+        require_backend().delete(storage_key)
+        _evict(storage_key)
         return True
     except Exception as e:
         print(f"[storage] Failed to delete {storage_key}: {e}")
@@ -236,10 +584,7 @@ def bucket_exists(bucket_name: str = None) -> bool:
     """
     bucket = bucket_name or _BUCKET
     try:
-        sb = require_sb()
-        buckets = sb.storage.list_buckets()
-        bucket_names = [b.name for b in buckets]
-        return bucket in bucket_names
+        return bucket in require_backend().bucket_names()
     except Exception as e:
         print(f"[storage] Failed to check bucket existence: {e}")
         return False
@@ -257,17 +602,11 @@ def ensure_bucket_exists(bucket_name: str = None) -> bool:
     """
     bucket = bucket_name or _BUCKET
     try:
-        sb = require_sb()
-        # List buckets to check if ours exists
-        buckets = sb.storage.list_buckets()
-        bucket_names = [b.name for b in buckets]
-
-        if bucket not in bucket_names:
-            # Create the bucket (private by default)
-            sb.storage.create_bucket(bucket, options={"public": False})
+        backend = require_backend()
+        if bucket not in backend.bucket_names():
+            backend.create_bucket(bucket)
             print(f"[storage] Created bucket: {bucket}")
         return True
     except Exception as e:
         print(f"[storage] Failed to ensure bucket exists: {e}")
         return False
-
@@ -1,11 +1,7 @@
 from datetime import datetime
 from typing import Optional, Literal
 from sqlalchemy import text
-import os
-import importlib.util
-spec = importlib.util.spec_from_file_location("db", os.path.join(os.path.dirname(__file__), "db.py"))
-db = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(db)
+from core import db
 get_conn = db.get_conn
 
 # Import status history for audit trail
@@ -0,0 +1,200 @@
+"""
+Document Template Registry
+
+Every template a document is rendered from comes through here:
+
+  File templates  rating_engine/templates/** via one shared Jinja
+                  Environment (TEMPLATE_ENV) with the document filters
+                  registered. Compiled templates are kept in memory, and a
+                  bytecode cache on disk lets a fresh process (API worker,
+                  render job) skip parsing them. preload() compiles all of
+                  them at startup.
+  DB templates    endorsement component templates and library document
+                  content. These use plain placeholders ({{policy_number}},
+                  [Date]), not Jinja. Each is compiled once into literal
+                  and placeholder segments, so rendering is a single join
+                  instead of a str.replace pass per known placeholder. The
+                  compiled templates sit in an LRU keyed by (template id,
+                  updated_at); an edit bumps updated_at, so a stale entry
+                  is never served.
+
+Environment:
+  TEMPLATE_BYTECODE_CACHE_DIR  Jinja bytecode cache (default: <system temp>/jinja_bytecode)
+  DB_TEMPLATE_CACHE_SIZE       compiled DB templates kept (default: 512)
+
+Usage:
+    from core.template_registry import TEMPLATE_ENV, db_template
+    html = TEMPLATE_ENV.get_template("quote_primary.html").render(**context)
+    lead_in = db_template(row_id, updated_at, content_html, placeholders).render(values)
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "rating_engine" / "templates"
+BYTECODE_CACHE_DIR = Path(os.getenv("TEMPLATE_BYTECODE_CACHE_DIR") or Path(tempfile.gettempdir()) / "jinja_bytecode")
+DB_TEMPLATE_CACHE_SIZE = int(os.getenv("DB_TEMPLATE_CACHE_SIZE", "512"))
+
+
+# ─────────────────────────────────────────────────────────────
+# Filters
+# ─────────────────────────────────────────────────────────────
+
+def format_currency(value):
+    """Format currency with K/M suffixes."""
+    if value is None:
+        return "—"
+    if isinstance(value, str):
+        return value
+    if value >= 1_000_000 and value % 1_000_000 == 0:
+        return f"${value // 1_000_000}M"
+    elif value >= 1_000 and value % 1_000 == 0:
+        return f"${value // 1_000}K"
+    return f"${value:,}"
+
+def format_date(dt):
+    """Format date for display."""
+    if dt is None:
+        return "—"
+    if isinstance(dt, str):
+        return dt
+    if hasattr(dt, 'strftime'):
+        return dt.strftime("%B %d, %Y")
+    return str(dt)
+
+def format_limit(value):
+    """Format limit with K/M suffixes (no $ sign)."""
+    if value is None:
+        return "—"
+    if value >= 1_000_000 and value % 1_000_000 == 0:
+        return f"{value // 1_000_000}M"
+    elif value >= 1_000 and value % 1_000 == 0:
+        return f"{value // 1_000}K"
+    return f"{value:,}"
+
+
+# ─────────────────────────────────────────────────────────────
+# File templates
+# ─────────────────────────────────────────────────────────────
+
+def _bytecode_cache() -> FileSystemBytecodeCache | None:
+    try:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"[template_registry] bytecode cache disabled ({BYTECODE_CACHE_DIR}): {e}")
+        return None
+    return FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR))
+
+
+TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+    bytecode_cache=_bytecode_cache(),
+    cache_size=-1,  # keep every compiled template (a few dozen files)
+)
+TEMPLATE_ENV.filters['format_currency'] = format_currency
+TEMPLATE_ENV.filters['format_date'] = format_date
+TEMPLATE_ENV.filters['format_limit'] = format_limit
+
+
+def preload() -> int:
+    """Compile every file template into TEMPLATE_ENV; returns how many loaded."""
+    loaded = 0
+    for name in TEMPLATE_ENV.list_templates(extensions=["html"]):
+        try:
+            TEMPLATE_ENV.get_template(name)
+            loaded += 1
+        except Exception as e:
+            print(f"[template_registry] could not compile {name}: {e}")
+    print(f"[template_registry] {loaded} document templates loaded")
+    return loaded
+
+
+# ─────────────────────────────────────────────────────────────
+# DB templates
+# ─────────────────────────────────────────────────────────────
+
+class PlaceholderTemplate:
+    """
+    Text with fixed placeholders, split once into literal/placeholder parts.
+
+    ``tokens`` are the placeholders that actually occur, in the order they
+    were declared; render() needs a value for each of them. Placeholders are
+    substituted in one pass, so substituted values are never scanned again.
+    """
+
+    __slots__ = ("source", "tokens", "_parts")
+
+    def __init__(self, source: str, placeholders: Iterable[str]):
+        self.source = source or ""
+        present = [p for p in dict.fromkeys(placeholders) if p and p in self.source]
+        self.tokens: tuple[str, ...] = tuple(present)
+        if present:
+            # Longest first, so a placeholder containing another wins at the same position
+            pattern = re.compile("(" + "|".join(re.escape(p) for p in sorted(present, key=len, reverse=True)) + ")")
+            self._parts = pattern.split(self.source)
+        else:
+            self._parts = [self.source]
+
+    def __bool__(self) -> bool:
+        return bool(self.source)
+
+    def __str__(self) -> str:
+        return self.source
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Substitute ``values[token]`` (already a string) for each placeholder."""
+        if not self.tokens:
+            return self.source
+        parts = self._parts[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = values[parts[i]]
+        return "".join(parts)
+
+
+_db_templates: OrderedDict[tuple, PlaceholderTemplate] = OrderedDict()
+_db_templates_lock = threading.Lock()
+
+
+def db_template(
+    template_id: Any,
+    updated_at: Any,
+    source: str,
+    placeholders: Iterable[str],
+) -> PlaceholderTemplate:
+    """
+    Compiled DB template from the LRU, compiling it on a miss.
+
+    Without a template id and updated_at (content that did not come
+    straight from a row) the template is compiled but not cached.
+    """
+    if template_id is None or updated_at is None:
+        return PlaceholderTemplate(source, placeholders)
+
+    key = (str(template_id), str(updated_at))
+    with _db_templates_lock:
+        template = _db_templates.get(key)
+        if template is not None:
+            _db_templates.move_to_end(key)
+            return template
+
+    template = PlaceholderTemplate(source, placeholders)
+    with _db_templates_lock:
+        _db_templates[key] = template
+        while len(_db_templates) > DB_TEMPLATE_CACHE_SIZE:
+            _db_templates.popitem(last=False)
+    return template
+
+
+def clear_db_templates() -> None:
+    """Drop all compiled DB templates."""
+    with _db_templates_lock:
+        _db_templates.clear()
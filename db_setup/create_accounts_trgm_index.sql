@@ -0,0 +1,21 @@
+-- =============================================================================
+-- Account Name Trigram Index
+--
+-- core/account_management.find_matching_accounts(_batch) matches applicant
+-- names with `normalized_name % :name` under a per-transaction
+-- pg_trgm.similarity_threshold, which this GIN index serves (a bare
+-- similarity(...) > x in the WHERE would compare against every account).
+--
+-- create_accounts_status_history.sql creates the same index for new
+-- databases; this file brings older ones up to date and is safe to re-run.
+--
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY), e.g.
+--     psql "$DATABASE_URL" -f db_setup/create_accounts_trgm_index.sql
+-- =============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_accounts_name_trgm
+    ON accounts USING GIN (normalized_name gin_trgm_ops);
+
+ANALYZE accounts;
@@ -0,0 +1,47 @@
+-- =============================================================================
+-- Comparable Search Indexes
+--
+-- core/benchmarking.get_comparables ranks submissions by cosine distance on
+-- ops_embedding, controls_embedding or their sum. The sum used to be an
+-- expression ((ops_embedding + controls_embedding) <=> ...) that no index can
+-- serve; it is now a stored generated column with its own HNSW index.
+--
+-- The revenue and NAICS filters get btree indexes so the pre-filter strategy
+-- (exact distance over a small filtered set) stays cheap, and the planner row
+-- estimates used to pick a strategy are accurate.
+--
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY), e.g.
+--     psql "$DATABASE_URL" -f db_setup/create_comparables_vector_indexes.sql
+-- Adding the generated column rewrites submissions once.
+-- =============================================================================
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+ALTER TABLE submissions
+    ADD COLUMN IF NOT EXISTS combined_embedding vector(1536)
+    GENERATED ALWAYS AS (ops_embedding + controls_embedding) STORED;
+
+-- HNSW (pgvector >= 0.5): better recall/latency than IVFFlat and no training
+-- step, so it stays accurate as submissions arrive. On pgvector < 0.5 use
+--     USING ivfflat (<col> vector_cosine_ops) WITH (lists = 100)
+-- and SET ivfflat.probes instead of hnsw.ef_search.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_ops_embedding_hnsw
+    ON submissions USING hnsw (ops_embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_controls_embedding_hnsw
+    ON submissions USING hnsw (controls_embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_combined_embedding_hnsw
+    ON submissions USING hnsw (combined_embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- Comparable filters
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_annual_revenue
+    ON submissions(annual_revenue);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_naics_primary_code
+    ON submissions(naics_primary_code);
+
+ANALYZE submissions;
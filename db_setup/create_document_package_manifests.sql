@@ -11,8 +11,9 @@ CREATE TABLE IF NOT EXISTS document_package_manifests (
     -- Package configuration
     package_type TEXT NOT NULL,             -- quote_only, full_package, custom
 
-    -- Manifest - ordered list of library documents included
-    -- Format: [{library_id, code, title, version, sort_order}, ...]
+    -- Manifest - ordered list of package sections (quote, policy_specimen,
+    -- library documents) with their PDF fragment and whether it was reused
+    -- Format: [{library_id, code, title, version, document_type, section, fragment, reused}, ...]
     manifest JSONB NOT NULL DEFAULT '[]',
 
     -- Timestamps
@@ -30,5 +31,5 @@ CREATE INDEX IF NOT EXISTS idx_document_package_manifests_policy_doc
 
 -- Comments for documentation
 COMMENT ON TABLE document_package_manifests IS 'Tracks which library documents were included in generated packages for regeneration';
-COMMENT ON COLUMN document_package_manifests.manifest IS 'Ordered array of library document references: [{library_id, code, title, version, sort_order}]';
+COMMENT ON COLUMN document_package_manifests.manifest IS 'Ordered array of package sections: [{library_id, code, title, version, document_type, section, fragment, reused}] (library_id null for quote/policy_specimen)';
 COMMENT ON COLUMN document_package_manifests.package_type IS 'Type of package: quote_only (no library docs), full_package (all selected), custom (specific selection)';
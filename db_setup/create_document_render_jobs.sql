@@ -0,0 +1,34 @@
+-- =============================================================================
+-- Document Render Jobs
+--
+-- Background document generation (POST /api/quotes/{id}/generate-package
+-- with "background": true). The request returns a job id straight away; the
+-- package is generated on the API process's job threads (PDF rendering on
+-- core.pdf_render's worker processes) and the UI polls
+-- GET /api/render-jobs/{job_id}. Status lives here so any API process can
+-- answer the poll.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS document_render_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_type VARCHAR(50) NOT NULL,          -- 'quote_package', ...
+    quote_option_id UUID REFERENCES insurance_towers(id) ON DELETE CASCADE,
+
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending, processing, completed, failed
+    params JSONB,                           -- the request that started the job
+    result JSONB,                           -- generator output (document id, pdf_url, manifest)
+    error TEXT,
+
+    created_by VARCHAR(100),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    completed_at TIMESTAMPTZ,
+
+    CONSTRAINT document_render_jobs_status_check
+        CHECK (status IN ('pending', 'processing', 'completed', 'failed'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_document_render_jobs_quote
+    ON document_render_jobs(quote_option_id, created_at DESC);
+
+COMMENT ON TABLE document_render_jobs IS 'Background document/package generation jobs and their status';
@@ -0,0 +1,22 @@
+-- =============================================================================
+-- Duplicate Detection Index
+--
+-- core/conflict_service.check_duplicate_submission runs a k-NN query
+-- (ORDER BY ops_embedding <=> :embedding LIMIT k) on every new submission and
+-- applies the similarity threshold to those k rows only. This HNSW index is
+-- what serves that ORDER BY; without it every check is a sequential scan.
+--
+-- Same index (same name) as db_setup/create_comparables_vector_indexes.sql,
+-- so running either file or both is safe.
+--
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY), e.g.
+--     psql "$DATABASE_URL" -f db_setup/create_duplicate_detection_index.sql
+-- =============================================================================
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_ops_embedding_hnsw
+    ON submissions USING hnsw (ops_embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+ANALYZE submissions;
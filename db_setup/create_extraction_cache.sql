@@ -0,0 +1,27 @@
+-- =============================================================================
+-- Extraction Result Cache
+--
+-- Content-addressed cache of paid extraction calls (Textract, Claude).
+-- Keyed by the document's SHA-256 plus everything that changes the output:
+-- extraction strategy, extraction schema version and model. Re-extracting
+-- identical bytes reuses the stored payload instead of calling the API again;
+-- provenance rows are still written by the caller.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    content_sha256 CHAR(64) NOT NULL,
+    strategy VARCHAR(100) NOT NULL,        -- e.g. textract_forms:p10, claude_vision, textract_lines
+    schema_version VARCHAR(64) NOT NULL,   -- hash of the extraction schema ('-' if not schema-dependent)
+    model VARCHAR(100) NOT NULL,
+    payload JSONB NOT NULL,
+    payload_bytes INTEGER,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_hit_at TIMESTAMPTZ,
+    PRIMARY KEY (content_sha256, strategy, schema_version, model)
+);
+
+CREATE INDEX IF NOT EXISTS idx_extraction_cache_created
+    ON extraction_cache(created_at);
+
+COMMENT ON TABLE extraction_cache IS 'Content-addressed cache of Textract / Claude extraction output';
@@ -88,6 +88,9 @@ export const getExtractionStats = (days = 30) => api.get(`/extraction/stats?days
 // Document content (for PDF viewer)
 export const getDocumentContent = (documentId) => api.get(`/documents/${documentId}/content`, { responseType: 'blob' });
 export const getDocumentUrl = (documentId) => `/api/documents/${documentId}/file`;
+// Single page (1-based) of a PDF document, as its own small PDF
+export const getDocumentPageUrl = (documentId, pageNumber) =>
+  `/api/documents/${documentId}/pages/${pageNumber}`;
 
 // Document bbox data for highlighting
 export const getDocumentBbox = (documentId, searchText = null, page = null) => {
@@ -169,6 +172,7 @@ export const getPackageDocuments = (position = 'primary') => api.get(`/package-d
 export const getQuoteEndorsements = (quoteId) => api.get(`/quotes/${quoteId}/endorsements`);
 export const getQuoteAutoEndorsements = (quoteId) => api.get(`/quotes/${quoteId}/auto-endorsements`);
 export const generateQuotePackage = (quoteId, data) => api.post(`/quotes/${quoteId}/generate-package`, data);
+export const getRenderJob = (jobId) => api.get(`/render-jobs/${jobId}`);
 
 // Quote Endorsements (junction table)
 export const linkEndorsementToQuote = (quoteId, endorsementId, fieldValues = {}) =>
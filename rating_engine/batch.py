@@ -0,0 +1,190 @@
+"""
+rating_engine/batch.py
+======================
+
+Vectorized pricing for many (industry, revenue, limit, retention, controls)
+rows at once - premium grids, portfolio re-rates.
+
+The engine's RatingTables are compiled once per config version into NumPy
+lookup arrays (hazard per industry, base-rate matrix, sorted limit /
+retention breakpoints, control modifier vector); a batch is then priced
+with searchsorted lookups and element-wise float64 arithmetic in the same
+order as ``engine.price_with_breakdown``, so every row matches the scalar path
+to the dollar.
+
+    from rating_engine.batch import price_batch
+    out = price_batch("Software_as_a_Service_SaaS", 30e6, [1e6, 2e6, 3e6, 5e6], 25_000)
+    out["risk_adjusted_premium"]  # int64 array, one per limit
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from rating_engine import engine
+
+BAND_KEYS = engine.BAND_KEYS
+BAND_EDGES_M = np.array(engine.BAND_EDGES_M)
+
+
+@dataclass(frozen=True)
+class CompiledTables:
+    """Rating YAML as lookup arrays."""
+    version: str                      # RatingTables.version compiled from
+    hazard_by_industry: dict          # slug -> hazard class
+    hazard_classes: np.ndarray        # sorted hazard classes (row order of base_rates)
+    base_rates: np.ndarray            # (n_hazard, n_bands) rate per $1k revenue
+    limit_keys: np.ndarray            # sorted limit breakpoints in $M
+    limit_factors: np.ndarray
+    retention_keys: np.ndarray        # sorted retentions in $
+    retention_factors: np.ndarray
+    control_slugs: tuple              # CTRL_MODS order (application order matters)
+    control_factors: np.ndarray       # 1 + modifier, per control slug
+
+    @classmethod
+    def from_rating_tables(cls, t: "engine.RatingTables") -> "CompiledTables":
+        hazards = sorted(t.base_rates)
+        return cls(
+            version=t.version,
+            hazard_by_industry=dict(t.industry_hazard),
+            hazard_classes=np.array(hazards, dtype=np.int64),
+            base_rates=np.array([t.base_rates[h] for h in hazards], dtype=np.float64),
+            limit_keys=np.array(t.limit_keys, dtype=np.float64),
+            limit_factors=np.array(t.limit_values, dtype=np.float64),
+            retention_keys=np.array(t.retention_keys, dtype=np.float64),
+            retention_factors=np.array(t.retention_values, dtype=np.float64),
+            control_slugs=tuple(c.slug for c in t.controls),
+            control_factors=np.array([1 + c.modifier for c in t.controls], dtype=np.float64),
+        )
+
+
+_compiled: Optional[CompiledTables] = None
+
+
+def compiled_tables(tables: Optional["engine.RatingTables"] = None) -> CompiledTables:
+    """NumPy form of the engine's current RatingTables (recompiled when they reload)."""
+    global _compiled
+    t = tables or engine.get_tables()
+    cached = _compiled
+    if cached is not None and cached.version == t.version:
+        return cached
+    compiled = CompiledTables.from_rating_tables(t)
+    if tables is None:
+        _compiled = compiled
+    return compiled
+
+
+def round_half_up(values: np.ndarray) -> np.ndarray:
+    """Round to whole dollars, half away from zero, on the exact binary value.
+
+    Same result as ``int(Decimal(x).quantize(Decimal("100"), ROUND_HALF_UP))``
+    in the scalar engine (Decimal("100") has exponent 0, so that rounds to
+    units). x - floor(x) is exact for |x| < 2**52, unlike floor(x + 0.5).
+    """
+    mag = np.abs(values)
+    whole = np.floor(mag)
+    rounded = whole + (mag - whole >= 0.5)
+    return (np.sign(values) * rounded).astype(np.int64)
+
+
+def _controls_matrix(controls: Optional[Sequence[Iterable[str]]], n: int, slugs: tuple) -> np.ndarray:
+    """(n, n_controls) bool: does each row's control modifier apply?"""
+    positive = [s[3:] if s.startswith("No_") else s for s in slugs]
+    present = np.zeros((n, len(slugs)), dtype=bool)
+    if controls is not None:
+        if len(controls) != n:
+            raise ValueError("controls must have one entry per row")
+        for i, row in enumerate(controls):
+            have = set(row or ())
+            present[i] = [p in have for p in positive]
+    negated = np.array([s.startswith("No_") for s in slugs], dtype=bool)
+    return np.where(negated, ~present, present)
+
+
+def price_batch(
+    industry,
+    revenue,
+    limit,
+    retention,
+    controls: Optional[Sequence[Iterable[str]]] = None,
+    tables: Optional[CompiledTables] = None,
+) -> dict:
+    """
+    Price many rows in one pass. Scalars broadcast against arrays.
+
+    Args:
+        industry: slug(s) from industry_hazard_map.yml
+        revenue / limit / retention: numbers or arrays (USD)
+        controls: per-row lists of control slugs; None = no controls
+            (so "No_*" surcharges apply, as with controls=[] in the scalar path)
+        tables: compiled tables (default: the engine's current RatingTables)
+
+    Returns:
+        dict of arrays: hazard_class, revenue_band (index into BAND_KEYS),
+        base_rate_per_1k, base_premium, limit_factor, retention_factor,
+        technical_premium, risk_adjusted_premium (int64), and ``valid``
+        (False where the industry slug is unknown or revenue is NaN;
+        premiums are 0 there).
+    """
+    t = tables or compiled_tables()
+    industry_arr, revenue_arr, limit_arr, retention_arr = np.broadcast_arrays(
+        np.asarray(industry, dtype=object),
+        np.asarray(revenue, dtype=np.float64),
+        np.asarray(limit, dtype=np.float64),
+        np.asarray(retention, dtype=np.float64),
+    )
+    shape = revenue_arr.shape
+    industry_arr = industry_arr.ravel()
+    revenue_arr = revenue_arr.ravel()
+    limit_arr = limit_arr.ravel()
+    retention_arr = retention_arr.ravel()
+    n = revenue_arr.shape[0]
+
+    # 1. Hazard class (0 = unknown slug)
+    lookup = t.hazard_by_industry.get
+    hazard = np.fromiter((lookup(slug, 0) for slug in industry_arr.tolist()), dtype=np.int64, count=n)
+    hazard_row = np.searchsorted(t.hazard_classes, hazard)
+    valid = (hazard_row < len(t.hazard_classes))
+    valid &= t.hazard_classes[np.minimum(hazard_row, len(t.hazard_classes) - 1)] == hazard
+    valid &= ~np.isnan(revenue_arr)
+    hazard_row = np.where(valid, hazard_row, 0)
+
+    # 2. Base rate per $1k revenue by hazard x revenue band
+    band = np.searchsorted(BAND_EDGES_M, revenue_arr / 1_000_000, side="right")
+    rate_per_k = t.base_rates[hazard_row, band]
+    base_prem = (revenue_arr / 1_000) * rate_per_k
+
+    # 3. Limit factor: closest breakpoint at or below the whole-$M limit, else the smallest
+    limit_m = np.floor_divide(limit_arr, 1_000_000)
+    limit_idx = np.maximum(np.searchsorted(t.limit_keys, limit_m, side="right") - 1, 0)
+    limit_factor = t.limit_factors[limit_idx]
+    prem = base_prem * limit_factor
+
+    # 4. Retention factor: exact match, else next-higher, else the largest
+    ret_idx = np.minimum(np.searchsorted(t.retention_keys, retention_arr, side="left"), len(t.retention_keys) - 1)
+    ret_factor = t.retention_factors[ret_idx]
+    prem = np.where(valid, prem * ret_factor, 0.0)
+    technical = round_half_up(prem)
+
+    # 5. Control modifiers, applied one at a time in YAML order (float products
+    #    aren't associative, so no pre-multiplied factor)
+    applies = _controls_matrix(controls, n, t.control_slugs)
+    for j, factor in enumerate(t.control_factors):
+        prem = prem * np.where(applies[:, j], factor, 1.0)
+    risk_adjusted = round_half_up(prem)
+
+    out = {
+        "hazard_class": hazard,
+        "revenue_band": band,
+        "base_rate_per_1k": rate_per_k,
+        "base_premium": base_prem,
+        "limit_factor": limit_factor,
+        "retention_factor": ret_factor,
+        "technical_premium": technical,
+        "risk_adjusted_premium": risk_adjusted,
+        "valid": valid,
+    }
+    return {k: v.reshape(shape) for k, v in out.items()}
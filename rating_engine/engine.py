@@ -4,7 +4,8 @@ rating_engine/engine.py
 
 Config-driven rating engine using a hazard-class approach.
 
-Required YAML files in rating_engine/config/:
+Required YAML files in rating_engine/config/ (compiled into RatingTables,
+hot-reloaded when they change - see get_tables):
   • industry_hazard_map.yml     ← maps industry slug → hazard class (1-5)
   • hazard_base_rates.yml       ← base rate per $1k revenue by hazard + band
   • limit_factors.yml           ← UW multipliers by policy limit
@@ -16,65 +17,243 @@ Install dep:
 """
 
 from __future__ import annotations
+import hashlib
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
 import yaml
 
 CFG_DIR = Path(__file__).parent / "config"
+CONFIG_NAMES = (
+    "industry_hazard_map",
+    "hazard_base_rates",
+    "limit_factors",
+    "retention_factors",
+    "control_modifiers",
+)
+
+# Revenue bands (YAML keys) and their $M breakpoints
+BAND_KEYS = ("<10M", "10M-50M", "50M-250M", ">250M")
+BAND_EDGES_M = (10.0, 50.0, 250.0)
+
+# How often (seconds) get_tables() stats the config files for changes
+RELOAD_CHECK_SECONDS = float(os.getenv("RATING_RELOAD_CHECK_SECONDS", "2"))
 
 # ---------------------------------------------------------------------------
-# YAML loaders
+# Compiled tables
 # ---------------------------------------------------------------------------
-def _load_yaml(name: str) -> dict:
-    path = CFG_DIR / f"{name}.yml"
+def _load_yaml(path: Path) -> dict:
     if not path.exists():
         raise FileNotFoundError(f"Missing config file {path}")
     with path.open() as f:
         return yaml.safe_load(f)
 
-INDUSTRY_HAZARD = _load_yaml("industry_hazard_map")
-HAZARD_BASE     = _load_yaml("hazard_base_rates")
-LIMIT_FACTORS   = _load_yaml("limit_factors")
-RET_FACTORS     = _load_yaml("retention_factors")
-CTRL_MODS       = _load_yaml("control_modifiers")
+
+@dataclass(frozen=True)
+class ControlModifier:
+    slug: str          # YAML key, e.g. "MFA" or "No_MFA"
+    control: str       # control it depends on ("MFA" for both)
+    when_missing: bool  # True for "No_*" surcharges
+    modifier: float
+
+
+@dataclass(frozen=True)
+class RatingTables:
+    """The five rating YAMLs, parsed once into sorted lookup structures.
+
+    Immutable: a config change builds a new instance (see get_tables), so a
+    pricing call that holds a reference sees one consistent set of factors.
+    """
+    cfg_dir: Path
+    version: str                    # sha256 of the five files' bytes (first 16 hex)
+    mtimes: tuple
+    industry_hazard: dict
+    hazard_base: dict
+    limit_factors: dict
+    retention_factors: dict
+    control_modifiers: dict
+    base_rates: dict                # hazard class -> tuple of rates in BAND_KEYS order
+    limit_keys: tuple               # sorted numeric $M breakpoints
+    limit_labels: tuple             # YAML keys in the same order ("1M", "2M", ...)
+    limit_values: tuple
+    retention_keys: tuple           # sorted numeric retentions
+    retention_values: tuple
+    controls: tuple                 # ControlModifier, in YAML (application) order
+
+    @classmethod
+    def load(cls, cfg_dir: Path | str = CFG_DIR) -> "RatingTables":
+        cfg_dir = Path(cfg_dir)
+        paths = [cfg_dir / f"{name}.yml" for name in CONFIG_NAMES]
+        digest = hashlib.sha256()
+        mtimes = []
+        raw = []
+        for path in paths:
+            if not path.exists():
+                raise FileNotFoundError(f"Missing config file {path}")
+            data = path.read_bytes()
+            digest.update(data)
+            mtimes.append(path.stat().st_mtime_ns)
+            raw.append(yaml.safe_load(data))
+        industry_hazard, hazard_base, limit_factors, ret_factors, ctrl_mods = raw
+
+        base_rates = {}
+        for hazard, table in hazard_base.items():
+            base_rates[int(hazard)] = tuple(table[band] for band in BAND_KEYS)
+
+        limits = sorted((float(k.rstrip("M")), k, v) for k, v in limit_factors.items() if k.endswith("M"))
+        rets = sorted((int(k), v) for k, v in ret_factors.items())
+        if not limits or not rets:
+            raise ValueError(f"{cfg_dir}: limit_factors and retention_factors must not be empty")
+        unrated = {h for h in industry_hazard.values() if int(h) not in base_rates}
+        if unrated:
+            raise ValueError(f"{cfg_dir}: no hazard_base_rates for hazard class(es) {sorted(unrated)}")
+
+        controls = tuple(
+            ControlModifier(slug, slug[3:], True, mod) if slug.startswith("No_")
+            else ControlModifier(slug, slug, False, mod)
+            for slug, mod in ctrl_mods.items()
+        )
+
+        return cls(
+            cfg_dir=cfg_dir,
+            version=digest.hexdigest()[:16],
+            mtimes=tuple(mtimes),
+            industry_hazard=industry_hazard,
+            hazard_base=hazard_base,
+            limit_factors=limit_factors,
+            retention_factors=ret_factors,
+            control_modifiers=ctrl_mods,
+            base_rates=base_rates,
+            limit_keys=tuple(k for k, _, _ in limits),
+            limit_labels=tuple(label for _, label, _ in limits),
+            limit_values=tuple(v for _, _, v in limits),
+            retention_keys=tuple(k for k, _ in rets),
+            retention_values=tuple(v for _, v in rets),
+            controls=controls,
+        )
+
+    def hazard_class(self, industry: str) -> int:
+        hazard = self.industry_hazard.get(industry)
+        if hazard is None:
+            raise ValueError(f"Unknown industry slug '{industry}' in INDUSTRY_HAZARD map")
+        return hazard
+
+    def revenue_band(self, revenue: float) -> int:
+        """Index into BAND_KEYS (<10M, 10M-50M, 50M-250M, >250M)."""
+        rev_m = revenue / 1_000_000
+        if rev_m != rev_m:  # NaN
+            raise ValueError("Revenue out of supported bands")
+        return bisect_right(BAND_EDGES_M, rev_m)
+
+    def base_rate(self, hazard: int, band: int) -> float:
+        return self.base_rates[int(hazard)][band]
+
+    def limit_factor(self, limit) -> tuple[str, float]:
+        """(YAML key, factor) for the closest breakpoint at or below the limit in whole $M."""
+        i = max(bisect_right(self.limit_keys, limit // 1_000_000) - 1, 0)
+        return self.limit_labels[i], self.limit_values[i]
+
+    def retention_factor(self, retention) -> float:
+        """Exact retention if configured, else the next-higher one, else the largest."""
+        i = min(bisect_left(self.retention_keys, retention), len(self.retention_keys) - 1)
+        return self.retention_values[i]
+
+    def applicable_controls(self, controls) -> list[ControlModifier]:
+        """Modifiers that apply given the controls present, in application order."""
+        have = set(controls)
+        return [c for c in self.controls if (c.control in have) != c.when_missing]
+
+
+class _TablesHolder:
+    """Current RatingTables for CFG_DIR, reloaded when the YAML changes.
+
+    Callers grab the reference once per calculation; a reload swaps the
+    reference, it never mutates tables in use.
+    """
+
+    def __init__(self, cfg_dir: Path):
+        self.cfg_dir = cfg_dir
+        self._tables = RatingTables.load(cfg_dir)
+        self._lock = threading.Lock()
+        self._next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+        self._rejected_mtimes = None  # don't re-parse a broken edit every interval
+
+    def _mtimes(self) -> tuple:
+        return tuple((self.cfg_dir / f"{name}.yml").stat().st_mtime_ns for name in CONFIG_NAMES)
+
+    def get(self) -> RatingTables:
+        if time.monotonic() >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                self._next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+                mtimes = self._mtimes()
+                if mtimes != self._tables.mtimes and mtimes != self._rejected_mtimes:
+                    if not self.reload() and self._tables.mtimes != mtimes:
+                        self._rejected_mtimes = mtimes
+            except OSError as e:  # file mid-replace; try again next interval
+                print(f"[rating_engine] Config check failed: {e}")
+            finally:
+                self._lock.release()
+        return self._tables
+
+    def reload(self) -> bool:
+        """Re-read the YAML; swap in new tables if the content changed. Bad YAML keeps the old tables."""
+        try:
+            fresh = RatingTables.load(self.cfg_dir)
+        except Exception as e:
+            print(f"[rating_engine] Config reload failed, keeping version {self._tables.version}: {e}")
+            return False
+        if fresh.version == self._tables.version:
+            # touched, not changed: remember the new mtimes so we stop re-reading
+            self._tables = fresh
+            return False
+        print(f"[rating_engine] Rating tables reloaded: {self._tables.version} -> {fresh.version}")
+        self._tables = fresh
+        return True
+
+
+_holder = _TablesHolder(CFG_DIR)
+
+
+def get_tables() -> RatingTables:
+    """Current rating tables (hot-reloaded from CFG_DIR when the files change)."""
+    return _holder.get()
+
+
+def reload_tables() -> bool:
+    """Force a config re-read now. Returns True if the factors changed."""
+    return _holder.reload()
+
+
+# Legacy module attributes (INDUSTRY_HAZARD, ...) track the current tables
+_LEGACY_ATTRS = {
+    "INDUSTRY_HAZARD": "industry_hazard",
+    "HAZARD_BASE": "hazard_base",
+    "LIMIT_FACTORS": "limit_factors",
+    "RET_FACTORS": "retention_factors",
+    "CTRL_MODS": "control_modifiers",
+}
+
+
+def __getattr__(name: str):
+    if name in _LEGACY_ATTRS:
+        return getattr(get_tables(), _LEGACY_ATTRS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 def _revenue_band_key(revenue: int) -> str:
     """Return band string matching YAML keys (<10M, 10M-50M, >250M)."""
-    rev_m = revenue / 1_000_000
-
-    for band in ("<10M", "10M-50M", "50M-250M", ">250M"):
-        if band.startswith("<"):
-            upper = float(band[1:-1])         # "<10M" → 10
-            if rev_m < upper:
-                return band
-        elif band.startswith(">"):
-            lower = float(band[1:-1])
-            if rev_m >= lower:
-                return band
-        else:
-            lower, upper = map(float, band.replace("M", "").split("-"))
-            if lower <= rev_m < upper:
-                return band
-    raise ValueError("Revenue out of supported bands")
-
-def _nearest_key(d: dict, key: str):
-    """If exact key not found, return closest lower key."""
-    if key in d:
-        return key
-    numeric_keys = sorted(
-        [float(k.rstrip("M")) for k in d.keys() if k.endswith("M")]
-    )
-    key_val = float(key.rstrip("M"))
-    lower = max([k for k in numeric_keys if k <= key_val], default=numeric_keys[0])
-    return f"{int(lower) if lower.is_integer() else lower}M"
+    return BAND_KEYS[get_tables().revenue_band(revenue)]
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
-def price_with_breakdown(submission: dict) -> dict:
+def price_with_breakdown(submission: dict, tables: RatingTables | None = None) -> dict:
     """
     Calculate premium with detailed breakdown of rating factors.
     
@@ -85,6 +264,9 @@ def price_with_breakdown(submission: dict) -> dict:
         retention       : int  – retention / deductible (e.g. 25_000)
         controls        : list[str] – control slugs present (e.g. ["MFA","EDR"])
         coverage_limits : dict – optional coverage limits structure
+
+    ``tables`` prices against a specific RatingTables (e.g. a candidate
+    config loaded with RatingTables.load) instead of the live config.
     
     Returns detailed breakdown including all rating factors and assumptions.
     """
@@ -98,21 +280,22 @@ def price_with_breakdown(submission: dict) -> dict:
     # Cast revenue to float so all math is float-based
     revenue = float(revenue)
 
+    # One consistent set of factors for the whole calculation
+    tables = tables or get_tables()
+
     # Track breakdown components
     breakdown = {}
 
     # 1️⃣  Hazard class lookup
-    hazard = INDUSTRY_HAZARD.get(industry)
-    if hazard is None:
-        raise ValueError(f"Unknown industry slug '{industry}' in INDUSTRY_HAZARD map")
+    hazard = tables.hazard_class(industry)
     
     breakdown["industry"] = industry
     breakdown["hazard_class"] = hazard
 
     # 2️⃣  Base rate per $1,000 revenue
-    band_key   = _revenue_band_key(revenue)
-    rate_table = HAZARD_BASE.get(str(hazard)) or HAZARD_BASE.get(hazard)
-    rate_per_k = rate_table[band_key]
+    band       = tables.revenue_band(revenue)
+    band_key   = BAND_KEYS[band]
+    rate_per_k = tables.base_rate(hazard, band)
     base_prem  = (revenue / 1_000) * rate_per_k
     
     breakdown["revenue_band"] = band_key
@@ -120,23 +303,15 @@ def price_with_breakdown(submission: dict) -> dict:
     breakdown["base_premium"] = base_prem
 
     # 3️⃣  Limit factor
-    limit_key = _nearest_key(LIMIT_FACTORS, f"{limit//1_000_000}M")
-    limit_factor = LIMIT_FACTORS[limit_key]
+    limit_key, limit_factor = tables.limit_factor(limit)
     prem = base_prem * limit_factor
     
     breakdown["limit_key"] = limit_key
     breakdown["limit_factor"] = limit_factor
     breakdown["premium_after_limit"] = prem
 
-    # 4️⃣  Retention factor  ─ tolerate str **or** int keys
-    ret_factor = RET_FACTORS.get(str(retention)) or RET_FACTORS.get(retention)
-    if ret_factor is None:
-        # choose the next-higher deductible if exact not found
-        numeric_keys = sorted(int(k) if isinstance(k, str) else k
-                              for k in RET_FACTORS.keys())
-        larger = [k for k in numeric_keys if k > retention]
-        chosen = larger[0] if larger else numeric_keys[-1]
-        ret_factor = RET_FACTORS.get(str(chosen)) or RET_FACTORS.get(chosen)
+    # 4️⃣  Retention factor (next-higher deductible if exact not found)
+    ret_factor = tables.retention_factor(retention)
 
     prem *= ret_factor
     
@@ -150,15 +325,10 @@ def price_with_breakdown(submission: dict) -> dict:
 
     # 5️⃣  Control modifiers
     applied_modifiers = []
-    for ctrl_slug, mod in CTRL_MODS.items():
-        if ctrl_slug.startswith("No_"):
-            positive_slug = ctrl_slug[3:]
-            if positive_slug not in controls:
-                prem *= (1 + mod)
-                applied_modifiers.append({"control": ctrl_slug, "modifier": mod, "reason": f"Missing {positive_slug}"})
-        elif ctrl_slug in controls:
-            prem *= (1 + mod)
-            applied_modifiers.append({"control": ctrl_slug, "modifier": mod, "reason": f"Has {ctrl_slug}"})
+    for ctrl in tables.applicable_controls(controls):
+        prem *= (1 + ctrl.modifier)
+        reason = f"Missing {ctrl.control}" if ctrl.when_missing else f"Has {ctrl.slug}"
+        applied_modifiers.append({"control": ctrl.slug, "modifier": ctrl.modifier, "reason": reason})
     
     breakdown["control_modifiers"] = applied_modifiers
     breakdown["premium_after_controls"] = prem
@@ -201,42 +371,26 @@ def price(submission: dict) -> dict:
     # Cast revenue to float so all math is float-based
     revenue = float(revenue)
 
+    tables = get_tables()
+
     # 1️⃣  Hazard class lookup
-    hazard = INDUSTRY_HAZARD.get(industry)
-    if hazard is None:
-        raise ValueError(f"Unknown industry slug '{industry}' in INDUSTRY_HAZARD map")
+    hazard = tables.hazard_class(industry)
 
     # 2️⃣  Base rate per $1,000 revenue
-    band_key   = _revenue_band_key(revenue)
-    rate_table = HAZARD_BASE.get(str(hazard)) or HAZARD_BASE.get(hazard)
-    rate_per_k = rate_table[band_key]
+    rate_per_k = tables.base_rate(hazard, tables.revenue_band(revenue))
     base_prem  = (revenue / 1_000) * rate_per_k
 
     # 3️⃣  Limit factor
-    limit_key = _nearest_key(LIMIT_FACTORS, f"{limit//1_000_000}M")
-    prem = base_prem * LIMIT_FACTORS[limit_key]
-
-    # 4️⃣  Retention factor  ─ tolerate str **or** int keys
-    ret_factor = RET_FACTORS.get(str(retention)) or RET_FACTORS.get(retention)
-    if ret_factor is None:
-        # choose the next-higher deductible if exact not found
-        numeric_keys = sorted(int(k) if isinstance(k, str) else k
-                              for k in RET_FACTORS.keys())
-        larger = [k for k in numeric_keys if k > retention]
-        chosen = larger[0] if larger else numeric_keys[-1]
-        ret_factor = RET_FACTORS.get(str(chosen)) or RET_FACTORS.get(chosen)
+    _, limit_factor = tables.limit_factor(limit)
+    prem = base_prem * limit_factor
 
-    prem *= ret_factor
+    # 4️⃣  Retention factor (next-higher deductible if exact not found)
+    prem *= tables.retention_factor(retention)
 
 
     # 5️⃣  Control modifiers
-    for ctrl_slug, mod in CTRL_MODS.items():
-        if ctrl_slug.startswith("No_"):
-            positive_slug = ctrl_slug[3:]
-            if positive_slug not in controls:
-                prem *= (1 + mod)
-        elif ctrl_slug in controls:
-            prem *= (1 + mod)
+    for ctrl in tables.applicable_controls(controls):
+        prem *= (1 + ctrl.modifier)
 
     # 6️⃣  Round to nearest 100
     prem = Decimal(prem).quantize(Decimal("100"), rounding=ROUND_HALF_UP)
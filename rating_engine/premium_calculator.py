@@ -4,10 +4,24 @@ rating_engine/premium_calculator.py
 
 Single source of truth for premium calculations.
 Both Rating tab and Quote tab should use this module to ensure consistent premiums.
+
+calculate_premium results are memoized per (industry slug, revenue, limit,
+retention, hazard_override, control_adjustment, rating config version) in an
+in-process LRU, optionally backed by a shared Redis-compatible store
+(PREMIUM_CACHE_REDIS_URL). A config reload changes the version, so stale
+entries are never served; see premium_cache_stats() for hit rates.
 """
 from __future__ import annotations
 import json
-from rating_engine.engine import price_with_breakdown
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from rating_engine.engine import get_tables, price_with_breakdown
+
+PREMIUM_CACHE_SIZE = int(os.getenv("PREMIUM_CACHE_SIZE", "20000"))  # 0 disables memoization
+PREMIUM_CACHE_REDIS_URL = os.getenv("PREMIUM_CACHE_REDIS_URL", "")
+PREMIUM_CACHE_TTL = int(os.getenv("PREMIUM_CACHE_TTL", "86400"))
 
 # Industry slug mapping - converts NAICS titles and common names to rating engine slugs
 INDUSTRY_SLUG_MAP = {
@@ -43,9 +57,10 @@ INDUSTRY_SLUG_MAP = {
 DEFAULT_INDUSTRY_SLUG = "Software_as_a_Service_SaaS"
 
 
+@lru_cache(maxsize=4096)
 def map_industry_to_slug(industry_name: str) -> str:
     """
-    Map any industry name to a valid rating engine slug.
+    Map any industry name to a valid rating engine slug (memoized).
 
     Args:
         industry_name: Raw industry name (NAICS title, common name, or slug)
@@ -117,6 +132,145 @@ def map_industry_to_slug(industry_name: str) -> str:
     return DEFAULT_INDUSTRY_SLUG
 
 
+# ─────────────────────────────────────────────────────────────
+# Premium cache
+# ─────────────────────────────────────────────────────────────
+
+def _copy_result(result: dict) -> dict:
+    """Copy a calculate_premium result down to the breakdown's modifier dicts.
+
+    Cheaper than copy.deepcopy, which costs more than pricing the row again.
+    """
+    out = dict(result)
+    breakdown = out.get("breakdown")
+    if breakdown is not None:
+        breakdown = out["breakdown"] = dict(breakdown)
+        mods = breakdown.get("control_modifiers")
+        if mods is not None:
+            breakdown["control_modifiers"] = [dict(m) for m in mods]
+    return out
+
+
+class PremiumCache:
+    """Thread-safe LRU of calculate_premium results, with an optional Redis tier.
+
+    Keys carry the rating config version. When the live config reloads, the
+    entries for the previous live version are dropped (they can never hit
+    again); entries for explicitly passed tables (e.g. a re-rate candidate)
+    just age out. Values are copied in and out so callers may mutate the
+    returned breakdown.
+    """
+
+    def __init__(self, max_items: int = PREMIUM_CACHE_SIZE, redis_url: str = PREMIUM_CACHE_REDIS_URL,
+                 ttl: int = PREMIUM_CACHE_TTL):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._mem: OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._live_version: str | None = None
+        self._redis = None
+        self.stats = {"hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0, "invalidations": 0}
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.25)
+            except ImportError:
+                print("[premium_calculator] redis not installed - premium cache is in-process only")
+
+    @staticmethod
+    def _redis_key(key: tuple) -> str:
+        return "premium:v1:" + ":".join(repr(part) for part in key)
+
+    def observe_live_version(self, version: str) -> None:
+        """Note the live config version; on a reload, purge the old version's entries."""
+        if version == self._live_version:
+            return
+        with self._lock:
+            old, self._live_version = self._live_version, version
+            if old is not None and old != version:
+                for key in [k for k in self._mem if k[-1] == old]:
+                    del self._mem[key]
+                self.stats["invalidations"] += 1
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+                self.stats["hits"] += 1
+                return _copy_result(hit)
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self._redis_key(key))
+            except Exception:
+                raw = None
+                self.stats["redis_errors"] += 1
+            if raw is not None:
+                value = json.loads(raw)
+                with self._lock:
+                    self.stats["redis_hits"] += 1
+                    self._remember(key, value)
+                return _copy_result(value)
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key: tuple, value: dict) -> None:
+        value = _copy_result(value)
+        with self._lock:
+            self._remember(key, value)
+        if self._redis is not None:
+            try:
+                self._redis.set(self._redis_key(key), json.dumps(value), ex=self.ttl)
+            except Exception:
+                self.stats["redis_errors"] += 1
+
+    def _remember(self, key: tuple, value: dict) -> None:
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+
+
+_premium_cache = PremiumCache()
+
+
+def premium_cache_stats() -> dict:
+    """Hit/miss counters for the premium and industry-slug caches (this process)."""
+    with _premium_cache._lock:
+        stats = dict(_premium_cache.stats)
+        stats["size"] = len(_premium_cache._mem)
+        stats["config_version"] = _premium_cache._live_version
+    lookups = stats["hits"] + stats["redis_hits"] + stats["misses"]
+    stats["hit_rate"] = round((stats["hits"] + stats["redis_hits"]) / lookups, 4) if lookups else 0.0
+    stats["redis"] = _premium_cache._redis is not None
+    slug = map_industry_to_slug.cache_info()
+    stats["slug_cache"] = {
+        "hits": slug.hits,
+        "misses": slug.misses,
+        "size": slug.currsize,
+        "hit_rate": round(slug.hits / (slug.hits + slug.misses), 4) if slug.hits + slug.misses else 0.0,
+    }
+    return stats
+
+
+def _premium_key(industry_slug, revenue, limit, retention, hazard_override, control_adjustment, version) -> tuple:
+    """Normalized cache key: 2_000_000, 2e6 and Decimal("2000000") share an entry."""
+    return (
+        industry_slug,
+        float(revenue),
+        float(limit),
+        float(retention),
+        int(hazard_override) if hazard_override else None,
+        float(control_adjustment or 0),
+        version,
+    )
+
+
 def calculate_premium(
     revenue: float,
     limit: int,
@@ -124,6 +278,7 @@ def calculate_premium(
     industry: str,
     hazard_override: int = None,
     control_adjustment: float = 0,
+    tables=None,
 ) -> dict:
     """
     Calculate technical and risk-adjusted premiums.
@@ -138,6 +293,7 @@ def calculate_premium(
         industry: Industry name (will be mapped to slug)
         hazard_override: Optional hazard class override (1-5)
         control_adjustment: Control adjustment factor (e.g., -0.10 for 10% credit)
+        tables: Optional engine.RatingTables to price against (default: live config)
 
     Returns:
         dict with keys:
@@ -145,7 +301,40 @@ def calculate_premium(
             - risk_adjusted_premium: Premium after control adjustments
             - breakdown: Detailed breakdown from rating engine
             - error: Error message if calculation failed (only present on error)
+
+    Successful results are memoized (see PremiumCache); errors are not.
     """
+    key = None
+    if PREMIUM_CACHE_SIZE > 0:
+        try:
+            if tables is None:
+                tables = get_tables()
+                _premium_cache.observe_live_version(tables.version)
+            key = _premium_key(map_industry_to_slug(industry), revenue, limit, retention,
+                               hazard_override, control_adjustment, tables.version)
+        except (TypeError, ValueError):
+            key = None  # unhashable / non-numeric input: let the calculation report it
+        if key is not None:
+            cached = _premium_cache.get(key)
+            if cached is not None:
+                return cached
+
+    result = _calculate_premium_uncached(revenue, limit, retention, industry,
+                                         hazard_override, control_adjustment, tables)
+    if key is not None and "error" not in result:
+        _premium_cache.put(key, result)
+    return result
+
+
+def _calculate_premium_uncached(
+    revenue: float,
+    limit: int,
+    retention: int,
+    industry: str,
+    hazard_override: int = None,
+    control_adjustment: float = 0,
+    tables=None,
+) -> dict:
     try:
         # Map industry to valid slug
         industry_slug = map_industry_to_slug(industry)
@@ -160,7 +349,7 @@ def calculate_premium(
         }
 
         # Get base premium from rating engine
-        result = price_with_breakdown(rating_input)
+        result = price_with_breakdown(rating_input, tables=tables)
         breakdown = result.get("breakdown", {})
         base_premium = result.get("premium", 0)
 
@@ -204,6 +393,79 @@ def calculate_premium(
         }
 
 
+def calculate_premium_batch(
+    revenue,
+    limit,
+    retention,
+    industry,
+    hazard_override=None,
+    control_adjustment=0,
+) -> dict:
+    """
+    Vectorized calculate_premium: same rules, arrays in, arrays out.
+
+    Scalars broadcast against arrays (e.g. one submission x many limits).
+    Results match calculate_premium row for row.
+
+    Returns:
+        dict of NumPy arrays: technical_premium, risk_adjusted_premium,
+        hazard_class, effective_hazard, industry_slug, valid
+    """
+    import numpy as np
+    from rating_engine.batch import price_batch
+
+    industries = np.asarray(industry, dtype=object)
+    slug_for = {name: map_industry_to_slug(name) for name in set(industries.ravel().tolist())}
+    slugs = np.array([slug_for[name] for name in industries.ravel().tolist()], dtype=object).reshape(industries.shape)
+    overrides = np.asarray(hazard_override, dtype=object)
+    overrides = np.array([h or 0 for h in overrides.ravel().tolist()], dtype=np.int64).reshape(overrides.shape)
+    adjustments = np.asarray(control_adjustment, dtype=object)
+    adjustments = np.array([a or 0 for a in adjustments.ravel().tolist()], dtype=np.float64).reshape(adjustments.shape)
+
+    # controls=[] -> "No_*" surcharges, exactly like the scalar rating input
+    priced = price_batch(slugs, revenue, limit, retention)
+    shape = priced["hazard_class"].shape
+    hazard = priced["hazard_class"]
+    # calculate_premium starts both premiums from the engine's final premium
+    technical = priced["risk_adjusted_premium"].astype(np.float64)
+    overrides = np.broadcast_to(overrides, shape)
+    adjustments = np.broadcast_to(adjustments, shape)
+
+    # Hazard override: each hazard level is ~20% difference; int() truncates
+    override = (overrides != 0) & (overrides != hazard)
+    hazard_factor = 1 + ((overrides - hazard) * 0.20)
+    technical = np.where(override, np.trunc(technical * hazard_factor), technical)
+    risk_adjusted = technical
+
+    # Control adjustment (only affects risk-adjusted premium)
+    risk_adjusted = np.where(adjustments != 0, np.trunc(risk_adjusted * (1 + adjustments)), risk_adjusted)
+
+    # A NaN adjustment is a calculation error in calculate_premium (0 premiums)
+    valid = priced["valid"] & np.isfinite(adjustments)
+    return {
+        "technical_premium": np.where(valid, technical, 0).astype(np.int64),
+        "risk_adjusted_premium": np.where(valid, risk_adjusted, 0).astype(np.int64),
+        "hazard_class": hazard,
+        "effective_hazard": np.where(overrides != 0, overrides, hazard),
+        "industry_slug": np.broadcast_to(slugs, shape),
+        "valid": valid,
+    }
+
+
+def parse_control_adjustment(control_overrides_raw) -> float:
+    """Overall control adjustment from submissions.control_overrides (JSON text or dict)."""
+    if not control_overrides_raw:
+        return 0
+    try:
+        if isinstance(control_overrides_raw, str):
+            control_overrides = json.loads(control_overrides_raw)
+        else:
+            control_overrides = control_overrides_raw
+        return control_overrides.get("overall", 0)
+    except:
+        return 0
+
+
 def calculate_premium_for_submission(
     submission_id: str,
     limit: int,
@@ -250,18 +512,6 @@ def calculate_premium_for_submission(
         if revenue is None:
             return {"error": "No revenue - add on Details tab", "technical_premium": 0, "risk_adjusted_premium": 0}
 
-        # Parse control overrides JSON
-        control_adj = 0
-        if control_overrides_raw:
-            try:
-                if isinstance(control_overrides_raw, str):
-                    control_overrides = json.loads(control_overrides_raw)
-                else:
-                    control_overrides = control_overrides_raw
-                control_adj = control_overrides.get("overall", 0)
-            except:
-                control_adj = 0
-
         # Call the main calculation function
         return calculate_premium(
             revenue=revenue,
@@ -269,7 +519,7 @@ def calculate_premium_for_submission(
             retention=retention,
             industry=industry or "Technology",
             hazard_override=hazard_override,
-            control_adjustment=control_adj,
+            control_adjustment=parse_control_adjustment(control_overrides_raw),
         )
 
     except Exception as e:
@@ -0,0 +1,397 @@
+"""
+rating_engine/rerate.py
+=======================
+
+Portfolio re-rate: what would a rating-config change do to the book?
+
+Streams every quoted or bound quote option (insurance_towers joined to its
+submission) out of Postgres through a server-side cursor, re-prices each
+chunk with ``calculate_premium`` under the live config and a candidate
+config directory in worker processes, and writes:
+  • <out>_detail.{parquet,csv}   one row per quote option
+  • <out>_summary.{parquet,csv}  premium delta by hazard class × revenue band × limit
+
+Memory stays bounded: at most ``2 × workers`` chunks are in flight, detail
+rows are appended to the report as chunks finish, and only the summary
+groups are kept until the end.
+
+    python -m rating_engine.rerate --candidate /path/to/new_config --out reports/rerate
+    python -m rating_engine.rerate --candidate new_cfg --base old_cfg --bound-only --format csv --out rerate
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from rating_engine.engine import CFG_DIR, RatingTables
+from rating_engine.premium_calculator import calculate_premium, parse_control_adjustment
+from rating_engine.tower import cmai_layer_index, layer_attachment, tower_amount
+
+CHUNK_SIZE = 2000
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+# Quote options in scope: bound, or on a quoted submission
+_ROWS_SQL = """
+    SELECT t.id, t.submission_id, s.annual_revenue, s.naics_primary_title,
+           s.hazard_override, s.control_overrides, t.tower_json, t.primary_retention,
+           t.position, t.is_bound, t.risk_adjusted_premium, t.sold_premium
+    FROM insurance_towers t
+    JOIN submissions s ON s.id = t.submission_id
+    WHERE {scope}
+"""
+_SCOPE_ALL = "t.is_bound = TRUE OR s.submission_status = 'quoted'"
+_SCOPE_BOUND = "t.is_bound = TRUE"
+
+# (name, type) - fixed so every Parquet row group / CSV chunk has the same schema
+DETAIL_COLUMNS = [
+    ("tower_id", "str"),
+    ("submission_id", "str"),
+    ("is_bound", "bool"),
+    ("position", "str"),
+    ("industry_slug", "str"),
+    ("hazard_class", "int"),
+    ("candidate_hazard_class", "int"),
+    ("revenue_band", "str"),
+    ("revenue", "float"),
+    ("limit", "int"),
+    ("attachment", "int"),
+    ("retention", "int"),
+    ("stored_risk_adjusted_premium", "float"),
+    ("sold_premium", "float"),
+    ("base_technical_premium", "int"),
+    ("base_risk_adjusted_premium", "int"),
+    ("candidate_technical_premium", "int"),
+    ("candidate_risk_adjusted_premium", "int"),
+    ("delta", "int"),
+    ("delta_pct", "float"),
+    ("error", "str"),
+]
+SUMMARY_COLUMNS = [
+    ("hazard_class", "int"),
+    ("revenue_band", "str"),
+    ("limit", "int"),
+    ("quote_options", "int"),
+    ("bound", "int"),
+    ("base_premium", "int"),
+    ("candidate_premium", "int"),
+    ("delta", "int"),
+    ("delta_pct", "float"),
+    ("min_delta_pct", "float"),
+    ("max_delta_pct", "float"),
+]
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+_base_tables: RatingTables | None = None
+_candidate_tables: RatingTables | None = None
+
+
+def _init_worker(base: RatingTables, candidate: RatingTables) -> None:
+    global _base_tables, _candidate_tables
+    _base_tables, _candidate_tables = base, candidate
+
+
+def _our_layer(tower_json, position: str | None) -> int | None:
+    """Index of CMAI's layer in the tower; a primary option without one rates its first layer."""
+    idx = cmai_layer_index(tower_json)
+    if idx is not None:
+        return idx
+    if position != "excess" and isinstance(tower_json, list) and tower_json and isinstance(tower_json[0], dict):
+        return 0
+    return None
+
+
+def _price_layer(tables: RatingTables, limit: int, attachment: int, **kwargs) -> tuple[int, int, dict]:
+    """(technical, risk_adjusted, breakdown) for our layer; excess layers use the ILF approach."""
+    total = calculate_premium(limit=attachment + limit, tables=tables, **kwargs)
+    if "error" in total:
+        raise ValueError(total["error"])
+    if attachment <= 0:
+        return total["technical_premium"], total["risk_adjusted_premium"], total["breakdown"]
+    underlying = calculate_premium(limit=attachment, tables=tables, **kwargs)
+    if "error" in underlying:
+        raise ValueError(underlying["error"])
+    return (
+        max(0, total["technical_premium"] - underlying["technical_premium"]),
+        max(0, total["risk_adjusted_premium"] - underlying["risk_adjusted_premium"]),
+        total["breakdown"],
+    )
+
+
+def _rerate_row(row: tuple) -> dict:
+    (tower_id, submission_id, revenue, industry, hazard_override, control_overrides,
+     tower_json, primary_retention, position, is_bound, stored_premium, sold_premium) = row
+    out = {
+        "tower_id": str(tower_id),
+        "submission_id": str(submission_id),
+        "is_bound": bool(is_bound),
+        "position": position or "primary",
+        "revenue": float(revenue) if revenue is not None else None,
+        "stored_risk_adjusted_premium": float(stored_premium) if stored_premium is not None else None,
+        "sold_premium": float(sold_premium) if sold_premium is not None else None,
+    }
+
+    idx = _our_layer(tower_json, position)
+    layer = tower_json[idx] if idx is not None else None
+    retention = primary_retention if primary_retention is not None else (layer or {}).get("retention")
+    if revenue is None:
+        out["error"] = "no revenue"
+        return out
+    if not layer or not layer.get("limit"):
+        out["error"] = "no rated layer in tower_json"
+        return out
+    if retention is None:
+        out["error"] = "no retention"
+        return out
+
+    try:
+        limit = tower_amount(layer["limit"])
+        attachment = layer_attachment(tower_json, idx)
+        retention = tower_amount(retention)
+        out.update(limit=limit, attachment=attachment, retention=retention)
+        kwargs = dict(
+            revenue=revenue,
+            retention=retention,
+            industry=industry or "Technology",
+            hazard_override=hazard_override,
+            control_adjustment=parse_control_adjustment(control_overrides),
+        )
+        base_tech, base_risk, base_bd = _price_layer(_base_tables, limit, attachment, **kwargs)
+        cand_tech, cand_risk, cand_bd = _price_layer(_candidate_tables, limit, attachment, **kwargs)
+    except Exception as e:
+        out["error"] = str(e)
+        return out
+
+    delta = cand_risk - base_risk
+    out.update(
+        industry_slug=base_bd.get("industry_slug"),
+        hazard_class=base_bd.get("effective_hazard"),
+        candidate_hazard_class=cand_bd.get("effective_hazard"),
+        revenue_band=base_bd.get("revenue_band"),
+        base_technical_premium=base_tech,
+        base_risk_adjusted_premium=base_risk,
+        candidate_technical_premium=cand_tech,
+        candidate_risk_adjusted_premium=cand_risk,
+        delta=delta,
+        delta_pct=round(delta / base_risk * 100, 4) if base_risk else None,
+    )
+    return out
+
+
+def _rerate_chunk(rows: list[tuple]) -> list[dict]:
+    return [_rerate_row(row) for row in rows]
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+def _stream_rows(bound_only: bool, chunk_size: int):
+    """Yield lists of quote-option rows from a server-side (named) cursor."""
+    from core.db import get_raw_conn
+
+    sql = _ROWS_SQL.format(scope=_SCOPE_BOUND if bound_only else _SCOPE_ALL)
+    with get_raw_conn() as conn:
+        cur = conn.cursor(name="portfolio_rerate")
+        cur.itersize = chunk_size
+        try:
+            cur.execute(sql)
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cur.close()
+
+
+class _ReportWriter:
+    """Append-only Parquet (pyarrow) or CSV writer with a fixed column schema."""
+
+    def __init__(self, path: Path, fmt: str, columns: list[tuple[str, str]]):
+        self.path = path
+        self.fmt = fmt
+        self.names = [name for name, _ in columns]
+        self.rows = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+            self._pa = pa
+            self._schema = pa.schema([(name, types[kind]) for name, kind in columns])
+            self._writer = pq.ParquetWriter(str(path), self._schema)
+        else:
+            self._file = path.open("w", newline="")
+            self._writer = csv.DictWriter(self._file, fieldnames=self.names, extrasaction="ignore")
+            self._writer.writeheader()
+
+    def write(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        if self.fmt == "parquet":
+            columns = {name: [r.get(name) for r in rows] for name in self.names}
+            self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+        else:
+            self._writer.writerows(rows)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        if self.fmt == "parquet":
+            self._writer.close()
+        else:
+            self._file.close()
+
+
+def _default_format() -> str:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return "parquet"
+    except ImportError:
+        return "csv"
+
+
+def _accumulate(groups: dict, row: dict) -> None:
+    key = (row["hazard_class"], row["revenue_band"], row["limit"])
+    g = groups.get(key)
+    if g is None:
+        g = groups[key] = {"quote_options": 0, "bound": 0, "base_premium": 0, "candidate_premium": 0,
+                           "min_delta_pct": None, "max_delta_pct": None}
+    g["quote_options"] += 1
+    g["bound"] += row["is_bound"]
+    g["base_premium"] += row["base_risk_adjusted_premium"]
+    g["candidate_premium"] += row["candidate_risk_adjusted_premium"]
+    pct = row["delta_pct"]
+    if pct is not None:
+        g["min_delta_pct"] = pct if g["min_delta_pct"] is None else min(g["min_delta_pct"], pct)
+        g["max_delta_pct"] = pct if g["max_delta_pct"] is None else max(g["max_delta_pct"], pct)
+
+
+def _summary_rows(groups: dict) -> list[dict]:
+    rows = []
+    for (hazard, band, limit), g in sorted(groups.items(), key=lambda kv: (kv[0][0] or 0, str(kv[0][1]), kv[0][2] or 0)):
+        delta = g["candidate_premium"] - g["base_premium"]
+        rows.append({
+            "hazard_class": hazard,
+            "revenue_band": band,
+            "limit": limit,
+            **g,
+            "delta": delta,
+            "delta_pct": round(delta / g["base_premium"] * 100, 4) if g["base_premium"] else None,
+        })
+    return rows
+
+
+def run_rerate(
+    candidate_dir: str | Path,
+    out: str | Path,
+    base_dir: str | Path = CFG_DIR,
+    bound_only: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = CHUNK_SIZE,
+    fmt: str | None = None,
+) -> dict:
+    """
+    Re-price the book under ``candidate_dir`` vs ``base_dir`` and write the diff report.
+
+    Returns:
+        dict with paths, quote options rated / skipped, base and candidate
+        premium totals, config versions and elapsed seconds
+    """
+    base = RatingTables.load(base_dir)            # fail fast on a broken config,
+    candidate = RatingTables.load(candidate_dir)  # before touching the database
+    fmt = fmt or _default_format()
+    out = Path(out)
+    detail_path = out.with_name(f"{out.name}_detail.{fmt}")
+    summary_path = out.with_name(f"{out.name}_summary.{fmt}")
+
+    started = time.perf_counter()
+    groups: dict = {}
+    totals = {"rated": 0, "skipped": 0, "base_premium": 0, "candidate_premium": 0}
+    detail = _ReportWriter(detail_path, fmt, DETAIL_COLUMNS)
+
+    def consume(rows: list[dict]) -> None:
+        detail.write(rows)
+        for row in rows:
+            if row.get("error"):
+                totals["skipped"] += 1
+                continue
+            totals["rated"] += 1
+            totals["base_premium"] += row["base_risk_adjusted_premium"]
+            totals["candidate_premium"] += row["candidate_risk_adjusted_premium"]
+            _accumulate(groups, row)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(base, candidate),
+        ) as pool:
+            pending = set()
+            for chunk in _stream_rows(bound_only, chunk_size):
+                pending.add(pool.submit(_rerate_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        consume(future.result())
+            for future in pending:
+                consume(future.result())
+    finally:
+        detail.close()
+
+    summary = _ReportWriter(summary_path, fmt, SUMMARY_COLUMNS)
+    summary.write(_summary_rows(groups))
+    summary.close()
+
+    return {
+        "detail_path": str(detail_path),
+        "summary_path": str(summary_path),
+        "base_version": base.version,
+        "candidate_version": candidate.version,
+        **totals,
+        "elapsed": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidate", required=True, help="config directory with the candidate *.yml files")
+    parser.add_argument("--base", default=str(CFG_DIR), help="config to compare against (default: live config)")
+    parser.add_argument("--out", required=True, help="report path prefix, e.g. reports/rerate")
+    parser.add_argument("--format", choices=["parquet", "csv"], default=None,
+                        help="default: parquet if pyarrow is installed, else csv")
+    parser.add_argument("--bound-only", action="store_true", help="only bound quote options")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        result = run_rerate(
+            args.candidate, args.out, base_dir=args.base, bound_only=args.bound_only,
+            workers=args.workers, chunk_size=args.chunk_size, fmt=args.format,
+        )
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(f"[rerate] {e}")
+
+    base_total, cand_total = result["base_premium"], result["candidate_premium"]
+    change = (cand_total - base_total) / base_total * 100 if base_total else 0.0
+    print(f"[rerate] config {result['base_version']} -> {result['candidate_version']}")
+    print(f"[rerate] {result['rated']} quote options re-rated, {result['skipped']} skipped "
+          f"in {result['elapsed']}s")
+    print(f"[rerate] premium ${base_total:,.0f} -> ${cand_total:,.0f} ({change:+.2f}%)")
+    print(f"[rerate] {result['detail_path']}")
+    print(f"[rerate] {result['summary_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+rating_engine/tower.py
+======================
+
+Reading CMAI's layer out of an insurance tower (insurance_towers.tower_json).
+
+Shared by the quote documents (core.document_generator) and the portfolio
+re-rate (rating_engine.rerate) so both find and attach the same layer.
+tower_json amounts arrive as int, float or string ("1000000.0").
+
+    from rating_engine.tower import cmai_layer_index, layer_attachment, tower_amount
+    idx = cmai_layer_index(tower_json)
+    limit = tower_amount(tower_json[idx].get("limit"))
+    attachment = layer_attachment(tower_json, idx)
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+
+def tower_amount(value) -> int:
+    """A tower_json amount as an int dollar figure; blank / missing is 0."""
+    return int(float(value)) if value else 0
+
+
+def is_cmai(layer) -> bool:
+    """Whether a tower layer is ours (carrier name contains CMAI)."""
+    return isinstance(layer, dict) and "CMAI" in str(layer.get("carrier") or "").upper()
+
+
+def cmai_layer_index(tower_json) -> Optional[int]:
+    """Index of CMAI's layer in the tower, or None."""
+    layers = tower_json if isinstance(tower_json, list) else []
+    return next((i for i, layer in enumerate(layers) if is_cmai(layer)), None)
+
+
+def layer_attachment(tower_json: list, idx: int) -> int:
+    """
+    Attachment of layer ``idx``. When the layer does not carry one (0 or
+    missing), it attaches above the layers below it: the sum of their limits.
+    """
+    attachment = tower_amount(tower_json[idx].get("attachment"))
+    if attachment == 0 and idx > 0:
+        attachment = sum(tower_amount(layer.get("limit")) for layer in tower_json[:idx])
+    return attachment
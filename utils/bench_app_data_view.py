@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark: credibility + contradiction scoring with a shared FlatAppData view.
+
+Generates large synthetic applications (nested sections, optional "data"
+wrapper, every field the consistency / plausibility / contradiction rules
+read, plus filler questions) and times:
+
+  per-check   each check given the raw dict, so each flattens it again
+              (detect_application_contradictions + the three credibility
+              dimensions + the question count, as before)
+  shared      one FlatAppData built up front and passed to every check
+
+It also checks that FlatAppData.fields / .lookup are identical (including
+key order) to the previous per-module flatteners, and that both paths
+produce the same scores and conflicts. No database needed.
+
+Usage:
+    python utils/bench_app_data_view.py
+    python utils/bench_app_data_view.py --apps 200 --fields 2000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.app_data_view import FlatAppData  # noqa: E402
+from core.conflict_config import APPLICATION_CONTRADICTION_RULES  # noqa: E402
+from core.conflict_detection import detect_application_contradictions  # noqa: E402
+from core.credibility_config import CONSISTENCY_RULES, PLAUSIBILITY_RULES, get_app_complexity  # noqa: E402
+from core.credibility_score import (  # noqa: E402
+    calculate_completeness_score,
+    calculate_consistency_score,
+    calculate_credibility_score,
+    calculate_plausibility_score,
+)
+
+ANSWERS = ["Yes", "No", "yes", "no", True, False, "TRUE", "false", None, "", "N/A", "CrowdStrike",
+           "Okta", "95%", 40, 0, "asdf", "We enforce MFA for all remote access and admin accounts.",
+           "Quarterly tabletop exercises with outside counsel", "TBD"]
+SECTIONS = ["general", "endpointSecurity", "identity", "backups", "privacy", "payments", "incident"]
+
+
+def rule_fields() -> list[str]:
+    names = set()
+    for rule in CONSISTENCY_RULES:
+        names.update((rule["field_a"], rule["field_b"]))
+    for rule in PLAUSIBILITY_RULES:
+        names.add(rule["field"])
+    for rule in APPLICATION_CONTRADICTION_RULES:
+        names.update((rule["field_a"], rule["field_b"]))
+        names.update(rule.get("field_a_alt", []) + rule.get("field_b_alt", []))
+    return sorted(names)
+
+
+def synthetic_app(rng: random.Random, fields: int, known: list[str]) -> dict:
+    app: dict = {}
+
+    def put(path: str, value):
+        node = app
+        *parents, leaf = path.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+            if not isinstance(node, dict):
+                return
+        node[leaf] = value
+
+    for name in known:
+        if rng.random() < 0.8:
+            key = name if "." in name or rng.random() < 0.5 else f"{rng.choice(SECTIONS)}.{name}"
+            if rng.random() < 0.2:
+                key = key.lower()
+            put(key, rng.choice(ANSWERS))
+    for i in range(fields):
+        depth = rng.randint(0, 3)
+        path = ".".join([rng.choice(SECTIONS)] + [f"group{rng.randint(0, 9)}" for _ in range(depth)])
+        put(f"{path}.question{i}", rng.choice(ANSWERS))
+    app["businessModel"] = rng.choice(["B2B", "B2C", "B2B2C"])
+    return {"data": app} if rng.random() < 0.5 else app
+
+
+# Previous flatteners, for the parity check
+def legacy_credibility_flatten(app_data: dict, prefix: str = "") -> dict:
+    result = {}
+    for key, value in app_data.items():
+        full_key = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            result.update(legacy_credibility_flatten(value, full_key))
+        else:
+            result[full_key] = value
+            result[key] = value
+    return result
+
+
+def legacy_conflict_flatten(app_data: dict) -> dict:
+    flat = {}
+
+    def _flatten(obj: dict, prefix: str = ""):
+        for key, value in obj.items():
+            full_key = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                _flatten(value, full_key)
+            else:
+                flat[key] = value
+                flat[full_key] = value
+                flat[key.lower()] = value
+
+    if "data" in app_data and isinstance(app_data["data"], dict):
+        _flatten(app_data["data"])
+    else:
+        _flatten(app_data)
+    return flat
+
+
+def per_check(app: dict, submission: dict):
+    conflicts = detect_application_contradictions(app)
+    question_count = FlatAppData(app).question_count
+    testable = get_app_complexity(question_count)["testable_pairs"]
+    dims = (
+        calculate_consistency_score(app, testable_pairs=testable),
+        calculate_plausibility_score(app, submission_data=submission),
+        calculate_completeness_score(app),
+    )
+    return conflicts, dims
+
+
+def shared(app: dict, submission: dict):
+    view = FlatAppData(app)
+    conflicts = detect_application_contradictions(view)
+    score = calculate_credibility_score(view, submission_data=submission)
+    return conflicts, (score.consistency, score.plausibility, score.completeness)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=100)
+    parser.add_argument("--fields", type=int, default=1000, help="filler questions per application")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    known = rule_fields()
+    apps = [synthetic_app(rng, args.fields, known) for _ in range(args.apps)]
+    submission = {"naics_primary_code": "541512", "annual_revenue": 25_000_000, "employee_count": 120}
+
+    mismatches = 0
+    for app in apps:
+        view = FlatAppData(app)
+        legacy_fields = legacy_credibility_flatten(app)
+        mismatches += list(view.fields.items()) != list(legacy_fields.items())
+        mismatches += view.lookup != legacy_conflict_flatten(app)
+        a, b = per_check(app, submission), shared(app, submission)
+        mismatches += a[0] != b[0]
+        mismatches += [(d.score, d.issues) for d in a[1]] != [(d.score, d.issues) for d in b[1]]
+
+    timings = {"per-check": [], "shared": []}
+    for app in apps:
+        for label, fn in (("per-check", per_check), ("shared", shared)):
+            started = time.perf_counter()
+            fn(app, submission)
+            timings[label].append((time.perf_counter() - started) * 1000)
+
+    leaves = statistics.mean(len(legacy_credibility_flatten(a)) for a in apps)
+    print(f"{args.apps} applications, ~{leaves:,.0f} flattened keys each")
+    for label, values in timings.items():
+        values.sort()
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"  {label:<10} median {statistics.median(values):8.2f} ms   p95 {p95:8.2f} ms")
+    print(f"  mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
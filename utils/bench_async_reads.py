@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: async (psycopg 3) vs sync (psycopg2) hot read endpoints.
+
+Starts the API twice against the local Postgres in DATABASE_URL - once with
+ASYNC_DB=0 (sync handlers in api/main.py) and once with ASYNC_DB=1 (async
+handlers in api/hot_reads.py) - and drives each endpoint with N concurrent
+clients, reporting requests/sec and p50/p99 latency.
+
+Usage:
+    python utils/bench_async_reads.py
+    python utils/bench_async_reads.py --concurrency 64 --duration 20
+    python utils/bench_async_reads.py --submission-id <uuid>
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = [
+    "/api/submissions",
+    "/api/workflow/queue",
+    "/api/dashboard/submission-status-counts",
+    "/api/dashboard/recent-submissions",
+    "/api/stats/summary",
+    "/api/stats/upcoming-renewals",
+    "/api/stats/retention-metrics",
+]
+
+
+def start_server(port: int, async_db: bool) -> subprocess.Popen:
+    env = {**os.environ, "ASYNC_DB": "1" if async_db else "0"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app",
+         "--port", str(port), "--workers", "1", "--log-level", "warning"],
+        cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base}/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"API at {base} did not become ready")
+
+
+async def hammer(base: str, path: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        while time.monotonic() < stop_at:
+            t0 = time.perf_counter()
+            try:
+                resp = await client.get(f"{base}{path}")
+                if resp.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        started = time.monotonic()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+    }
+
+
+async def run_mode(async_db: bool, port: int, endpoints: list[str], args) -> dict:
+    proc = start_server(port, async_db)
+    base = f"http://127.0.0.1:{port}"
+    try:
+        await wait_ready(base)
+        results = {}
+        for path in endpoints:
+            await hammer(base, path, args.concurrency, 1.0)  # warm pools
+            results[path] = await hammer(base, path, args.concurrency, args.duration)
+        return results
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--submission-id", help="also benchmark /api/submissions/{id}")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        sys.exit("DATABASE_URL must point at a local Postgres")
+
+    endpoints = list(ENDPOINTS)
+    if args.submission_id:
+        endpoints.insert(1, f"/api/submissions/{args.submission_id}")
+
+    sync_results = asyncio.run(run_mode(False, args.port, endpoints, args))
+    async_results = asyncio.run(run_mode(True, args.port + 1, endpoints, args))
+
+    print(f"\nconcurrency={args.concurrency} duration={args.duration}s per endpoint\n")
+    print(f"{'endpoint':<45} {'mode':<6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    print("-" * 90)
+    for path in endpoints:
+        for mode, res in (("sync", sync_results[path]), ("async", async_results[path])):
+            print(f"{path:<45} {mode:<6} {res['rps']:>9.1f} {res['p50']:>9.1f} {res['p99']:>9.1f} {res['errors']:>7}")
+        s, a = sync_results[path], async_results[path]
+        if s["rps"]:
+            print(f"{'':<45} {'x':<6} {a['rps'] / s['rps']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
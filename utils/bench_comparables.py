@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark: comparable search on a synthetic 100k-submission table.
+
+Builds a scratch schema (bench_comparables) with a submissions table shaped
+like the real one (clustered embeddings, revenue, NAICS, stage, dates, the
+stored combined_embedding column and HNSW indexes), then times, for several
+filter selectivities and similarity modes:
+
+  legacy       the old query shape: distance ORDER BY with the filters in
+               the same WHERE; combined mode on (ops + controls) expression
+  pre_filter   exact distance over the filtered rows
+  post_filter  HNSW top-N, then the filters
+  auto         core.benchmarking's per-query choice
+
+and reports median / p95 latency and recall@k against the exact answer.
+
+The schema is dropped at the end unless --keep is given; re-runs with
+--keep reuse the table.
+
+Usage:
+    python utils/bench_comparables.py
+    python utils/bench_comparables.py --rows 100000 --dim 1536 --queries 50 --keep
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+SCHEMA = "bench_comparables"
+STATUSES = [("received", "pending"), ("quoted", "pending"), ("quoted", "bound"),
+            ("quoted", "lost"), ("declined", "declined")]
+NAICS = [f"5{i:05d}" for i in range(40)]
+
+# (label, revenue_tolerance, same_industry, stage_filter, date_window_months)
+SCENARIOS = [
+    ("wide: 24 months", 0, False, None, 24),
+    ("medium: revenue ±25%", 0.25, False, None, 24),
+    ("narrow: revenue ±25%, same NAICS, bound", 0.25, True, "bound", 24),
+]
+
+
+def build_table(conn, rows: int, dim: int, seed: int = 5) -> None:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(len(NAICS), dim))
+    today = date.today()
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCHEMA}")
+        cur.execute(f"""
+            CREATE TABLE {SCHEMA}.submissions (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                annual_revenue NUMERIC,
+                naics_primary_code TEXT,
+                submission_status TEXT,
+                submission_outcome TEXT,
+                effective_date DATE,
+                date_received DATE,
+                ops_embedding vector({dim}),
+                controls_embedding vector({dim}),
+                combined_embedding vector({dim})
+                    GENERATED ALWAYS AS (ops_embedding + controls_embedding) STORED
+            )
+        """)
+        batch = 5000
+        for start in range(0, rows, batch):
+            n = min(batch, rows - start)
+            industry = rng.integers(0, len(NAICS), n)
+            ops = centers[industry] + rng.normal(scale=0.8, size=(n, dim))
+            ops /= np.linalg.norm(ops, axis=1, keepdims=True)
+            ctrl = rng.normal(size=(n, dim))
+            ctrl /= np.linalg.norm(ctrl, axis=1, keepdims=True)
+            revenue = np.exp(rng.normal(17.5, 1.5, n)).round(-3)
+            stage = rng.integers(0, len(STATUSES), n)
+            age = rng.integers(0, 4 * 365, n)
+            buf = io.StringIO()
+            for i in range(n):
+                status, outcome = STATUSES[stage[i]]
+                received = today - timedelta(days=int(age[i]))
+                buf.write(
+                    f"{revenue[i]:.0f}\t{NAICS[industry[i]]}\t{status}\t{outcome}\t"
+                    f"{received + timedelta(days=30)}\t{received}\t"
+                    "[" + ",".join(f"{v:.5f}" for v in ops[i]) + "]\t"
+                    "[" + ",".join(f"{v:.5f}" for v in ctrl[i]) + "]\n"
+                )
+            buf.seek(0)
+            cur.copy_expert(
+                f"COPY {SCHEMA}.submissions (annual_revenue, naics_primary_code, submission_status, "
+                "submission_outcome, effective_date, date_received, ops_embedding, controls_embedding) "
+                "FROM STDIN",
+                buf,
+            )
+            print(f"\r  loaded {start + n:,}/{rows:,}", end="", flush=True)
+        print()
+        started = time.perf_counter()
+        for col in ("ops_embedding", "controls_embedding", "combined_embedding"):
+            cur.execute(f"CREATE INDEX ON {SCHEMA}.submissions USING hnsw ({col} vector_cosine_ops)")
+        cur.execute(f"CREATE INDEX ON {SCHEMA}.submissions (annual_revenue)")
+        cur.execute(f"CREATE INDEX ON {SCHEMA}.submissions (naics_primary_code)")
+        cur.execute(f"ANALYZE {SCHEMA}.submissions")
+        print(f"  indexes built in {time.perf_counter() - started:.1f}s")
+    conn.commit()
+
+
+def legacy_search(cur, mode: str, query_vec, where_sql: str, params: list, limit: int) -> list[tuple]:
+    from pgvector import Vector
+
+    vec_col = "(ops_embedding + controls_embedding)" if mode == "combined" else "ops_embedding"
+    cur.execute(f"""
+        SELECT s.id, {vec_col} <=> %s AS distance
+        FROM submissions s
+        WHERE {where_sql} AND {vec_col} IS NOT NULL
+        ORDER BY distance
+        LIMIT %s
+    """, [Vector(query_vec), *params, limit])
+    return cur.fetchall()
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384, help="embedding dimension (production: 1536)")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=15)
+    parser.add_argument("--keep", action="store_true", help="keep (and reuse) the bench schema")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        sys.exit("DATABASE_URL must point at a local Postgres with pgvector")
+
+    from core.benchmarking import VECTOR_COLUMNS, _comparable_filters, _nearest_submissions
+    from core.db import get_raw_conn
+
+    with get_raw_conn(vector=True) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s)", (f"{SCHEMA}.submissions",))
+            exists = cur.fetchone()[0] is not None
+        if not (args.keep and exists):
+            print(f"building {SCHEMA}.submissions: {args.rows:,} rows, dim {args.dim}")
+            build_table(conn, args.rows, args.dim)
+
+        with conn.cursor() as cur:
+            cur.execute(f"SET search_path TO {SCHEMA}, public")
+            cur.execute(
+                "SELECT id, annual_revenue, naics_primary_code, ops_embedding, combined_embedding "
+                "FROM submissions ORDER BY random() LIMIT %s", (args.queries,)
+            )
+            probes = cur.fetchall()
+
+        try:
+            for mode in ("operations", "combined"):
+                vec_col = VECTOR_COLUMNS[mode]
+                print(f"\n== {mode} ({vec_col}), k={args.limit}, {len(probes)} queries")
+                print(f"{'scenario':<42} {'path':<12} {'median ms':>10} {'p95 ms':>8} {'recall':>7}")
+                for label, tolerance, same_industry, stage, months in SCENARIOS:
+                    timings = {"legacy": [], "pre_filter": [], "post_filter": [], "auto": []}
+                    recall = {"legacy": [], "post_filter": [], "auto": []}
+                    chosen = {}
+                    for sub_id, revenue, naics, ops_vec, combined_vec in probes:
+                        query_vec = ops_vec if mode == "operations" else combined_vec
+                        where_sql, params = _comparable_filters(
+                            str(sub_id), revenue, naics, tolerance, same_industry, stage, months
+                        )
+                        with conn.cursor() as cur:
+                            exact, ms = timed(_nearest_submissions, cur, vec_col, query_vec,
+                                              where_sql, params, args.limit, "pre_filter")
+                            timings["pre_filter"].append(ms)
+                            truth = {r[0] for r in exact[0]}
+                            runs = {
+                                "legacy": timed(legacy_search, cur, mode, query_vec, where_sql, params, args.limit),
+                                "post_filter": timed(_nearest_submissions, cur, vec_col, query_vec,
+                                                     where_sql, params, args.limit, "post_filter"),
+                                "auto": timed(_nearest_submissions, cur, vec_col, query_vec,
+                                              where_sql, params, args.limit, "auto"),
+                            }
+                        for path, (result, ms) in runs.items():
+                            rows = result if path == "legacy" else result[0]
+                            timings[path].append(ms)
+                            if truth:
+                                recall[path].append(len(truth & {r[0] for r in rows}) / len(truth))
+                            if path == "auto":
+                                chosen[result[1]] = chosen.get(result[1], 0) + 1
+                    for path, values in timings.items():
+                        values.sort()
+                        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+                        r = recall.get(path)
+                        r_txt = f"{statistics.mean(r):.3f}" if r else "exact"
+                        print(f"{label:<42} {path:<12} {statistics.median(values):>10.1f} {p95:>8.1f} {r_txt:>7}")
+                    print(f"{'':<42} auto chose: {chosen}")
+        finally:
+            conn.rollback()  # read-only timing transaction (and SET LOCALs)
+            if not args.keep:
+                with conn.cursor() as cur:
+                    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+
+
+if __name__ == "__main__":
+    main()
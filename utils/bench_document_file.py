@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes and time to show pages of a large PDF via /api/documents/{id}/file.
+
+Builds a synthetic --pages page PDF and replays a viewer session: open the
+document, look at --views pages, then reopen it later. Three ways of serving
+(api.document_files.file_response is called directly, with the headers a
+browser would send):
+
+  full     the previous endpoint: the whole file on every open, no validators
+  ranges   Range requests, as pdf.js makes them once Accept-Ranges is present:
+           the tail (trailer + xref) then each viewed page's byte span; the
+           reopen is a conditional request answered 304
+  pages    /api/documents/{id}/pages/{n}: a single-page PDF per viewed page
+           (the first one pays for splitting the document)
+
+Reports bytes sent and time for each. Checks range bodies against the file's
+bytes and each split page's text against the source page; differences are
+counted as mismatches.
+
+Usage:
+    python utils/bench_document_file.py
+    python utils/bench_document_file.py --pages 300 --views 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+WORDS = ("insured", "loss", "claim", "reserve", "paid", "incurred", "policy", "period",
+         "ransomware", "notice", "retention", "aggregate", "breach", "vendor", "forensics")
+
+
+def build_pdf(path: Path, pages: int):
+    """A loss-run-like PDF: one uncompressed text stream (~20 KB) per page."""
+    from pypdf import PdfWriter
+    from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    rng = random.Random(7)
+    writer = PdfWriter()
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+    font_ref = writer._add_object(font)
+    for n in range(1, pages + 1):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font_ref}),
+        })
+        lines = [f"BT /F1 8 Tf 36 760 Td (Page {n} of {pages}) Tj ET"]
+        for row in range(240):
+            text = " ".join(rng.choice(WORDS) for _ in range(12))
+            lines.append(f"BT /F1 6 Tf 36 {750 - row * 3} Td (Claim {n}-{row}: {text}) Tj ET")
+        stream = DecodedStreamObject()
+        stream.set_data("\n".join(lines).encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+async def _drain(iterator) -> bytes:
+    if hasattr(iterator, "__aiter__"):
+        return b"".join([chunk async for chunk in iterator])
+    return b"".join(iterator)
+
+
+def fetch(path: str, headers: dict, media_type: str = None) -> tuple[int, bytes, dict]:
+    """(status, body, response headers) for a request with ``headers``."""
+    from api.document_files import file_response
+
+    response = file_response(headers, path, "loss_run.pdf", media_type=media_type)
+    body = b""
+    if hasattr(response, "body_iterator"):
+        body = asyncio.run(_drain(response.body_iterator))
+    return response.status_code, body, dict(response.headers)
+
+
+def page_spans(path: str) -> dict[int, tuple[int, int]]:
+    """Byte span of each page's content stream object in the file."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    offsets = sorted((offset, num) for num, offset in reader.xref.get(0, {}).items())
+    starts = {num: (offset, offsets[i + 1][0] if i + 1 < len(offsets) else os.path.getsize(path))
+              for i, (offset, num) in enumerate(offsets)}
+    spans = {}
+    for n, page in enumerate(reader.pages, start=1):
+        contents = page.get("/Contents")
+        spans[n] = starts[contents.idnum]
+    return spans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--views", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_document_file_"))
+    os.environ["DOCUMENT_PAGE_CACHE_DIR"] = str(workdir / "pages")
+    from api import document_files  # noqa: E402
+    from pypdf import PdfReader  # noqa: E402
+
+    source = workdir / "loss_run.pdf"
+    build_pdf(source, args.pages)
+    path = str(source)
+    size = source.stat().st_size
+    data = source.read_bytes()
+    viewed = sorted(random.Random(3).sample(range(1, args.pages + 1), min(args.views, args.pages)))
+    print(f"{args.pages}-page PDF, {size / 1024 / 1024:.1f} MB; viewing pages {viewed}, then reopening")
+
+    mismatches = 0
+
+    # full: whole file on open and on reopen
+    t0 = time.perf_counter()
+    sent = 0
+    for _ in range(2):
+        _, body, _ = fetch(path, {})
+        sent += len(body)
+        mismatches += body != data
+    full_s = time.perf_counter() - t0
+    print(f"  full     {sent / 1024:9.0f} KB   {full_s * 1000:7.1f} ms")
+
+    # ranges: tail, each viewed page's content stream, then a conditional reopen
+    spans = page_spans(path)
+    t0 = time.perf_counter()
+    sent = 0
+    ranges = [(max(0, size - 64 * 1024), size - 1)] + [(spans[n][0], spans[n][1] - 1) for n in viewed]
+    etag = None
+    for start, end in ranges:
+        status, body, headers = fetch(path, {"range": f"bytes={start}-{end}"})
+        etag = headers.get("etag")
+        sent += len(body)
+        mismatches += status != 206 or body != data[start:end + 1]
+    status, body, _ = fetch(path, {"if-none-match": etag})
+    sent += len(body)
+    mismatches += status != 304
+    ranges_s = time.perf_counter() - t0
+    print(f"  ranges   {sent / 1024:9.0f} KB   {ranges_s * 1000:7.1f} ms   (reopen: {status})")
+
+    # pages: one single-page PDF per view, then conditional re-fetches on reopen
+    reader = PdfReader(path)
+    t0 = time.perf_counter()
+    sent = 0
+    first_ms = None
+    page_etags = {}
+    for n in viewed:
+        page_path = str(document_files.page_file(path, n))
+        status, body, headers = fetch(page_path, {}, media_type="application/pdf")
+        first_ms = first_ms if first_ms is not None else (time.perf_counter() - t0) * 1000
+        page_etags[n] = headers.get("etag")
+        sent += len(body)
+    for n in viewed:
+        page_path = str(document_files.page_file(path, n))
+        status, body, _ = fetch(page_path, {"if-none-match": page_etags[n]}, media_type="application/pdf")
+        sent += len(body)
+        mismatches += status != 304
+    pages_s = time.perf_counter() - t0
+    for n in viewed:
+        single = PdfReader(str(document_files.page_file(path, n)))
+        mismatches += len(single.pages) != 1 or \
+            single.pages[0].extract_text() != reader.pages[n - 1].extract_text()
+    print(f"  pages    {sent / 1024:9.0f} KB   {pages_s * 1000:7.1f} ms   (first page incl. split: {first_ms:.0f} ms)")
+
+    print(f"mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark: duplicate detection, threshold-in-WHERE vs k-NN then threshold.
+
+For each table size builds a scratch schema (bench_duplicates) with a
+submissions table of random ops embeddings, ~5% of them near-duplicates of
+another row, and times check_duplicate_submission's query shapes:
+
+  legacy (seq)   1 - (ops_embedding <=> e) >= threshold in the WHERE, no index
+  legacy (hnsw)  same query with the HNSW index present
+  knn (hnsw)     core.conflict_service.DUPLICATE_KNN_SQL: k-NN, then threshold
+
+reporting median / p95 latency and how often k-NN returns the same
+duplicates as the exact legacy scan.
+
+Usage:
+    python utils/bench_duplicate_detection.py
+    python utils/bench_duplicate_detection.py --sizes 10000 100000 --dim 1536 --queries 50
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+SCHEMA = "bench_duplicates"
+
+LEGACY_SQL = """
+    SELECT
+        id, applicant_name, broker_email, date_received,
+        1 - (ops_embedding <=> CAST(:embedding AS vector)) as similarity
+    FROM submissions
+    WHERE id != :submission_id
+      AND ops_embedding IS NOT NULL
+      AND 1 - (ops_embedding <=> CAST(:embedding AS vector)) >= :threshold
+    ORDER BY ops_embedding <=> CAST(:embedding AS vector)
+    LIMIT :limit
+"""
+
+
+def vec_literal(v) -> str:
+    return "[" + ",".join(f"{x:.5f}" for x in v) + "]"
+
+
+def build_table(conn, rows: int, dim: int, seed: int = 9) -> None:
+    rng = np.random.default_rng(seed)
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"""
+        CREATE TABLE {SCHEMA}.submissions (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            applicant_name TEXT,
+            broker_email TEXT,
+            date_received DATE DEFAULT CURRENT_DATE,
+            ops_embedding vector({dim})
+        )
+    """))
+    cur = conn.connection.cursor()
+    batch = 5000
+    previous = None
+    for start in range(0, rows, batch):
+        n = min(batch, rows - start)
+        vecs = rng.normal(size=(n, dim))
+        if previous is not None:
+            # ~5% near-duplicates of rows from the previous batch
+            dup = rng.random(n) < 0.05
+            src = rng.integers(0, len(previous), n)
+            vecs[dup] = previous[src[dup]] + rng.normal(scale=0.05, size=(int(dup.sum()), dim))
+        vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+        buf = io.StringIO()
+        for i in range(n):
+            buf.write(f"Applicant {start + i}\tbroker{(start + i) % 300}@example.com\t{vec_literal(vecs[i])}\n")
+        buf.seek(0)
+        cur.copy_expert(
+            f"COPY {SCHEMA}.submissions (applicant_name, broker_email, ops_embedding) FROM STDIN", buf
+        )
+        previous = vecs
+    cur.close()
+    conn.execute(text(f"ANALYZE {SCHEMA}.submissions"))
+
+
+def run(conn, sql: str, probes, threshold: float, limit: int, knn: bool):
+    timings, results = [], []
+    for sub_id, embedding in probes:
+        params = {"submission_id": sub_id, "embedding": embedding, "threshold": threshold, "limit": limit}
+        if knn:
+            params["candidates"] = limit + 1
+        started = time.perf_counter()
+        rows = conn.execute(text(sql), params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+        results.append({str(r[0]) for r in rows})
+    timings.sort()
+    return timings, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384, help="embedding dimension (production: 1536)")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--threshold", type=float, default=0.95)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        sys.exit("DATABASE_URL must point at a local Postgres with pgvector")
+
+    from core.conflict_service import DUPLICATE_KNN_SQL
+    from core.db import engine
+
+    try:
+        for size in args.sizes:
+            print(f"\n== {size:,} submissions, dim {args.dim}, threshold {args.threshold}, k={args.limit}")
+            with engine.begin() as conn:
+                build_table(conn, size, args.dim)
+
+            with engine.connect() as conn:
+                conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+                probes = conn.execute(text(
+                    "SELECT id::text, ops_embedding::text FROM submissions ORDER BY random() LIMIT :n"
+                ), {"n": args.queries}).fetchall()
+
+                paths = {}
+                paths["legacy (seq)"] = run(conn, LEGACY_SQL, probes, args.threshold, args.limit, knn=False)
+                started = time.perf_counter()
+                conn.execute(text("CREATE INDEX ON submissions USING hnsw (ops_embedding vector_cosine_ops)"))
+                conn.execute(text("ANALYZE submissions"))
+                print(f"  HNSW index built in {time.perf_counter() - started:.1f}s")
+                paths["legacy (hnsw)"] = run(conn, LEGACY_SQL, probes, args.threshold, args.limit, knn=False)
+                paths["knn (hnsw)"] = run(conn, DUPLICATE_KNN_SQL, probes, args.threshold, args.limit, knn=True)
+                conn.rollback()
+
+            exact = paths["legacy (seq)"][1]
+            found = sum(1 for r in exact if r)
+            print(f"  {found}/{len(exact)} probes have duplicates above the threshold")
+            print(f"  {'path':<15} {'median ms':>10} {'p95 ms':>8} {'same as exact':>14}")
+            for path, (timings, results) in paths.items():
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                same = sum(1 for a, b in zip(results, exact) if a == b)
+                print(f"  {path:<15} {statistics.median(timings):>10.2f} {p95:>8.2f} {same:>10}/{len(exact)}")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
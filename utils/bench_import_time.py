@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the backend entry points.
+
+Imports each module in a fresh interpreter several times and reports the
+median wall time, plus the slowest imports (by cumulative time) from
+``python -X importtime`` for the last run.
+
+Usage:
+    python utils/bench_import_time.py
+    python utils/bench_import_time.py --runs 10 core.pipeline
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = ["core.pipeline", "api.main"]
+
+
+def time_import(module: str) -> tuple[float, str]:
+    code = (
+        "import time; t0 = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - t0)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return float(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def slowest_imports(importtime_log: str, top: int) -> list[tuple[int, str]]:
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        times = []
+        log = ""
+        for _ in range(args.runs):
+            elapsed, log = time_import(module)
+            times.append(elapsed)
+        print(f"\n{module}: median {statistics.median(times) * 1000:.0f} ms "
+              f"(min {min(times) * 1000:.0f}, max {max(times) * 1000:.0f}, runs={args.runs})")
+        for cumulative_us, name in slowest_imports(log, args.top):
+            print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: duplicate-name detection, pairwise loop vs SubmissionNameIndex.
+
+Generates N synthetic company names (with near-duplicate variants: suffixes,
+punctuation, typos), then for a sample of query names compares the old
+per-pair loop (normalize + trigram build for every existing submission)
+against SubmissionNameIndex lookups, checking that both flag exactly the same
+submissions with the same scores. No database needed.
+
+Usage:
+    python utils/bench_name_index.py
+    python utils/bench_name_index.py --names 100000 --queries 500 --threshold 0.85
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.conflict_detection import (  # noqa: E402
+    SubmissionNameIndex,
+    _normalize_company_name,
+    _string_similarity,
+)
+
+SUFFIXES = ["", " Inc", " Inc.", " LLC", " Ltd", " Corp.", " Corporation", " Co", " Company", " PLC"]
+INDUSTRY_WORDS = ["Systems", "Solutions", "Health", "Medical", "Capital", "Partners", "Financial", "Labs",
+                  "Digital", "Media", "Foods", "Energy", "Motors", "Group", "Holdings", "Services",
+                  "Consulting", "Analytics", "Security", "Networks", "Software", "Retail", "Travel"]
+# Invented-word syllables (consonant + vowel [+ consonant]) for brand-like names
+SYLLABLES = [c + v + e for c in "bcdfghklmnprstvz" for v in "aeiou" for e in ("", "n", "r", "x")]
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+
+
+def random_name(rng: random.Random) -> str:
+    words = [random_word(rng) for _ in range(rng.randint(1, 2))] + [rng.choice(INDUSTRY_WORDS)]
+    return " ".join(words) + rng.choice(SUFFIXES)
+
+
+def variant(rng: random.Random, name: str) -> str:
+    base = name.split(" Inc")[0]
+    kind = rng.randint(0, 3)
+    if kind == 0:
+        return base + rng.choice(SUFFIXES)
+    if kind == 1:
+        return base.replace(" ", ", ", 1)
+    if kind == 2 and len(base) > 5:
+        i = rng.randrange(1, len(base) - 1)
+        return base[:i] + base[i + 1:]
+    return base.upper()
+
+
+def synthetic_submissions(n: int, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    subs = []
+    for i in range(n):
+        if subs and rng.random() < 0.1:
+            name = variant(rng, rng.choice(subs)["applicant_name"])
+        else:
+            name = random_name(rng)
+        subs.append({"id": f"sub-{i}", "applicant_name": name, "broker_email": None, "date_received": None})
+    return subs
+
+
+def pairwise(name: str, submissions: list[dict], threshold: float) -> list[tuple[int, float]]:
+    """The previous detect_duplicate_submission loop."""
+    current = _normalize_company_name(name)
+    out = []
+    for pos, existing in enumerate(submissions):
+        existing_name = existing.get("applicant_name", "")
+        if not existing_name:
+            continue
+        similarity = _string_similarity(current, _normalize_company_name(existing_name))
+        if similarity >= threshold:
+            out.append((pos, similarity))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    args = parser.parse_args()
+
+    submissions = synthetic_submissions(args.names)
+    rng = random.Random(17)
+    queries = [variant(rng, rng.choice(submissions)["applicant_name"]) if i % 2 else random_name(rng)
+               for i in range(args.queries)]
+
+    started = time.perf_counter()
+    index = SubmissionNameIndex(submissions)
+    build_s = time.perf_counter() - started
+
+    index_ms, pair_ms, mismatches, flagged = [], [], 0, 0
+    for q in queries:
+        t0 = time.perf_counter()
+        got = index.matches(q, args.threshold)
+        index_ms.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        want = pairwise(q, submissions, args.threshold)
+        pair_ms.append((time.perf_counter() - t0) * 1000)
+        flagged += bool(want)
+        mismatches += got != want
+
+    def p95(values):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * 0.95))]
+
+    print(f"{args.names:,} names, {args.queries} queries, threshold {args.threshold} "
+          f"({flagged} queries with duplicates)")
+    print(f"  index build: {build_s:.2f} s")
+    print(f"  pairwise:    median {statistics.median(pair_ms):9.3f} ms   p95 {p95(pair_ms):9.3f} ms")
+    print(f"  index:       median {statistics.median(index_ms):9.3f} ms   p95 {p95(index_ms):9.3f} ms")
+    print(f"  mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: package rendering, one combined document vs cached per-section fragments.
+
+Builds a synthetic package (quote letter plus N endorsements, styled like
+rating_engine/templates/_base.html) and times:
+
+  combined        the previous path: the whole package as one HTML document
+  fragments cold  every section rendered to a fragment, merged, page
+                  numbers stamped (empty fragment cache)
+  regenerate      the same package after editing one endorsement - only that
+                  fragment and the quote letter (new generation time) render
+
+Checks that every fragment package has the same page count as the combined
+render and that the regenerate pass reused all but two fragments.
+
+Usage:
+    python utils/bench_package_fragments.py
+    python utils/bench_package_fragments.py --endorsements 30 --workers 4
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.pdf_fragments import HIDE_PAGE_MARGIN_BOXES, add_styles, document_shell  # noqa: E402
+
+STYLE = """
+<style>
+  @page { size: letter; margin: 20mm 20mm 25mm 20mm;
+          @bottom-center { content: "Page " counter(page) " of " counter(pages); font-size: 9px; } }
+  body { font-family: Helvetica, Arial, sans-serif; font-size: 11px; }
+  table { width: 100%; border-collapse: collapse; }
+  td, th { border: 1px solid #cbd5e0; padding: 4px 6px; }
+  .page-break { page-break-after: always; }
+</style>
+"""
+
+
+def quote_letter(generated_at: str) -> str:
+    rows = "".join(f"<tr><td>Coverage {r}</td><td>${(r + 1) * 250_000:,}</td></tr>" for r in range(40))
+    return (f"<html><head>{STYLE}</head><body><h1>Quote Q-2026-000123</h1><table>{rows}</table>"
+            f"<p>Generated: {generated_at}</p></body></html>")
+
+
+def endorsement(i: int, revision: int = 0) -> str:
+    para = f"This endorsement (revision {revision}) modifies insurance provided under the policy. " * 40
+    return f"<h2>ENDORSEMENT E-{i:03d}</h2><p>{para}</p><p>{para}</p>"
+
+
+def build(endorsements: list[str], generated_at: str) -> tuple[str, list[str]]:
+    """(combined html, per-section htmls) the way core.package_generator builds them."""
+    quote = quote_letter(generated_at)
+    combined = quote[:quote.rfind("</body>")] + "".join(
+        f'<div class="page-break"></div>{e}' for e in endorsements) + "</body></html>"
+    quote = add_styles(quote, HIDE_PAGE_MARGIN_BOXES)
+    open_tag, close = document_shell(quote)
+    return combined, [quote] + [open_tag + e + close for e in endorsements]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endorsements", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    os.environ["PDF_RENDER_WORKERS"] = str(args.workers)
+    os.environ["PDF_FRAGMENT_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench_fragments_")
+
+    # Settings are read at import time
+    import core.pdf_fragments as pdf_fragments
+    import core.pdf_render as pdf_render
+    importlib.reload(pdf_render)
+    importlib.reload(pdf_fragments)
+
+    pdf_render.start()
+    endorsements = [endorsement(i) for i in range(args.endorsements)]
+    mismatches = 0
+
+    combined, sections = build(endorsements, "2026-01-01 09:00")
+    t0 = time.perf_counter()
+    expected_pages = pdf_fragments.page_count(pdf_render.render_pdf(combined))
+    print(f"package: quote + {args.endorsements} endorsements, {expected_pages} pages")
+    print(f"  combined        {(time.perf_counter() - t0) * 1000:8.0f} ms")
+
+    t0 = time.perf_counter()
+    pdf, _ = pdf_fragments.render_merged(sections)
+    pages = pdf_fragments.page_count(pdf)
+    print(f"  fragments cold  {(time.perf_counter() - t0) * 1000:8.0f} ms")
+    mismatches += pages != expected_pages
+
+    endorsements[len(endorsements) // 2] = endorsement(len(endorsements) // 2, revision=1)
+    _, sections = build(endorsements, "2026-01-01 09:05")
+    t0 = time.perf_counter()
+    pdf, fragments = pdf_fragments.render_merged(sections)
+    pages = pdf_fragments.page_count(pdf)
+    rendered = sum(1 for f in fragments if not f.reused)
+    print(f"  regenerate      {(time.perf_counter() - t0) * 1000:8.0f} ms   ({rendered} of {len(sections)} sections rendered)")
+    mismatches += pages != expected_pages
+    mismatches += rendered != 2
+
+    pdf_render.shutdown()
+    print(f"mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PDF rendering, per-request WeasyPrint vs the warm render pool.
+
+Renders N synthetic quote-like documents (styled header, coverage and
+sublimit tables, endorsement text; a few pages each) three ways:
+
+  inline       the previous path: HTML(string=...).write_pdf() to a temp
+               file in the calling process, then read back - one at a time
+  pool x1      core.pdf_render with one warm worker (latency, no parallelism)
+  pool xN      N concurrent callers (like N API requests) sharing N warm
+               workers
+
+and reports per-document latency and documents/second. Worker start-up and
+warm-up are timed separately (they happen once, at API startup).
+
+Usage:
+    python utils/bench_pdf_render.py
+    python utils/bench_pdf_render.py --docs 100 --workers 8 --pages 6
+"""
+
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+STYLE = """
+<style>
+  @page { size: letter; margin: 0.75in; @bottom-center { content: counter(page) " of " counter(pages); } }
+  body { font-family: Helvetica, Arial, sans-serif; font-size: 10pt; color: #1a202c; }
+  h1 { font-size: 18pt; border-bottom: 2px solid #2b6cb0; }
+  table { width: 100%; border-collapse: collapse; margin: 12px 0; }
+  th { background: #edf2f7; text-align: left; }
+  td, th { border: 1px solid #cbd5e0; padding: 4px 6px; }
+  .page-break { page-break-before: always; }
+</style>
+"""
+
+
+def synthetic_document(i: int, pages: int) -> str:
+    rows = "".join(
+        f"<tr><td>Coverage {r}</td><td>${(r + 1) * 250_000:,}</td><td>${(r + 1) * 10_000:,}</td></tr>"
+        for r in range(40)
+    )
+    para = ("This endorsement modifies insurance provided under the policy. " * 30)
+    sections = "".join(
+        f'<div class="page-break"></div><h2>Endorsement {p}</h2><p>{para}</p><table>'
+        f"<tr><th>Coverage</th><th>Limit</th><th>Retention</th></tr>{rows}</table>"
+        for p in range(pages - 1)
+    )
+    return (
+        f"<html><head>{STYLE}</head><body><h1>Quote Q-2026-{i:06d}</h1>"
+        f"<p>Insured: Example Holdings {i} LLC</p><table>"
+        f"<tr><th>Coverage</th><th>Limit</th><th>Retention</th></tr>{rows}</table>"
+        f"{sections}</body></html>"
+    )
+
+
+def render_inline(html: str) -> bytes:
+    """The previous render_and_upload path (minus the upload)."""
+    from weasyprint import HTML
+
+    with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        HTML(string=html).write_pdf(tmp.name)
+        pdf_path = Path(tmp.name)
+    try:
+        return pdf_path.read_bytes()
+    finally:
+        pdf_path.unlink(missing_ok=True)
+
+
+def load_pdf_render(workers: int):
+    os.environ["PDF_RENDER_WORKERS"] = str(workers)
+    import core.pdf_render as pdf_render
+
+    pdf_render.shutdown()
+    return importlib.reload(pdf_render)
+
+
+def report(label: str, per_doc_ms: list[float], wall_s: float, docs: int) -> None:
+    per_doc_ms = sorted(per_doc_ms)
+    p95 = per_doc_ms[min(len(per_doc_ms) - 1, int(len(per_doc_ms) * 0.95))]
+    print(f"  {label:<10} median {statistics.median(per_doc_ms):8.1f} ms   p95 {p95:8.1f} ms   "
+          f"{docs / wall_s:6.1f} docs/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=40)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    docs = [synthetic_document(i, args.pages) for i in range(args.docs)]
+    print(f"{args.docs} documents, ~{args.pages} pages each")
+
+    started = time.perf_counter()
+    first = render_inline(docs[0])
+    print(f"  inline first document (cold process): {(time.perf_counter() - started) * 1000:.0f} ms, "
+          f"{len(first) / 1024:.0f} KB")
+
+    timings = []
+    started = time.perf_counter()
+    for html in docs:
+        t0 = time.perf_counter()
+        render_inline(html)
+        timings.append((time.perf_counter() - t0) * 1000)
+    report("inline", timings, time.perf_counter() - started, len(docs))
+
+    for workers in sorted({1, args.workers}):
+        pdf_render = load_pdf_render(workers)
+        started = time.perf_counter()
+        pdf_render.start()
+        print(f"  pool x{workers} start + warm-up: {(time.perf_counter() - started):.2f} s")
+
+        def timed_render(html: str) -> float:
+            t0 = time.perf_counter()
+            pdf_render.render_pdf(html)
+            return (time.perf_counter() - t0) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as callers:
+            timings = list(callers.map(timed_render, docs))
+        report(f"pool x{workers}", timings, time.perf_counter() - started, len(docs))
+        pdf_render.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: repeated document downloads, whole-object vs streamed + cached.
+
+Stores a synthetic document in a local storage backend (STORAGE_BACKEND=local
+in a temp directory) and downloads it --runs times, the way re-running
+extraction does:
+
+  whole    the previous download_document: the object read into memory in one
+           piece, then written to a temp file
+  cached   core.storage.download_document: streamed into the download cache
+           on the first run, linked/copied from the cache afterwards (with
+           --revalidate 0 every run also makes a conditional fetch)
+
+Reports per-run time, peak Python memory (tracemalloc) and how many runs
+actually transferred the object. Checks every downloaded copy matches.
+
+Usage:
+    python utils/bench_storage_cache.py
+    python utils/bench_storage_cache.py --mb 200 --runs 10 --revalidate 0
+"""
+
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--revalidate", type=float, default=300)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_storage_"))
+    os.environ.update({
+        "STORAGE_BACKEND": "local",
+        "STORAGE_LOCAL_ROOT": str(workdir / "store"),
+        "DOCUMENT_CACHE_DIR": str(workdir / "cache"),
+        "DOCUMENT_CACHE_REVALIDATE_SECONDS": str(args.revalidate),
+    })
+    from core import storage  # noqa: E402
+
+    source = workdir / "loss_run.pdf"
+    with open(source, "wb") as f:
+        for _ in range(args.mb):
+            f.write(os.urandom(1024 * 1024))
+    expected = sha256_file(source)
+    key = storage.upload_document(source, "bench-submission")["storage_key"]
+    print(f"{args.mb} MB document, {args.runs} downloads")
+
+    backend = storage.require_backend()
+    transfers = {"whole": 0, "cached": 0}
+    mismatches = 0
+
+    def whole_download() -> Path:
+        transfers["whole"] += 1
+        data = backend._path(key).read_bytes()  # the previous .download(): whole object in memory
+        temp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+        temp.write(data)
+        temp.close()
+        return Path(temp.name)
+
+    original_fetch = backend.fetch
+
+    def counting_fetch(k, dest, etag=None):
+        modified, new_etag = original_fetch(k, dest, etag=etag)
+        transfers["cached"] += modified
+        return modified, new_etag
+
+    backend.fetch = counting_fetch
+
+    for label, download in (("whole", whole_download), ("cached", lambda: storage.download_document(key))):
+        timings = []
+        tracemalloc.start()
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            path = download()
+            timings.append((time.perf_counter() - t0) * 1000)
+            mismatches += sha256_file(path) != expected
+            path.unlink()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {label:<7} first {timings[0]:7.1f} ms   median {statistics.median(timings):7.1f} ms   "
+              f"peak {peak / 1024 / 1024:6.1f} MB   {transfers[label]} transfers")
+
+    print(f"mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
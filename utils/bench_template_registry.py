@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rendering 1,000 quote documents through the template registry.
+
+Each document is the quote_primary.html letter plus N endorsements rendered
+by core.package_generator._render_library_document_html (fill-ins, lead-in
+and closing components). The component fetch is stubbed, so no database is
+needed. Two ways:
+
+  legacy    fill-ins and components substituted with a str.replace pass per
+            known placeholder on every render (the previous implementation,
+            inlined below)
+  registry  DB templates compiled once and served from the (id, updated_at)
+            LRU in core.template_registry
+
+Both produce byte-identical HTML; differing documents are counted as
+mismatches. Also times the first quote render in a fresh interpreter without
+and with the Jinja bytecode cache (what an API worker or render job pays on
+start-up; preload() moves it to startup).
+
+Usage:
+    python utils/bench_template_registry.py
+    python utils/bench_template_registry.py --docs 1000 --endorsements 8
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import core.package_generator as package_generator  # noqa: E402
+from core.document_generator import COMPONENT_PLACEHOLDERS  # noqa: E402
+from core.template_registry import TEMPLATE_ENV, db_template, format_limit  # noqa: E402
+
+LEAD_IN = ("<p>This endorsement, effective {{effective_date}}, forms part of policy {{policy_number}} "
+           "and modifies form {{form_number}} ({{policy_type}}).</p>")
+CLOSING = "<p>All other terms of policy {{policy_number}} remain unchanged.</p>"
+
+COVERAGE_PARAGRAPH = (
+    "<p>Solely with respect to coverage provided for {{insured_name}} for the period {{effective_date}} to "
+    "{{expiration_date}}, the aggregate limit of {{aggregate_limit}} and retention of {{retention}} apply. "
+    "Notice must be given within thirty days of discovery.</p>"
+)
+
+
+def endorsement_rows(count: int) -> list[dict]:
+    updated_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [{
+        "id": f"00000000-0000-0000-0000-{i:012d}",
+        "updated_at": updated_at,
+        "document_type": "endorsement",
+        "title": f"Endorsement {i}",
+        "code": f"END-{i:03d}",
+        "content_html": COVERAGE_PARAGRAPH * 6 + ("{{sublimits_schedule}}" if i % 3 == 0 else ""),
+        "fill_in_mappings": None,
+    } for i in range(count)]
+
+
+def quote_context(i: int) -> dict:
+    return {
+        "insured_name": f"Example Holdings {i} LLC",
+        "insured_address": "1 Main St, New York, NY",
+        "broker_name": "Jane Broker",
+        "broker_company": "Broker Co",
+        "quote_number": f"Q-2026-{i:06d}",
+        "document_number": f"Q-2026-{i:06d}",
+        "quote_date": "January 5, 2026",
+        "effective_date": "February 1, 2026",
+        "expiration_date": "February 1, 2027",
+        "aggregate_limit": 5_000_000,
+        "retention": 50_000,
+        "premium": 42_000,
+        "position": "primary",
+        "sublimits": [{"coverage": "Social Engineering", "limit": 250_000},
+                      {"coverage": "Funds Transfer", "limit": 500_000}],
+        "endorsements": [f"END-{e:03d}" for e in range(8)],
+        "subjectivities": ["Signed application", "MFA attestation"],
+        "document_id": f"{i:08X}",
+        "generated_at": "2026-01-05 09:00",
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Previous implementation
+# ─────────────────────────────────────────────────────────────
+
+def legacy_component(template_html: str, context: dict) -> str:
+    if not template_html:
+        return ""
+    result = template_html
+    placeholder_map = {
+        "form_number": context.get("document_code", ""),
+        "edition_date": context.get("edition_date", ""),
+        "policy_type": context.get("document_type", "Cyber Quote").replace(" Quote", ""),
+        "effective_date": context.get("effective_date", ""),
+        "policy_number": context.get("document_number", ""),
+    }
+    for key, value in placeholder_map.items():
+        result = result.replace("{{" + key + "}}", str(value) if value else "")
+    return result
+
+
+def legacy_fill_ins(content: str, context: dict, fill_in_mappings: dict = None, **_) -> str:
+    if not content:
+        return content
+    mappings = dict(package_generator.STANDARD_FILL_IN_MAPPINGS)
+    if fill_in_mappings:
+        mappings.update(fill_in_mappings)
+    for variable, context_field in mappings.items():
+        if variable not in content:
+            continue
+        if variable == "{{sublimits_schedule}}" or context_field == "sublimits":
+            value = package_generator._render_sublimits_schedule(context)
+        elif variable == "{{additional_insureds_schedule}}" or context_field == "additional_insureds":
+            value = package_generator._render_additional_insureds_schedule(context)
+        elif variable in ("{{aggregate_limit}}", "{{retention}}") or \
+                context_field in ("aggregate_limit", "retention", "limit"):
+            raw_value = context.get(context_field, 0)
+            value = format_limit(raw_value) if raw_value else ""
+        else:
+            value = str(context.get(context_field, ""))
+        content = content.replace(variable, value)
+    if "{{sublimits_schedule}}" in content:
+        content = content.replace("{{sublimits_schedule}}", package_generator._render_sublimits_schedule(context))
+    if "{{additional_insureds_schedule}}" in content:
+        content = content.replace("{{additional_insureds_schedule}}",
+                                  package_generator._render_additional_insureds_schedule(context))
+    return content
+
+
+# ─────────────────────────────────────────────────────────────
+# Modes
+# ─────────────────────────────────────────────────────────────
+
+def use_legacy():
+    package_generator.get_endorsement_component_templates = lambda position: {
+        "header": "", "lead_in": LEAD_IN, "closing": CLOSING}
+    package_generator.render_endorsement_component = legacy_component
+    package_generator.process_endorsement_fill_ins = legacy_fill_ins
+
+
+def use_registry(originals: dict):
+    updated_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    package_generator.get_endorsement_component_templates = lambda position: {
+        "header": db_template("component-header", updated_at, "", COMPONENT_PLACEHOLDERS),
+        "lead_in": db_template("component-lead-in", updated_at, LEAD_IN, COMPONENT_PLACEHOLDERS),
+        "closing": db_template("component-closing", updated_at, CLOSING, COMPONENT_PLACEHOLDERS),
+    }
+    package_generator.render_endorsement_component = originals["render_endorsement_component"]
+    package_generator.process_endorsement_fill_ins = originals["process_endorsement_fill_ins"]
+
+
+def render_documents(docs: int, endorsements: list[dict]) -> tuple[list[str], float]:
+    template = TEMPLATE_ENV.get_template("quote_primary.html")
+    started = time.perf_counter()
+    out = []
+    for i in range(docs):
+        context = quote_context(i)
+        parts = [template.render(**context)]
+        parts.extend(package_generator._render_library_document_html(doc, context) for doc in endorsements)
+        out.append("".join(parts))
+    return out, time.perf_counter() - started
+
+
+COLD_START = """
+import sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+from core.template_registry import TEMPLATE_ENV
+TEMPLATE_ENV.get_template("quote_primary.html")
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def cold_start_ms(cache_dir: str) -> float:
+    env = {**os.environ, "TEMPLATE_BYTECODE_CACHE_DIR": cache_dir}
+    out = subprocess.run([sys.executable, "-c", COLD_START.format(root=str(ROOT))],
+                         env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--endorsements", type=int, default=8)
+    args = parser.parse_args()
+
+    originals = {
+        "render_endorsement_component": package_generator.render_endorsement_component,
+        "process_endorsement_fill_ins": package_generator.process_endorsement_fill_ins,
+    }
+    endorsements = endorsement_rows(args.endorsements)
+    print(f"{args.docs} quote documents, {args.endorsements} endorsements each")
+
+    use_legacy()
+    legacy, legacy_s = render_documents(args.docs, endorsements)
+    print(f"  legacy    {legacy_s:6.2f} s   {legacy_s / args.docs * 1000:6.2f} ms/doc")
+
+    use_registry(originals)
+    registry, registry_s = render_documents(args.docs, endorsements)
+    print(f"  registry  {registry_s:6.2f} s   {registry_s / args.docs * 1000:6.2f} ms/doc   "
+          f"({legacy_s / registry_s:.2f}x)")
+
+    mismatches = sum(1 for a, b in zip(legacy, registry) if a != b)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = cold_start_ms(cache_dir)   # compiles and writes bytecode
+        warm = cold_start_ms(cache_dir)   # loads bytecode
+    print(f"  first template load, fresh process: {cold:.0f} ms without bytecode cache, {warm:.0f} ms with")
+
+    print(f"mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
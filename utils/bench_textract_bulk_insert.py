@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: saving a large Textract result, per-row INSERTs vs bulk insert.
+
+Builds a synthetic Textract result (LINE blocks, KEY_VALUE pairs and raw
+checkboxes; 5,000 blocks by default) and writes it to textract_extractions
+for an existing document, once with the old one-INSERT-per-block loop (rolled
+back) and once through _save_textract_lines (committed).
+
+The document's existing textract_extractions rows are REPLACED - point it at
+a scratch document in a local database.
+
+Usage:
+    python utils/bench_textract_bulk_insert.py --document-id <uuid>
+    python utils/bench_textract_bulk_insert.py --document-id <uuid> --blocks 20000 --runs 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+
+def synthetic_result(blocks: int, seed: int = 7):
+    """TextractResult with ~80% LINE blocks, ~12% KEY_VALUE pairs, ~8% checkboxes."""
+    from ai.textract_extractor import BoundingBox, ExtractedField, TextractResult
+
+    rng = random.Random(seed)
+    n_kv = blocks * 12 // 100
+    n_cb = blocks * 8 // 100
+    n_lines = blocks - n_kv - n_cb
+    pages = max(1, blocks // 125)
+
+    def bbox():
+        return BoundingBox(rng.random() * 0.8, rng.random() * 0.9, rng.random() * 0.2, 0.012)
+
+    fields = [
+        ExtractedField(
+            field_name=f"line_{i}", value=f"Synthetic line {i} " + "x" * rng.randint(5, 80),
+            confidence=rng.uniform(80, 100), page=1 + i * pages // n_lines, bbox=bbox(),
+        )
+        for i in range(n_lines)
+    ]
+    checkboxes = [
+        ExtractedField(
+            field_name=f"cb_{i}", value=None, confidence=rng.uniform(70, 100),
+            page=1 + i * pages // max(n_cb, 1), bbox=bbox(), field_type="checkbox",
+            is_selected=rng.random() < 0.4,
+        )
+        for i in range(n_cb)
+    ]
+    key_value_pairs = {}
+    for i in range(n_kv):
+        b = bbox()
+        key_value_pairs[f"Question {i}?"] = {
+            "value": rng.choice(["Yes", "No", f"Answer {i}"]),
+            "type": rng.choice(["text", "checkbox"]),
+            "page": 1 + i * pages // max(n_kv, 1),
+            "confidence": rng.uniform(60, 100),
+            "bbox": {"left": b.left, "top": b.top, "width": b.width, "height": b.height},
+        }
+    return TextractResult(pages=pages, fields=fields, checkboxes=checkboxes, key_value_pairs=key_value_pairs)
+
+
+def save_per_row(document_id: str, result) -> float:
+    """The old write path: one INSERT (... RETURNING id) per block. Rolled back."""
+    from core.db import engine
+
+    sql = text("""
+        INSERT INTO textract_extractions
+        (document_id, page_number, field_key, field_value, field_type,
+         bbox_left, bbox_top, bbox_width, bbox_height, confidence)
+        VALUES (:doc_id, :page, :key, :value, :type, :left, :top, :width, :height, :conf)
+        RETURNING id
+    """)
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        trans = conn.begin()
+        conn.execute(text("DELETE FROM textract_extractions WHERE document_id = :doc_id"), {"doc_id": document_id})
+        for idx, cb in enumerate(result.checkboxes):
+            b = cb.bbox
+            conn.execute(sql, {"doc_id": document_id, "page": cb.page, "key": f"CB_{idx}",
+                               "value": str(cb.is_selected), "type": "raw_checkbox",
+                               "left": b.left, "top": b.top, "width": b.width, "height": b.height,
+                               "conf": cb.confidence})
+        for idx, f in enumerate(result.fields):
+            b = f.bbox
+            conn.execute(sql, {"doc_id": document_id, "page": f.page, "key": f"LINE_{idx}",
+                               "value": f.value, "type": "line",
+                               "left": b.left, "top": b.top, "width": b.width, "height": b.height,
+                               "conf": f.confidence}).fetchone()
+        for key, kv in result.key_value_pairs.items():
+            b = kv["bbox"]
+            conn.execute(sql, {"doc_id": document_id, "page": kv["page"], "key": key,
+                               "value": str(kv["value"]), "type": kv["type"],
+                               "left": b["left"], "top": b["top"], "width": b["width"], "height": b["height"],
+                               "conf": kv["confidence"]}).fetchone()
+        trans.rollback()
+    return time.perf_counter() - started
+
+
+def save_bulk(document_id: str, result) -> float:
+    from core.extraction_orchestrator import _save_textract_lines
+
+    started = time.perf_counter()
+    lines, id_map, _kvs = _save_textract_lines(document_id, result)
+    elapsed = time.perf_counter() - started
+    if len(id_map) != len(lines) + len(result.key_value_pairs):
+        raise RuntimeError("bulk save did not return an id for every line / key-value pair")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--document-id", required=True, help="existing documents.id to write against")
+    parser.add_argument("--blocks", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        sys.exit("DATABASE_URL must point at a local Postgres")
+
+    result = synthetic_result(args.blocks)
+    print(f"{len(result.fields)} lines + {len(result.key_value_pairs)} key-values "
+          f"+ {len(result.checkboxes)} checkboxes over {result.pages} pages")
+
+    per_row = [save_per_row(args.document_id, result) for _ in range(args.runs)]
+    bulk = [save_bulk(args.document_id, result) for _ in range(args.runs)]
+
+    p, b = statistics.median(per_row), statistics.median(bulk)
+    print(f"\n{'path':<10} {'median s':>10} {'min s':>8} {'rows/s':>10}")
+    print(f"{'per-row':<10} {p:>10.3f} {min(per_row):>8.3f} {args.blocks / p:>10.0f}")
+    print(f"{'bulk':<10} {b:>10.3f} {min(bulk):>8.3f} {args.blocks / b:>10.0f}")
+    print(f"\nspeedup x{p / b:.1f}")
+
+
+if __name__ == "__main__":
+    main()